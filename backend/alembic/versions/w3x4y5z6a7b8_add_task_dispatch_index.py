@@ -0,0 +1,64 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Add dispatch index for executor task polling
+
+Revision ID: w3x4y5z6a7b8
+Revises: v2w3x4y5z6a7
+Create Date: 2025-01-22
+
+Adds stored generated columns for the task status, type label and source
+label to the tasks table, plus indexes on tasks and subtasks, so that
+executor dispatch no longer evaluates JSON_EXTRACT over the whole table.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "w3x4y5z6a7b8"
+down_revision: Union[str, None] = "v2w3x4y5z6a7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Generated columns are maintained by MySQL on every write to json
+    op.execute(
+        """
+        ALTER TABLE tasks
+        ADD COLUMN dispatch_status VARCHAR(32)
+            GENERATED ALWAYS AS (json ->> '$.status.status') STORED
+            COMMENT 'Task status (generated from json)',
+        ADD COLUMN dispatch_type VARCHAR(32)
+            GENERATED ALWAYS AS (json ->> '$.metadata.labels.type') STORED
+            COMMENT 'Task type label (generated from json)',
+        ADD COLUMN dispatch_source VARCHAR(32)
+            GENERATED ALWAYS AS (json ->> '$.metadata.labels.source') STORED
+            COMMENT 'Task source label (generated from json)'
+        """
+    )
+    op.create_index(
+        "ix_tasks_dispatch",
+        "tasks",
+        ["dispatch_status", "kind", "is_active", "created_at"],
+    )
+    op.create_index(
+        "ix_subtasks_dispatch",
+        "subtasks",
+        ["task_id", "role", "status", "message_id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subtasks_dispatch", table_name="subtasks")
+    op.drop_index("ix_tasks_dispatch", table_name="tasks")
+    op.execute(
+        """
+        ALTER TABLE tasks
+        DROP COLUMN dispatch_source,
+        DROP COLUMN dispatch_type,
+        DROP COLUMN dispatch_status
+        """
+    )
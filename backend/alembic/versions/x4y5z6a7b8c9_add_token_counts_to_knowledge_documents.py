@@ -0,0 +1,36 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Add token_counts to knowledge_documents
+
+Revision ID: x4y5z6a7b8c9
+Revises: w3x4y5z6a7b8
+Create Date: 2025-01-23
+
+Stores the token counts computed per tokenizer family while indexing a
+document, e.g. {"openai": 1234, "default": 1301}.
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "x4y5z6a7b8c9"
+down_revision: Union[str, None] = "w3x4y5z6a7b8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add token_counts JSON column to knowledge_documents table"""
+    op.add_column(
+        "knowledge_documents", sa.Column("token_counts", sa.JSON, nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Remove token_counts column from knowledge_documents table"""
+    op.drop_column("knowledge_documents", "token_counts")
@@ -18,13 +18,15 @@ from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.api.dependencies import get_db
 from app.core.config import settings
 from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
 from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
 from app.models.user import User
+from app.services.chat.storage.history_cache import history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -170,30 +172,39 @@ def parse_session_id(session_id: str) -> tuple[str, int]:
 
 
 def subtask_to_message(
-    subtask: Subtask, db: Session, is_group_chat: bool = False
+    subtask: Subtask,
+    db: Session,
+    is_group_chat: bool = False,
+    contexts: Optional[list[SubtaskContext]] = None,
+    sender_username: Optional[str] = None,
 ) -> MessageResponse:
     """Convert Subtask ORM object to MessageResponse with full context loading.
 
     For user messages, this function:
-    1. Loads all contexts (attachments and knowledge_base) in one query
+    1. Uses the given contexts, or loads them (attachments and knowledge_base)
     2. Processes attachments first (images or text) - they have priority
     3. Processes knowledge_base contexts with remaining token space
     4. Follows MAX_EXTRACTED_TEXT_LENGTH limit with attachments having priority
+
+    When converting many subtasks, load contexts and sender usernames in batch
+    with _load_message_contexts and _load_sender_usernames and pass them in.
     """
     role = "user" if subtask.role == SubtaskRole.USER else "assistant"
 
     # Extract content based on role
     if subtask.role == SubtaskRole.USER:
         # Get sender username for group chat
-        sender_username = None
-        if is_group_chat and subtask.sender_user_id:
-            user = db.query(User).filter(User.id == subtask.sender_user_id).first()
-            if user:
-                sender_username = user.user_name
+        if is_group_chat and sender_username is None and subtask.sender_user_id:
+            sender_username = _load_sender_usernames(db, [subtask]).get(
+                subtask.sender_user_id
+            )
+
+        if contexts is None:
+            contexts = _load_message_contexts(db, [subtask.id]).get(subtask.id, [])
 
         # Build content with context (attachments and knowledge bases)
         content = _build_user_message_content(
-            db, subtask, sender_username, is_group_chat
+            contexts, subtask, sender_username, is_group_chat
         )
     else:
         # For assistant, content is in result.value
@@ -210,8 +221,93 @@ def subtask_to_message(
     )
 
 
+def _load_sender_usernames(db: Session, subtasks: list[Subtask]) -> dict[int, str]:
+    """Load the usernames of the senders of subtasks in one query."""
+    user_ids = {
+        subtask.sender_user_id for subtask in subtasks if subtask.sender_user_id
+    }
+    if not user_ids:
+        return {}
+    rows = db.query(User.id, User.user_name).filter(User.id.in_(user_ids)).all()
+    return {user_id: user_name for user_id, user_name in rows}
+
+
+def _load_message_contexts(
+    db: Session, subtask_ids: list[int]
+) -> dict[int, list[SubtaskContext]]:
+    """Load the prompt contexts of many subtasks in one batch.
+
+    Contexts are queried once for all subtasks without their large columns.
+    Afterwards only the payloads the message content uses are fetched, again
+    in one query each: extracted_text of documents and knowledge bases, and
+    image_base64 of images. binary_data is never loaded.
+
+    Args:
+        db: Database session
+        subtask_ids: IDs of the user subtasks
+
+    Returns:
+        Dict mapping subtask ID to its READY attachment and knowledge_base
+        contexts, ordered by creation time
+    """
+    if not subtask_ids:
+        return {}
+
+    contexts = (
+        db.query(SubtaskContext)
+        .options(
+            load_only(
+                SubtaskContext.subtask_id,
+                SubtaskContext.context_type,
+                SubtaskContext.name,
+                SubtaskContext.text_length,
+                SubtaskContext.type_data,
+                SubtaskContext.created_at,
+            )
+        )
+        .filter(
+            SubtaskContext.subtask_id.in_(subtask_ids),
+            SubtaskContext.status == ContextStatus.READY.value,
+            SubtaskContext.context_type.in_(
+                [ContextType.ATTACHMENT.value, ContextType.KNOWLEDGE_BASE.value]
+            ),
+        )
+        .order_by(SubtaskContext.created_at, SubtaskContext.id)
+        .all()
+    )
+
+    contexts_by_subtask: dict[int, list[SubtaskContext]] = {}
+    text_contexts = {}
+    image_contexts = {}
+    for context in contexts:
+        contexts_by_subtask.setdefault(context.subtask_id, []).append(context)
+        if context.context_type == ContextType.ATTACHMENT.value and (
+            context.mime_type or ""
+        ).startswith("image/"):
+            image_contexts[context.id] = context
+        else:
+            text_contexts[context.id] = context
+
+    # Fill the deferred columns in place so the contexts do not lazy-load them
+    for column, targets in (
+        (SubtaskContext.extracted_text, text_contexts),
+        (SubtaskContext.image_base64, image_contexts),
+    ):
+        if not targets:
+            continue
+        rows = (
+            db.query(SubtaskContext.id, column)
+            .filter(SubtaskContext.id.in_(list(targets)))
+            .all()
+        )
+        for context_id, value in rows:
+            set_committed_value(targets[context_id], column.key, value)
+
+    return contexts_by_subtask
+
+
 def _build_user_message_content(
-    db: Session,
+    all_contexts: list[SubtaskContext],
     subtask: Subtask,
     sender_username: str | None,
     is_group_chat: bool = False,
@@ -220,27 +316,11 @@ def _build_user_message_content(
 
     Returns either a string or a list of content blocks (for multimodal messages).
     """
-    import base64
-
     # Build text content
     text_content = subtask.prompt or ""
     if is_group_chat and sender_username:
         text_content = f"User[{sender_username}]: {text_content}"
 
-    # Load all contexts in one query and separate by type
-    all_contexts = (
-        db.query(SubtaskContext)
-        .filter(
-            SubtaskContext.subtask_id == subtask.id,
-            SubtaskContext.status == ContextStatus.READY.value,
-            SubtaskContext.context_type.in_(
-                [ContextType.ATTACHMENT.value, ContextType.KNOWLEDGE_BASE.value]
-            ),
-        )
-        .order_by(SubtaskContext.created_at)
-        .all()
-    )
-
     if not all_contexts:
         return text_content
 
@@ -337,6 +417,31 @@ def _build_user_message_content(
     return text_content
 
 
+def _render_messages(
+    db: Session, subtasks: list[Subtask], is_group_chat: bool
+) -> list[dict[str, Any]]:
+    """Render subtasks into cacheable message dicts for the history cache.
+
+    Contexts and sender usernames of all subtasks are loaded in batch.
+    """
+    user_subtasks = [st for st in subtasks if st.role == SubtaskRole.USER]
+    contexts_by_subtask = _load_message_contexts(db, [st.id for st in user_subtasks])
+    sender_usernames = (
+        _load_sender_usernames(db, user_subtasks) if is_group_chat else {}
+    )
+
+    return [
+        subtask_to_message(
+            st,
+            db,
+            is_group_chat,
+            contexts=contexts_by_subtask.get(st.id, []),
+            sender_username=sender_usernames.get(st.sender_user_id),
+        ).model_dump()
+        for st in subtasks
+    ]
+
+
 # ==================== API Endpoints ====================
 
 
@@ -376,30 +481,18 @@ async def get_chat_history(
             detail="Only task-based sessions are supported",
         )
 
-    # Build query for subtasks - only get COMPLETED messages for history
-    # This matches the behavior in backup version (loader.py:75-78)
-    query = db.query(Subtask).filter(
-        Subtask.task_id == task_id,
-        Subtask.status == SubtaskStatus.COMPLETED,
+    # Only COMPLETED messages are included, and only messages added since the
+    # previous request are rendered; earlier ones come from the history cache
+    # message_id (not subtask.id) represents the order within the conversation
+    rendered = history_cache.load(
+        db,
+        task_id,
+        variant="remote:group" if is_group_chat else "remote",
+        render=lambda db, subtasks: _render_messages(db, subtasks, is_group_chat),
+        before_message_id=before_message_id or None,
+        limit=limit,
     )
-
-    if before_message_id:
-        # Filter by message_id, not subtask.id
-        # message_id represents the order within the conversation
-        query = query.filter(Subtask.message_id < before_message_id)
-
-    # When limit is specified, we need to get the most recent N messages
-    # First order by message_id desc to get the latest, then reverse
-    if limit:
-        subtasks = query.order_by(Subtask.message_id.desc()).limit(limit).all()
-        # Reverse to get chronological order (oldest first)
-        subtasks = list(reversed(subtasks))
-    else:
-        # No limit - get all messages in chronological order
-        subtasks = query.order_by(Subtask.message_id.asc()).all()
-
-    # Convert to message format with full context loading
-    messages = [subtask_to_message(st, db, is_group_chat) for st in subtasks]
+    messages = [MessageResponse(**message) for message in rendered]
 
     logger.debug(
         "get_chat_history: session_id=%s, count=%d, is_group_chat=%s, limit=%s",
@@ -614,6 +707,7 @@ async def update_message(
         }
 
     db.commit()
+    history_cache.invalidate(subtask.task_id)
 
     logger.debug(
         "update_message: session_id=%s, message_id=%s",
@@ -646,6 +740,7 @@ async def delete_message(
 
     subtask.status = SubtaskStatus.DELETE
     db.commit()
+    history_cache.invalidate(subtask.task_id)
 
     logger.debug(
         "delete_message: session_id=%s, message_id=%s",
@@ -677,6 +772,7 @@ async def clear_history(
         {"status": SubtaskStatus.DELETE}
     )
     db.commit()
+    history_cache.invalidate(task_id)
 
     logger.debug("clear_history: session_id=%s", session_id)
 
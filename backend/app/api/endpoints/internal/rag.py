@@ -155,6 +155,10 @@ class KnowledgeBaseSizeRequest(BaseModel):
     """Request for getting knowledge base size."""
 
     knowledge_base_ids: list[int] = Field(..., description="List of knowledge base IDs")
+    model_family: str = Field(
+        default="default",
+        description="Model family to report token counts for (openai, anthropic, google, default)",
+    )
 
 
 class KnowledgeBaseSizeInfo(BaseModel):
@@ -163,7 +167,7 @@ class KnowledgeBaseSizeInfo(BaseModel):
     id: int
     total_file_size: int  # Total file size in bytes
     document_count: int  # Number of active documents
-    estimated_tokens: int  # Estimated token count (file_size / 4)
+    estimated_tokens: int  # Token count from index time, file_size / 4 if unknown
 
 
 class KnowledgeBaseSizeResponse(BaseModel):
@@ -182,12 +186,13 @@ async def get_knowledge_base_size(
     """
     Get size information for knowledge bases.
 
-    This endpoint returns the total file size and estimated token count
-    for the specified knowledge bases. Used by chat_shell to decide
-    whether to use direct injection or RAG retrieval.
+    This endpoint returns the total file size and token count for the
+    specified knowledge bases. Token counts are aggregated at index time
+    per model family. Used by chat_shell to decide whether to use direct
+    injection or RAG retrieval.
 
     Args:
-        request: Request with knowledge base IDs
+        request: Request with knowledge base IDs and model family
         db: Database session
 
     Returns:
@@ -203,8 +208,9 @@ async def get_knowledge_base_size(
         try:
             file_size = KnowledgeService.get_total_file_size(db, kb_id)
             doc_count = KnowledgeService.get_active_document_count(db, kb_id)
-            # Estimate tokens: approximately 4 characters per token for most models
-            estimated_tokens = file_size // 4
+            estimated_tokens = KnowledgeService.get_total_token_count(
+                db, kb_id, request.model_family
+            )
 
             items.append(
                 KnowledgeBaseSizeInfo(
@@ -368,6 +374,7 @@ class ChunkInfo(BaseModel):
     title: str
     chunk_id: Optional[int] = None
     doc_ref: Optional[str] = None
+    token_counts: Optional[dict] = None
     metadata: Optional[dict] = None
 
 
@@ -425,6 +432,7 @@ async def get_all_chunks(
                     title=c.get("title", "Unknown"),
                     chunk_id=c.get("chunk_id"),
                     doc_ref=c.get("doc_ref"),
+                    token_counts=c.get("token_counts"),
                     metadata=c.get("metadata"),
                 )
                 for c in chunks
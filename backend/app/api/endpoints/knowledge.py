@@ -46,7 +46,10 @@ from app.services.knowledge import (
     knowledge_base_qa_service,
 )
 from app.services.rag.document_service import DocumentService
-from app.services.rag.storage.factory import create_storage_backend
+from app.services.rag.storage.factory import (
+    get_shared_storage_backend,
+    storage_backend_registry,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -550,7 +553,9 @@ def _trigger_document_summary_if_enabled(
                     )
                 )
             finally:
-                # Properly shutdown async generators and close the loop
+                # Close cached storage clients bound to this loop, then
+                # properly shutdown async generators and close the loop
+                storage_backend_registry.release_event_loop(loop)
                 loop.run_until_complete(loop.shutdown_asyncgens())
                 loop.close()
             logger.info(
@@ -635,9 +640,9 @@ def _index_document_background(
 
         logger.info(f"Found retriever: {retriever_name}")
 
-        # Create storage backend from retriever
-        storage_backend = create_storage_backend(retriever_crd)
-        logger.info(f"Created storage backend: {type(storage_backend).__name__}")
+        # Get shared storage backend for retriever
+        storage_backend = get_shared_storage_backend(retriever_crd)
+        logger.info(f"Using storage backend: {type(storage_backend).__name__}")
 
         # Create document service
         doc_service = DocumentService(storage_backend=storage_backend)
@@ -662,7 +667,9 @@ def _index_document_background(
                 )
             )
         finally:
-            # Properly shutdown async generators and close the loop
+            # Close cached storage clients bound to this loop, then
+            # properly shutdown async generators and close the loop
+            storage_backend_registry.release_event_loop(loop)
             loop.run_until_complete(loop.shutdown_asyncgens())
             loop.close()
         logger.info(
@@ -681,11 +688,14 @@ def _index_document_background(
             if doc:
                 doc.is_active = True
                 doc.status = DocumentStatus.ENABLED
+                doc.token_counts = result.get("token_counts")
                 db.commit()
                 logger.info(
                     f"Updated document {document_id} is_active to True and status to enabled after successful indexing"
                 )
 
+                KnowledgeService.refresh_token_counts(db, int(knowledge_base_id))
+
                 # Trigger document summary generation if enabled
                 _trigger_document_summary_if_enabled(
                     db=db,
@@ -1313,7 +1323,9 @@ def _update_kb_summary_after_deletion(kb_id: int, user_id: int, user_name: str):
                 )
             )
         finally:
-            # Properly shutdown async generators and close the loop
+            # Close cached storage clients bound to this loop, then
+            # properly shutdown async generators and close the loop
+            storage_backend_registry.release_event_loop(loop)
             loop.run_until_complete(loop.shutdown_asyncgens())
             loop.close()
 
@@ -36,7 +36,7 @@ from app.services.adapters.retriever_kinds import retriever_kinds_service
 from app.services.group_permission import get_effective_role_in_group
 from app.services.rag.document_service import DocumentService
 from app.services.rag.retrieval_service import RetrievalService
-from app.services.rag.storage.factory import create_storage_backend
+from app.services.rag.storage.factory import get_shared_storage_backend
 
 router = APIRouter()
 
@@ -64,8 +64,8 @@ def get_retriever_and_backend(
         db, user_id=user_id, name=retriever_name, namespace=retriever_namespace
     )
 
-    # Create storage backend from Retriever config
-    storage_backend = create_storage_backend(retriever)
+    # Get shared storage backend for Retriever config
+    storage_backend = get_shared_storage_backend(retriever)
 
     return retriever, storage_backend
 
@@ -4,6 +4,7 @@
 
 """Web scraper API endpoints for fetching and converting web pages."""
 
+import hashlib
 import logging
 from typing import Optional
 
@@ -181,6 +182,7 @@ async def create_web_document(
     # Step 3: Create attachment (SubtaskContext) to store the content
     content_bytes = result.content.encode("utf-8")
     content_size = len(content_bytes)
+    content_sha256 = hashlib.sha256(content_bytes).hexdigest()
 
     attachment = SubtaskContext(
         user_id=current_user.id,
@@ -193,6 +195,7 @@ async def create_web_document(
             "original_filename": doc_name,
             "file_extension": "md",
             "file_size": content_size,
+            "sha256": content_sha256,
             "mime_type": "text/markdown",
             "storage_backend": "mysql",
         },
@@ -390,6 +393,7 @@ async def refresh_web_document(
     # Step 4: Update the attachment content
     content_bytes = result.content.encode("utf-8")
     content_size = len(content_bytes)
+    content_sha256 = hashlib.sha256(content_bytes).hexdigest()
 
     attachment = (
         db.query(SubtaskContext)
@@ -404,6 +408,7 @@ async def refresh_web_document(
         attachment.type_data = {
             **attachment.type_data,
             "file_size": content_size,
+            "sha256": content_sha256,
         }
         db.flush()
         logger.info(f"Updated attachment {attachment.id} for web document")
@@ -420,6 +425,7 @@ async def refresh_web_document(
                 "original_filename": document.name,
                 "file_extension": "md",
                 "file_size": content_size,
+                "sha256": content_sha256,
                 "mime_type": "text/markdown",
                 "storage_backend": "mysql",
             },
@@ -1339,15 +1339,22 @@ class ChatNamespace(socketio.AsyncNamespace):
 
             messages = []
             for st in subtasks:
+                content = (
+                    st.prompt
+                    if st.role == SubtaskRole.USER
+                    else (st.result.get("value", "") if st.result else "")
+                )
+                if st.role != SubtaskRole.USER and st.status == SubtaskStatus.RUNNING:
+                    # The DB only holds checkpoint snapshots of a running
+                    # stream, the Redis cache has everything appended so far
+                    cached_content = await session_manager.get_streaming_content(st.id)
+                    if cached_content and len(cached_content) > len(content or ""):
+                        content = cached_content
                 msg = {
                     "subtask_id": st.id,
                     "message_id": st.message_id,
                     "role": st.role.value,
-                    "content": (
-                        st.prompt
-                        if st.role == SubtaskRole.USER
-                        else (st.result.get("value", "") if st.result else "")
-                    ),
+                    "content": content,
                     "status": st.status.value,
                     "created_at": st.created_at.isoformat() if st.created_at else None,
                 }
@@ -4,38 +4,239 @@
 
 import asyncio
 import logging
-from typing import Any, Optional
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import orjson
 from redis import Redis as SyncRedis
-from redis.asyncio import Redis
+from redis.asyncio import ConnectionPool, Redis
 
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# Pub/Sub channel used to drop L1 entries in other processes
+L1_INVALIDATION_CHANNEL = "wegent:cache:invalidate"
+
+# Seconds to wait before re-subscribing after a Pub/Sub error
+L1_LISTENER_RETRY_SECONDS = 5
+
+
+class LocalTTLCache:
+    """
+    Bounded in-process cache with per-entry expiry.
+
+    Holds raw Redis payloads (bytes) so every hit is decoded into a fresh
+    object and callers cannot mutate the cached value.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 30.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached payload, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return payload
+
+    def put(self, key: str, payload: bytes, expire: Optional[int] = None) -> None:
+        """Store a payload, never keeping it longer than the Redis TTL."""
+        ttl = self.ttl if not expire else min(self.ttl, expire)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all keys."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class RedisCache:
     """Redis-based cache manager for GitHub repositories"""
 
-    def __init__(self, url: str):
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 50,
+        l1_prefixes: Sequence[str] = (),
+        l1_ttl: float = 30.0,
+        l1_max_entries: int = 1000,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            url: Redis URL
+            max_connections: Connection pool size per event loop
+            l1_prefixes: Key prefixes also cached in process (read-mostly keys)
+            l1_ttl: Upper bound for how long an L1 entry is served
+            l1_max_entries: Maximum number of L1 entries
+        """
         # Use binary responses (decode_responses=False) to store orjson bytes
         self._url = url
         self._connection_params = {
             "encoding": "utf-8",
             "decode_responses": False,
-            "max_connections": 10,
+            "max_connections": max_connections,
             "socket_timeout": 5.0,
             "socket_connect_timeout": 2.0,
             "retry_on_timeout": True,
         }
+        # redis.asyncio connections are bound to the loop that opened them,
+        # so each event loop gets its own pool and client
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Redis]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._sync_client: Optional[SyncRedis] = None
+        self._client_lock = threading.Lock()
+
+        self._l1_prefixes = tuple(prefix for prefix in l1_prefixes if prefix)
+        self._l1 = LocalTTLCache(max_entries=l1_max_entries, ttl=l1_ttl)
+        self._instance_id = uuid.uuid4().hex
+        self._listener_thread: Optional[threading.Thread] = None
+        self._listener_stop = threading.Event()
+
+    def _get_loop_client(self) -> Redis:
+        """Get the pooled client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            with self._client_lock:
+                client = self._clients.get(loop)
+                if client is None:
+                    pool = ConnectionPool.from_url(self._url, **self._connection_params)
+                    client = Redis(connection_pool=pool)
+                    self._clients[loop] = client
+        return client
 
     async def _get_client(self) -> Redis:
         """
-        Get Redis client, simply and directly create new connection
+        Get a Redis client backed by the running loop's connection pool.
+
+        Callers may aclose() the returned client, which only returns its
+        connection to the shared pool.
         """
-        # Create new client every time to avoid event loop closure issues
-        return Redis.from_url(self._url, **self._connection_params)
+        return Redis(connection_pool=self._get_loop_client().connection_pool)
+
+    def _get_sync_client(self) -> SyncRedis:
+        """Get the shared, thread-safe sync client."""
+        if self._sync_client is None:
+            with self._client_lock:
+                if self._sync_client is None:
+                    self._sync_client = SyncRedis.from_url(
+                        self._url,
+                        encoding="utf-8",
+                        decode_responses=False,
+                        socket_timeout=5.0,
+                        socket_connect_timeout=2.0,
+                    )
+        return self._sync_client
+
+    @staticmethod
+    def _decode(data: Optional[bytes]) -> Optional[Any]:
+        if data is None:
+            return None
+        try:
+            return orjson.loads(data)
+        except Exception:
+            # If value was stored as plain bytes/string
+            return data
+
+    # ==================== L1 tier ====================
+
+    def _is_l1_key(self, key: str) -> bool:
+        return bool(self._l1_prefixes) and key.startswith(self._l1_prefixes)
+
+    def _l1_put(self, key: str, payload: bytes, expire: Optional[int] = None) -> None:
+        if self._is_l1_key(key):
+            self._ensure_l1_listener()
+            self._l1.put(key, payload, expire)
+
+    async def _invalidate_remote(self, client: Redis, keys: Iterable[str]) -> None:
+        """Drop L1 keys locally and tell other processes to do the same."""
+        l1_keys = [key for key in keys if self._is_l1_key(key)]
+        if not l1_keys:
+            return
+        for key in l1_keys:
+            self._l1.invalidate(key)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key in l1_keys:
+                pipe.publish(L1_INVALIDATION_CHANNEL, f"{self._instance_id} {key}")
+            await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Error publishing cache invalidation: {str(e)}")
+
+    def _ensure_l1_listener(self) -> None:
+        """Start the Pub/Sub invalidation listener on first L1 use."""
+        if self._listener_thread is not None:
+            return
+        with self._client_lock:
+            if self._listener_thread is not None:
+                return
+            self._listener_thread = threading.Thread(
+                target=self._l1_listener,
+                name="redis-cache-l1-invalidation",
+                daemon=True,
+            )
+            self._listener_thread.start()
+
+    def _l1_listener(self) -> None:
+        """Drop L1 entries changed by other processes."""
+        while not self._listener_stop.is_set():
+            pubsub = None
+            try:
+                pubsub = self._get_sync_client().pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(L1_INVALIDATION_CHANNEL)
+                # Entries cached while unsubscribed may have missed updates
+                self._l1.clear()
+                while not self._listener_stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if not message:
+                        continue
+                    data = message["data"]
+                    if isinstance(data, bytes):
+                        data = data.decode("utf-8")
+                    sender, _, key = data.partition(" ")
+                    if sender != self._instance_id:
+                        self._l1.invalidate(key)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {str(e)}")
+                self._l1.clear()
+                self._listener_stop.wait(L1_LISTENER_RETRY_SECONDS)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    # ==================== Public API ====================
 
     def generate_full_cache_key(self, user_id: int, git_domain: str) -> str:
         """Generate cache key for full user repositories list"""
@@ -44,48 +245,87 @@ class RedisCache:
 
     async def get(self, key: str) -> Optional[Any]:
         """Get value from cache"""
+        if self._is_l1_key(key):
+            payload = self._l1.get(key)
+            if payload is not None:
+                return self._decode(payload)
         try:
-            client = await self._get_client()
-            try:
-                data = await client.get(key)
-                if data is None:
-                    return None
-                try:
-                    return orjson.loads(data)
-                except Exception:
-                    # If value was stored as plain bytes/string
-                    return data
-            finally:
-                await client.aclose()
+            data = await self._get_loop_client().get(key)
+            if data is not None:
+                self._l1_put(key, data)
+            return self._decode(data)
+        except Exception as e:
+            logger.error(f"Error getting cache key {key}: {str(e)}")
+            return None
+
+    async def get_raw(self, key: str) -> Optional[bytes]:
+        """
+        Get the undecoded payload of a key.
+
+        For callers that keep data derived from a value and only need to
+        know whether it changed.
+        """
+        if self._is_l1_key(key):
+            payload = self._l1.get(key)
+            if payload is not None:
+                return payload
+        try:
+            data = await self._get_loop_client().get(key)
+            if data is not None:
+                self._l1_put(key, data)
+            return data
         except Exception as e:
             logger.error(f"Error getting cache key {key}: {str(e)}")
             return None
 
     def get_sync(self, key: str) -> Optional[Any]:
         """Get value from cache synchronously"""
+        if self._is_l1_key(key):
+            payload = self._l1.get(key)
+            if payload is not None:
+                return self._decode(payload)
         try:
-            client = SyncRedis.from_url(
-                self._url,
-                encoding="utf-8",
-                decode_responses=False,
-                socket_timeout=5.0,
-                socket_connect_timeout=2.0,
-            )
-            try:
-                data = client.get(key)
-                if data is None:
-                    return None
-                try:
-                    return orjson.loads(data)
-                except Exception:
-                    # If value was stored as plain bytes/string
-                    return data
-            finally:
-                client.close()
+            data = self._get_sync_client().get(key)
+            if data is not None:
+                self._l1_put(key, data)
+            return self._decode(data)
         except Exception as e:
             logger.error(f"Error getting cache key {key} (sync): {str(e)}")
             return None
 
+    async def mget(self, keys: Sequence[str]) -> List[Optional[Any]]:
+        """
+        Get several values in one round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Values aligned with keys, None for missing keys
+        """
+        results: List[Optional[Any]] = [None] * len(keys)
+        missing: List[int] = []
+        for i, key in enumerate(keys):
+            payload = self._l1.get(key) if self._is_l1_key(key) else None
+            if payload is not None:
+                results[i] = self._decode(payload)
+            else:
+                missing.append(i)
+        if not missing:
+            return results
+
+        try:
+            values = await self._get_loop_client().mget([keys[i] for i in missing])
+        except Exception as e:
+            logger.error(f"Error getting {len(missing)} cache keys: {str(e)}")
+            return results
+
+        for i, data in zip(missing, values):
+            if data is not None:
+                self._l1_put(keys[i], data)
+            results[i] = self._decode(data)
+        return results
+
     def get_user_repositories_sync(
         self, user_id: int, git_domain: str
     ) -> Optional[list]:
@@ -107,29 +347,55 @@ class RedisCache:
     ) -> bool:
         """Set value to cache with expiration (seconds)"""
         try:
-            client = await self._get_client()
-            try:
-                payload = orjson.dumps(value)
-                ok = await client.set(key, payload, ex=expire)
-                return bool(ok)
-            finally:
-                await client.aclose()
+            client = self._get_loop_client()
+            payload = orjson.dumps(value)
+            ok = await client.set(key, payload, ex=expire)
+            await self._invalidate_remote(client, [key])
+            return bool(ok)
         except Exception as e:
             logger.error(f"Error setting cache key {key}: {str(e)}")
             return False
 
+    async def mset(
+        self,
+        mapping: Dict[str, Any],
+        expire: int = settings.REPO_CACHE_EXPIRED_TIME,
+    ) -> bool:
+        """
+        Set several values with expiration (seconds) in one pipelined round trip.
+
+        Args:
+            mapping: Key to value mapping
+            expire: Expiration in seconds applied to every key
+
+        Returns:
+            True if all keys were set
+        """
+        if not mapping:
+            return True
+        try:
+            client = self._get_loop_client()
+            pipe = client.pipeline(transaction=False)
+            for key, value in mapping.items():
+                pipe.set(key, orjson.dumps(value), ex=expire)
+            results = await pipe.execute()
+            await self._invalidate_remote(client, mapping.keys())
+            return all(results)
+        except Exception as e:
+            logger.error(f"Error setting {len(mapping)} cache keys: {str(e)}")
+            return False
+
     async def setnx(
         self, key: str, value: Any, expire: int = settings.REPO_CACHE_EXPIRED_TIME
     ) -> bool:
         """Set value to cache only if key doesn't exist (SETNX operation)"""
         try:
-            client = await self._get_client()
-            try:
-                payload = orjson.dumps(value)
-                ok = await client.set(key, payload, ex=expire, nx=True)
-                return bool(ok)
-            finally:
-                await client.aclose()
+            client = self._get_loop_client()
+            payload = orjson.dumps(value)
+            ok = await client.set(key, payload, ex=expire, nx=True)
+            if ok:
+                await self._invalidate_remote(client, [key])
+            return bool(ok)
         except Exception as e:
             logger.error(f"Error setting cache key {key} with SETNX: {str(e)}")
             return False
@@ -137,12 +403,10 @@ class RedisCache:
     async def delete(self, key: str) -> bool:
         """Delete key from cache"""
         try:
-            client = await self._get_client()
-            try:
-                deleted = await client.delete(key)
-                return deleted > 0
-            finally:
-                await client.aclose()
+            client = self._get_loop_client()
+            deleted = await client.delete(key)
+            await self._invalidate_remote(client, [key])
+            return deleted > 0
         except Exception as e:
             logger.error(f"Error deleting cache key {key}: {str(e)}")
             return False
@@ -154,11 +418,7 @@ class RedisCache:
     async def get_cache_size(self) -> int:
         """Get approximate number of keys in current DB"""
         try:
-            client = await self._get_client()
-            try:
-                return await client.dbsize()
-            finally:
-                await client.aclose()
+            return await self._get_loop_client().dbsize()
         except Exception as e:
             logger.error(f"Error getting cache size: {str(e)}")
             return 0
@@ -191,6 +451,24 @@ class RedisCache:
             )
             return False
 
+    async def close(self) -> None:
+        """Stop the invalidation listener and close the pool of the running loop."""
+        self._listener_stop.set()
+        self._l1.clear()
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose(close_connection_pool=True)
+
 
 # Global cache instance
-cache_manager = RedisCache(settings.REDIS_URL)
+cache_manager = RedisCache(
+    settings.REDIS_URL,
+    max_connections=settings.REDIS_CACHE_MAX_CONNECTIONS,
+    l1_prefixes=(
+        [prefix.strip() for prefix in settings.REDIS_CACHE_L1_PREFIXES.split(",")]
+        if settings.REDIS_CACHE_L1_ENABLED
+        else []
+    ),
+    l1_ttl=settings.REDIS_CACHE_L1_TTL,
+    l1_max_entries=settings.REDIS_CACHE_L1_MAX_ENTRIES,
+)
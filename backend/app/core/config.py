@@ -65,6 +65,13 @@ class Settings(BaseSettings):
     EXECUTOR_CANCEL_TASK_URL: str = (
         "http://localhost:8001/executor-manager/tasks/cancel"
     )
+    # Push dispatch hints to executor_manager through a Redis Stream when
+    # executor subtasks become PENDING (executor_manager keeps polling as a
+    # fallback)
+    EXECUTOR_DISPATCH_QUEUE_ENABLED: bool = True
+    EXECUTOR_DISPATCH_QUEUE_STREAM: str = "wegent:executor:dispatch"
+    # Approximate maximum stream length; old hints are trimmed
+    EXECUTOR_DISPATCH_QUEUE_MAXLEN: int = 10000
 
     # JWT configuration
     SECRET_KEY: str = "secret-key"
@@ -78,6 +85,14 @@ class Settings(BaseSettings):
     # Cache configuration
     REPO_CACHE_EXPIRED_TIME: int = 7200  # 2 hour in seconds
     REPO_UPDATE_INTERVAL_SECONDS: int = 3600  # 1 hour in seconds
+    # Concurrent page requests when fetching a user's repository list
+    REPO_FETCH_CONCURRENCY: int = 4
+    # Incremental repository syncs fall back to a full sync after this long
+    REPO_FULL_SYNC_INTERVAL_SECONDS: int = 6 * 3600
+    # Maximum results returned by repository search
+    REPO_SEARCH_MAX_RESULTS: int = 100
+    # Number of per-user, per-domain repository search indexes kept in process
+    REPO_SEARCH_INDEX_MAX_ENTRIES: int = 200
 
     # Task limits
     MAX_RUNNING_TASKS_PER_USER: int = 10
@@ -104,6 +119,17 @@ class Settings(BaseSettings):
     STREAMING_DB_SAVE_INTERVAL: float = 5.0  # Database save interval (seconds)
     STREAMING_REDIS_TTL: int = 300  # Redis streaming cache TTL (seconds)
     STREAMING_MIN_CHARS_TO_SAVE: int = 50  # Minimum characters to save on disconnect
+    # Token coalescing: tokens are batched into one chunk event per frame,
+    # flushed after STREAMING_COALESCE_INTERVAL seconds or once the frame
+    # reaches STREAMING_COALESCE_MAX_BYTES
+    STREAMING_COALESCE_ENABLED: bool = True
+    STREAMING_COALESCE_INTERVAL: float = 0.03
+    STREAMING_COALESCE_MAX_BYTES: int = 256
+    # Append-only persistence: only new content is appended to the Redis
+    # streaming cache, and running results are snapshotted to the DB every
+    # STREAMING_DB_CHECKPOINT_INTERVAL seconds (or after new thinking steps)
+    STREAMING_APPEND_PERSISTENCE: bool = True
+    STREAMING_DB_CHECKPOINT_INTERVAL: float = 30.0
 
     # Task append expiration (hours)
     APPEND_CHAT_TASK_EXPIRE_HOURS: int = 2
@@ -129,6 +155,17 @@ class Settings(BaseSettings):
 
     # Redis configuration
     REDIS_URL: str = "redis://127.0.0.1:6379/0"
+    # Connection pool size per event loop for app.core.cache
+    REDIS_CACHE_MAX_CONNECTIONS: int = 50
+    # In-process L1 tier for hot, read-mostly cache keys
+    # Entries are dropped via Redis Pub/Sub when any process writes the key
+    REDIS_CACHE_L1_ENABLED: bool = True
+    # Comma-separated key prefixes served from L1
+    REDIS_CACHE_L1_PREFIXES: str = "git_repos:"
+    # Maximum age of an L1 entry (seconds)
+    REDIS_CACHE_L1_TTL: int = 30
+    # Maximum number of L1 entries
+    REDIS_CACHE_L1_MAX_ENTRIES: int = 1000
 
     # Celery configuration
     CELERY_BROKER_URL: Optional[str] = None  # If None/empty, uses REDIS_URL
@@ -361,6 +398,45 @@ class Settings(BaseSettings):
     # Enable/disable automatic summary generation after document indexing
     SUMMARY_ENABLED: bool = True
 
+    # Embedding cache configuration
+    # Caches embeddings by (Model CRD identity, sha256(text)) to avoid
+    # re-embedding identical texts during re-indexing and repeated queries
+    EMBEDDING_CACHE_ENABLED: bool = True
+    # Maximum number of embeddings kept in the in-process LRU tier
+    EMBEDDING_CACHE_MAX_ENTRIES: int = 10000
+    # Enable Redis as the shared second cache tier
+    EMBEDDING_CACHE_REDIS_ENABLED: bool = True
+    # Redis TTL for cached embeddings (seconds, default 7 days)
+    EMBEDDING_CACHE_REDIS_TTL: int = 7 * 24 * 3600
+
+    # Storage backend registry configuration
+    # Reuses Elasticsearch/Qdrant clients per Retriever CRD across requests
+    STORAGE_BACKEND_CACHE_ENABLED: bool = True
+    # Maximum number of cached storage backends
+    STORAGE_BACKEND_CACHE_MAX_ENTRIES: int = 32
+    # Evict backends unused for this long (seconds)
+    STORAGE_BACKEND_CACHE_IDLE_TTL: int = 1800
+    # Interval for health-checking cached backends (seconds)
+    STORAGE_BACKEND_HEALTH_CHECK_INTERVAL: int = 60
+
+    # Knowledge base chunk snapshot cache for direct injection
+    # Serves all chunks of a knowledge base from a compressed Redis snapshot
+    # keyed by its content version instead of scrolling the vector store
+    CHUNK_SNAPSHOT_CACHE_ENABLED: bool = True
+    # Maximum number of decoded snapshots kept in process
+    CHUNK_SNAPSHOT_CACHE_MAX_ENTRIES: int = 32
+    # Redis TTL for snapshots (seconds, default 1 day)
+    CHUNK_SNAPSHOT_CACHE_TTL: int = 24 * 3600
+
+    # Rendered chat history cache
+    # Keeps prompt-ready history messages per task so that each chat turn only
+    # renders the messages added since the previous turn
+    CHAT_HISTORY_CACHE_ENABLED: bool = True
+    # Maximum number of task histories kept in process
+    CHAT_HISTORY_CACHE_MAX_ENTRIES: int = 128
+    # Redis TTL for rendered histories (seconds, default 1 day)
+    CHAT_HISTORY_CACHE_TTL: int = 24 * 3600
+
     # Long-term memory configuration (mem0)
     # Enable/disable long-term memory feature
     MEMORY_ENABLED: bool = False
@@ -297,7 +297,13 @@ async def lifespan(app: FastAPI):
     await shutdown_pending_request_registry()
     logger.info("✓ PendingRequestRegistry shutdown completed")
 
-    # Step 6: Shutdown OpenTelemetry
+    # Step 6: Close pooled Redis cache connections
+    from app.core.cache import cache_manager
+
+    await cache_manager.close()
+    logger.info("✓ Redis cache connections closed")
+
+    # Step 7: Shutdown OpenTelemetry
     from shared.telemetry.config import get_otel_config
     from shared.telemetry.core import is_telemetry_enabled, shutdown_telemetry
 
@@ -89,6 +89,9 @@ class KnowledgeDocument(Base):
         JSON, nullable=False, default={}
     )  # Source configuration (e.g., {"url": "..."} for table)
     summary = Column(JSON, nullable=True)  # Document summary information (JSON)
+    token_counts = Column(
+        JSON, nullable=True
+    )  # Token counts per tokenizer family, computed at index time
     created_at = Column(DateTime, nullable=False, default=func.now())
     updated_at = Column(
         DateTime, nullable=False, default=func.now(), onupdate=func.now()
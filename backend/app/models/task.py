@@ -14,7 +14,9 @@ from sqlalchemy import (
     JSON,
     Boolean,
     Column,
+    Computed,
     DateTime,
+    Index,
     Integer,
     String,
     UniqueConstraint,
@@ -75,10 +77,32 @@ class TaskResource(Base):
         index=True,
         comment="Project ID for task grouping",
     )
+    # Stored generated columns mirroring the JSON fields executor dispatch
+    # filters on, so the dispatch query can use an index instead of
+    # evaluating JSON_EXTRACT over every row. The database keeps them in
+    # sync with every write to json.
+    dispatch_status = Column(
+        String(32),
+        Computed("json ->> '$.status.status'", persisted=True),
+        comment="Task status (generated from json)",
+    )
+    dispatch_type = Column(
+        String(32),
+        Computed("json ->> '$.metadata.labels.type'", persisted=True),
+        comment="Task type label (generated from json)",
+    )
+    dispatch_source = Column(
+        String(32),
+        Computed("json ->> '$.metadata.labels.source'", persisted=True),
+        comment="Task source label (generated from json)",
+    )
 
     __table_args__ = (
         UniqueConstraint(
             "user_id", "kind", "name", "namespace", name="uniq_user_kind_name_namespace"
         ),
+        Index(
+            "ix_tasks_dispatch", "dispatch_status", "kind", "is_active", "created_at"
+        ),
         {"mysql_charset": "utf8mb4", "mysql_collate": "utf8mb4_unicode_ci"},
     )
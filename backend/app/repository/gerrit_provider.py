@@ -10,8 +10,11 @@ import base64
 import hashlib
 import logging
 import re
+import sys
+from functools import partial
 from typing import Any, Dict, List, Optional
 
+import httpx
 import requests
 from fastapi import HTTPException
 from requests.auth import HTTPBasicAuth, HTTPDigestAuth
@@ -20,6 +23,12 @@ from app.core.cache import cache_manager
 from app.core.config import settings
 from app.models.user import User
 from app.repository.interfaces.repository_provider import RepositoryProvider
+from app.repository.repo_sync import (
+    ProviderHttpClient,
+    conditional_headers,
+    sync_repositories,
+)
+from app.repository.search_index import repository_search_indexes
 from app.schemas.github import Branch, Repository
 from shared.utils.sensitive_data_masker import mask_string
 from shared.utils.url_util import build_url
@@ -35,6 +44,7 @@ class GerritProvider(RepositoryProvider):
         self.logger = logging.getLogger(__name__)
         self.domain = "gerrit"
         self.type = "gerrit"
+        self._http = ProviderHttpClient()
 
     def _get_git_infos(
         self, user: User, git_domain: Optional[str] = None
@@ -583,9 +593,6 @@ class GerritProvider(RepositoryProvider):
         Raises:
             HTTPException: Raised when search fails
         """
-        # Normalize query, case-insensitive
-        query_lower = query.lower()
-
         # Iterate all gerrit entries for this user (may be multiple domains)
         entries = self._get_git_infos(user)
         all_results: List[Dict[str, Any]] = []
@@ -600,108 +607,24 @@ class GerritProvider(RepositoryProvider):
                 # Skip empty token/user_name entries
                 continue
 
-            # 1) Try to get from full cache first (per domain)
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
-                all_results.extend(
-                    [
-                        Repository(
-                            id=repo["id"],
-                            name=repo["name"],
-                            full_name=repo["full_name"],
-                            clone_url=repo["clone_url"],
-                            git_domain=git_domain,
-                            type="gerrit",
-                            private=repo["private"],
-                        ).model_dump()
-                        for repo in filtered_repos
-                    ]
-                )
-                continue
-
-            # 2) If cache is being built for this domain, wait (with timeout)
-            is_building = await cache_manager.is_building(user.id, git_domain)
-            if is_building:
-                start_time = asyncio.get_event_loop().time()
-                while await cache_manager.is_building(user.id, git_domain):
-                    if asyncio.get_event_loop().time() - start_time > timeout:
-                        raise HTTPException(
-                            status_code=408,
-                            detail="Timeout waiting for repository data to be ready",
-                        )
-                    await asyncio.sleep(1)
-
-                # Try cache again
-                full_cached = await self._get_all_repositories_from_cache(
-                    user, git_domain
-                )
-                if full_cached:
-                    if fullmatch:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower == repo["name"].lower()
-                            or query_lower == repo["full_name"].lower()
-                        ]
-                    else:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower in repo["name"].lower()
-                            or query_lower in repo["full_name"].lower()
-                        ]
-                    all_results.extend(
-                        [
-                            Repository(
-                                id=repo["id"],
-                                name=repo["name"],
-                                full_name=repo["full_name"],
-                                clone_url=repo["clone_url"],
-                                git_domain=git_domain,
-                                type="gerrit",
-                                private=repo["private"],
-                            ).model_dump()
-                            for repo in filtered_repos
-                        ]
-                    )
-                    continue
-
-            # 3) No cache and not building, trigger domain-level full retrieval
-            await self._fetch_all_repositories_async(
-                user, git_token, user_name, git_domain, auth_type
+            # 1) Search the indexed full cache (per domain); the cache is built on
+            # first use and served stale while it is being refreshed
+            cached_repos = await repository_search_indexes.search(
+                user.id,
+                git_domain,
+                query,
+                refresh=partial(
+                    self._fetch_all_repositories_async,
+                    user,
+                    git_token,
+                    user_name,
+                    git_domain,
+                    auth_type,
+                ),
+                fullmatch=fullmatch,
+                timeout=timeout,
             )
-
-            # 4) Try cache after building
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
+            if cached_repos is not None:
                 all_results.extend(
                     [
                         Repository(
@@ -713,10 +636,9 @@ class GerritProvider(RepositoryProvider):
                             type="gerrit",
                             private=repo["private"],
                         ).model_dump()
-                        for repo in filtered_repos
+                        for repo in cached_repos
                     ]
                 )
-
         return all_results
 
     async def _fetch_all_repositories_async(
@@ -746,44 +668,60 @@ class GerritProvider(RepositoryProvider):
         try:
             # Get API base URL based on git domain
             api_base_url = self._get_api_base_url(git_domain)
+            client = self._http.get()
+            if auth_type == "basic":
+                auth = httpx.BasicAuth(user_name, git_token)
+            else:
+                auth = httpx.DigestAuth(user_name, git_token)
 
             self.logger.info(f"Fetching gerrit all projects for user {user.user_name}")
 
-            # Gerrit returns all projects in one call
-            response = await self._make_request_async(
-                method="GET",
-                url=f"{api_base_url}/projects/",
-                username=user_name,
-                http_password=git_token,
-                auth_type=auth_type,
-                params={"d": ""},  # Include descriptions
-            )
+            async def fetch_page(page, etag, since):
+                return await client.get(
+                    f"{api_base_url}/projects/",
+                    auth=auth,
+                    headers=conditional_headers({"Accept": "application/json"}, etag),
+                    params={"d": ""},  # Include descriptions
+                )
 
-            # Parse response and strip XSSI prefix
-            response_text = self._strip_xssi_prefix(response.text)
-            projects = (
-                requests.models.complexjson.loads(response_text)
-                if response_text
-                else {}
-            )
+            def parse_page(response):
+                # Parse response and strip XSSI prefix
+                response_text = self._strip_xssi_prefix(response.text)
+                projects = (
+                    requests.models.complexjson.loads(response_text)
+                    if response_text
+                    else {}
+                )
 
-            # Convert to standard format
-            all_repos = []
-            for project_name, project_info in projects.items():
-                project_id = abs(hash(project_name)) % (10**10)
-                clone_url = build_url(git_domain, f"/{project_name}.git")
+                # Convert to standard format
+                repos = []
+                for project_name, project_info in projects.items():
+                    project_id = abs(hash(project_name)) % (10**10)
+                    clone_url = build_url(git_domain, f"/{project_name}.git")
 
-                all_repos.append(
-                    {
-                        "id": project_id,
-                        "name": project_name.split("/")[-1],
-                        "full_name": project_name,
-                        "clone_url": clone_url,
-                        "git_domain": git_domain,
-                        "type": "gerrit",
-                        "private": True,
-                    }
-                )
+                    repos.append(
+                        {
+                            "id": project_id,
+                            "name": project_name.split("/")[-1],
+                            "full_name": project_name,
+                            "clone_url": clone_url,
+                            "git_domain": git_domain,
+                            "type": "gerrit",
+                            "private": True,
+                        }
+                    )
+                return repos
+
+            # Gerrit returns all projects in one call; the ETag of the previous
+            # sync still saves re-downloading an unchanged list
+            all_repos = await sync_repositories(
+                user.id,
+                git_domain,
+                fetch_page,
+                parse_page,
+                per_page=sys.maxsize,
+                max_pages=1,
+            )
 
             # Sort by project name
             all_repos.sort(key=lambda x: x["full_name"])
@@ -7,7 +7,7 @@ Gitea repository provider implementation
 """
 import asyncio
 import logging
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -17,6 +17,12 @@ from app.core.cache import cache_manager
 from app.core.config import settings
 from app.models.user import User
 from app.repository.interfaces.repository_provider import RepositoryProvider
+from app.repository.repo_sync import (
+    ProviderHttpClient,
+    conditional_headers,
+    sync_repositories,
+)
+from app.repository.search_index import repository_search_indexes
 from app.schemas.github import Branch, Repository
 from shared.utils.sensitive_data_masker import mask_string
 from shared.utils.url_util import build_url
@@ -32,6 +38,7 @@ class GiteaProvider(RepositoryProvider):
         self.api_base_url = "https://gitea.com/api/v1"
         self.domain = "gitea.com"
         self.type = "gitea"
+        self._http = ProviderHttpClient()
 
     def _get_git_infos(
         self, user: User, git_domain: Optional[str] = None
@@ -406,101 +413,19 @@ class GiteaProvider(RepositoryProvider):
             if not git_token:
                 continue
 
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
-                all_results.extend(
-                    [
-                        Repository(
-                            id=repo["id"],
-                            name=repo["name"],
-                            full_name=repo["full_name"],
-                            clone_url=repo["clone_url"],
-                            git_domain=git_domain,
-                            type=self.type,
-                            private=repo.get("private", False),
-                        ).model_dump()
-                        for repo in filtered_repos
-                    ]
-                )
-                continue
-
-            is_building = await cache_manager.is_building(user.id, git_domain)
-            if is_building:
-                start_time = asyncio.get_event_loop().time()
-                while await cache_manager.is_building(user.id, git_domain):
-                    if asyncio.get_event_loop().time() - start_time > timeout:
-                        raise HTTPException(
-                            status_code=408,
-                            detail="Timeout waiting for repository data to be ready",
-                        )
-                    await asyncio.sleep(1)
-
-                full_cached = await self._get_all_repositories_from_cache(
-                    user, git_domain
-                )
-                if full_cached:
-                    if fullmatch:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower == repo["name"].lower()
-                            or query_lower == repo["full_name"].lower()
-                        ]
-                    else:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower in repo["name"].lower()
-                            or query_lower in repo["full_name"].lower()
-                        ]
-                    all_results.extend(
-                        [
-                            Repository(
-                                id=repo["id"],
-                                name=repo["name"],
-                                full_name=repo["full_name"],
-                                clone_url=repo["clone_url"],
-                                git_domain=git_domain,
-                                type=self.type,
-                                private=repo.get("private", False),
-                            ).model_dump()
-                            for repo in filtered_repos
-                        ]
-                    )
-                    continue
-
-            await self._fetch_all_repositories_async(user, git_token, git_domain)
-
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
+            # 1) Search the indexed full cache (per domain); the cache is built on
+            # first use and served stale while it is being refreshed
+            cached_repos = await repository_search_indexes.search(
+                user.id,
+                git_domain,
+                query,
+                refresh=partial(
+                    self._fetch_all_repositories_async, user, git_token, git_domain
+                ),
+                fullmatch=fullmatch,
+                timeout=timeout,
+            )
+            if cached_repos is not None:
                 all_results.extend(
                     [
                         Repository(
@@ -512,7 +437,7 @@ class GiteaProvider(RepositoryProvider):
                             type=self.type,
                             private=repo.get("private", False),
                         ).model_dump()
-                        for repo in filtered_repos
+                        for repo in cached_repos
                     ]
                 )
                 continue
@@ -592,9 +517,8 @@ class GiteaProvider(RepositoryProvider):
         try:
             api_base_url = self._get_api_base_url(git_domain)
             headers = self._build_headers(git_token)
+            client = self._http.get()
 
-            all_repos = []
-            page = 1
             # Gitea servers may have MAX_RESPONSE_ITEMS configured (default 50)
             # We request 50 to be safe and rely on pagination
             per_page = 50
@@ -603,20 +527,15 @@ class GiteaProvider(RepositoryProvider):
                 f"Fetching gitea all repositories for user {user.user_name}"
             )
 
-            while True:
-                response = await asyncio.to_thread(
-                    requests.get,
+            async def fetch_page(page, etag, since):
+                return await client.get(
                     f"{api_base_url}/user/repos",
-                    headers=headers,
+                    headers=conditional_headers(headers, etag),
                     params={"limit": per_page, "page": page, "sort": "updated"},
                 )
-                response.raise_for_status()
-
-                repos = response.json()
-                if not repos:
-                    break
 
-                mapped_repos = [
+            def parse_page(response):
+                return [
                     {
                         "id": repo["id"],
                         "name": repo["name"],
@@ -626,33 +545,18 @@ class GiteaProvider(RepositoryProvider):
                         "type": self.type,
                         "private": repo.get("private", False),
                     }
-                    for repo in repos
+                    for repo in response.json()
                 ]
-                all_repos.extend(mapped_repos)
-
-                # Check if there are more pages using X-Total-Count header
-                # or fall back to checking if we got fewer items than requested
-                total_count = response.headers.get("X-Total-Count")
-                if total_count:
-                    try:
-                        total = int(total_count)
-                        if len(all_repos) >= total:
-                            break
-                    except (ValueError, TypeError):
-                        # Malformed header, fall back to checking response size
-                        if len(repos) < per_page:
-                            break
-                elif len(repos) < per_page:
-                    # No header available, fall back to old logic
-                    break
-
-                page += 1
 
-                if page > 100:
-                    self.logger.warning(
-                        f"Reached maximum page limit (100) for user {user.id}"
-                    )
-                    break
+            # Gitea cannot filter by update time, so every sync is a full one
+            all_repos = await sync_repositories(
+                user.id,
+                git_domain,
+                fetch_page,
+                parse_page,
+                per_page=per_page,
+                max_pages=100,
+            )
 
             cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
             await cache_manager.set(
@@ -7,7 +7,7 @@ Gitee repository provider implementation
 """
 import asyncio
 import logging
-from functools import lru_cache
+from functools import lru_cache, partial
 from typing import Any, Dict, List, Optional
 
 import requests
@@ -17,6 +17,12 @@ from app.core.cache import cache_manager
 from app.core.config import settings
 from app.models.user import User
 from app.repository.interfaces.repository_provider import RepositoryProvider
+from app.repository.repo_sync import (
+    ProviderHttpClient,
+    conditional_headers,
+    sync_repositories,
+)
+from app.repository.search_index import repository_search_indexes
 from app.schemas.github import Branch, Repository
 from shared.utils.sensitive_data_masker import mask_string
 from shared.utils.url_util import build_url
@@ -32,6 +38,7 @@ class GiteeProvider(RepositoryProvider):
         self.api_base_url = "https://gitee.com/api/v5"
         self.domain = "gitee.com"
         self.type = "gitee"
+        self._http = ProviderHttpClient()
 
     def _get_git_infos(
         self, user: User, git_domain: Optional[str] = None
@@ -387,106 +394,19 @@ class GiteeProvider(RepositoryProvider):
                 # skip empty token entries
                 continue
 
-            # 1) Try to get from full cache first (per domain)
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
-                all_results.extend(
-                    [
-                        Repository(
-                            id=repo["id"],
-                            name=repo["name"],
-                            full_name=repo["full_name"],
-                            clone_url=repo["clone_url"],
-                            git_domain=git_domain,
-                            type="gitee",
-                            private=repo["private"],
-                        ).model_dump()
-                        for repo in filtered_repos
-                    ]
-                )
-                continue
-
-            # 2) If cache is being built for this domain, wait (with timeout)
-            is_building = await cache_manager.is_building(user.id, git_domain)
-            if is_building:
-                start_time = asyncio.get_event_loop().time()
-                while await cache_manager.is_building(user.id, git_domain):
-                    if asyncio.get_event_loop().time() - start_time > timeout:
-                        raise HTTPException(
-                            status_code=408,
-                            detail="Timeout waiting for repository data to be ready",
-                        )
-                    await asyncio.sleep(1)
-
-                # try cache again
-                full_cached = await self._get_all_repositories_from_cache(
-                    user, git_domain
-                )
-                if full_cached:
-                    if fullmatch:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower == repo["name"].lower()
-                            or query_lower == repo["full_name"].lower()
-                        ]
-                    else:
-                        filtered_repos = [
-                            repo
-                            for repo in full_cached
-                            if query_lower in repo["name"].lower()
-                            or query_lower in repo["full_name"].lower()
-                        ]
-                    all_results.extend(
-                        [
-                            Repository(
-                                id=repo["id"],
-                                name=repo["name"],
-                                full_name=repo["full_name"],
-                                clone_url=repo["clone_url"],
-                                git_domain=git_domain,
-                                type="gitee",
-                                private=repo["private"],
-                            ).model_dump()
-                            for repo in filtered_repos
-                        ]
-                    )
-                    continue
-
-            # 3) No cache and not building (or build finished but still no cache), trigger domain-level full retrieval
-            await self._fetch_all_repositories_async(user, git_token, git_domain)
-
-            # 4) Try cache after building
-            full_cached = await self._get_all_repositories_from_cache(user, git_domain)
-            if full_cached:
-                if fullmatch:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower == repo["name"].lower()
-                        or query_lower == repo["full_name"].lower()
-                    ]
-                else:
-                    filtered_repos = [
-                        repo
-                        for repo in full_cached
-                        if query_lower in repo["name"].lower()
-                        or query_lower in repo["full_name"].lower()
-                    ]
+            # 1) Search the indexed full cache (per domain); the cache is built on
+            # first use and served stale while it is being refreshed
+            cached_repos = await repository_search_indexes.search(
+                user.id,
+                git_domain,
+                query,
+                refresh=partial(
+                    self._fetch_all_repositories_async, user, git_token, git_domain
+                ),
+                fullmatch=fullmatch,
+                timeout=timeout,
+            )
+            if cached_repos is not None:
                 all_results.extend(
                     [
                         Repository(
@@ -498,12 +418,12 @@ class GiteeProvider(RepositoryProvider):
                             type="gitee",
                             private=repo["private"],
                         ).model_dump()
-                        for repo in filtered_repos
+                        for repo in cached_repos
                     ]
                 )
                 continue
 
-            # 5) Fallback: fetch first page for this domain only (avoid cross-domain aggregation)
+            # 2) Fallback: fetch first page for this domain only (avoid cross-domain aggregation)
             try:
                 api_base_url = self._get_api_base_url(git_domain)
                 response = requests.get(
@@ -585,35 +505,28 @@ class GiteeProvider(RepositoryProvider):
         try:
             # Get API base URL based on git domain
             api_base_url = self._get_api_base_url(git_domain)
-
-            all_repos = []
-            page = 1
-            per_page = 100
+            client = self._http.get()
 
             self.logger.info(
                 f"Fetching gitee all repositories for user {user.user_name}"
             )
 
-            while True:
-                response = await asyncio.to_thread(
-                    requests.get,
+            async def fetch_page(page, etag, since):
+                return await client.get(
                     f"{api_base_url}/user/repos",
+                    headers=conditional_headers({}, etag),
                     params={
                         "access_token": git_token,
-                        "per_page": per_page,
+                        "per_page": 100,
                         "page": page,
                         "sort": "updated",
                         "affiliation": "owner,collaborator",
                     },
                 )
-                response.raise_for_status()
-
-                repos = response.json()
-                if not repos:
-                    break
 
+            def parse_page(response):
                 # Map Gitee API response to standard format
-                mapped_repos = [
+                return [
                     {
                         "id": repo["id"],
                         "name": repo["name"],
@@ -623,22 +536,19 @@ class GiteeProvider(RepositoryProvider):
                         "type": "gitee",
                         "private": repo.get("private", False),
                     }
-                    for repo in repos
+                    for repo in response.json()
                 ]
-                all_repos.extend(mapped_repos)
-
-                # If the number of retrieved repos is less than per_page, we've reached the end
-                if len(repos) < per_page:
-                    break
 
-                page += 1
-
-                # Prevent infinite loop, set maximum page limit
-                if page > 50:  # Maximum 5000 repositories
-                    self.logger.warning(
-                        f"Reached maximum page limit (50) for user {user.id}"
-                    )
-                    break
+            # Gitee cannot filter by update time, so every sync is a full one
+            # Maximum 50 pages (5000 repositories)
+            all_repos = await sync_repositories(
+                user.id,
+                git_domain,
+                fetch_page,
+                parse_page,
+                per_page=100,
+                max_pages=50,
+            )
 
             # Cache complete repository list
             cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
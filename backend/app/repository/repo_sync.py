@@ -0,0 +1,265 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Paginated repository list synchronization shared by the git providers
+
+Full syncs fetch the first page, work out the last page from the response
+headers and fetch the remaining pages concurrently. Each page is requested
+with the ETag of the previous sync, so unchanged pages come back as 304 and
+are taken from the stored sync state. Providers whose API can filter by
+update time also get incremental syncs between full syncs.
+"""
+import asyncio
+import logging
+import math
+import threading
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import httpx
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Re-fetch a little before the last sync to cover clock skew between servers
+SINCE_OVERLAP_SECONDS = 300
+
+# Request timeout for repository list pages (seconds)
+PAGE_REQUEST_TIMEOUT = 30.0
+
+# Requests one page: (page, etag) -> response
+PageFetcher = Callable[[int, Optional[str]], Awaitable[httpx.Response]]
+# Maps a page response to repositories in the standard format
+PageParser = Callable[[httpx.Response], List[Dict[str, Any]]]
+
+
+class ProviderHttpClient:
+    """
+    Keep-alive httpx clients for one provider, one per event loop
+
+    The periodic repository job runs on its own event loop, and httpx
+    connections cannot be shared across loops.
+    """
+
+    def __init__(self):
+        self._clients: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]"
+        ) = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def get(self) -> httpx.AsyncClient:
+        """Get the client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            with self._lock:
+                client = self._clients.get(loop)
+                if client is None or client.is_closed:
+                    client = httpx.AsyncClient(
+                        timeout=PAGE_REQUEST_TIMEOUT,
+                        limits=httpx.Limits(
+                            max_connections=settings.REPO_FETCH_CONCURRENCY * 2,
+                            max_keepalive_connections=settings.REPO_FETCH_CONCURRENCY,
+                        ),
+                        follow_redirects=True,
+                    )
+                    self._clients[loop] = client
+        return client
+
+
+def conditional_headers(headers: Dict[str, str], etag: Optional[str]) -> Dict[str, str]:
+    """Add If-None-Match to request headers when an ETag is known."""
+    if not etag:
+        return headers
+    return {**headers, "If-None-Match": etag}
+
+
+def _last_page(response: httpx.Response, per_page: int) -> Optional[int]:
+    """Get the last page number from pagination headers, if the server sent any."""
+    last = response.links.get("last")
+    if last and last.get("url"):
+        pages = parse_qs(urlparse(last["url"]).query).get("page")
+        if pages and pages[0].isdigit():
+            return int(pages[0])
+
+    for header in ("X-Total-Pages", "total_page"):
+        value = response.headers.get(header)
+        if value and value.isdigit():
+            return int(value)
+
+    total = response.headers.get("X-Total-Count")
+    if total and total.isdigit():
+        return max(1, math.ceil(int(total) / per_page))
+    return None
+
+
+async def fetch_all_pages(
+    fetch_page: PageFetcher,
+    parse_page: PageParser,
+    per_page: int,
+    max_pages: int,
+    previous_pages: Optional[List[Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch every page of a repository list
+
+    Args:
+        fetch_page: Coroutine function requesting one page
+        parse_page: Maps a page response to repositories
+        per_page: Page size requested by fetch_page
+        max_pages: Maximum number of pages to fetch
+        previous_pages: Pages of the previous sync, reused on 304
+
+    Returns:
+        Pages as [{"etag": ..., "repos": [...]}], in page order
+    """
+    previous_pages = previous_pages or []
+
+    async def get(page: int) -> Dict[str, Any]:
+        previous = previous_pages[page - 1] if page <= len(previous_pages) else None
+        etag = previous.get("etag") if previous else None
+        response = await fetch_page(page, etag)
+        if response.status_code == 304 and previous is not None:
+            return {**previous, "last_page": None}
+        response.raise_for_status()
+        return {
+            "etag": response.headers.get("ETag"),
+            "repos": parse_page(response),
+            "last_page": _last_page(response, per_page),
+        }
+
+    first = await get(1)
+    pages = [first]
+    # A 304 carries no pagination headers, assume the page count is unchanged
+    last_page = first["last_page"] or len(previous_pages) or None
+
+    if last_page and len(first["repos"]) >= per_page:
+        semaphore = asyncio.Semaphore(settings.REPO_FETCH_CONCURRENCY)
+
+        async def bounded(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await get(page)
+
+        rest = await asyncio.gather(
+            *(bounded(page) for page in range(2, min(last_page, max_pages) + 1))
+        )
+        for page in rest:
+            pages.append(page)
+            if len(page["repos"]) < per_page:
+                break
+
+    # Without pagination headers, keep walking until a short page
+    while (
+        len(pages[-1]["repos"]) >= per_page
+        and len(pages) < max_pages
+        and (last_page is None or len(pages) < last_page)
+    ):
+        pages.append(await get(len(pages) + 1))
+
+    if len(pages) >= max_pages and len(pages[-1]["repos"]) >= per_page:
+        logger.warning(f"Reached maximum page limit ({max_pages}) for repository list")
+
+    for page in pages:
+        page.pop("last_page", None)
+    return pages
+
+
+def merge_updated_repos(
+    previous: List[Dict[str, Any]], updated: List[Dict[str, Any]]
+) -> List[Dict[str, Any]]:
+    """Put recently updated repositories first, replacing their previous entries."""
+    updated_ids = {repo["id"] for repo in updated}
+    return updated + [repo for repo in previous if repo.get("id") not in updated_ids]
+
+
+def _sync_state_key(user_id: int, git_domain: str) -> str:
+    return f"git_repos_sync:{user_id}:{git_domain}"
+
+
+def _isoformat(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+async def sync_repositories(
+    user_id: int,
+    git_domain: str,
+    fetch_page: Callable[
+        [int, Optional[str], Optional[str]], Awaitable[httpx.Response]
+    ],
+    parse_page: PageParser,
+    per_page: int,
+    max_pages: int,
+    incremental: bool = False,
+) -> List[Dict[str, Any]]:
+    """
+    Fetch a user's full repository list for one git domain
+
+    Args:
+        user_id: User ID
+        git_domain: Git domain
+        fetch_page: Coroutine function (page, etag, since) requesting one page;
+            since is an ISO 8601 time to filter by, or None for all repositories
+        parse_page: Maps a page response to repositories
+        per_page: Page size requested by fetch_page
+        max_pages: Maximum number of pages to fetch
+        incremental: Whether fetch_page can filter by update time
+
+    Returns:
+        Repository list in the standard format
+    """
+    started = time.time()
+    state_key = _sync_state_key(user_id, git_domain)
+    state = await cache_manager.get(state_key)
+    if not isinstance(state, dict):
+        state = {}
+
+    if (
+        incremental
+        and state.get("synced_at")
+        and started - state.get("full_synced_at", 0)
+        < settings.REPO_FULL_SYNC_INTERVAL_SECONDS
+    ):
+        previous = await cache_manager.get(
+            cache_manager.generate_full_cache_key(user_id, git_domain)
+        )
+        if isinstance(previous, list):
+            since = _isoformat(state["synced_at"] - SINCE_OVERLAP_SECONDS)
+            pages = await fetch_all_pages(
+                lambda page, etag: fetch_page(page, None, since),
+                parse_page,
+                per_page,
+                max_pages,
+            )
+            updated = [repo for page in pages for repo in page["repos"]]
+            logger.info(
+                f"Incremental repository sync for user {user_id} on {git_domain}: "
+                f"{len(updated)} updated since {since}"
+            )
+            state["synced_at"] = started
+            await cache_manager.set(
+                state_key, state, expire=settings.REPO_FULL_SYNC_INTERVAL_SECONDS
+            )
+            return merge_updated_repos(previous, updated)
+
+    pages = await fetch_all_pages(
+        lambda page, etag: fetch_page(page, etag, None),
+        parse_page,
+        per_page,
+        max_pages,
+        previous_pages=state.get("pages"),
+    )
+    await cache_manager.set(
+        state_key,
+        {"pages": pages, "synced_at": started, "full_synced_at": started},
+        expire=settings.REPO_FULL_SYNC_INTERVAL_SECONDS,
+    )
+    return [repo for page in pages for repo in page["repos"]]
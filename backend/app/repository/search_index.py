@@ -0,0 +1,322 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+In-process search index over cached repository lists
+
+Every provider caches the user's full repository list per git domain in
+Redis. The repo picker searches that list on every keystroke, so instead of
+decoding and scanning the whole list each time, a trigram index is built once
+per cached payload and reused until the payload changes.
+"""
+import asyncio
+import hashlib
+import heapq
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
+from fastapi import HTTPException
+
+from app.core.cache import cache_manager
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Characters that start a new word inside a repository path
+WORD_SEPARATORS = "/-_. "
+
+# Polling bounds (seconds) while another process builds the cache
+BUILD_POLL_MIN_INTERVAL = 0.05
+BUILD_POLL_MAX_INTERVAL = 1.0
+
+# Sorts after every match_rank() result
+UNMATCHED_RANK = (7, 0)
+
+
+def _subsequence_gaps(query: str, text: str) -> Optional[int]:
+    """Number of skipped characters if query is a subsequence of text."""
+    start = -1
+    pos = -1
+    for char in query:
+        pos = text.find(char, pos + 1)
+        if pos < 0:
+            return None
+        if start < 0:
+            start = pos
+    return pos - start + 1 - len(query)
+
+
+def _is_word_prefix(query: str, text: str) -> bool:
+    """Whether query starts at the beginning of a word of text."""
+    pos = text.find(query)
+    while pos >= 0:
+        if pos == 0 or text[pos - 1] in WORD_SEPARATORS:
+            return True
+        pos = text.find(query, pos + 1)
+    return False
+
+
+def match_rank(
+    query: str, name: str, full_name: str, fuzzy: bool = True
+) -> Optional[Tuple[int, int]]:
+    """
+    Rank how well a repository matches a lowercase query
+
+    Args:
+        query: Lowercase search keyword
+        name: Lowercase repository name
+        full_name: Lowercase repository full name
+        fuzzy: Also accept subsequence matches
+
+    Returns:
+        Sort key (lower is better), or None if the repository does not match
+    """
+    if name == query:
+        return (0, len(name))
+    if full_name == query:
+        return (1, len(name))
+    if name.startswith(query):
+        return (2, len(name))
+    if _is_word_prefix(query, full_name):
+        return (3, len(name))
+    if query in name:
+        return (4, len(name))
+    if query in full_name:
+        return (5, len(name))
+    if fuzzy:
+        gaps = _subsequence_gaps(query, name)
+        if gaps is None:
+            gaps = _subsequence_gaps(query, full_name)
+        if gaps is not None:
+            return (6, gaps)
+    return None
+
+
+def _trigrams(text: str) -> set:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class RepositorySearchIndex:
+    """Trigram index over one repository list"""
+
+    def __init__(self, repos: List[Dict[str, Any]]):
+        self.repos = repos
+        self._names = [repo["name"].lower() for repo in repos]
+        self._full_names = [repo["full_name"].lower() for repo in repos]
+        self._exact: Dict[str, List[int]] = {}
+        self._trigrams: Dict[str, List[int]] = {}
+
+        for i, (name, full_name) in enumerate(zip(self._names, self._full_names)):
+            self._exact.setdefault(name, []).append(i)
+            if full_name != name:
+                self._exact.setdefault(full_name, []).append(i)
+            for gram in _trigrams(name) | _trigrams(full_name):
+                self._trigrams.setdefault(gram, []).append(i)
+
+    def _substring_candidates(self, query: str) -> List[int]:
+        if len(query) < 3:
+            return list(range(len(self.repos)))
+        postings = []
+        for gram in _trigrams(query):
+            posting = self._trigrams.get(gram)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            candidates.intersection_update(posting)
+            if not candidates:
+                break
+        return sorted(candidates)
+
+    def search(
+        self, query: str, fullmatch: bool = False, limit: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Search repositories by name or full name
+
+        Substring matches are ranked exact > prefix > word prefix > substring;
+        subsequence (fuzzy) matches are returned only when nothing else matches.
+
+        Args:
+            query: Search keyword
+            fullmatch: Only return exact name or full name matches
+            limit: Maximum number of results
+
+        Returns:
+            Best matching repositories, best first
+        """
+        query = query.lower()
+        if fullmatch:
+            matches = sorted(set(self._exact.get(query, [])))
+            return [self.repos[i] for i in matches[:limit]]
+
+        ranked = []
+        for i in self._substring_candidates(query):
+            rank = match_rank(query, self._names[i], self._full_names[i], fuzzy=False)
+            if rank is not None:
+                ranked.append((rank, i))
+
+        if not ranked and query:
+            for i in range(len(self.repos)):
+                rank = match_rank(query, self._names[i], self._full_names[i])
+                if rank is not None:
+                    ranked.append((rank, i))
+
+        best = heapq.nsmallest(limit, ranked) if limit else sorted(ranked)
+        return [self.repos[i] for _, i in best]
+
+
+class RepositorySearchIndexes:
+    """
+    Per-user, per-domain search indexes of the cached repository lists
+
+    An index stays valid as long as the cached payload it was built from is
+    unchanged. When the cache has expired or is being rebuilt, the last index
+    keeps answering (stale-while-revalidate) while the list is refreshed in
+    the background.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._indexes: "OrderedDict[str, Tuple[bytes, RepositorySearchIndex]]" = (
+            OrderedDict()
+        )
+        self._refreshes: Dict[str, asyncio.Task] = {}
+
+    async def search(
+        self,
+        user_id: int,
+        git_domain: str,
+        query: str,
+        refresh: Callable[[], Awaitable[None]],
+        fullmatch: bool = False,
+        timeout: int = 30,
+        limit: Optional[int] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Search the cached repository list of a git domain
+
+        Args:
+            user_id: User ID
+            git_domain: Git domain
+            query: Search keyword
+            refresh: Coroutine function fetching the full list into the cache
+            fullmatch: Only return exact name or full name matches
+            timeout: Seconds to wait for a cache being built elsewhere
+            limit: Maximum number of results, defaults to REPO_SEARCH_MAX_RESULTS
+
+        Returns:
+            Matching cached repositories, or None if no list could be cached
+
+        Raises:
+            HTTPException: Raised when waiting for the cache times out
+        """
+        limit = limit or settings.REPO_SEARCH_MAX_RESULTS
+        key = cache_manager.generate_full_cache_key(user_id, git_domain)
+
+        index = await self._get_index(key)
+        if index is None:
+            stale = self._indexes.get(key)
+            if stale is not None:
+                self._refresh_in_background(key, refresh)
+                return stale[1].search(query, fullmatch, limit)
+
+            if await cache_manager.is_building(user_id, git_domain):
+                await self._wait_for_build(key, user_id, git_domain, timeout)
+            else:
+                await self._refresh(key, refresh)
+            index = await self._get_index(key)
+            if index is None:
+                return None
+
+        return index.search(query, fullmatch, limit)
+
+    async def _get_index(self, key: str) -> Optional[RepositorySearchIndex]:
+        """Get the index of the current cached payload, rebuilding it if changed."""
+        payload = await cache_manager.get_raw(key)
+        if payload is None:
+            return None
+
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        entry = self._indexes.get(key)
+        if entry is not None and entry[0] == digest:
+            self._indexes.move_to_end(key)
+            return entry[1]
+
+        try:
+            index = await asyncio.to_thread(self._build, payload)
+        except Exception as e:
+            logger.error(f"Error building repository search index for {key}: {e}")
+            return None
+        self._indexes[key] = (digest, index)
+        self._indexes.move_to_end(key)
+        while len(self._indexes) > self.max_entries:
+            self._indexes.popitem(last=False)
+        return index
+
+    @staticmethod
+    def _build(payload: bytes) -> RepositorySearchIndex:
+        repos = orjson.loads(payload)
+        if not isinstance(repos, list):
+            raise ValueError("cached repository list is not a list")
+        return RepositorySearchIndex(repos)
+
+    async def _refresh(self, key: str, refresh: Callable[[], Awaitable[None]]):
+        task = self._refreshes.get(key)
+        if task is None:
+            task = self._start_refresh(key, refresh)
+        await asyncio.shield(task)
+
+    def _refresh_in_background(
+        self, key: str, refresh: Callable[[], Awaitable[None]]
+    ) -> None:
+        if key not in self._refreshes:
+            self._start_refresh(key, refresh)
+
+    def _start_refresh(
+        self, key: str, refresh: Callable[[], Awaitable[None]]
+    ) -> asyncio.Task:
+        task = asyncio.create_task(refresh())
+        self._refreshes[key] = task
+        task.add_done_callback(lambda _: self._refreshes.pop(key, None))
+        return task
+
+    async def _wait_for_build(
+        self, key: str, user_id: int, git_domain: str, timeout: int
+    ) -> None:
+        """Wait for a cache build started by this or another process."""
+        task = self._refreshes.get(key)
+        try:
+            if task is not None:
+                await asyncio.wait_for(asyncio.shield(task), timeout)
+                return
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + timeout
+            interval = BUILD_POLL_MIN_INTERVAL
+            while await cache_manager.is_building(user_id, git_domain):
+                if loop.time() > deadline:
+                    raise asyncio.TimeoutError()
+                await asyncio.sleep(interval)
+                interval = min(interval * 2, BUILD_POLL_MAX_INTERVAL)
+        except asyncio.TimeoutError:
+            raise HTTPException(
+                status_code=408,
+                detail="Timeout waiting for repository data to be ready",
+            )
+
+    def invalidate(self, user_id: int, git_domain: str) -> None:
+        """Drop the index of a domain so it is not served stale after a clear."""
+        key = cache_manager.generate_full_cache_key(user_id, git_domain)
+        self._indexes.pop(key, None)
+
+
+# Global search index instance
+repository_search_indexes = RepositorySearchIndexes(
+    max_entries=settings.REPO_SEARCH_INDEX_MAX_ENTRIES
+)
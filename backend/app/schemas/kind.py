@@ -5,6 +5,7 @@
 """
 Kubernetes-style API schemas for cloud-native agent management
 """
+
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional
@@ -228,6 +229,13 @@ class ModelRef(BaseModel):
     namespace: str = "default"
 
 
+class GitCloneConfig(BaseModel):
+    """Repository checkout options for a shell"""
+
+    depth: Optional[int] = None  # Shallow clone depth, full history if unset
+    filter: Optional[str] = None  # Partial clone filter (e.g., "blob:none")
+
+
 class ShellSpec(BaseModel):
     """Shell specification"""
 
@@ -239,6 +247,7 @@ class ShellSpec(BaseModel):
     baseShellRef: Optional[str] = (
         None  # Reference to base public shell (e.g., "ClaudeCode")
     )
+    gitClone: Optional[GitCloneConfig] = None
 
 
 class ShellStatus(Status):
@@ -685,6 +694,8 @@ class KnowledgeBaseStatus(Status):
     """KnowledgeBase status"""
 
     state: str = "Available"  # Available, Unavailable
+    # Token counts of active documents by model family, computed at index time
+    tokenCounts: Optional[Dict[str, int]] = None
 
 
 class KnowledgeBase(BaseModel):
@@ -0,0 +1,121 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Push channel from backend to executor_manager.
+
+When executor subtasks become PENDING, a dispatch hint is added to a Redis
+Stream. executor_manager reads the stream through a consumer group, blocking
+with its free slot count, and claims work through the regular
+/executors/tasks/dispatch endpoint. Hints only say "there is work of this
+type", so a lost or duplicated hint is harmless: the dispatch endpoint stays
+the single place where subtasks are claimed, and the executor_manager poller
+remains as a fallback.
+"""
+
+import logging
+import time
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Hint types, matching the executor_manager fetch jobs
+DISPATCH_TYPE_ONLINE = "online"
+DISPATCH_TYPE_PIPELINE = "pipeline"
+
+# Seconds to skip publishing after a Redis error
+REDIS_ERROR_BACKOFF_SECONDS = 30
+
+
+def get_dispatch_type(task_json: Dict[str, Any]) -> Optional[str]:
+    """
+    Get the dispatch hint type for a Task CRD.
+
+    Returns:
+        DISPATCH_TYPE_ONLINE, or None for tasks that are not pushed: chat_shell
+        tasks are not handled by executor_manager, and offline tasks are only
+        fetched in the offline time window by the poller
+    """
+    labels = (task_json.get("metadata") or {}).get("labels") or {}
+    if labels.get("source") == "chat_shell" or labels.get("type") == "offline":
+        return None
+    return DISPATCH_TYPE_ONLINE
+
+
+class DispatchQueue:
+    """Publishes dispatch hints to the executor dispatch stream."""
+
+    def __init__(self, redis_url: str, stream: str, maxlen: int = 10000):
+        self.stream = stream
+        self.maxlen = maxlen
+        self._redis_url = redis_url
+        self._redis_client: Optional[redis.Redis] = None
+        self._backoff_until = 0.0
+
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        """Lazy-load a pooled Redis client, or None while Redis is unavailable."""
+        if time.monotonic() < self._backoff_until:
+            return None
+        if self._redis_client is None:
+            try:
+                self._redis_client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=True,
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+            except Exception as e:
+                logger.warning(f"[DispatchQueue] Failed to connect to Redis: {e}")
+                self._backoff_until = time.monotonic() + REDIS_ERROR_BACKOFF_SECONDS
+        return self._redis_client
+
+    def notify(self, task_id: int, dispatch_type: Optional[str]) -> bool:
+        """
+        Add a dispatch hint for a task.
+
+        Call after the transaction that made the subtask PENDING has been
+        committed, so executor_manager can see it when it fetches.
+
+        Args:
+            task_id: Task ID
+            dispatch_type: One of the DISPATCH_TYPE_* values; None is ignored
+
+        Returns:
+            bool: True if the hint was published
+        """
+        if not settings.EXECUTOR_DISPATCH_QUEUE_ENABLED or dispatch_type is None:
+            return False
+        client = self.redis_client
+        if client is None:
+            return False
+        try:
+            client.xadd(
+                self.stream,
+                {"task_id": str(task_id), "type": dispatch_type},
+                maxlen=self.maxlen,
+                approximate=True,
+            )
+            return True
+        except Exception as e:
+            logger.warning(
+                f"[DispatchQueue] Failed to publish hint for task {task_id}: {e}"
+            )
+            self._backoff_until = time.monotonic() + REDIS_ERROR_BACKOFF_SECONDS
+            return False
+
+    def notify_task(self, task_id: int, task_json: Dict[str, Any]) -> bool:
+        """Add a dispatch hint for a task, typed from its Task CRD."""
+        return self.notify(task_id, get_dispatch_type(task_json))
+
+
+dispatch_queue = DispatchQueue(
+    settings.REDIS_URL,
+    settings.EXECUTOR_DISPATCH_QUEUE_STREAM,
+    maxlen=settings.EXECUTOR_DISPATCH_QUEUE_MAXLEN,
+)
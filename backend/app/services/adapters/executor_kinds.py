@@ -10,7 +10,7 @@ from typing import Any, Dict, List, Optional
 
 import httpx
 from fastapi import HTTPException
-from sqlalchemy import and_, func, text
+from sqlalchemy import and_, func, or_
 from sqlalchemy.orm import Session, selectinload
 from sqlalchemy.orm.attributes import flag_modified
 
@@ -21,6 +21,7 @@ from app.models.task import TaskResource
 from app.models.user import User
 from app.schemas.kind import Bot, Ghost, Model, Shell, Task, Team, Workspace
 from app.schemas.subtask import SubtaskExecutorUpdate
+from app.services.adapters.dispatch_queue import DISPATCH_TYPE_PIPELINE, dispatch_queue
 from app.services.base import BaseService
 from app.services.context import context_service
 from app.services.webhook_notification import Notification, webhook_notification_service
@@ -120,47 +121,7 @@ class ExecutorKindsService(
         if task_ids:
             # Scenario 1: Specify task ID list, query subtasks for these tasks
             # When multiple task_ids are provided, ignore limit parameter, each task will only take 1 subtask
-            subtasks = []
-
-            for task_id in task_ids:
-                # First query tasks table to check task status
-                task = (
-                    db.query(TaskResource)
-                    .filter(
-                        TaskResource.id == task_id,
-                        TaskResource.kind == "Task",
-                        TaskResource.is_active,
-                    )
-                    .params(type=type)
-                    .first()
-                )
-                if not task:
-                    # Task doesn't exist, skip
-                    continue
-                # Check task status from JSON, skip if not PENDING or RUNNING
-                task_crd = Task.model_validate(task.json)
-                task_status = task_crd.status.status if task_crd.status else "PENDING"
-                if task_status not in ["PENDING", "RUNNING"]:
-                    continue
-
-                # Check if the specified task has RUNNING status subtasks
-                running_subtasks = (
-                    db.query(Subtask)
-                    .filter(
-                        Subtask.task_id == task_id,
-                        Subtask.status == SubtaskStatus.RUNNING,
-                    )
-                    .count()
-                )
-
-                if running_subtasks > 0:
-                    # If there are running subtasks, skip this task
-                    continue
-
-                # Get subtasks for this task, only take 1 per task
-                task_subtasks = self._get_subtasks_for_task(db, task_id, status, 1)
-                if task_subtasks:
-                    subtasks.extend(task_subtasks)
+            subtasks = self._get_first_subtasks_for_task_ids(db, task_ids, status)
         else:
             # Scenario 2: No task_ids, first query tasks, then query first subtask for each task
             subtasks = self._get_first_subtasks_for_tasks(db, status, limit, type)
@@ -176,21 +137,90 @@ class ExecutorKindsService(
         result = self._format_subtasks_response(db, updated_subtasks)
         return result
 
-    def _get_subtasks_for_task(
-        self, db: Session, task_id: int, status: str, limit: int
+    def _get_first_subtasks(
+        self, db: Session, task_ids: List[int], status: str
     ) -> List[Subtask]:
-        """Get subtasks for specified task, return first one sorted by message_id"""
-        return (
-            db.query(Subtask)
+        """Get the first ASSISTANT subtask with given status for each task.
+
+        Runs a single query over the ix_subtasks_dispatch index instead of one
+        query per task. Results follow the order of task_ids.
+        """
+        if not task_ids:
+            return []
+
+        ranked = (
+            db.query(
+                Subtask.id.label("id"),
+                func.row_number()
+                .over(
+                    partition_by=Subtask.task_id,
+                    order_by=(Subtask.message_id.asc(), Subtask.created_at.asc()),
+                )
+                .label("rn"),
+            )
             .filter(
-                Subtask.task_id == task_id,
+                Subtask.task_id.in_(task_ids),
                 Subtask.role == SubtaskRole.ASSISTANT,
                 Subtask.status == status,
             )
-            .order_by(Subtask.message_id.asc(), Subtask.created_at.asc())
-            .limit(limit)
+            .subquery()
+        )
+        subtasks = (
+            db.query(Subtask)
+            .join(ranked, Subtask.id == ranked.c.id)
+            .filter(ranked.c.rn == 1)
+            .all()
+        )
+
+        position = {task_id: index for index, task_id in enumerate(task_ids)}
+        return sorted(subtasks, key=lambda subtask: position[subtask.task_id])
+
+    def _get_first_subtasks_for_task_ids(
+        self, db: Session, task_ids: List[int], status: str
+    ) -> List[Subtask]:
+        """Get first subtask for each of the given tasks.
+
+        Tasks that are not PENDING or RUNNING, or that already have a RUNNING
+        subtask, are skipped.
+        """
+        # Tasks without a status are treated as PENDING
+        dispatchable_ids = {
+            task_id
+            for (task_id,) in db.query(TaskResource.id)
+            .filter(
+                TaskResource.id.in_(task_ids),
+                TaskResource.kind == "Task",
+                TaskResource.is_active.is_(True),
+                or_(
+                    TaskResource.dispatch_status.in_(["PENDING", "RUNNING"]),
+                    TaskResource.dispatch_status.is_(None),
+                ),
+            )
+            .all()
+        }
+        if not dispatchable_ids:
+            return []
+
+        # Skip tasks that have RUNNING subtasks
+        busy_ids = {
+            task_id
+            for (task_id,) in db.query(Subtask.task_id)
+            .filter(
+                Subtask.task_id.in_(dispatchable_ids),
+                Subtask.status == SubtaskStatus.RUNNING,
+            )
+            .distinct()
             .all()
+        }
+
+        ordered_ids = list(
+            dict.fromkeys(
+                task_id
+                for task_id in task_ids
+                if task_id in dispatchable_ids and task_id not in busy_ids
+            )
         )
+        return self._get_first_subtasks(db, ordered_ids, status)
 
     def _get_first_subtasks_for_tasks(
         self, db: Session, status: str, limit: int, type: str
@@ -202,78 +232,50 @@ class ExecutorKindsService(
         Chat Shell tasks are identified by:
         - source='chat_shell' (WebSocket chat)
         - source='subscription' with Chat shell type (Subscription Scheduler triggered)
+
+        Task rows are claimed with SELECT ... FOR UPDATE SKIP LOCKED, so
+        concurrent dispatchers pick disjoint tasks.
         """
         # Step 1: First query tasks table to get limit tasks
-        # Exclude tasks that should be handled by Chat Shell (not executor_manager)
-        # - source='chat_shell': Direct WebSocket chat
-        # - source='subscription': Subscription Scheduler triggered (Chat Shell type is handled by Subscription Scheduler directly)
-        tasks = None
+        # Filters use the generated dispatch_* columns (ix_tasks_dispatch)
+        # rather than JSON_EXTRACT over the json column.
         # Note: We exclude 'chat_shell' source tasks because they are handled
         # directly by the backend (via WebSocket). However, we DO NOT exclude
         # 'subscription' source tasks because Subscription Scheduler can trigger Executor-type tasks
         # that need to be picked up by executor_manager.
         if type == "offline":
-            tasks = (
-                db.query(TaskResource)
-                .filter(
-                    TaskResource.kind == "Task",
-                    TaskResource.is_active.is_(True),
-                    text(
-                        "JSON_EXTRACT(json, '$.metadata.labels.type') = 'offline' "
-                        "and JSON_EXTRACT(json, '$.status.status') = :status "
-                        "and (JSON_EXTRACT(json, '$.metadata.labels.source') IS NULL "
-                        "    OR JSON_EXTRACT(json, '$.metadata.labels.source') != 'chat_shell')"
-                    ),
-                )
-                .params(status=status)
-                .order_by(TaskResource.created_at.desc())
-                .limit(limit)
-                .all()
-            )
+            type_filter = TaskResource.dispatch_type == "offline"
         else:
             # Include 'subscription' type tasks for executor to pick up (Subscription Scheduler triggered Executor-type tasks)
-            tasks = (
-                db.query(TaskResource)
-                .filter(
-                    TaskResource.kind == "Task",
-                    TaskResource.is_active.is_(True),
-                    text(
-                        "(JSON_EXTRACT(json, '$.metadata.labels.type') IS NULL "
-                        "    OR JSON_EXTRACT(json, '$.metadata.labels.type') = 'online' "
-                        "    OR JSON_EXTRACT(json, '$.metadata.labels.type') = 'subscription') "
-                        "and JSON_EXTRACT(json, '$.status.status') = :status "
-                        "and (JSON_EXTRACT(json, '$.metadata.labels.source') IS NULL "
-                        "    OR JSON_EXTRACT(json, '$.metadata.labels.source') != 'chat_shell')"
-                    ),
-                )
-                .params(status=status)
-                .order_by(TaskResource.created_at.desc())
-                .limit(limit)
-                .all()
+            type_filter = or_(
+                TaskResource.dispatch_type.is_(None),
+                TaskResource.dispatch_type.in_(["online", "subscription"]),
             )
 
-        if not tasks:
-            return []
-
-        task_ids = [task.id for task in tasks]
-        # Step 2: Query first subtask with matching status for each task
-        subtasks = []
-        for tid in task_ids:
-            first_subtask = (
-                db.query(Subtask)
-                .filter(
-                    Subtask.task_id == tid,
-                    Subtask.role == SubtaskRole.ASSISTANT,
-                    Subtask.status == status,
-                )
-                .order_by(Subtask.message_id.asc(), Subtask.created_at.asc())
-                .first()
+        task_ids = [
+            task_id
+            for (task_id,) in db.query(TaskResource.id)
+            .filter(
+                TaskResource.dispatch_status == status,
+                TaskResource.kind == "Task",
+                TaskResource.is_active.is_(True),
+                type_filter,
+                or_(
+                    TaskResource.dispatch_source.is_(None),
+                    TaskResource.dispatch_source != "chat_shell",
+                ),
             )
+            .order_by(TaskResource.created_at.desc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .all()
+        ]
 
-            if first_subtask:
-                subtasks.append(first_subtask)
+        if not task_ids:
+            return []
 
-        return subtasks
+        # Step 2: Query first subtask with matching status for each task
+        return self._get_first_subtasks(db, task_ids, status)
 
     def _update_subtasks_to_running(
         self, db: Session, subtasks: List[Subtask]
@@ -1056,6 +1058,7 @@ class ExecutorKindsService(
                 mcp_servers = {}
                 skills = []
                 shell_type = ""
+                git_clone = {}
                 agent_config = {}
 
                 if ghost and ghost.json:
@@ -1073,6 +1076,10 @@ class ExecutorKindsService(
                     # Extract baseImage from shell (user-defined shell overrides public shell)
                     if shell_crd.spec.baseImage:
                         shell_base_image = shell_crd.spec.baseImage
+                    if shell_crd.spec.gitClone:
+                        git_clone = shell_crd.spec.gitClone.model_dump(
+                            exclude_none=True
+                        )
 
                 if model and model.json:
                     model_crd = Model.model_validate(model.json)
@@ -1120,6 +1127,7 @@ class ExecutorKindsService(
                         "skills": skills,
                         "role": team_member_info.role if team_member_info else "",
                         "base_image": shell_base_image,  # Custom base image for executor
+                        "git_clone": git_clone,  # Repository checkout options
                     }
                 )
 
@@ -1184,6 +1192,9 @@ class ExecutorKindsService(
                     "file_extension": ctx.file_extension,
                     "file_size": ctx.file_size,
                     "mime_type": ctx.mime_type,
+                    # Key of the executor's attachment cache, empty for
+                    # attachments uploaded before checksums were recorded
+                    "sha256": ctx.sha256,
                 }
                 # Note: We intentionally don't include image_base64 here to avoid
                 # large task JSON payloads. The executor will download attachments
@@ -1478,6 +1489,10 @@ class ExecutorKindsService(
 
         db.commit()
 
+        # A completed pipeline stage may have created the next stage's subtask
+        if subtask_update.status == SubtaskStatus.COMPLETED:
+            self._notify_pending_subtask(db, subtask.task_id)
+
         return {
             "subtask_id": subtask.id,
             "task_id": subtask.task_id,
@@ -1486,6 +1501,20 @@ class ExecutorKindsService(
             "message": "Subtask updated successfully",
         }
 
+    def _notify_pending_subtask(self, db: Session, task_id: int) -> None:
+        """Push a pipeline dispatch hint if the task has a PENDING subtask."""
+        pending = (
+            db.query(Subtask.id)
+            .filter(
+                Subtask.task_id == task_id,
+                Subtask.role == SubtaskRole.ASSISTANT,
+                Subtask.status == SubtaskStatus.PENDING,
+            )
+            .first()
+        )
+        if pending:
+            dispatch_queue.notify(task_id, DISPATCH_TYPE_PIPELINE)
+
     def _update_task_status_based_on_subtasks(self, db: Session, task_id: int) -> None:
         """Update task status based on subtask status using tasks table"""
         # Get task from tasks table
@@ -21,6 +21,7 @@ from app.models.kind import Kind
 from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
 from app.models.task import TaskResource
 from app.schemas.kind import Task, Team
+from app.services.adapters.dispatch_queue import DISPATCH_TYPE_PIPELINE, dispatch_queue
 
 logger = logging.getLogger(__name__)
 
@@ -448,6 +449,8 @@ class PipelineStageService:
         flag_modified(task, "json")
         db.commit()
 
+        dispatch_queue.notify(task.id, DISPATCH_TYPE_PIPELINE)
+
         # Get next stage name
         next_stage_name = None
         if next_stage < len(team_crd.spec.members):
@@ -22,6 +22,14 @@ from app.services.group_permission import check_group_permission, get_user_group
 logger = logging.getLogger(__name__)
 
 
+def _invalidate_storage_backend(name: str, namespace: str) -> None:
+    """Drop cached storage backends built from a Retriever CRD."""
+    # Imported lazily to keep RAG storage clients out of this module's imports
+    from app.services.rag.storage.factory import storage_backend_registry
+
+    storage_backend_registry.invalidate(name, namespace)
+
+
 class RetrieverKindsService(BaseService[Kind, Dict, Dict]):
     """
     Retriever service class using kinds table
@@ -428,6 +436,9 @@ class RetrieverKindsService(BaseService[Kind, Dict, Dict]):
         db.commit()
         db.refresh(kind)
 
+        # Drop cached storage clients built from the previous config
+        _invalidate_storage_backend(name, namespace)
+
         return Retriever.model_validate(kind.json)
 
     def delete_retriever(
@@ -499,6 +510,8 @@ class RetrieverKindsService(BaseService[Kind, Dict, Dict]):
         kind.is_active = False
         db.commit()
 
+        _invalidate_storage_backend(name, namespace)
+
     def count_retrievers(
         self,
         db: Session,
@@ -26,6 +26,7 @@ from app.models.task import TaskResource
 from app.models.user import User
 from app.schemas.kind import Task, Team, Workspace
 from app.schemas.task import TaskCreate, TaskUpdate
+from app.services.adapters.dispatch_queue import dispatch_queue
 from app.services.adapters.executor_kinds import executor_kinds_service
 from app.services.adapters.pipeline_stage import pipeline_stage_service
 from app.services.readers.kinds import KindType, kindReader
@@ -90,6 +91,9 @@ class TaskOperationsMixin:
         db.commit()
         db.refresh(task)
 
+        # Wake up executor_manager instead of waiting for its next poll
+        dispatch_queue.notify_task(task.id, task.json)
+
         return convert_to_task_dict(task, db, user.id)
 
     def _handle_existing_task(
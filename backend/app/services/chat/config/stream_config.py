@@ -11,6 +11,8 @@ from dataclasses import dataclass, field
 
 from langchain_core.tools.base import BaseTool
 
+from app.services.streaming.core import StreamingConfig
+
 
 @dataclass
 class WebSocketStreamConfig:
@@ -35,6 +37,9 @@ class WebSocketStreamConfig:
         bot_namespace: Bot namespace
         shell_type: Shell type (Chat, ClaudeCode, Agno) for frontend display
         extra_tools: Additional tools (e.g., KnowledgeBaseTool)
+
+        coalesce_tokens: Batch tokens into frames; None uses the global setting,
+            False emits every token immediately for latency-sensitive clients
     """
 
     # Task identification
@@ -72,6 +77,16 @@ class WebSocketStreamConfig:
     # Context flags
     has_table_context: bool = False  # Whether user selected table context
 
+    # Streaming behavior
+    coalesce_tokens: bool | None = None  # None = STREAMING_COALESCE_ENABLED
+
+    def get_streaming_config(self) -> StreamingConfig:
+        """Build the StreamingConfig for this stream."""
+        config = StreamingConfig()
+        if self.coalesce_tokens is not None:
+            config.coalesce_tokens = self.coalesce_tokens
+        return config
+
     def get_username_for_message(self) -> str | None:
         """Get username for message prefix in group chat mode."""
         return self.user_name if self.is_group_chat else None
@@ -16,6 +16,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
+from app.services.chat.storage.history_cache import history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -215,6 +216,7 @@ def apply_correction_to_subtask(
     subtask.result = subtask_result
     flag_modified(subtask, "result")
     db.commit()
+    history_cache.invalidate(subtask.task_id)
 
     logger.info(f"Applied correction for subtask {subtask.id}")
 
@@ -18,6 +18,7 @@ from sqlalchemy.orm import Session, aliased, joinedload
 from app.models.kind import Kind
 from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
 from app.models.task import TaskResource
+from app.services.chat.storage.history_cache import history_cache
 
 logger = logging.getLogger(__name__)
 
@@ -164,6 +165,8 @@ def reset_subtask_for_retry(
         db.rollback()
         raise  # Re-raise to prevent downstream processing
 
+    history_cache.invalidate(subtask.task_id)
+
     logger.info(
         f"Reset subtask to PENDING: id={subtask.id}, message_id={subtask.message_id}"
     )
@@ -8,6 +8,7 @@ Provides unified access to database and session storage.
 """
 
 from .db import db_handler
+from .history_cache import HistoryCache, history_cache
 from .proxy import StorageProxy
 from .session import session_manager
 from .task_manager import (
@@ -35,6 +36,8 @@ __all__ = [
     "StorageProxy",
     "db_handler",
     "session_manager",
+    "HistoryCache",
+    "history_cache",
     # Task manager
     "TaskCreationParams",
     "TaskCreationResult",
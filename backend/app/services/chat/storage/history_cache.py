@@ -0,0 +1,403 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Incremental cache of rendered chat history.
+
+Building the history of a chat turn renders every COMPLETED subtask of the
+task into a prompt-ready message, including attachment prefixes and image
+blocks, although only the last exchange is new. This module keeps the
+rendered messages of a task, up to the last message ID they cover, in an
+in-process LRU with a compressed Redis copy behind it. Later turns only
+render the subtasks after that message ID and append them.
+
+A cached prefix is only reused while it still matches the database: each
+lookup checks the count, highest ID and latest update time of the COMPLETED
+subtasks it covers. Edits, deletes and retries additionally invalidate the
+task explicitly by bumping its Redis version.
+"""
+
+import copy
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+import orjson
+import redis
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.subtask import Subtask, SubtaskStatus
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefixes for task versions and rendered histories
+VERSION_KEY_PREFIX = "wegent:chat_history:version:"
+HISTORY_KEY_PREFIX = "wegent:chat_history:rendered:"
+
+# Seconds to skip Redis after a Redis error
+REDIS_ERROR_BACKOFF_SECONDS = 30
+
+# Histories larger than this (compressed) are only cached in process
+MAX_REDIS_BYTES = 16 * 1024 * 1024
+
+# (count, highest subtask ID, latest updated_at) of the covered subtasks
+Fingerprint = Tuple[int, int, Optional[str]]
+
+# Renders subtasks into messages, returning None for subtasks to skip
+Renderer = Callable[[Session, List[Subtask]], List[Optional[Any]]]
+
+
+@dataclass
+class RenderedHistory:
+    """Rendered messages of all COMPLETED subtasks up to last_message_id."""
+
+    last_message_id: int
+    fingerprint: Fingerprint
+    # (message_id, rendered message) in message_id order
+    messages: List[Tuple[int, Any]]
+
+
+def _timestamp(value: Optional[datetime]) -> Optional[str]:
+    # Second precision, matching MySQL DATETIME columns
+    return value.replace(microsecond=0).isoformat() if value else None
+
+
+def _merge_fingerprint(
+    fingerprint: Fingerprint, subtasks: List[Subtask]
+) -> Fingerprint:
+    """Extend a fingerprint with newly rendered subtasks."""
+    count, max_id, latest = fingerprint
+    for subtask in subtasks:
+        count += 1
+        max_id = max(max_id, subtask.id)
+        updated_at = _timestamp(subtask.updated_at)
+        if updated_at is not None and (latest is None or updated_at > latest):
+            latest = updated_at
+    return count, max_id, latest
+
+
+def _load_fingerprint(db: Session, task_id: int, last_message_id: int) -> Fingerprint:
+    """Compute the fingerprint of the COMPLETED subtasks up to last_message_id."""
+    count, max_id, latest = (
+        db.query(
+            func.count(Subtask.id), func.max(Subtask.id), func.max(Subtask.updated_at)
+        )
+        .filter(
+            Subtask.task_id == task_id,
+            Subtask.status == SubtaskStatus.COMPLETED,
+            Subtask.message_id <= last_message_id,
+        )
+        .one()
+    )
+    return count or 0, max_id or 0, _timestamp(latest)
+
+
+def encode_history(history: RenderedHistory) -> bytes:
+    """Encode a rendered history as compressed JSON."""
+    return zlib.compress(
+        orjson.dumps(
+            {
+                "last_message_id": history.last_message_id,
+                "fingerprint": history.fingerprint,
+                "messages": history.messages,
+            }
+        )
+    )
+
+
+def decode_history(data: bytes) -> RenderedHistory:
+    """Decode a rendered history created by encode_history."""
+    raw = orjson.loads(zlib.decompress(data))
+    return RenderedHistory(
+        last_message_id=raw["last_message_id"],
+        fingerprint=tuple(raw["fingerprint"]),
+        messages=[(message_id, message) for message_id, message in raw["messages"]],
+    )
+
+
+class HistoryCache:
+    """
+    Rendered chat history cache keyed by task, task version and variant.
+
+    The variant separates renderings of the same task that differ in format,
+    e.g. package mode vs the internal HTTP API, or group chat prefixes.
+    Without Redis only the in-process LRU is used. Redis failures are logged
+    and treated as misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 128,
+        redis_url: Optional[str] = None,
+        redis_ttl: int = 24 * 3600,
+        enabled: bool = True,
+    ):
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self.enabled = enabled
+        self._redis_url = redis_url
+        self._redis_client: Optional[redis.Redis] = None
+        self._redis_disabled = redis_url is None
+        self._redis_backoff_until = 0.0
+        # (task_id, variant) -> (version, history)
+        self._lru: "OrderedDict[Tuple[int, str], Tuple[int, RenderedHistory]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        """Lazy-load a pooled Redis client, or None while Redis is unavailable."""
+        if self._redis_disabled or time.monotonic() < self._redis_backoff_until:
+            return None
+        if self._redis_client is None:
+            try:
+                self._redis_client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=False,
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+            except Exception as e:
+                logger.warning(f"[HistoryCache] Failed to connect to Redis: {e}")
+                self._redis_disabled = True
+        return self._redis_client
+
+    def _redis_error(self, operation: str, error: Exception) -> None:
+        logger.warning(f"[HistoryCache] Redis {operation} failed: {error}")
+        self._redis_backoff_until = time.monotonic() + REDIS_ERROR_BACKOFF_SECONDS
+
+    def _get_version(self, task_id: int) -> int:
+        client = self.redis_client
+        if client is None:
+            return 0
+        try:
+            return int(client.get(f"{VERSION_KEY_PREFIX}{task_id}") or 0)
+        except Exception as e:
+            self._redis_error("GET", e)
+            return 0
+
+    def get(self, task_id: int, variant: str) -> Tuple[int, Optional[RenderedHistory]]:
+        """
+        Look up the rendered history of the current task version.
+
+        Args:
+            task_id: Task ID
+            variant: Rendering variant
+
+        Returns:
+            Tuple of (current version, history or None on a miss)
+        """
+        version = self._get_version(task_id)
+        key = (task_id, variant)
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and entry[0] == version:
+                self._lru.move_to_end(key)
+                return version, entry[1]
+
+        client = self.redis_client
+        if client is None:
+            return version, None
+        try:
+            data = client.get(f"{HISTORY_KEY_PREFIX}{task_id}:{version}:{variant}")
+        except Exception as e:
+            self._redis_error("GET", e)
+            return version, None
+        if data is None:
+            return version, None
+
+        try:
+            history = decode_history(data)
+        except Exception as e:
+            logger.warning(
+                f"[HistoryCache] Dropping corrupt history of task {task_id}: {e}"
+            )
+            return version, None
+        self._put_local(key, version, history)
+        return version, history
+
+    def put(
+        self, task_id: int, variant: str, version: int, history: RenderedHistory
+    ) -> None:
+        """
+        Store the rendered history of a task version.
+
+        Args:
+            task_id: Task ID
+            variant: Rendering variant
+            version: Task version read before the subtasks were loaded
+            history: Rendered history
+        """
+        self._put_local((task_id, variant), version, history)
+
+        client = self.redis_client
+        if client is None:
+            return
+        data = encode_history(history)
+        if len(data) > MAX_REDIS_BYTES:
+            logger.info(
+                f"[HistoryCache] History of task {task_id} is {len(data)} bytes, "
+                "not storing in Redis"
+            )
+            return
+        try:
+            client.set(
+                f"{HISTORY_KEY_PREFIX}{task_id}:{version}:{variant}",
+                data,
+                ex=self.redis_ttl,
+            )
+        except Exception as e:
+            self._redis_error("SET", e)
+
+    def invalidate(self, task_id: int) -> None:
+        """
+        Drop the cached histories of a task after its messages changed.
+
+        Args:
+            task_id: Task ID
+        """
+        with self._lock:
+            for key in [key for key in self._lru if key[0] == task_id]:
+                del self._lru[key]
+
+        client = self.redis_client
+        if client is None:
+            return
+        try:
+            client.incr(f"{VERSION_KEY_PREFIX}{task_id}")
+        except Exception as e:
+            self._redis_error("INCR", e)
+
+    def clear(self) -> None:
+        """Drop all local entries."""
+        with self._lock:
+            self._lru.clear()
+
+    def _put_local(
+        self, key: Tuple[int, str], version: int, history: RenderedHistory
+    ) -> None:
+        with self._lock:
+            self._lru[key] = (version, history)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def load(
+        self,
+        db: Session,
+        task_id: int,
+        variant: str,
+        render: Renderer,
+        before_message_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Get the rendered history of a task, rendering only new subtasks.
+
+        With a limit and no usable cached history, only the most recent
+        limit subtasks are loaded and rendered, and the cache is not filled:
+        a full render would cost far more than the request needs.
+
+        Args:
+            db: Database session
+            task_id: Task ID
+            variant: Rendering variant, must identify the renderer output
+            render: Renders a list of subtasks, one message (or None) each
+            before_message_id: Only return messages with a smaller message_id
+            limit: If positive, only return the most recent limit messages
+
+        Returns:
+            Rendered messages in message_id order, as copies
+        """
+        version, cached = self.get(task_id, variant) if self.enabled else (0, None)
+        if cached is not None and cached.fingerprint != _load_fingerprint(
+            db, task_id, cached.last_message_id
+        ):
+            logger.debug(f"[HistoryCache] Stale history for task {task_id}")
+            cached = None
+        if limit is not None and limit <= 0:
+            limit = None
+        if cached is None and limit is not None:
+            return self._load_recent(db, task_id, render, before_message_id, limit)
+        if cached is None:
+            cached = RenderedHistory(
+                last_message_id=0, fingerprint=(0, 0, None), messages=[]
+            )
+
+        if (
+            before_message_id is not None
+            and before_message_id <= cached.last_message_id + 1
+        ):
+            messages = [
+                message
+                for message_id, message in cached.messages
+                if message_id < before_message_id
+            ]
+            return copy.deepcopy(messages[-limit:] if limit else messages)
+
+        query = db.query(Subtask).filter(
+            Subtask.task_id == task_id,
+            Subtask.status == SubtaskStatus.COMPLETED,
+            Subtask.message_id > cached.last_message_id,
+        )
+        if before_message_id is not None:
+            query = query.filter(Subtask.message_id < before_message_id)
+        subtasks = query.order_by(Subtask.message_id.asc()).all()
+
+        messages = list(cached.messages)
+        for subtask, message in zip(subtasks, render(db, subtasks)):
+            if message is not None:
+                messages.append((subtask.message_id, message))
+
+        if subtasks and self.enabled:
+            self.put(
+                task_id,
+                variant,
+                version,
+                RenderedHistory(
+                    last_message_id=subtasks[-1].message_id,
+                    fingerprint=_merge_fingerprint(cached.fingerprint, subtasks),
+                    messages=messages,
+                ),
+            )
+        if limit:
+            messages = messages[-limit:]
+        # Callers may modify the messages, the cached ones must stay intact
+        return copy.deepcopy([message for _, message in messages])
+
+    def _load_recent(
+        self,
+        db: Session,
+        task_id: int,
+        render: Renderer,
+        before_message_id: Optional[int],
+        limit: int,
+    ) -> List[Any]:
+        """Render only the most recent limit COMPLETED subtasks, uncached."""
+        query = db.query(Subtask).filter(
+            Subtask.task_id == task_id,
+            Subtask.status == SubtaskStatus.COMPLETED,
+        )
+        if before_message_id is not None:
+            query = query.filter(Subtask.message_id < before_message_id)
+        subtasks = query.order_by(Subtask.message_id.desc()).limit(limit).all()
+        subtasks.reverse()
+        return [message for message in render(db, subtasks) if message is not None]
+
+
+# Global rendered history cache instance
+history_cache = HistoryCache(
+    max_entries=settings.CHAT_HISTORY_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL if settings.CHAT_HISTORY_CACHE_ENABLED else None,
+    redis_ttl=settings.CHAT_HISTORY_CACHE_TTL,
+    enabled=settings.CHAT_HISTORY_CACHE_ENABLED,
+)
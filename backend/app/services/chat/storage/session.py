@@ -26,8 +26,9 @@ CANCEL_KEY_PREFIX = "chat:cancel:"
 # Cancellation flag TTL in seconds (5 minutes should be enough for any chat)
 CANCEL_FLAG_TTL = 300
 
-# Redis key prefix for streaming content cache
-STREAMING_KEY_PREFIX = "chat:streaming:"
+# Redis key prefix for streaming content cache. Content is stored as raw
+# UTF-8 text (not JSON) so deltas can be added with APPEND.
+STREAMING_KEY_PREFIX = "chat:streaming:text:"
 # Redis Pub/Sub channel prefix for streaming updates
 STREAMING_CHANNEL_PREFIX = "chat:stream_channel:"
 # Redis key prefix for task-level streaming status (for group chat)
@@ -351,7 +352,8 @@ class SessionManager:
         Save streaming content to Redis (temporary cache).
 
         This is used for fast recovery when user refreshes during streaming.
-        Content is saved frequently (every 1 second) to minimize data loss.
+        Overwrites any content cached so far; streams that persist
+        incrementally use append_streaming_content instead.
 
         Args:
             subtask_id: Subtask ID
@@ -364,18 +366,72 @@ class SessionManager:
         try:
             key = self._get_streaming_key(subtask_id)
             expire_time = expire or settings.STREAMING_REDIS_TTL
-            return await self._cache.set(key, content, expire=expire_time)
+            redis_client = await self._cache._get_client()
+            try:
+                return bool(
+                    await redis_client.set(key, content.encode("utf-8"), ex=expire_time)
+                )
+            finally:
+                await redis_client.aclose()
         except Exception as e:
             logger.error(
                 f"Error saving streaming content for subtask {subtask_id}: {e}"
             )
             return False
 
+    async def append_streaming_content(
+        self, subtask_id: int, delta: str, offset: int, expire: int = None
+    ) -> bool:
+        """
+        Append a content delta to the streaming cache.
+
+        Only the new text is sent, so write volume stays proportional to the
+        delta rather than to the whole response. ``offset`` is the byte
+        length the cached content must have before this append; if the
+        resulting length does not match (key expired, deleted or written by
+        someone else), the cached content is stale and False is returned so
+        the caller can rewrite it with save_streaming_content.
+
+        Args:
+            subtask_id: Subtask ID
+            delta: Content produced since the previous save
+            offset: Byte offset of the delta in the UTF-8 encoded content
+            expire: Expiration time in seconds (default from settings)
+
+        Returns:
+            bool: True if the delta was appended at the expected offset
+        """
+        try:
+            key = self._get_streaming_key(subtask_id)
+            expire_time = expire or settings.STREAMING_REDIS_TTL
+            data = delta.encode("utf-8")
+            redis_client = await self._cache._get_client()
+            try:
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.append(key, data)
+                pipe.expire(key, expire_time)
+                new_length, _ = await pipe.execute()
+            finally:
+                await redis_client.aclose()
+            if new_length != offset + len(data):
+                logger.warning(
+                    f"Streaming content for subtask {subtask_id} out of sync "
+                    f"(expected {offset + len(data)} bytes, got {new_length})"
+                )
+                return False
+            return True
+        except Exception as e:
+            logger.error(
+                f"Error appending streaming content for subtask {subtask_id}: {e}"
+            )
+            return False
+
     async def get_streaming_content(self, subtask_id: int) -> Optional[str]:
         """
         Get streaming content from Redis cache.
 
-        Used for recovery when user refreshes during streaming.
+        Used for recovery when user refreshes during streaming. Returns the
+        content rebuilt from all deltas appended so far.
 
         Args:
             subtask_id: Subtask ID
@@ -385,10 +441,14 @@ class SessionManager:
         """
         try:
             key = self._get_streaming_key(subtask_id)
-            content = await self._cache.get(key)
-            if content is not None and isinstance(content, str):
-                return content
-            return None
+            redis_client = await self._cache._get_client()
+            try:
+                content = await redis_client.get(key)
+            finally:
+                await redis_client.aclose()
+            if content is None:
+                return None
+            return content.decode("utf-8", errors="replace")
         except Exception as e:
             logger.error(
                 f"Error getting streaming content for subtask {subtask_id}: {e}"
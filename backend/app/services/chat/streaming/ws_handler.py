@@ -108,7 +108,7 @@ class WebSocketStreamingHandler:
         )
 
         # Create streaming core
-        core = StreamingCore(emitter, state, StreamingConfig())
+        core = StreamingCore(emitter, state, config.get_streaming_config())
 
         try:
             # Register with shutdown manager (always succeeds for existing connections)
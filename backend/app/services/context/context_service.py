@@ -9,6 +9,7 @@ Unified service for handling attachments, knowledge bases, and other
 context types that can be associated with subtasks.
 """
 
+import hashlib
 import logging
 import os
 from typing import Any, Dict, List, Optional, Tuple, Union
@@ -135,6 +136,8 @@ class ContextService:
                 "original_filename": filename,
                 "file_extension": extension,
                 "file_size": file_size,
+                # Lets consumers such as executors cache the content
+                "sha256": hashlib.sha256(binary_data).hexdigest(),
                 "mime_type": mime_type,
                 "storage_backend": storage_backend.backend_type,
                 "storage_key": "",
@@ -156,6 +156,24 @@ def repo_update_worker(stop_event: threading.Event):
         stop_event.wait(timeout=settings.REPO_UPDATE_INTERVAL_SECONDS)
 
 
+def storage_backend_health_worker(stop_event: threading.Event):
+    """
+    Background worker for evicting idle or unhealthy RAG storage backends
+
+    Args:
+        stop_event: Event to signal the worker to stop
+    """
+    # Imported lazily to avoid loading RAG storage clients at module import
+    from app.services.rag.storage.factory import storage_backend_registry
+
+    while not stop_event.wait(timeout=settings.STORAGE_BACKEND_HEALTH_CHECK_INTERVAL):
+        try:
+            storage_backend_registry.check_health()
+        except Exception as e:
+            # Log and continue loop
+            logger.error(f"[job] storage backend health check error: {e}")
+
+
 def start_background_jobs(app):
     """
     Start all background jobs
@@ -185,6 +203,18 @@ def start_background_jobs(app):
     app.state.repo_update_thread.start()
     logger.info("[job] repository update worker started")
 
+    # Start storage backend health check thread
+    if settings.STORAGE_BACKEND_CACHE_ENABLED:
+        app.state.storage_health_stop_event = threading.Event()
+        app.state.storage_health_thread = threading.Thread(
+            target=storage_backend_health_worker,
+            args=(app.state.storage_health_stop_event,),
+            name="storage-backend-health-worker",
+            daemon=True,
+        )
+        app.state.storage_health_thread.start()
+        logger.info("[job] storage backend health worker started")
+
     # Note: Subscription scheduler is now handled by Celery Beat
     # Start celery worker and beat separately:
     # - celery -A app.core.celery_app worker --loglevel=info
@@ -216,5 +246,17 @@ def stop_background_jobs(app):
         repo_thread.join(timeout=5.0)
     logger.info("[job] repository update worker stopped")
 
+    # Stop storage backend health thread and close cached backends
+    storage_stop_event = getattr(app.state, "storage_health_stop_event", None)
+    storage_thread = getattr(app.state, "storage_health_thread", None)
+    if storage_stop_event:
+        storage_stop_event.set()
+    if storage_thread:
+        storage_thread.join(timeout=5.0)
+        from app.services.rag.storage.factory import storage_backend_registry
+
+        storage_backend_registry.clear()
+        logger.info("[job] storage backend health worker stopped")
+
     # Note: Subscription scheduler is now handled by Celery Beat
     # Celery worker/beat are managed separately
@@ -5,6 +5,7 @@
 """
 Implementation of specific Kind services
 """
+
 import logging
 from typing import Any, Dict
 
@@ -15,6 +16,7 @@ from app.models.kind import Kind
 from app.models.subtask import Subtask
 from app.models.task import TaskResource
 from app.schemas.kind import Bot, Model, Retriever, Task, Team
+from app.services.adapters.dispatch_queue import dispatch_queue
 from app.services.adapters.task_kinds import task_kinds_service
 from app.services.kind_base import KindBaseService, TaskResourceBaseService
 from shared.utils.crypto import decrypt_api_key, encrypt_api_key, is_api_key_encrypted
@@ -118,6 +120,22 @@ class ModelKindService(KindBaseService):
 
         return resource_data
 
+    def _update_side_effects(
+        self, db: Session, user_id: int, db_resource: Kind, resource: Dict[str, Any]
+    ) -> None:
+        """Drop cached embeddings produced by the previous Model configuration"""
+        from app.services.rag.embedding.cache import embedding_cache
+
+        embedding_cache.invalidate_model(db_resource.id)
+
+    def _post_delete_side_effects(
+        self, db: Session, user_id: int, db_resource: Kind
+    ) -> None:
+        """Drop cached embeddings of the deleted Model"""
+        from app.services.rag.embedding.cache import embedding_cache
+
+        embedding_cache.invalidate_model(db_resource.id)
+
     def _format_resource(self, resource: Kind) -> Dict[str, Any]:
         """Format Model resource for API response with decrypted API key"""
         # Get the stored resource data
@@ -473,6 +491,7 @@ class TaskKindService(TaskResourceBaseService):
                 user_prompt=task_crd.spec.prompt,
             )
             db.commit()
+            dispatch_queue.notify_task(db_resource.id, db_resource.json)
 
         except Exception as e:
             # Log error but don't interrupt the process
@@ -514,6 +533,7 @@ class TaskKindService(TaskResourceBaseService):
                 user_prompt=task_crd.spec.prompt,
             )
             db.commit()
+            dispatch_queue.notify_task(db_resource.id, db_resource.json)
 
         except Exception as e:
             # Log error but don't interrupt the process
@@ -658,6 +678,22 @@ class RetrieverKindService(KindBaseService):
 
         return resource_data
 
+    def _update_side_effects(
+        self, db: Session, user_id: int, db_resource: Kind, resource: Dict[str, Any]
+    ) -> None:
+        """Drop cached storage backends built from the previous configuration"""
+        from app.services.rag.storage.factory import storage_backend_registry
+
+        storage_backend_registry.invalidate(db_resource.name, db_resource.namespace)
+
+    def _post_delete_side_effects(
+        self, db: Session, user_id: int, db_resource: Kind
+    ) -> None:
+        """Drop cached storage backends of the deleted Retriever"""
+        from app.services.rag.storage.factory import storage_backend_registry
+
+        storage_backend_registry.invalidate(db_resource.name, db_resource.namespace)
+
     def _format_resource(self, resource: Kind) -> Dict[str, Any]:
         """Format Retriever resource for API response with decrypted sensitive data"""
         # Get the stored resource data
@@ -37,6 +37,8 @@ from app.services.group_permission import (
     get_effective_role_in_group,
     get_user_groups,
 )
+from app.services.rag.chunk_snapshot import chunk_snapshot_cache
+from app.services.rag.index.tokenizers import DEFAULT_FAMILY, select_token_count
 
 
 @dataclass
@@ -543,6 +545,96 @@ class KnowledgeService:
             or 0
         )
 
+    @staticmethod
+    def refresh_token_counts(
+        db: Session,
+        knowledge_base_id: int,
+    ) -> dict[str, int]:
+        """
+        Aggregate the token counts of active documents onto the knowledge base.
+
+        The totals are stored in the KnowledgeBase status as tokenCounts, so
+        the injection decision reads them without touching the documents.
+        Documents indexed before token counting contribute file_size / 4 to
+        every family.
+
+        Args:
+            db: Database session
+            knowledge_base_id: Knowledge base ID
+
+        Returns:
+            Total token count by model family
+        """
+        kb = (
+            db.query(Kind)
+            .filter(Kind.id == knowledge_base_id, Kind.kind == "KnowledgeBase")
+            .with_for_update()
+            .first()
+        )
+        if not kb:
+            return {}
+
+        documents = (
+            db.query(KnowledgeDocument.token_counts, KnowledgeDocument.file_size)
+            .filter(
+                KnowledgeDocument.kind_id == knowledge_base_id,
+                KnowledgeDocument.is_active == True,
+            )
+            .all()
+        )
+
+        counted = [token_counts for token_counts, _ in documents if token_counts]
+        uncounted_tokens = sum(
+            (file_size or 0) // 4
+            for token_counts, file_size in documents
+            if not token_counts
+        )
+        families = {DEFAULT_FAMILY}.union(*counted)
+        totals = {
+            family: uncounted_tokens
+            + sum(select_token_count(counts, family) or 0 for counts in counted)
+            for family in families
+        }
+
+        kb_json = dict(kb.json)
+        status = dict(kb_json.get("status") or {})
+        status["tokenCounts"] = totals
+        kb_json["status"] = status
+        kb.json = kb_json
+        # Mark JSON field as modified so SQLAlchemy detects the change
+        flag_modified(kb, "json")
+        db.commit()
+        return totals
+
+    @staticmethod
+    def get_total_token_count(
+        db: Session,
+        knowledge_base_id: int,
+        model_family: str = DEFAULT_FAMILY,
+    ) -> int:
+        """
+        Get the total token count of a knowledge base for a model family.
+
+        Args:
+            db: Database session
+            knowledge_base_id: Knowledge base ID
+            model_family: Model family, as detected by chat_shell's TokenCounter
+
+        Returns:
+            Token count aggregated at index time, or file_size / 4 for
+            knowledge bases without aggregated counts
+        """
+        kb = (
+            db.query(Kind)
+            .filter(Kind.id == knowledge_base_id, Kind.kind == "KnowledgeBase")
+            .first()
+        )
+        status = (kb.json.get("status") or {}) if kb else {}
+        token_count = select_token_count(status.get("tokenCounts"), model_family)
+        if token_count is not None:
+            return token_count
+        return KnowledgeService.get_total_file_size(db, knowledge_base_id) // 4
+
     # ============== Knowledge Document Operations ==============
 
     # Maximum number of documents allowed in notebook mode knowledge base
@@ -611,6 +703,7 @@ class KnowledgeService:
 
         db.commit()
         db.refresh(document)
+        chunk_snapshot_cache.bump_version(knowledge_base_id)
         return document
 
     @staticmethod
@@ -722,14 +815,19 @@ class KnowledgeService:
         if data.name is not None:
             doc.name = data.name
 
+        status_changed = False
         if data.status is not None:
-            doc.status = DocumentStatus(data.status.value)
+            new_status = DocumentStatus(data.status.value)
+            status_changed = doc.status != new_status
+            doc.status = new_status
 
         if data.splitter_config is not None:
             doc.splitter_config = data.splitter_config.model_dump()
 
         db.commit()
         db.refresh(doc)
+        if status_changed:
+            chunk_snapshot_cache.bump_version(doc.kind_id)
         return doc
 
     @staticmethod
@@ -758,7 +856,7 @@ class KnowledgeService:
         from app.services.adapters.retriever_kinds import retriever_kinds_service
         from app.services.context import context_service
         from app.services.rag.document_service import DocumentService
-        from app.services.rag.storage.factory import create_storage_backend
+        from app.services.rag.storage.factory import get_shared_storage_backend
 
         logger = logging.getLogger(__name__)
 
@@ -806,6 +904,8 @@ class KnowledgeService:
         # Physically delete document from database
         db.delete(doc)
         db.commit()
+        chunk_snapshot_cache.bump_version(kind_id)
+        KnowledgeService.refresh_token_counts(db, kind_id)
 
         # Delete RAG index if knowledge base has retrieval_config
         if kb:
@@ -829,8 +929,8 @@ class KnowledgeService:
                         )
 
                         if retriever_crd:
-                            # Create storage backend from retriever
-                            storage_backend = create_storage_backend(retriever_crd)
+                            # Get shared storage backend for retriever
+                            storage_backend = get_shared_storage_backend(retriever_crd)
 
                             # Create document service
                             doc_service = DocumentService(
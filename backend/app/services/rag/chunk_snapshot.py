@@ -0,0 +1,266 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Versioned chunk snapshots for direct injection.
+
+Direct injection needs every chunk of a knowledge base on every query, which
+means scrolling the whole vector store collection. Instead, the cleaned chunk
+list is stored as a compressed snapshot in Redis under
+(knowledge base id, content version), with a small in-process LRU of decoded
+snapshots in front of it.
+
+The content version is a Redis counter bumped whenever documents of the
+knowledge base are added, deleted, enabled or disabled. Bumping makes the old
+snapshot unreachable; it then expires through its TTL.
+"""
+
+import logging
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import orjson
+import redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefixes for content versions and snapshots
+VERSION_KEY_PREFIX = "wegent:kb_chunks:version:"
+SNAPSHOT_KEY_PREFIX = "wegent:kb_chunks:snapshot:"
+
+# Seconds to skip Redis after a Redis error
+REDIS_ERROR_BACKOFF_SECONDS = 30
+
+# Snapshots larger than this (compressed) are not stored
+MAX_SNAPSHOT_BYTES = 32 * 1024 * 1024
+
+# Chunk fields kept in snapshots, in stored order
+SNAPSHOT_FIELDS = ("content", "title", "chunk_id", "doc_ref", "token_counts")
+
+KnowledgeBaseId = Union[int, str]
+
+
+def encode_snapshot(chunks: List[Dict[str, Any]], max_chunks: int) -> bytes:
+    """
+    Encode chunks as a compact compressed snapshot.
+
+    Args:
+        chunks: Chunks as returned by the storage backend
+        max_chunks: Chunk limit the list was fetched with
+
+    Returns:
+        zlib-compressed JSON bytes
+    """
+    rows = [[chunk.get(field) for field in SNAPSHOT_FIELDS] for chunk in chunks]
+    return zlib.compress(orjson.dumps({"max_chunks": max_chunks, "chunks": rows}))
+
+
+def decode_snapshot(data: bytes) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Decode a snapshot created by encode_snapshot.
+
+    Returns:
+        Tuple of (max_chunks the snapshot was fetched with, chunks)
+    """
+    snapshot = orjson.loads(zlib.decompress(data))
+    chunks = [dict(zip(SNAPSHOT_FIELDS, row)) for row in snapshot["chunks"]]
+    return snapshot["max_chunks"], chunks
+
+
+class ChunkSnapshotCache:
+    """
+    Chunk snapshot cache keyed by knowledge base content version.
+
+    Without Redis there is no shared content version, so every lookup is a
+    miss. Redis failures are logged and treated as misses.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 32,
+        redis_url: Optional[str] = None,
+        redis_ttl: int = 24 * 3600,
+    ):
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self._redis_url = redis_url
+        self._redis_client: Optional[redis.Redis] = None
+        self._redis_disabled = redis_url is None
+        self._redis_backoff_until = 0.0
+        # str(kb_id) -> (version, max_chunks, chunks)
+        self._lru: "OrderedDict[str, Tuple[int, int, List[Dict[str, Any]]]]" = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        """Lazy-load a pooled Redis client, or None while Redis is unavailable."""
+        if self._redis_disabled or time.monotonic() < self._redis_backoff_until:
+            return None
+        if self._redis_client is None:
+            try:
+                self._redis_client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=False,
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+            except Exception as e:
+                logger.warning(f"[ChunkSnapshotCache] Failed to connect to Redis: {e}")
+                self._redis_disabled = True
+        return self._redis_client
+
+    def _redis_error(self, operation: str, error: Exception) -> None:
+        logger.warning(f"[ChunkSnapshotCache] Redis {operation} failed: {error}")
+        self._redis_backoff_until = time.monotonic() + REDIS_ERROR_BACKOFF_SECONDS
+
+    @staticmethod
+    def _usable(
+        snapshot_max_chunks: int, chunks: List[Dict[str, Any]], max_chunks: int
+    ) -> bool:
+        """Whether a snapshot holds every chunk a request for max_chunks needs."""
+        return len(chunks) < snapshot_max_chunks or max_chunks <= snapshot_max_chunks
+
+    def get(
+        self, kb_id: KnowledgeBaseId, max_chunks: int
+    ) -> Tuple[Optional[int], Optional[List[Dict[str, Any]]]]:
+        """
+        Look up the snapshot of the current content version.
+
+        Args:
+            kb_id: Knowledge base ID
+            max_chunks: Maximum number of chunks requested
+
+        Returns:
+            Tuple of (current version, chunks). The version is None when
+            snapshots are unavailable, the chunks are None on a miss.
+        """
+        client = self.redis_client
+        if client is None:
+            return None, None
+
+        key = str(kb_id)
+        try:
+            version = int(client.get(f"{VERSION_KEY_PREFIX}{key}") or 0)
+        except Exception as e:
+            self._redis_error("GET", e)
+            return None, None
+
+        with self._lock:
+            entry = self._lru.get(key)
+            if entry is not None and entry[0] == version:
+                self._lru.move_to_end(key)
+                if self._usable(entry[1], entry[2], max_chunks):
+                    return version, [dict(chunk) for chunk in entry[2][:max_chunks]]
+
+        try:
+            data = client.get(f"{SNAPSHOT_KEY_PREFIX}{key}:{version}")
+        except Exception as e:
+            self._redis_error("GET", e)
+            return None, None
+        if data is None:
+            return version, None
+
+        try:
+            snapshot_max_chunks, chunks = decode_snapshot(data)
+        except Exception as e:
+            logger.warning(
+                f"[ChunkSnapshotCache] Dropping corrupt snapshot of KB {key}: {e}"
+            )
+            return version, None
+
+        self._put_local(key, version, snapshot_max_chunks, chunks)
+        if not self._usable(snapshot_max_chunks, chunks, max_chunks):
+            return version, None
+        return version, [dict(chunk) for chunk in chunks[:max_chunks]]
+
+    def put(
+        self,
+        kb_id: KnowledgeBaseId,
+        version: int,
+        max_chunks: int,
+        chunks: List[Dict[str, Any]],
+    ) -> None:
+        """
+        Store the chunks fetched for a content version.
+
+        Args:
+            kb_id: Knowledge base ID
+            version: Content version read before the chunks were fetched
+            max_chunks: Chunk limit the chunks were fetched with
+            chunks: Chunks as returned by the storage backend
+        """
+        client = self.redis_client
+        if client is None:
+            return
+
+        key = str(kb_id)
+        data = encode_snapshot(chunks, max_chunks)
+        if len(data) > MAX_SNAPSHOT_BYTES:
+            logger.info(
+                f"[ChunkSnapshotCache] Snapshot of KB {key} is {len(data)} bytes, "
+                "not caching"
+            )
+            return
+
+        try:
+            client.set(f"{SNAPSHOT_KEY_PREFIX}{key}:{version}", data, ex=self.redis_ttl)
+        except Exception as e:
+            self._redis_error("SET", e)
+            return
+        self._put_local(key, version, max_chunks, decode_snapshot(data)[1])
+
+    def bump_version(self, kb_id: KnowledgeBaseId) -> None:
+        """
+        Mark the chunks of a knowledge base as changed.
+
+        Call after the change is visible in the vector store, so that a
+        snapshot fetched under the new version includes it.
+
+        Args:
+            kb_id: Knowledge base ID
+        """
+        key = str(kb_id)
+        with self._lock:
+            self._lru.pop(key, None)
+
+        client = self.redis_client
+        if client is None:
+            return
+        try:
+            client.incr(f"{VERSION_KEY_PREFIX}{key}")
+        except Exception as e:
+            self._redis_error("INCR", e)
+
+    def clear(self) -> None:
+        """Drop all local entries."""
+        with self._lock:
+            self._lru.clear()
+
+    def _put_local(
+        self,
+        key: str,
+        version: int,
+        max_chunks: int,
+        chunks: List[Dict[str, Any]],
+    ) -> None:
+        with self._lock:
+            self._lru[key] = (version, max_chunks, chunks)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+
+# Global chunk snapshot cache instance
+chunk_snapshot_cache = ChunkSnapshotCache(
+    max_entries=settings.CHUNK_SNAPSHOT_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL if settings.CHUNK_SNAPSHOT_CACHE_ENABLED else None,
+    redis_ttl=settings.CHUNK_SNAPSHOT_CACHE_TTL,
+)
@@ -17,6 +17,7 @@ from sqlalchemy.orm import Session
 from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
 from app.schemas.rag import SplitterConfig
 from app.services.context import context_service
+from app.services.rag.chunk_snapshot import chunk_snapshot_cache
 from app.services.rag.embedding.factory import create_embedding_model_from_crd
 from app.services.rag.index import DocumentIndexer
 from app.services.rag.storage.base import BaseStorageBackend
@@ -180,6 +181,7 @@ class DocumentService:
                 user_id=user_id,
             )
 
+        chunk_snapshot_cache.bump_version(knowledge_id)
         return result
 
     async def index_document(
@@ -256,12 +258,14 @@ class DocumentService:
                 - status: Deletion status
         """
         # Run in thread pool to avoid uvloop conflicts
-        return await asyncio.to_thread(
+        result = await asyncio.to_thread(
             self.storage_backend.delete_document,
             knowledge_id=knowledge_id,
             doc_ref=doc_ref,
             user_id=user_id,
         )
+        await asyncio.to_thread(chunk_snapshot_cache.bump_version, knowledge_id)
+        return result
 
     async def list_documents(
         self,
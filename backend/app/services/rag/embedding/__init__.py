@@ -6,10 +6,18 @@
 Embedding module for RAG functionality.
 """
 
+from app.services.rag.embedding.cache import (
+    CachedEmbedding,
+    EmbeddingCache,
+    embedding_cache,
+)
 from app.services.rag.embedding.custom import CustomEmbedding
 from app.services.rag.embedding.factory import create_embedding_model_from_crd
 
 __all__ = [
     "create_embedding_model_from_crd",
+    "CachedEmbedding",
     "CustomEmbedding",
+    "EmbeddingCache",
+    "embedding_cache",
 ]
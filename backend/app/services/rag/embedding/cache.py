@@ -0,0 +1,390 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Content-hash embedding cache.
+
+Embeddings are cached under (model identity, mode, sha256(text)) in two tiers:
+- L1: bounded in-process LRU
+- L2: Redis, shared across backend processes and celery workers
+
+The model identity combines the Model CRD id with a fingerprint of the
+settings that determine the vectors (protocol, endpoint, model id), so editing
+a Model CRD makes its old entries unreachable. Local entries are also dropped
+eagerly through ``invalidate_model`` when the CRD is updated or deleted.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import orjson
+import redis
+from llama_index.core.base.embeddings.base import BaseEmbedding
+from prometheus_client import Counter
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Redis key prefix for cached embeddings
+EMBEDDING_CACHE_KEY_PREFIX = "wegent:embedding:"
+
+# Seconds to skip the Redis tier after a Redis error
+REDIS_ERROR_BACKOFF_SECONDS = 30
+
+# Cache modes: query and text embeddings may differ for some providers
+MODE_QUERY = "query"
+MODE_TEXT = "text"
+
+# Prometheus metrics
+EMBEDDING_CACHE_REQUESTS = Counter(
+    "embedding_cache_requests_total",
+    "Embedding cache lookups by tier and result",
+    ["tier", "result"],
+)
+
+Embedding = List[float]
+
+
+def build_model_cache_key(kind_id: int, **identity: Any) -> str:
+    """
+    Build the cache identity for an embedding Model CRD.
+
+    Args:
+        kind_id: Kind.id of the Model CRD
+        **identity: Settings that determine the embedding vectors
+            (e.g. protocol, base_url, model_id)
+
+    Returns:
+        Identity string such as ``"42:1f2e3d4c5b6a7980"``
+    """
+    fingerprint = hashlib.sha256(
+        orjson.dumps(identity, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()[:16]
+    return f"{kind_id}:{fingerprint}"
+
+
+def hash_text(text: str) -> str:
+    """Return the sha256 hex digest of a text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier embedding cache (in-process LRU + Redis).
+
+    Redis failures are logged and treated as misses so the cache never breaks
+    embedding calls.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        redis_url: Optional[str] = None,
+        redis_ttl: int = 7 * 24 * 3600,
+    ):
+        self.max_entries = max_entries
+        self.redis_ttl = redis_ttl
+        self._redis_url = redis_url
+        self._redis_client: Optional[redis.Redis] = None
+        self._redis_disabled = redis_url is None
+        self._redis_backoff_until = 0.0
+        self._lru: "OrderedDict[Tuple[str, str, str], Embedding]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    @property
+    def redis_client(self) -> Optional[redis.Redis]:
+        """Lazy-load a pooled Redis client, or None while Redis is unavailable."""
+        if self._redis_disabled or time.monotonic() < self._redis_backoff_until:
+            return None
+        if self._redis_client is None:
+            try:
+                self._redis_client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=False,
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] Failed to connect to Redis: {e}")
+                self._redis_disabled = True
+        return self._redis_client
+
+    @staticmethod
+    def _redis_key(model_key: str, mode: str, text_hash: str) -> str:
+        return f"{EMBEDDING_CACHE_KEY_PREFIX}{model_key}:{mode}:{text_hash}"
+
+    def get_many(
+        self, model_key: str, mode: str, texts: Sequence[str]
+    ) -> List[Optional[Embedding]]:
+        """
+        Look up embeddings for texts.
+
+        Args:
+            model_key: Model identity from build_model_cache_key
+            mode: MODE_QUERY or MODE_TEXT
+            texts: Texts to look up
+
+        Returns:
+            List aligned with texts, None where the embedding is not cached
+        """
+        hashes = [hash_text(text) for text in texts]
+        results: List[Optional[Embedding]] = [None] * len(texts)
+        l2_indexes: List[int] = []
+
+        with self._lock:
+            for i, text_hash in enumerate(hashes):
+                lru_key = (model_key, mode, text_hash)
+                embedding = self._lru.get(lru_key)
+                if embedding is not None:
+                    self._lru.move_to_end(lru_key)
+                    results[i] = embedding
+                else:
+                    l2_indexes.append(i)
+        l1_hits = len(texts) - len(l2_indexes)
+
+        l2_hits = 0
+        client = self.redis_client if l2_indexes else None
+        if client is not None:
+            try:
+                values = client.mget(
+                    [self._redis_key(model_key, mode, hashes[i]) for i in l2_indexes]
+                )
+            except Exception as e:
+                logger.warning(f"[EmbeddingCache] Redis MGET failed: {e}")
+                self._redis_backoff_until = (
+                    time.monotonic() + REDIS_ERROR_BACKOFF_SECONDS
+                )
+                values = [None] * len(l2_indexes)
+
+            found: List[Tuple[Tuple[str, str, str], Embedding]] = []
+            for i, value in zip(l2_indexes, values):
+                if value is None:
+                    continue
+                try:
+                    embedding = orjson.loads(value)
+                except orjson.JSONDecodeError:
+                    continue
+                results[i] = embedding
+                found.append(((model_key, mode, hashes[i]), embedding))
+            l2_hits = len(found)
+            if found:
+                with self._lock:
+                    for lru_key, embedding in found:
+                        self._put_local(lru_key, embedding)
+
+        misses = len(l2_indexes) - l2_hits
+        self._record(l1_hits, l2_hits, misses)
+        return results
+
+    def put_many(
+        self,
+        model_key: str,
+        mode: str,
+        texts: Sequence[str],
+        embeddings: Sequence[Embedding],
+    ) -> None:
+        """Store embeddings for texts in both tiers."""
+        if not texts:
+            return
+
+        items = [
+            ((model_key, mode, hash_text(text)), list(embedding))
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            for lru_key, embedding in items:
+                self._put_local(lru_key, embedding)
+
+        client = self.redis_client
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for (key_model, key_mode, text_hash), embedding in items:
+                pipe.set(
+                    self._redis_key(key_model, key_mode, text_hash),
+                    orjson.dumps(embedding),
+                    ex=self.redis_ttl,
+                )
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f"[EmbeddingCache] Redis pipeline SET failed: {e}")
+            self._redis_backoff_until = time.monotonic() + REDIS_ERROR_BACKOFF_SECONDS
+
+    def invalidate_model(self, model_id: int) -> int:
+        """
+        Drop local entries for a Model CRD.
+
+        Redis entries are keyed by the CRD fingerprint, so they become
+        unreachable once the CRD changes and expire through their TTL.
+
+        Args:
+            model_id: Kind.id of the Model CRD
+
+        Returns:
+            Number of local entries removed
+        """
+        prefix = f"{model_id}:"
+        with self._lock:
+            stale = [key for key in self._lru if key[0].startswith(prefix)]
+            for key in stale:
+                del self._lru[key]
+        if stale:
+            logger.info(
+                f"[EmbeddingCache] Invalidated {len(stale)} entries for model {model_id}"
+            )
+        return len(stale)
+
+    def clear(self) -> None:
+        """Drop all local entries and reset statistics."""
+        with self._lock:
+            self._lru.clear()
+            self._stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit/miss counters and current L1 size."""
+        with self._lock:
+            return {**self._stats, "l1_size": len(self._lru)}
+
+    def _put_local(self, lru_key: Tuple[str, str, str], embedding: Embedding) -> None:
+        """Insert into the LRU. Caller must hold the lock."""
+        self._lru[lru_key] = embedding
+        self._lru.move_to_end(lru_key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    def _record(self, l1_hits: int, l2_hits: int, misses: int) -> None:
+        with self._lock:
+            self._stats["l1_hits"] += l1_hits
+            self._stats["l2_hits"] += l2_hits
+            self._stats["misses"] += misses
+        if l1_hits:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="l1", result="hit").inc(l1_hits)
+        if l2_hits:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="l2", result="hit").inc(l2_hits)
+        if misses:
+            EMBEDDING_CACHE_REQUESTS.labels(tier="l2", result="miss").inc(misses)
+
+
+class CachedEmbedding(BaseEmbedding):
+    """
+    LlamaIndex embedding wrapper that serves repeated texts from EmbeddingCache.
+
+    Cache misses are embedded by the wrapped model in a single batch call, so
+    the wrapped model's own batching and concurrency still apply.
+    """
+
+    inner: Any
+    model_key: str
+    cache: Any
+
+    def __init__(self, inner: BaseEmbedding, model_key: str, cache: EmbeddingCache):
+        super().__init__(
+            model_name=inner.model_name,
+            embed_batch_size=inner.embed_batch_size,
+            inner=inner,
+            model_key=model_key,
+            cache=cache,
+        )
+
+    @classmethod
+    def class_name(cls) -> str:
+        return "CachedEmbedding"
+
+    def _lookup(
+        self, mode: str, texts: List[str]
+    ) -> Tuple[List[Optional[Embedding]], List[str]]:
+        """Return cached results and the distinct texts that still need embedding."""
+        results = self.cache.get_many(self.model_key, mode, texts)
+        missing = list(
+            dict.fromkeys(text for text, emb in zip(texts, results) if emb is None)
+        )
+        return results, missing
+
+    def _merge(
+        self,
+        mode: str,
+        texts: List[str],
+        results: List[Optional[Embedding]],
+        missing: List[str],
+        computed: List[Embedding],
+    ) -> List[Embedding]:
+        """Store freshly computed embeddings and fill them into results."""
+        self.cache.put_many(self.model_key, mode, missing, computed)
+        by_text = dict(zip(missing, computed))
+        return [
+            emb if emb is not None else by_text[text]
+            for text, emb in zip(texts, results)
+        ]
+
+    def _get_query_embedding(self, query: str) -> Embedding:
+        results, missing = self._lookup(MODE_QUERY, [query])
+        if not missing:
+            return results[0]
+        computed = [self.inner.get_query_embedding(query)]
+        return self._merge(MODE_QUERY, [query], results, missing, computed)[0]
+
+    async def _aget_query_embedding(self, query: str) -> Embedding:
+        results, missing = await asyncio.to_thread(self._lookup, MODE_QUERY, [query])
+        if not missing:
+            return results[0]
+        computed = [await self.inner.aget_query_embedding(query)]
+        merged = await asyncio.to_thread(
+            self._merge, MODE_QUERY, [query], results, missing, computed
+        )
+        return merged[0]
+
+    def _get_text_embedding(self, text: str) -> Embedding:
+        return self._get_text_embeddings([text])[0]
+
+    async def _aget_text_embedding(self, text: str) -> Embedding:
+        embeddings = await self._aget_text_embeddings([text])
+        return embeddings[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return self.get_text_embedding_batch(texts)
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[Embedding]:
+        return await self.aget_text_embedding_batch(texts)
+
+    def get_text_embedding_batch(
+        self, texts: List[str], show_progress: bool = False, **kwargs: Any
+    ) -> List[Embedding]:
+        """Embed texts, sending only uncached, distinct texts to the wrapped model."""
+        results, missing = self._lookup(MODE_TEXT, texts)
+        if not missing:
+            return results
+        computed = self.inner.get_text_embedding_batch(
+            missing, show_progress=show_progress, **kwargs
+        )
+        return self._merge(MODE_TEXT, texts, results, missing, computed)
+
+    async def aget_text_embedding_batch(
+        self, texts: List[str], show_progress: bool = False, **kwargs: Any
+    ) -> List[Embedding]:
+        """Async version of get_text_embedding_batch."""
+        results, missing = await asyncio.to_thread(self._lookup, MODE_TEXT, texts)
+        if not missing:
+            return results
+        computed = await self.inner.aget_text_embedding_batch(
+            missing, show_progress=show_progress, **kwargs
+        )
+        return await asyncio.to_thread(
+            self._merge, MODE_TEXT, texts, results, missing, computed
+        )
+
+
+# Global embedding cache instance
+embedding_cache = EmbeddingCache(
+    max_entries=settings.EMBEDDING_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL if settings.EMBEDDING_CACHE_REDIS_ENABLED else None,
+    redis_ttl=settings.EMBEDDING_CACHE_REDIS_TTL,
+)
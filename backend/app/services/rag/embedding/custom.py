@@ -7,10 +7,16 @@ Custom embedding implementation for external APIs.
 """
 
 import asyncio
-from typing import Dict, List, Optional
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
+import httpx
 import requests
 from llama_index.core.base.embeddings.base import BaseEmbedding
+from pydantic import PrivateAttr
+from requests.adapters import HTTPAdapter
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 
@@ -18,6 +24,10 @@ class CustomEmbedding(BaseEmbedding):
     """
     Custom embedding wrapper for external APIs.
     Implements LlamaIndex's BaseEmbedding interface with retry mechanism.
+
+    Texts are sent to the OpenAI-compatible endpoint in batches of
+    ``embed_batch_size`` inputs per request. Requests reuse a keep-alive
+    HTTP session, and up to ``max_concurrency`` batches are in flight at once.
     """
 
     # Declare fields as class attributes for Pydantic compatibility
@@ -25,7 +35,13 @@ class CustomEmbedding(BaseEmbedding):
     model: str
     headers: Dict[str, str]
     api_key: Optional[str] = None
+    max_concurrency: int = 4
+    timeout: float = 30.0
     _dimension: Optional[int] = None
+    _session: Optional[requests.Session] = None
+    _async_client: Optional[httpx.AsyncClient] = None
+    _async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+    _client_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
 
     def __init__(
         self,
@@ -34,6 +50,8 @@ class CustomEmbedding(BaseEmbedding):
         headers: Optional[Dict[str, str]] = None,
         api_key: Optional[str] = None,
         embed_batch_size: int = 10,
+        max_concurrency: int = 4,
+        timeout: float = 30.0,
         **kwargs,
     ):
         # Merge api_key into headers if provided
@@ -41,6 +59,9 @@ class CustomEmbedding(BaseEmbedding):
         if api_key and "Authorization" not in final_headers:
             final_headers["Authorization"] = f"Bearer {api_key}"
 
+        # num_workers bounds LlamaIndex's async batch fan-out
+        kwargs.setdefault("num_workers", max_concurrency)
+
         super().__init__(
             model_name=model,
             embed_batch_size=embed_batch_size,
@@ -48,6 +69,8 @@ class CustomEmbedding(BaseEmbedding):
             model=model,
             headers=final_headers,
             api_key=api_key,
+            max_concurrency=max_concurrency,
+            timeout=timeout,
             **kwargs,
         )
 
@@ -59,16 +82,137 @@ class CustomEmbedding(BaseEmbedding):
         """Get embedding for a text string."""
         return self._call_api(text)
 
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for a batch of texts in a single API call."""
+        return self._call_api_batch(texts)
+
     async def _aget_query_embedding(self, query: str) -> List[float]:
-        """Async version - runs sync call in thread pool to avoid blocking."""
-        return await asyncio.to_thread(self._get_query_embedding, query)
+        """Get embedding for a query string asynchronously."""
+        embeddings = await self._acall_api_batch([query])
+        return embeddings[0]
+
+    async def _aget_text_embedding(self, text: str) -> List[float]:
+        """Get embedding for a text string asynchronously."""
+        embeddings = await self._acall_api_batch([text])
+        return embeddings[0]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Get embeddings for a batch of texts in a single async API call."""
+        return await self._acall_api_batch(texts)
+
+    def get_text_embedding_batch(
+        self,
+        texts: List[str],
+        show_progress: bool = False,
+        **kwargs: Any,
+    ) -> List[List[float]]:
+        """
+        Get embeddings for many texts, running batches concurrently.
+
+        The base implementation sends batches one after another. Here the input
+        is cut into ``embed_batch_size`` windows and up to ``max_concurrency``
+        windows are embedded in parallel, each through the base implementation
+        so callbacks, instrumentation and rate limiting still apply.
+
+        Args:
+            texts: Texts to embed
+            show_progress: Whether to show a progress bar (sequential path only)
+
+        Returns:
+            Embedding vectors in input order
+        """
+        batch_embed = super().get_text_embedding_batch
+        batch_size = self.embed_batch_size
+        if self.max_concurrency <= 1 or len(texts) <= batch_size:
+            return batch_embed(texts, show_progress=show_progress, **kwargs)
+
+        windows = [texts[i : i + batch_size] for i in range(0, len(texts), batch_size)]
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_concurrency, len(windows)),
+            thread_name_prefix="custom-embedding",
+        ) as executor:
+            # Each window runs in its own copy of the caller's context so
+            # LlamaIndex instrumentation spans stay attached to the caller
+            futures = [
+                executor.submit(
+                    contextvars.copy_context().run, batch_embed, window, **kwargs
+                )
+                for window in windows
+            ]
+            results: List[List[float]] = []
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+    def _get_session(self) -> requests.Session:
+        """Get the shared keep-alive HTTP session, creating it on first use."""
+        if self._session is None:
+            with self._client_lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=1,
+                        pool_maxsize=max(self.max_concurrency, 1),
+                    )
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    self._session = session
+        return self._session
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """
+        Get the shared async HTTP client for the running event loop.
+
+        httpx clients are bound to the loop they were first used on, so a new
+        client is created when called from a different loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client is None or self._async_client_loop is not loop:
+            self._async_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=max(self.max_concurrency, 1),
+                    max_keepalive_connections=max(self.max_concurrency, 1),
+                ),
+            )
+            self._async_client_loop = loop
+        return self._async_client
+
+    def _build_payload(self, texts: List[str]) -> Dict[str, Any]:
+        """Build OpenAI-compatible request body for a batch of texts."""
+        return {"model": self.model, "input": texts}
+
+    def _parse_embeddings(
+        self, response_json: Dict[str, Any], expected: int
+    ) -> List[List[float]]:
+        """
+        Extract embeddings from an OpenAI-compatible response.
+
+        Items are ordered by their ``index`` field when present, since
+        providers are not required to return them in input order.
+
+        Raises:
+            ValueError: If the number of embeddings does not match the input
+        """
+        data = response_json["data"]
+        if all("index" in item for item in data):
+            data = sorted(data, key=lambda item: item["index"])
+        embeddings = [item["embedding"] for item in data]
+
+        if len(embeddings) != expected:
+            raise ValueError(
+                f"Embedding API returned {len(embeddings)} embeddings "
+                f"for {expected} inputs"
+            )
+
+        if self._dimension is None and embeddings:
+            self._dimension = len(embeddings[0])
+
+        return embeddings
 
-    @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
-    )
     def _call_api(self, text: str) -> List[float]:
         """
-        Call external embedding API with retry mechanism.
+        Call external embedding API for a single text.
 
         Args:
             text: Text to embed
@@ -79,16 +223,53 @@ class CustomEmbedding(BaseEmbedding):
         Raises:
             requests.HTTPError: If API call fails after retries
         """
-        response = requests.post(
+        return self._call_api_batch([text])[0]
+
+    @retry(
+        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    def _call_api_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Call external embedding API for a batch of texts with retry mechanism.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Embedding vectors in input order
+
+        Raises:
+            requests.HTTPError: If API call fails after retries
+        """
+        if not texts:
+            return []
+
+        response = self._get_session().post(
             self.api_url,
-            json={"model": self.model, "input": text},
+            json=self._build_payload(texts),
             headers=self.headers,
-            timeout=30,
+            timeout=self.timeout,
         )
         response.raise_for_status()
-        embedding = response.json()["data"][0]["embedding"]
+        return self._parse_embeddings(response.json(), len(texts))
+
+    @retry(
+        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=2, max=10)
+    )
+    async def _acall_api_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Async version of _call_api_batch using a pooled httpx client.
 
-        if self._dimension is None:
-            self._dimension = len(embedding)
+        Raises:
+            httpx.HTTPStatusError: If API call fails after retries
+        """
+        if not texts:
+            return []
 
-        return embedding
+        response = await self._get_async_client().post(
+            self.api_url,
+            json=self._build_payload(texts),
+            headers=self.headers,
+        )
+        response.raise_for_status()
+        return self._parse_embeddings(response.json(), len(texts))
@@ -7,11 +7,17 @@ Embedding model factory.
 """
 
 import logging
-from typing import Any, Dict
+from typing import Any, Optional
 
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.models.kind import Kind
+from app.services.rag.embedding.cache import (
+    CachedEmbedding,
+    build_model_cache_key,
+    embedding_cache,
+)
 from app.services.rag.embedding.custom import CustomEmbedding
 from shared.utils.crypto import decrypt_api_key
 
@@ -36,7 +42,9 @@ def create_embedding_model_from_crd(
         model_namespace: Model namespace (default: "default")
 
     Returns:
-        LlamaIndex-compatible embedding model
+        LlamaIndex-compatible embedding model. When EMBEDDING_CACHE_ENABLED is
+        set, the model is wrapped in CachedEmbedding so repeated texts are
+        served from the embedding cache.
 
     Raises:
         ValueError: If model not found or not an embedding model
@@ -123,6 +131,54 @@ def create_embedding_model_from_crd(
                 f"Failed to decrypt API key for embedding_model '{model_name}': {str(e)}. Using as-is."
             )
 
+    embed_model = _build_embedding_model(
+        model_name=model_name,
+        protocol=protocol,
+        api_key=api_key,
+        base_url=base_url,
+        model_id=model_id,
+        custom_headers=custom_headers,
+    )
+
+    if not settings.EMBEDDING_CACHE_ENABLED:
+        return embed_model
+
+    model_key = build_model_cache_key(
+        model_kind.id,
+        protocol=protocol,
+        base_url=base_url,
+        model_id=model_id,
+    )
+    return CachedEmbedding(
+        inner=embed_model, model_key=model_key, cache=embedding_cache
+    )
+
+
+def _build_embedding_model(
+    model_name: str,
+    protocol: Optional[str],
+    api_key: Optional[str],
+    base_url: Optional[str],
+    model_id: Optional[str],
+    custom_headers: Any,
+):
+    """
+    Build the provider-specific embedding model.
+
+    Args:
+        model_name: Model CRD name (for error messages)
+        protocol: Embedding protocol ('openai', 'cohere', 'jina', 'custom')
+        api_key: Decrypted API key
+        base_url: Provider base URL
+        model_id: Provider model identifier
+        custom_headers: Extra HTTP headers
+
+    Returns:
+        LlamaIndex-compatible embedding model
+
+    Raises:
+        ValueError: If protocol is unsupported or configuration is incomplete
+    """
     # Build embedding config based on protocol
     if protocol == "openai":
         # OpenAI protocol (supports custom headers for internal gateways)
@@ -14,8 +14,10 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional
 
 from llama_index.core import Document, SimpleDirectoryReader
+from llama_index.core.schema import BaseNode
 
 from app.schemas.rag import SplitterConfig
+from app.services.rag.index.tokenizers import count_tokens
 from app.services.rag.splitter import SemanticSplitter, SentenceSplitter
 from app.services.rag.splitter.factory import create_splitter
 from app.services.rag.storage.base import BaseStorageBackend
@@ -66,6 +68,34 @@ def sanitize_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
     return sanitized
 
 
+def count_chunk_tokens(nodes: List[BaseNode]) -> Dict[str, int]:
+    """
+    Store per-chunk token counts in node metadata and sum them per document.
+
+    The counts are excluded from the text sent to the embedding model and
+    the LLM.
+
+    Args:
+        nodes: Chunks of one document
+
+    Returns:
+        Document token counts by model family
+    """
+    totals: Dict[str, int] = {}
+    for node in nodes:
+        counts = count_tokens(node.get_content())
+        node.metadata["token_counts"] = counts
+        for keys in (
+            node.excluded_embed_metadata_keys,
+            node.excluded_llm_metadata_keys,
+        ):
+            if "token_counts" not in keys:
+                keys.append("token_counts")
+        for family, count in counts.items():
+            totals[family] = totals.get(family, 0) + count
+    return totals
+
+
 class DocumentIndexer:
     """Orchestrates document indexing process."""
 
@@ -217,6 +247,10 @@ class DocumentIndexer:
         # Split documents into nodes
         nodes = self.splitter.split_documents(documents)
 
+        # Count tokens once per chunk so direct injection can decide without
+        # re-estimating chunk sizes at query time
+        token_counts = count_chunk_tokens(nodes)
+
         # Prepare metadata
         created_at = datetime.now(timezone.utc).isoformat()
 
@@ -238,6 +272,7 @@ class DocumentIndexer:
                 "knowledge_id": knowledge_id,
                 "source_file": source_file,
                 "chunk_count": len(nodes),
+                "token_counts": token_counts,
                 "created_at": created_at,
             }
         )
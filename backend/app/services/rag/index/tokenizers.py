@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Tokenizers used to count chunk tokens at index time.
+
+Counts are computed once per chunk for every registered model family and
+stored with the chunk, the document and the knowledge base, so the direct
+injection decision does not need to re-estimate tokens per query. Families
+match the providers detected by chat_shell's TokenCounter. OpenAI models are
+counted with tiktoken; families without a local tokenizer use a
+characters-per-token estimate.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Family used when a model's family has no counts
+DEFAULT_FAMILY = "default"
+
+# Average characters per token for families without a local tokenizer
+CHARS_PER_TOKEN: Dict[str, float] = {
+    "openai": 4.0,
+    "anthropic": 3.5,
+    "google": 4.0,
+    DEFAULT_FAMILY: 4.0,
+}
+
+Tokenizer = Callable[[str], int]
+
+_tokenizers: Dict[str, Tokenizer] = {}
+_defaults_registered = False
+
+
+@lru_cache(maxsize=4)
+def _get_tiktoken_encoding(encoding_name: str):
+    """Get a tiktoken encoding, or None if tiktoken is unavailable."""
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(encoding_name)
+    except ImportError:
+        logger.warning("tiktoken not available, falling back to character estimation")
+        return None
+    except Exception as e:
+        logger.warning(f"Failed to load tiktoken encoding {encoding_name}: {e}")
+        return None
+
+
+def char_estimate_tokenizer(chars_per_token: float) -> Tokenizer:
+    """Build a tokenizer that estimates tokens from the character count."""
+
+    def count(text: str) -> int:
+        return int(len(text) / chars_per_token)
+
+    return count
+
+
+def tiktoken_tokenizer(encoding_name: str = "cl100k_base") -> Optional[Tokenizer]:
+    """Build a tokenizer from a tiktoken encoding, or None if unavailable."""
+    encoding = _get_tiktoken_encoding(encoding_name)
+    if encoding is None:
+        return None
+
+    def count(text: str) -> int:
+        return len(encoding.encode(text, disallowed_special=()))
+
+    return count
+
+
+def register_tokenizer(family: str, tokenizer: Tokenizer) -> None:
+    """
+    Register the tokenizer of a model family.
+
+    Documents indexed afterwards get counts for the family; documents indexed
+    before fall back to the default family.
+
+    Args:
+        family: Model family name, as detected by chat_shell's TokenCounter
+        tokenizer: Function returning the token count of a text
+    """
+    _tokenizers[family] = tokenizer
+
+
+def get_tokenizers() -> Dict[str, Tokenizer]:
+    """Get the registered tokenizers by model family, including the defaults."""
+    global _defaults_registered
+    if not _defaults_registered:
+        defaults = {
+            family: char_estimate_tokenizer(chars_per_token)
+            for family, chars_per_token in CHARS_PER_TOKEN.items()
+        }
+        openai_tokenizer = tiktoken_tokenizer()
+        if openai_tokenizer is not None:
+            defaults["openai"] = openai_tokenizer
+        for family, tokenizer in defaults.items():
+            _tokenizers.setdefault(family, tokenizer)
+        _defaults_registered = True
+    return _tokenizers
+
+
+def count_tokens(text: str) -> Dict[str, int]:
+    """
+    Count the tokens of a text with every registered tokenizer.
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Token count by model family
+    """
+    return {family: tokenizer(text) for family, tokenizer in get_tokenizers().items()}
+
+
+def select_token_count(counts: Optional[Dict[str, int]], family: str) -> Optional[int]:
+    """
+    Pick the count of a model family from stored counts.
+
+    Args:
+        counts: Stored token counts by model family
+        family: Requested model family
+
+    Returns:
+        Token count, falling back to the default family, or None
+    """
+    if not counts:
+        return None
+    count = counts.get(family, counts.get(DEFAULT_FAMILY))
+    return int(count) if count is not None else None
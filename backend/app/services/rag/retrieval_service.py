@@ -15,10 +15,11 @@ from sqlalchemy.orm import Session
 
 from app.services.adapters.retriever_kinds import retriever_kinds_service
 from app.services.knowledge import KnowledgeService
+from app.services.rag.chunk_snapshot import chunk_snapshot_cache
 from app.services.rag.embedding.factory import create_embedding_model_from_crd
 from app.services.rag.retrieval.retriever import DocumentRetriever
 from app.services.rag.storage.base import BaseStorageBackend
-from app.services.rag.storage.factory import create_storage_backend
+from app.services.rag.storage.factory import get_shared_storage_backend
 
 logger = logging.getLogger(__name__)
 
@@ -253,9 +254,120 @@ class RetrievalService:
         Raises:
             ValueError: If knowledge base not found or configuration invalid
         """
+        # Get knowledge base directly without permission check
+        kb = self._get_active_knowledge_base(db, knowledge_base_id)
+
+        return await self._retrieve_from_kb_internal(
+            query=query,
+            kb=kb,
+            db=db,
+            metadata_condition=metadata_condition,
+        )
+
+    async def retrieve_from_knowledge_bases_internal(
+        self,
+        query: str,
+        knowledge_base_ids: List[int],
+        db: Session,
+        metadata_condition: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[int, Dict]:
+        """
+        Retrieve from several knowledge bases concurrently without permission check.
+
+        Knowledge bases are searched in parallel. Knowledge bases that use the
+        same embedding model share a single query embedding. Results are
+        partial: knowledge bases that fail or miss the deadline are logged and
+        left out instead of failing the whole call.
+
+        ⚠️ WARNING: This method bypasses user permission checks, see
+        retrieve_from_knowledge_base_internal.
+
+        Args:
+            query: Search query
+            knowledge_base_ids: Knowledge base IDs to search
+            db: Database session
+            metadata_condition: Optional metadata filtering conditions
+            timeout: Optional deadline in seconds for the whole fan-out
+
+        Returns:
+            Dict mapping knowledge base ID to its Dify-compatible result
+        """
+        # Resolve configuration up front: DB access stays on the caller's
+        # thread, only embedding and vector search run in worker threads
+        plans: Dict[int, Dict[str, Any]] = {}
+        for kb_id in knowledge_base_ids:
+            try:
+                kb = self._get_active_knowledge_base(db, kb_id)
+                plans[kb_id] = self._prepare_kb_retrieval(kb, db)
+            except Exception as e:
+                logger.warning(f"[RAG] Skipping KB {kb_id}: {e}")
+
+        if not plans:
+            return {}
+
+        embedding_tasks: Dict[tuple, asyncio.Task] = {}
+
+        async def _retrieve_one(plan: Dict[str, Any]) -> Dict:
+            query_embedding = None
+            if plan["retrieval_setting"].get("retrieval_mode", "vector") != "keyword":
+                key = plan["embedding_key"]
+                if key not in embedding_tasks:
+                    embedding_tasks[key] = asyncio.create_task(
+                        asyncio.to_thread(
+                            plan["embed_model"].get_query_embedding, query
+                        )
+                    )
+                query_embedding = await embedding_tasks[key]
+            return await self._execute_kb_retrieval(
+                plan,
+                query=query,
+                metadata_condition=metadata_condition,
+                query_embedding=query_embedding,
+            )
+
+        tasks = {
+            asyncio.create_task(_retrieve_one(plan)): kb_id
+            for kb_id, plan in plans.items()
+        }
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+
+        for task in pending:
+            task.cancel()
+            logger.warning(
+                f"[RAG] KB {tasks[task]} retrieval exceeded deadline of {timeout}s, "
+                f"returning partial results"
+            )
+        for task in embedding_tasks.values():
+            if not task.done():
+                task.cancel()
+
+        results: Dict[int, Dict] = {}
+        for task in done:
+            kb_id = tasks[task]
+            if task.exception() is not None:
+                logger.error(
+                    f"[RAG] Retrieval from KB {kb_id} failed: {task.exception()}"
+                )
+                continue
+            results[kb_id] = task.result()
+
+        logger.info(
+            f"[RAG] Fan-out retrieval finished: {len(results)}/{len(knowledge_base_ids)} KBs, "
+            f"{len(embedding_tasks)} query embeddings"
+        )
+        return results
+
+    @staticmethod
+    def _get_active_knowledge_base(db: Session, knowledge_base_id: int):
+        """
+        Get an active knowledge base Kind by ID without permission check.
+
+        Raises:
+            ValueError: If knowledge base not found
+        """
         from app.models.kind import Kind
 
-        # Get knowledge base directly without permission check
         kb = (
             db.query(Kind)
             .filter(
@@ -268,13 +380,7 @@ class RetrievalService:
 
         if not kb:
             raise ValueError(f"Knowledge base {knowledge_base_id} not found")
-
-        return await self._retrieve_from_kb_internal(
-            query=query,
-            kb=kb,
-            db=db,
-            metadata_condition=metadata_condition,
-        )
+        return kb
 
     async def _retrieve_from_kb_internal(
         self,
@@ -295,6 +401,25 @@ class RetrievalService:
         Returns:
             Dict with retrieval results
 
+        Raises:
+            ValueError: If configuration is invalid
+        """
+        plan = self._prepare_kb_retrieval(kb, db)
+        return await self._execute_kb_retrieval(
+            plan, query=query, metadata_condition=metadata_condition
+        )
+
+    def _prepare_kb_retrieval(self, kb, db: Session) -> Dict[str, Any]:
+        """
+        Resolve retriever, embedding model and retrieval settings for a KB.
+
+        Args:
+            kb: Knowledge base Kind instance
+            db: Database session
+
+        Returns:
+            Retrieval plan dict consumed by _execute_kb_retrieval
+
         Raises:
             ValueError: If configuration is invalid
         """
@@ -338,10 +463,10 @@ class RetrievalService:
                 f"Retriever {retriever_name} (namespace: {retriever_namespace}) not found"
             )
 
-        # Create storage backend from retriever
-        storage_backend = create_storage_backend(retriever)
+        # Get shared storage backend for retriever
+        storage_backend = get_shared_storage_backend(retriever)
         logger.info(
-            f"[RAG] Storage backend created: {storage_backend.__class__.__name__}"
+            f"[RAG] Storage backend ready: {storage_backend.__class__.__name__}"
         )
 
         # Extract embedding model configuration
@@ -402,9 +527,43 @@ class RetrievalService:
             model_namespace=embedding_model_namespace,
         )
 
+        return {
+            "kb": kb,
+            "knowledge_id": knowledge_id,
+            "storage_backend": storage_backend,
+            "embed_model": embed_model,
+            "embedding_key": (
+                embedding_model_name,
+                embedding_model_namespace,
+                embedding_owner_user_id,
+            ),
+            "retrieval_setting": retrieval_setting,
+        }
+
+    async def _execute_kb_retrieval(
+        self,
+        plan: Dict[str, Any],
+        query: str,
+        metadata_condition: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+    ) -> Dict:
+        """
+        Run retrieval for a plan built by _prepare_kb_retrieval.
+
+        Args:
+            plan: Retrieval plan
+            query: Search query
+            metadata_condition: Optional metadata filtering conditions
+            query_embedding: Optional precomputed query vector
+
+        Returns:
+            Dict with retrieval results
+        """
+        kb = plan["kb"]
+
         # Create retriever with storage backend
         retriever_instance = DocumentRetriever(
-            storage_backend=storage_backend, embed_model=embed_model
+            storage_backend=plan["storage_backend"], embed_model=plan["embed_model"]
         )
 
         # Retrieve documents (run in thread pool to avoid event loop conflicts)
@@ -412,11 +571,12 @@ class RetrievalService:
         # This ensures consistent index access for all users accessing this KB
         result = await asyncio.to_thread(
             retriever_instance.retrieve,
-            knowledge_id=knowledge_id,
+            knowledge_id=plan["knowledge_id"],
             query=query,
-            retrieval_setting=retrieval_setting,
+            retrieval_setting=plan["retrieval_setting"],
             metadata_condition=metadata_condition,
             user_id=kb.user_id,
+            query_embedding=query_embedding,
         )
 
         # Log detailed retrieval results for debugging
@@ -454,6 +614,8 @@ class RetrievalService:
 
         This method is used for smart context injection where we need all
         chunks from a knowledge base to determine if direct injection is possible.
+        Chunks are served from the snapshot of the knowledge base's current
+        content version when one exists, without touching the vector store.
 
         Args:
             knowledge_base_id: Knowledge base ID
@@ -461,7 +623,8 @@ class RetrievalService:
             max_chunks: Maximum number of chunks to retrieve (safety limit)
 
         Returns:
-            List of chunk dicts with content, title, chunk_id, doc_ref, metadata
+            List of chunk dicts with content, title, chunk_id, doc_ref,
+            token_counts (and metadata when read from the vector store)
 
         Raises:
             ValueError: If knowledge base not found or configuration invalid
@@ -499,6 +662,17 @@ class RetrievalService:
                 f"Knowledge base {kb.id} has incomplete retrieval config (missing retriever_name)"
             )
 
+        # Serve from the snapshot of the current content version if present
+        version, chunks = await asyncio.to_thread(
+            chunk_snapshot_cache.get, kb.id, max_chunks
+        )
+        if chunks is not None:
+            logger.info(
+                f"[RAG] Served {len(chunks)} chunks of KB {knowledge_base_id} "
+                f"from snapshot version {version}"
+            )
+            return chunks
+
         # Get retriever CRD
         retriever = retriever_kinds_service.get_retriever(
             db=db,
@@ -512,8 +686,8 @@ class RetrievalService:
                 f"Retriever {retriever_name} (namespace: {retriever_namespace}) not found"
             )
 
-        # Create storage backend from retriever
-        storage_backend = create_storage_backend(retriever)
+        # Get shared storage backend for retriever
+        storage_backend = get_shared_storage_backend(retriever)
 
         # Use knowledge base ID as knowledge_id
         knowledge_id = str(kb.id)
@@ -531,4 +705,11 @@ class RetrievalService:
             f"[RAG] Retrieved {len(chunks)} total chunks from KB {knowledge_base_id}"
         )
 
+        # Store under the version read before fetching, so a change made
+        # meanwhile bumps past this snapshot instead of being hidden by it
+        if version is not None:
+            await asyncio.to_thread(
+                chunk_snapshot_cache.put, kb.id, version, max_chunks, chunks
+            )
+
         return chunks
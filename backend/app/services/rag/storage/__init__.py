@@ -8,7 +8,11 @@ Storage backend abstraction for RAG functionality.
 
 from app.services.rag.storage.base import BaseStorageBackend
 from app.services.rag.storage.elasticsearch_backend import ElasticsearchBackend
-from app.services.rag.storage.factory import create_storage_backend
+from app.services.rag.storage.factory import (
+    create_storage_backend,
+    get_shared_storage_backend,
+    storage_backend_registry,
+)
 from app.services.rag.storage.qdrant_backend import QdrantBackend
 
 __all__ = [
@@ -16,4 +20,6 @@ __all__ = [
     "ElasticsearchBackend",
     "QdrantBackend",
     "create_storage_backend",
+    "get_shared_storage_backend",
+    "storage_backend_registry",
 ]
@@ -6,8 +6,10 @@
 Base storage backend interface for RAG functionality.
 """
 
+import asyncio
 import json
 import logging
+import threading
 from abc import ABC, abstractmethod
 from typing import Any, ClassVar, Dict, List, Optional
 
@@ -46,6 +48,64 @@ class BaseStorageBackend(ABC):
         self.index_strategy = config.get("indexStrategy", {})
         self.ext = config.get("ext", {})
 
+        # Vector store wrappers memoized by get_vector_store()
+        self._vector_stores: Dict[tuple, Any] = {}
+        self._vector_store_lock = threading.Lock()
+
+    def get_vector_store(self, index_name: str, *args) -> Any:
+        """
+        Get the vector store for an index, creating it on first use.
+
+        Backends are long-lived (see StorageBackendRegistry), so the LlamaIndex
+        wrapper for an index is built once and reused across requests.
+
+        Args:
+            index_name: Index/collection name
+            *args: Extra create_vector_store() arguments (e.g. retrieval mode)
+
+        Returns:
+            Vector store instance
+        """
+        key = (index_name, *args)
+        stores = self._get_vector_store_cache()
+        store = stores.get(key)
+        if store is None:
+            with self._vector_store_lock:
+                store = stores.get(key)
+                if store is None:
+                    store = self.create_vector_store(index_name, *args)
+                    stores[key] = store
+        return store
+
+    def _get_vector_store_cache(self) -> Dict[tuple, Any]:
+        """Return the dict that memoizes vector stores for the caller."""
+        return self._vector_stores
+
+    def release_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Release resources bound to an event loop before it is closed.
+
+        Only needed by backends whose clients are bound to an event loop.
+        The loop must not be running.
+
+        Args:
+            loop: Event loop about to be closed
+        """
+
+    def health_check(self) -> bool:
+        """
+        Check whether the backend is still usable.
+
+        Used by the backend registry to evict broken clients. Defaults to
+        test_connection().
+        """
+        return self.test_connection()
+
+    def close(self) -> None:
+        """Release memoized vector stores and pooled clients."""
+        with self._vector_store_lock:
+            self._vector_stores.clear()
+
     def extract_chunk_text(self, raw_content: Any) -> str:
         """Extract normalized plain text from raw chunk content.
 
@@ -265,6 +325,7 @@ class BaseStorageBackend(ABC):
         embed_model,
         retrieval_setting: Dict[str, Any],
         metadata_condition: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
         **kwargs,
     ) -> Dict:
         """
@@ -281,6 +342,9 @@ class BaseStorageBackend(ABC):
                 - vector_weight: Optional, weight for vector search
                 - keyword_weight: Optional, weight for keyword search
             metadata_condition: Optional metadata filtering conditions
+            query_embedding: Optional precomputed query vector. When given, the
+                query is not embedded again (used to share one embedding
+                across knowledge bases that use the same model)
             **kwargs: Additional parameters
 
         Returns:
@@ -377,6 +441,8 @@ class BaseStorageBackend(ABC):
                 - title: str, source document name
                 - chunk_id: int, chunk index within document
                 - doc_ref: str, document reference ID
+                - token_counts: dict, index-time token counts by model family
+                  (None for chunks indexed before token counting)
                 - metadata: dict, additional metadata
         """
         pass
@@ -11,6 +11,10 @@ Supported retrieval modes:
 - hybrid: Combined vector + BM25 search with configurable weights
 """
 
+import asyncio
+import logging
+import warnings
+import weakref
 from typing import Any, ClassVar, Dict, List, Optional
 
 from elasticsearch import Elasticsearch
@@ -30,6 +34,23 @@ from llama_index.vector_stores.elasticsearch import ElasticsearchStore
 from app.services.rag.retrieval.filters import parse_metadata_filters
 from app.services.rag.storage.base import BaseStorageBackend
 
+logger = logging.getLogger(__name__)
+
+
+def _current_event_loop() -> Optional[asyncio.AbstractEventLoop]:
+    """Return the loop ElasticsearchStore would run on in the calling thread."""
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    try:
+        # Same lookup as the synchronous ElasticsearchStore methods
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            return asyncio.get_event_loop()
+    except RuntimeError:
+        return None
+
 
 class ElasticsearchBackend(BaseStorageBackend):
     """
@@ -70,6 +91,59 @@ class ElasticsearchBackend(BaseStorageBackend):
         elif self.api_key:
             self.llama_es_kwargs["es_api_key"] = self.api_key
 
+        # Native client is thread-safe and pools connections, build it lazily
+        self._es_client: Optional[Elasticsearch] = None
+
+        # ElasticsearchStore wraps an AsyncElasticsearch client bound to the
+        # event loop it first ran on, so stores are memoized per event loop.
+        # Callers that create a loop per request release it through
+        # release_event_loop() before closing it
+        self._loop_stores: (
+            "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[tuple, Any]]"
+        ) = weakref.WeakKeyDictionary()
+
+    @property
+    def es_client(self) -> Elasticsearch:
+        """Shared native Elasticsearch client."""
+        if self._es_client is None:
+            with self._vector_store_lock:
+                if self._es_client is None:
+                    self._es_client = Elasticsearch(self.url, **self.es_kwargs)
+        return self._es_client
+
+    def _get_vector_store_cache(self) -> Dict[tuple, Any]:
+        """Return the vector store cache of the calling thread's event loop."""
+        loop = _current_event_loop()
+        if loop is None or loop.is_closed():
+            # Nothing to bind a store to, build an uncached one
+            return {}
+        with self._vector_store_lock:
+            # Loops closed without release_event_loop() cannot close their
+            # clients any more, drop them so they are garbage collected
+            for closed in [key for key in self._loop_stores if key.is_closed()]:
+                del self._loop_stores[closed]
+            return self._loop_stores.setdefault(loop, {})
+
+    def release_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Close the vector store clients bound to a loop that is shutting down."""
+        with self._vector_store_lock:
+            stores = self._loop_stores.pop(loop, {})
+        for store in stores.values():
+            try:
+                loop.run_until_complete(store.client.close())
+            except Exception as e:
+                logger.warning(f"Failed to close Elasticsearch store client: {e}")
+
+    def close(self) -> None:
+        """Close the native client and drop memoized vector stores."""
+        super().close()
+        # Stores of other loops are closed with their loop
+        with self._vector_store_lock:
+            self._loop_stores = weakref.WeakKeyDictionary()
+        client, self._es_client = self._es_client, None
+        if client is not None:
+            client.close()
+
     def create_vector_store(
         self, index_name: str, retrieval_mode: str = "vector"
     ) -> ElasticsearchStore:
@@ -153,7 +227,7 @@ class ElasticsearchBackend(BaseStorageBackend):
         index_name = self.get_index_name(knowledge_id, **kwargs)
 
         # Index nodes
-        vector_store = self.create_vector_store(index_name)
+        vector_store = self.get_vector_store(index_name)
         storage_context = StorageContext.from_defaults(vector_store=vector_store)
 
         VectorStoreIndex(
@@ -176,6 +250,7 @@ class ElasticsearchBackend(BaseStorageBackend):
         embed_model,
         retrieval_setting: Dict[str, Any],
         metadata_condition: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
         **kwargs,
     ) -> Dict:
         """
@@ -196,6 +271,7 @@ class ElasticsearchBackend(BaseStorageBackend):
                 - retrieval_mode: Optional 'vector'/'keyword'/'hybrid' (default: 'vector')
                 - alpha: Optional weight for hybrid search (0=keyword only, 1=vector only, default: 0.7)
             metadata_condition: Optional metadata filtering
+            query_embedding: Optional precomputed query vector
             **kwargs: Additional parameters
 
         Returns:
@@ -208,7 +284,7 @@ class ElasticsearchBackend(BaseStorageBackend):
         retrieval_mode = retrieval_setting.get("retrieval_mode", "vector")
 
         # Create vector store with appropriate retrieval strategy
-        vector_store = self.create_vector_store(index_name, retrieval_mode)
+        vector_store = self.get_vector_store(index_name, retrieval_mode)
 
         # Build metadata filters
         filters = self._build_metadata_filters(knowledge_id, metadata_condition)
@@ -223,7 +299,8 @@ class ElasticsearchBackend(BaseStorageBackend):
             # Hybrid search - needs embedding
             # alpha: 0 = pure keyword, 1 = pure vector, default 0.7 (70% vector)
             query_mode = VectorStoreQueryMode.HYBRID
-            query_embedding = embed_model.get_query_embedding(query)
+            if query_embedding is None:
+                query_embedding = embed_model.get_query_embedding(query)
             # Convert vector_weight to alpha (they have the same meaning)
             alpha = retrieval_setting.get(
                 "alpha", retrieval_setting.get("vector_weight", 0.7)
@@ -231,7 +308,8 @@ class ElasticsearchBackend(BaseStorageBackend):
         else:
             # Default: Pure vector search
             query_mode = VectorStoreQueryMode.DEFAULT
-            query_embedding = embed_model.get_query_embedding(query)
+            if query_embedding is None:
+                query_embedding = embed_model.get_query_embedding(query)
             alpha = None
 
         # Create VectorStoreQuery
@@ -338,7 +416,7 @@ class ElasticsearchBackend(BaseStorageBackend):
             Deletion result dict
         """
         index_name = self.get_index_name(knowledge_id, **kwargs)
-        vector_store = self.create_vector_store(index_name)
+        vector_store = self.get_vector_store(index_name)
 
         # Build filters to match the document
         filters = self._build_doc_ref_filters(knowledge_id, doc_ref)
@@ -373,7 +451,7 @@ class ElasticsearchBackend(BaseStorageBackend):
             Document details dict with chunks
         """
         index_name = self.get_index_name(knowledge_id, **kwargs)
-        vector_store = self.create_vector_store(index_name)
+        vector_store = self.get_vector_store(index_name)
 
         # Build filters to match the document
         filters = self._build_doc_ref_filters(knowledge_id, doc_ref)
@@ -441,7 +519,7 @@ class ElasticsearchBackend(BaseStorageBackend):
         to match the doc_ref returned in retrieve API metadata.
         """
         index_name = self.get_index_name(knowledge_id, **kwargs)
-        es_client = Elasticsearch(self.url, **self.es_kwargs)
+        es_client = self.es_client
 
         # Aggregate by doc_ref (our custom document ID), filtered by knowledge_id
         search_body = {
@@ -510,8 +588,7 @@ class ElasticsearchBackend(BaseStorageBackend):
     def test_connection(self) -> bool:
         """Test connection to Elasticsearch."""
         try:
-            es_client = Elasticsearch(self.url, **self.es_kwargs)
-            return es_client.ping()
+            return self.es_client.ping()
         except Exception:
             return False
 
@@ -532,7 +609,7 @@ class ElasticsearchBackend(BaseStorageBackend):
             List of chunk dicts with content, title, chunk_id, doc_ref, metadata
         """
         index_name = self.get_index_name(knowledge_id, **kwargs)
-        es_client = Elasticsearch(self.url, **self.es_kwargs)
+        es_client = self.es_client
 
         # Query all chunks for this knowledge base
         search_body = {
@@ -568,6 +645,7 @@ class ElasticsearchBackend(BaseStorageBackend):
                         "title": metadata.get("source_file", ""),
                         "chunk_id": metadata.get("chunk_index", 0),
                         "doc_ref": metadata.get("doc_ref", ""),
+                        "token_counts": metadata.get("token_counts"),
                         "metadata": metadata,
                     }
                 )
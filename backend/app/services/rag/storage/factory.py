@@ -8,10 +8,12 @@ Storage backend factory for creating storage backends from Retriever CRD.
 
 from typing import Dict, List, Optional, Type
 
+from app.core.config import settings
 from app.schemas.kind import Retriever
 from app.services.rag.storage.base import BaseStorageBackend
 from app.services.rag.storage.elasticsearch_backend import ElasticsearchBackend
 from app.services.rag.storage.qdrant_backend import QdrantBackend
+from app.services.rag.storage.registry import StorageBackendRegistry
 
 # Registry of storage backend classes by type
 STORAGE_BACKEND_REGISTRY: Dict[str, Type[BaseStorageBackend]] = {
@@ -158,3 +160,32 @@ def create_storage_backend(retriever: Retriever) -> BaseStorageBackend:
     # Create backend instance
     backend_class = STORAGE_BACKEND_REGISTRY[storage_type]
     return backend_class(config)
+
+
+# Global registry of long-lived backends, one per Retriever CRD
+storage_backend_registry = StorageBackendRegistry(
+    factory=create_storage_backend,
+    max_entries=settings.STORAGE_BACKEND_CACHE_MAX_ENTRIES,
+    idle_ttl=settings.STORAGE_BACKEND_CACHE_IDLE_TTL,
+)
+
+
+def get_shared_storage_backend(retriever: Retriever) -> BaseStorageBackend:
+    """
+    Get a shared storage backend for a Retriever CRD.
+
+    Unlike create_storage_backend, the backend and its clients are reused
+    across calls until the CRD changes or the backend is evicted.
+
+    Args:
+        retriever: Retriever CRD instance
+
+    Returns:
+        Storage backend instance
+
+    Raises:
+        ValueError: If storage type is not supported
+    """
+    if not settings.STORAGE_BACKEND_CACHE_ENABLED:
+        return create_storage_backend(retriever)
+    return storage_backend_registry.get(retriever)
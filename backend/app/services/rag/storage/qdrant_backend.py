@@ -86,6 +86,11 @@ class QdrantBackend(BaseStorageBackend):
             # Local Qdrant connection
             self.client = QdrantClient(url=self.url)
 
+    def close(self) -> None:
+        """Close the Qdrant client and drop memoized vector stores."""
+        super().close()
+        self.client.close()
+
     def create_vector_store(self, collection_name: str):
         """
         Create Qdrant vector store.
@@ -145,7 +150,7 @@ class QdrantBackend(BaseStorageBackend):
         collection_name = self.get_index_name(knowledge_id, **kwargs)
 
         # Index nodes (LlamaIndex auto-creates collection if needed)
-        vector_store = self.create_vector_store(collection_name)
+        vector_store = self.get_vector_store(collection_name)
         storage_context = StorageContext.from_defaults(vector_store=vector_store)
 
         VectorStoreIndex(
@@ -168,6 +173,7 @@ class QdrantBackend(BaseStorageBackend):
         embed_model,
         retrieval_setting: Dict[str, Any],
         metadata_condition: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
         **kwargs,
     ) -> Dict:
         """
@@ -184,6 +190,7 @@ class QdrantBackend(BaseStorageBackend):
                 - score_threshold: Minimum similarity score (0-1)
                 - retrieval_mode: Only 'vector' is supported
             metadata_condition: Optional metadata filtering
+            query_embedding: Optional precomputed query vector
             **kwargs: Additional parameters
 
         Returns:
@@ -207,13 +214,14 @@ class QdrantBackend(BaseStorageBackend):
             )
 
         # Create vector store
-        vector_store = self.create_vector_store(collection_name)
+        vector_store = self.get_vector_store(collection_name)
 
         # Build metadata filters
         filters = self._build_metadata_filters(knowledge_id, metadata_condition)
 
-        # Generate query embedding
-        query_embedding = embed_model.get_query_embedding(query)
+        # Generate query embedding unless it was precomputed
+        if query_embedding is None:
+            query_embedding = embed_model.get_query_embedding(query)
 
         # Create VectorStoreQuery (vector mode only)
         vs_query = VectorStoreQuery(
@@ -304,7 +312,7 @@ class QdrantBackend(BaseStorageBackend):
             Deletion result dict
         """
         collection_name = self.get_index_name(knowledge_id, **kwargs)
-        vector_store = self.create_vector_store(collection_name)
+        vector_store = self.get_vector_store(collection_name)
 
         # Build filters to match the document
         filters = self._build_doc_ref_filters(knowledge_id, doc_ref)
@@ -339,7 +347,7 @@ class QdrantBackend(BaseStorageBackend):
             Document details dict with chunks
         """
         collection_name = self.get_index_name(knowledge_id, **kwargs)
-        vector_store = self.create_vector_store(collection_name)
+        vector_store = self.get_vector_store(collection_name)
 
         # Build filters to match the document
         filters = self._build_doc_ref_filters(knowledge_id, doc_ref)
@@ -565,6 +573,7 @@ class QdrantBackend(BaseStorageBackend):
                         "title": payload.get("source_file", ""),
                         "chunk_id": payload.get("chunk_index", 0),
                         "doc_ref": payload.get("doc_ref", ""),
+                        "token_counts": payload.get("token_counts"),
                         "metadata": payload,
                     }
                 )
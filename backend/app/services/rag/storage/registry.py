@@ -0,0 +1,261 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Process-wide registry of storage backends built from Retriever CRDs.
+
+Building a backend opens new Elasticsearch/Qdrant clients, so the registry
+keeps one long-lived backend per Retriever CRD and reuses its pooled clients
+and memoized vector stores across requests.
+
+Entries are keyed by (namespace, name, config fingerprint). Editing a
+Retriever CRD changes its fingerprint, so the next lookup builds a fresh
+backend (hot reload). The old entry is dropped through ``invalidate`` when the
+CRD is updated or deleted, and otherwise ages out. A background job calls
+``check_health`` to evict idle backends and backends that fail their health
+check.
+"""
+
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Tuple
+
+import orjson
+from prometheus_client import Counter
+
+from app.schemas.kind import Retriever
+from app.services.rag.storage.base import BaseStorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Prometheus metrics
+STORAGE_BACKEND_REGISTRY_EVENTS = Counter(
+    "storage_backend_registry_events_total",
+    "Storage backend registry lookups and evictions",
+    ["event"],
+)
+
+RegistryKey = Tuple[str, str, str]
+
+
+def build_retriever_fingerprint(retriever: Retriever) -> str:
+    """
+    Fingerprint the storage configuration of a Retriever CRD.
+
+    Args:
+        retriever: Retriever CRD
+
+    Returns:
+        Short sha256 hex digest of the storage configuration
+    """
+    config = retriever.spec.storageConfig.model_dump(mode="json", exclude_none=True)
+    return hashlib.sha256(
+        orjson.dumps(config, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()[:16]
+
+
+@dataclass
+class _RegistryEntry:
+    backend: BaseStorageBackend
+    last_used_at: float = field(default_factory=time.monotonic)
+
+
+class StorageBackendRegistry:
+    """
+    Bounded LRU of storage backends keyed by Retriever CRD.
+
+    Evicted backends are not closed, since a request may still be using them;
+    their clients are released when they are garbage collected. Only
+    ``clear`` (used on shutdown) closes backends explicitly.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Retriever], BaseStorageBackend],
+        max_entries: int = 32,
+        idle_ttl: float = 1800,
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            factory: Builds a new backend from a Retriever CRD
+            max_entries: Maximum number of cached backends
+            idle_ttl: Seconds after which an unused backend is evicted
+        """
+        self.factory = factory
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl
+        self._entries: "OrderedDict[RegistryKey, _RegistryEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(retriever: Retriever) -> RegistryKey:
+        return (
+            retriever.metadata.namespace or "default",
+            retriever.metadata.name,
+            build_retriever_fingerprint(retriever),
+        )
+
+    def get(self, retriever: Retriever) -> BaseStorageBackend:
+        """
+        Get the backend for a Retriever CRD, building it on first use.
+
+        Args:
+            retriever: Retriever CRD
+
+        Returns:
+            Shared storage backend instance
+
+        Raises:
+            ValueError: If storage type is not supported
+        """
+        key = self._key(retriever)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.last_used_at = time.monotonic()
+                self._entries.move_to_end(key)
+                STORAGE_BACKEND_REGISTRY_EVENTS.labels(event="hit").inc()
+                return entry.backend
+
+        # Build outside the lock, client construction may block
+        backend = self.factory(retriever)
+        STORAGE_BACKEND_REGISTRY_EVENTS.labels(event="miss").inc()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                # Another thread won the race, keep its backend
+                self._entries.move_to_end(key)
+                return entry.backend
+
+            self._entries[key] = _RegistryEntry(backend=backend)
+            while len(self._entries) > self.max_entries:
+                evicted_key, _ = self._entries.popitem(last=False)
+                STORAGE_BACKEND_REGISTRY_EVENTS.labels(event="evict_lru").inc()
+                logger.info(
+                    f"[StorageRegistry] Evicted backend for retriever "
+                    f"{evicted_key[0]}/{evicted_key[1]} (LRU)"
+                )
+
+        logger.info(
+            f"[StorageRegistry] Created {backend.__class__.__name__} for retriever "
+            f"{key[0]}/{key[1]} (fingerprint={key[2]})"
+        )
+        return backend
+
+    def invalidate(self, name: str, namespace: str = "default") -> int:
+        """
+        Drop all backends built from a Retriever CRD.
+
+        Args:
+            name: Retriever name
+            namespace: Retriever namespace
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [
+                key
+                for key in self._entries
+                if key[0] == (namespace or "default") and key[1] == name
+            ]
+            for key in keys:
+                del self._entries[key]
+        if keys:
+            STORAGE_BACKEND_REGISTRY_EVENTS.labels(event="invalidate").inc(len(keys))
+            logger.info(
+                f"[StorageRegistry] Invalidated {len(keys)} backend(s) for retriever "
+                f"{namespace}/{name}"
+            )
+        return len(keys)
+
+    def check_health(self) -> int:
+        """
+        Evict idle backends and backends that fail their health check.
+
+        Health checks run outside the registry lock.
+
+        Returns:
+            Number of entries evicted
+        """
+        now = time.monotonic()
+        with self._lock:
+            snapshot = dict(self._entries)
+
+        to_evict: List[Tuple[RegistryKey, str]] = []
+        for key, entry in snapshot.items():
+            if now - entry.last_used_at > self.idle_ttl:
+                to_evict.append((key, "evict_idle"))
+                continue
+            try:
+                healthy = entry.backend.health_check()
+            except Exception as e:
+                logger.warning(
+                    f"[StorageRegistry] Health check error for {key[0]}/{key[1]}: {e}"
+                )
+                healthy = False
+            if not healthy:
+                to_evict.append((key, "evict_unhealthy"))
+
+        evicted = 0
+        with self._lock:
+            for key, event in to_evict:
+                # Skip entries replaced while the health checks were running
+                if self._entries.get(key) is not snapshot[key]:
+                    continue
+                del self._entries[key]
+                evicted += 1
+                STORAGE_BACKEND_REGISTRY_EVENTS.labels(event=event).inc()
+                logger.info(
+                    f"[StorageRegistry] Evicted backend for retriever "
+                    f"{key[0]}/{key[1]} ({event})"
+                )
+        return evicted
+
+    def release_event_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Release the resources cached backends hold on an event loop.
+
+        Call before closing an event loop created for a single request.
+
+        Args:
+            loop: Event loop about to be closed, must not be running
+        """
+        with self._lock:
+            backends = [entry.backend for entry in self._entries.values()]
+        for backend in backends:
+            try:
+                backend.release_event_loop(loop)
+            except Exception as e:
+                logger.warning(
+                    f"[StorageRegistry] Failed to release event loop resources: {e}"
+                )
+
+    def clear(self) -> None:
+        """Close and remove all backends."""
+        with self._lock:
+            entries = list(self._entries.values())
+            self._entries.clear()
+        for entry in entries:
+            try:
+                entry.backend.close()
+            except Exception as e:
+                logger.warning(f"[StorageRegistry] Failed to close backend: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get registry statistics."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "retrievers": [f"{key[0]}/{key[1]}" for key in self._entries],
+            }
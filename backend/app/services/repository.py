@@ -11,12 +11,18 @@ from typing import Any, Dict, List
 
 from fastapi import HTTPException
 
+from app.core.config import settings
 from app.models.user import User
 from app.repository.gerrit_provider import GerritProvider
 from app.repository.gitea_provider import GiteaProvider
 from app.repository.gitee_provider import GiteeProvider
 from app.repository.github_provider import GitHubProvider
 from app.repository.gitlab_provider import GitLabProvider
+from app.repository.search_index import (
+    UNMATCHED_RANK,
+    match_rank,
+    repository_search_indexes,
+)
 
 
 class RepositoryService:
@@ -243,19 +249,16 @@ class RepositoryService:
                 )
                 continue
 
-        # Sort by relevance (basic sorting by name match)
+        # Merge providers by the same ranking the search indexes use
         query_lower = query.lower()
         all_results.sort(
-            key=lambda x: (
-                not (
-                    query_lower in x["name"].lower()
-                    or query_lower in x["full_name"].lower()
-                ),
-                -len(x["name"]),
+            key=lambda x: match_rank(
+                query_lower, x["name"].lower(), x["full_name"].lower()
             )
+            or UNMATCHED_RANK
         )
 
-        return all_results
+        return all_results[: settings.REPO_SEARCH_MAX_RESULTS]
 
     async def clear_user_cache(self, user: User) -> List[str]:
         """
@@ -279,6 +282,7 @@ class RepositoryService:
             if git_domain:
                 cache_key = cache_manager.generate_full_cache_key(user.id, git_domain)
                 deleted = await cache_manager.delete(cache_key)
+                repository_search_indexes.invalidate(user.id, git_domain)
                 if deleted:
                     cleared_domains.append(git_domain)
                     self.logger.info(
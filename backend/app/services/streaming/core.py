@@ -63,6 +63,12 @@ class StorageHandlerProtocol(Protocol):
         """Save streaming content to cache."""
         ...
 
+    async def append_streaming_content(
+        self, subtask_id: int, delta: str, offset: int
+    ) -> bool:
+        """Append a content delta at a byte offset; False if the cache is stale."""
+        ...
+
     async def delete_streaming_content(self, subtask_id: int) -> None:
         """Delete streaming content from cache."""
         ...
@@ -109,7 +115,13 @@ class StreamingState:
     )
 
     # Runtime state
-    full_response: str = ""
+    # Response text is kept as a list of chunks so appends are O(1);
+    # read it through the full_response property
+    _response_chunks: list[str] = field(default_factory=list, init=False, repr=False)
+    # Content appended since the last Redis save, and the UTF-8 byte length
+    # already persisted (-1 forces a full rewrite)
+    _unsaved_chunks: list[str] = field(default_factory=list, init=False, repr=False)
+    persisted_bytes: int = 0
     offset: int = 0
     last_redis_save: float = 0.0
     last_db_save: float = 0.0
@@ -119,11 +131,32 @@ class StreamingState:
     )  # Knowledge base sources for citation
     reasoning_content: str = ""  # Reasoning/thinking content from DeepSeek R1 etc.
 
+    @property
+    def full_response(self) -> str:
+        """Accumulated response text."""
+        if len(self._response_chunks) > 1:
+            # Collapse so repeated reads do not re-join the whole response
+            self._response_chunks[:] = ["".join(self._response_chunks)]
+        return self._response_chunks[0] if self._response_chunks else ""
+
+    @full_response.setter
+    def full_response(self, value: str) -> None:
+        self._response_chunks[:] = [value] if value else []
+        self._unsaved_chunks.clear()
+        self.persisted_bytes = -1
+
     def append_content(self, token: str) -> None:
         """Append token to accumulated response."""
-        self.full_response += token
+        self._response_chunks.append(token)
+        self._unsaved_chunks.append(token)
         self.offset += len(token)
 
+    def take_unsaved_content(self) -> str:
+        """Return the content appended since the previous call."""
+        delta = "".join(self._unsaved_chunks)
+        self._unsaved_chunks.clear()
+        return delta
+
     def append_reasoning(self, content: str) -> None:
         """Append reasoning content (from DeepSeek R1 and similar models)."""
         self.reasoning_content += content
@@ -276,6 +309,25 @@ class StreamingConfig:
         default_factory=lambda: settings.STREAMING_DB_SAVE_INTERVAL
     )
     semaphore_timeout: float = 5.0
+    # Token coalescing: batch tokens into one chunk event per frame.
+    # Disable per stream for latency-sensitive clients.
+    coalesce_tokens: bool = field(
+        default_factory=lambda: settings.STREAMING_COALESCE_ENABLED
+    )
+    coalesce_interval: float = field(
+        default_factory=lambda: settings.STREAMING_COALESCE_INTERVAL
+    )
+    coalesce_max_bytes: int = field(
+        default_factory=lambda: settings.STREAMING_COALESCE_MAX_BYTES
+    )
+    # Append-only persistence: send only new content to Redis and write DB
+    # snapshots at checkpoints instead of every db_save_interval
+    append_persistence: bool = field(
+        default_factory=lambda: settings.STREAMING_APPEND_PERSISTENCE
+    )
+    db_checkpoint_interval: float = field(
+        default_factory=lambda: settings.STREAMING_DB_CHECKPOINT_INTERVAL
+    )
 
 
 class StreamingCore:
@@ -332,6 +384,18 @@ class StreamingCore:
         self._cancel_event: asyncio.Event | None = None
         self._mcp_client: Any = None
 
+        # Coalescing buffer: tokens not yet emitted, the offset of the first
+        # one, and the timer that flushes them if no further token arrives
+        self._pending_tokens: list[str] = []
+        self._pending_bytes = 0
+        self._pending_offset = 0
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task | None = None
+        self._emit_lock = asyncio.Lock()
+
+        # Thinking steps included in the last DB snapshot
+        self._checkpoint_thinking_count = 0
+
     @property
     def cancel_event(self) -> asyncio.Event | None:
         """Get the cancellation event."""
@@ -431,6 +495,7 @@ class StreamingCore:
                 await self._mcp_client.disconnect()
                 self._mcp_client = None
         finally:
+            self._cancel_flush_timer()
             # Release semaphore
             if self._acquired:
                 self._semaphore.release()
@@ -479,6 +544,7 @@ class StreamingCore:
                 self.state.subtask_id,
                 len(self.state.full_response),
             )
+            await self.flush_pending()
             await self.emitter.emit_cancelled(self.state.subtask_id)
             # Use COMPLETED status to ensure Task status is properly updated
             # The partial response is preserved in the result
@@ -501,6 +567,9 @@ class StreamingCore:
         reasoning_end = "__END_REASONING__"
 
         if token.startswith(reasoning_start) and token.endswith(reasoning_end):
+            # Keep content and reasoning events in stream order
+            await self.flush_pending()
+
             # Extract reasoning content
             reasoning_text = token[len(reasoning_start) : -len(reasoning_end)]
             self.state.append_reasoning(reasoning_text)
@@ -525,8 +594,28 @@ class StreamingCore:
             return True
 
         # Regular content - Accumulate content
+        is_first_token = self.state.offset == 0
         self.state.append_content(token)
 
+        if not self.config.coalesce_tokens or is_first_token:
+            # Emit immediately (first token is never delayed to keep
+            # time-to-first-token low)
+            await self._emit_content(token, self.state.offset - len(token))
+        else:
+            await self._buffer_token(token)
+
+        # Periodic saves
+        await self._periodic_save()
+
+        return True
+
+    async def _emit_content(self, content: str, offset: int) -> None:
+        """Emit a content chunk to the client.
+
+        Args:
+            content: Content text (a single token or a coalesced frame)
+            offset: Offset of the first character of content
+        """
         # Emit chunk to client with result data
         # - include_value=False: avoid sending full response in every chunk (reduces data size)
         # - include_thinking: only for Code mode (ClaudeCode, Agno), Chat mode only needs token
@@ -537,16 +626,51 @@ class StreamingCore:
             include_thinking=not is_chat_mode,  # Chat mode doesn't need thinking in chunks
         )
         await self.emitter.emit_chunk(
-            token,
-            self.state.offset - len(token),  # offset before this token
+            content,
+            offset,
             self.state.subtask_id,
             result=result,  # Include result with shell_type for frontend display
         )
 
-        # Periodic saves
-        await self._periodic_save()
+    async def _buffer_token(self, token: str) -> None:
+        """Add a token to the coalescing buffer, flushing when it is full."""
+        if not self._pending_tokens:
+            self._pending_offset = self.state.offset - len(token)
+            # Flush after coalesce_interval even if the model pauses
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.config.coalesce_interval, self._on_flush_timer
+            )
+        self._pending_tokens.append(token)
+        self._pending_bytes += len(token.encode("utf-8"))
 
-        return True
+        if self._pending_bytes >= self.config.coalesce_max_bytes:
+            await self.flush_pending()
+
+    def _on_flush_timer(self) -> None:
+        """Timer callback: flush the buffered frame in the background."""
+        self._flush_timer = None
+        if self._pending_tokens:
+            self._flush_task = asyncio.create_task(self.flush_pending())
+
+    def _cancel_flush_timer(self) -> None:
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+    async def flush_pending(self) -> None:
+        """Emit buffered tokens as one chunk event.
+
+        Safe to call when nothing is buffered. Frames are emitted in order.
+        """
+        async with self._emit_lock:
+            if not self._pending_tokens:
+                return
+            content = "".join(self._pending_tokens)
+            offset = self._pending_offset
+            self._pending_tokens = []
+            self._pending_bytes = 0
+            self._cancel_flush_timer()
+            await self._emit_content(content, offset)
 
     async def _periodic_save(self) -> None:
         """Perform periodic saves to Redis and DB."""
@@ -554,14 +678,11 @@ class StreamingCore:
 
         # Save to Redis
         if current_time - self.state.last_redis_save >= self.config.redis_save_interval:
-            await self._storage.save_streaming_content(
-                self.state.subtask_id,
-                self.state.full_response,
-            )
+            await self._save_streaming_content()
             self.state.last_redis_save = current_time
 
         # Save to DB with thinking data
-        if current_time - self.state.last_db_save >= self.config.db_save_interval:
+        if self._db_snapshot_due(current_time):
             # For Chat mode with tools, use slim_thinking to reduce payload size
             is_chat_mode = self.state.shell_type == "Chat"
             result = self.state.get_current_result(
@@ -577,6 +698,45 @@ class StreamingCore:
                 result=result,
             )
             self.state.last_db_save = current_time
+            self._checkpoint_thinking_count = len(self.state.thinking)
+
+    def _db_snapshot_due(self, current_time: float) -> bool:
+        """Whether the running result should be snapshotted to the DB.
+
+        In append mode the response text is recoverable from Redis, so the DB
+        is only written at checkpoints: every db_checkpoint_interval, or after
+        new thinking steps (which Redis does not hold) at the regular cadence.
+        """
+        elapsed = current_time - self.state.last_db_save
+        if not self.config.append_persistence:
+            return elapsed >= self.config.db_save_interval
+        if elapsed >= self.config.db_checkpoint_interval:
+            return True
+        return (
+            len(self.state.thinking) != self._checkpoint_thinking_count
+            and elapsed >= self.config.db_save_interval
+        )
+
+    async def _save_streaming_content(self) -> None:
+        """Persist new response content to the Redis streaming cache."""
+        delta = self.state.take_unsaved_content()
+        if self.config.append_persistence and self.state.persisted_bytes >= 0:
+            if not delta:
+                return
+            offset = self.state.persisted_bytes
+            self.state.persisted_bytes += len(delta.encode("utf-8"))
+            if await self._storage.append_streaming_content(
+                self.state.subtask_id, delta, offset
+            ):
+                return
+            logger.info(
+                "[STREAMING] subtask=%s rewriting streaming cache",
+                self.state.subtask_id,
+            )
+
+        content = self.state.full_response
+        await self._storage.save_streaming_content(self.state.subtask_id, content)
+        self.state.persisted_bytes = len(content.encode("utf-8"))
 
     async def finalize(self) -> dict[str, Any]:
         """Finalize streaming and save results.
@@ -584,6 +744,9 @@ class StreamingCore:
         Returns:
             Result dictionary with the full response and thinking steps
         """
+        # Emit tokens still waiting in the coalescing buffer
+        await self.flush_pending()
+
         # For Chat mode with tools, use slim_thinking to reduce payload size
         # For Chat mode without tools, thinking will be empty anyway
         is_chat_mode = self.state.shell_type == "Chat"
@@ -594,10 +757,7 @@ class StreamingCore:
         )
 
         # Save final content to Redis for streaming recovery
-        await self._storage.save_streaming_content(
-            self.state.subtask_id,
-            self.state.full_response,
-        )
+        await self._save_streaming_content()
 
         # Publish done signal
         await self._storage.publish_streaming_done(
@@ -646,6 +806,16 @@ class StreamingCore:
 
         error_msg = str(error)
 
+        # Deliver buffered tokens before the error so the partial response
+        # shown by the client matches the saved one
+        try:
+            await self.flush_pending()
+        except Exception:
+            logger.warning(
+                "[STREAMING] subtask=%s failed to flush pending tokens",
+                self.state.subtask_id,
+            )
+
         # Record error in OpenTelemetry trace using unified function
         record_stream_error(
             error=error,
@@ -12,6 +12,7 @@ from sqlalchemy.orm import Session, load_only, subqueryload, undefer
 from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
 from app.schemas.subtask import SubtaskCreate, SubtaskUpdate
 from app.services.base import BaseService
+from app.services.chat.storage.history_cache import history_cache
 from shared.models.db.enums import ContextType
 from shared.models.db.subtask_context import SubtaskContext
 
@@ -252,6 +253,7 @@ class SubtaskService(BaseService[Subtask, SubtaskCreate, SubtaskUpdate]):
 
         db.delete(subtask)
         db.commit()
+        history_cache.invalidate(subtask.task_id)
 
     def get_new_messages_since(
         self,
@@ -430,6 +432,7 @@ class SubtaskService(BaseService[Subtask, SubtaskCreate, SubtaskUpdate]):
             db.delete(subtask)
 
         db.commit()
+        history_cache.invalidate(task_id)
 
         logger.info(
             f"Deleted {deleted_count} subtasks from message_id {from_message_id} for task {task_id}"
@@ -495,6 +498,7 @@ class SubtaskService(BaseService[Subtask, SubtaskCreate, SubtaskUpdate]):
             db.delete(subtask)
 
         db.commit()
+        history_cache.invalidate(task_id)
 
         logger.info(
             f"Deleted {deleted_count} subtasks after message_id {after_message_id} for task {task_id}"
@@ -0,0 +1,76 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the internal chat history API used by chat_shell in HTTP mode."""
+
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.internal.chat_storage import get_chat_history
+from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
+from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
+from app.models.user import User
+
+
+async def test_history_loads_contexts_and_senders_in_batch(
+    test_db: Session, test_user: User
+) -> None:
+    for turn in range(5):
+        subtask = Subtask(
+            user_id=test_user.id,
+            task_id=77,
+            team_id=1,
+            title="history",
+            bot_ids=[],
+            role=SubtaskRole.USER,
+            prompt=f"q{turn}",
+            message_id=turn + 1,
+            status=SubtaskStatus.COMPLETED,
+            sender_user_id=test_user.id,
+            completed_at=datetime.now(),
+        )
+        test_db.add(subtask)
+        test_db.flush()
+        for name, type_data, payload in [
+            ("doc.md", {"mime_type": "text/markdown"}, {"extracted_text": "doc"}),
+            ("img.png", {"mime_type": "image/png"}, {"image_base64": "cG5n"}),
+        ]:
+            test_db.add(
+                SubtaskContext(
+                    subtask_id=subtask.id,
+                    user_id=test_user.id,
+                    context_type=ContextType.ATTACHMENT.value,
+                    name=name,
+                    status=ContextStatus.READY.value,
+                    binary_data=b"x" * 1024,
+                    type_data=type_data,
+                    **payload,
+                )
+            )
+    test_db.commit()
+    test_db.expunge_all()
+
+    statements = []
+    event.listen(
+        test_db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    response = await get_chat_history(
+        "task-77", limit=None, before_message_id=None, is_group_chat=True, db=test_db
+    )
+
+    # Subtasks, context metadata, texts, images, senders
+    statements = [s for s in statements if s.startswith("SELECT")]
+    assert len(statements) == 5
+    assert not any("binary_data" in statement for statement in statements)
+
+    assert len(response.messages) == 5
+    assert response.messages[0].content == [
+        {"type": "text", "text": "[Document: doc.md]\ndoc\n\nUser[testuser]: q0"},
+        {"type": "image_url", "image_url": {"url": "data:image/png;base64,cG5n"}},
+    ]
@@ -0,0 +1,107 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Micro-benchmark for chat_shell/compression token counting
+
+Measures MessageCompressor.compress_if_needed on synthetic long
+conversations with tiktoken counting, with and without memoized token
+counts. Not collected by pytest, run it directly from backend/:
+
+    PYTHONPATH=../chat_shell:.. python tests/chat_shell/bench_compression.py
+
+tiktoken downloads the cl100k_base encoding on first use; set
+TIKTOKEN_CACHE_DIR to a directory containing it when running offline.
+"""
+
+import argparse
+import logging
+import sys
+import time
+
+from chat_shell.compression import token_counter
+from chat_shell.compression.compressor import MessageCompressor
+from chat_shell.compression.config import CompressionConfig, ModelContextConfig
+from chat_shell.compression.token_counter import TokenCountCache, TokenCounter
+
+
+def _conversation(turns: int) -> list[dict]:
+    """Conversation with attachments, tool output and plain chat turns."""
+    messages = [{"role": "system", "content": "You are a helpful assistant. " * 50}]
+    for turn in range(turns):
+        if turn % 5 == 0:
+            question = (
+                f"[Attachment {turn}]\n"
+                + f"Section {turn}: the quarterly report covers revenue. " * 200
+                + f"\nPlease summarize attachment {turn}."
+            )
+        else:
+            question = f"Question {turn}: how does step {turn} work? " * 10
+        messages.append({"role": "user", "content": question})
+
+        if turn % 3 == 0:
+            answer = "Tool Result:\n" + f"row {turn}, value {turn * 7}\n" * 300
+        else:
+            answer = f"Step {turn} parses the input and validates it. " * 40
+        messages.append({"role": "assistant", "content": answer})
+    return messages
+
+
+def _compressor() -> MessageCompressor:
+    compressor = MessageCompressor(
+        model_id="gpt-4", config=CompressionConfig(enabled=True)
+    )
+    compressor.model_context = ModelContextConfig(
+        context_window=64000,
+        output_tokens=4096,
+        trigger_threshold=0.9,
+        target_threshold=0.7,
+    )
+    return compressor
+
+
+def _run(name: str, conversations: list[list[dict]], max_entries: int, warm: bool):
+    token_counter._token_count_cache = TokenCountCache(max_entries=max_entries)
+    if warm:
+        # Previous turns were already counted by earlier requests
+        for messages in conversations:
+            _compressor().compress_if_needed(messages[:-2])
+
+    started = time.perf_counter()
+    for messages in conversations:
+        result = _compressor().compress_if_needed(messages)
+    elapsed = time.perf_counter() - started
+
+    print(
+        f"{name:<26} {elapsed / len(conversations) * 1000:>9.1f} ms/request "
+        f"{result.original_tokens:>8d} -> {result.compressed_tokens} tokens"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=120)
+    parser.add_argument("--conversations", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    if not TokenCounter("gpt-4")._encoding:
+        sys.exit("tiktoken cl100k_base encoding is not available")
+
+    conversations = [
+        # Distinct texts per conversation so they do not share cache entries
+        [
+            {**message, "content": f"{index} {message['content']}"}
+            for message in _conversation(args.turns)
+        ]
+        for index in range(args.conversations)
+    ]
+
+    _run("no memoization", conversations, 0, warm=False)
+    _run("memoized, cold", conversations, 16384, warm=False)
+    _run("memoized, next turn", conversations, 16384, warm=True)
+
+
+if __name__ == "__main__":
+    main()
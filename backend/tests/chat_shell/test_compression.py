@@ -16,8 +16,34 @@ from chat_shell.compression.strategies import (
     AttachmentTruncationStrategy,
     CompressionResult,
     HistoryTruncationStrategy,
+    ToolResultTruncationStrategy,
 )
-from chat_shell.compression.token_counter import TokenCounter
+from chat_shell.compression.token_counter import TokenCountCache, TokenCounter
+
+
+class FakeEncoding:
+    """One token per word, recording what was encoded."""
+
+    def __init__(self):
+        self.encoded: list[str] = []
+        self.batches = 0
+
+    def encode(self, text: str) -> list[str]:
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts: list[str]) -> list[list[str]]:
+        self.batches += 1
+        return [self.encode(text) for text in texts]
+
+
+@pytest.fixture
+def fake_counter() -> TokenCounter:
+    """An OpenAI token counter with a fake encoding and a private cache."""
+    counter = TokenCounter(model_id="gpt-4")
+    counter._encoding = FakeEncoding()
+    counter._cache = TokenCountCache()
+    return counter
 
 
 class TestTokenCounter:
@@ -93,6 +119,42 @@ class TestTokenCounter:
         assert not counter.is_over_limit(messages, 1000)
         assert counter.is_over_limit(messages, 1)
 
+    def test_count_texts_encodes_each_text_once(self, fake_counter):
+        """Test that token counts are memoized and misses are batch encoded."""
+        messages = [
+            {"role": "user", "content": "one two three"},
+            {"role": "assistant", "content": [{"type": "text", "text": "four"}]},
+            {"role": "user", "content": "one two three"},
+        ]
+
+        assert fake_counter.count_messages(messages) == 3 * 2 + 7 + 3 * 3
+        assert fake_counter._encoding.encoded == ["one two three", "four"]
+        assert fake_counter._encoding.batches == 1
+
+        # Counting again, or a single message, hits the cache
+        assert fake_counter.count_messages(messages) == 22
+        assert fake_counter.count_message(messages[1]) == 3
+        assert fake_counter.count_text("") == 0
+        assert len(fake_counter._encoding.encoded) == 2
+
+    def test_count_delta_counts_replaced_messages(self, fake_counter):
+        """Test that count_delta only counts messages that were replaced."""
+        messages = [
+            {"role": "user", "content": "a b c d"},
+            {"role": "assistant", "content": "e f"},
+        ]
+        updated = [messages[0], {"role": "assistant", "content": "e f g h i"}]
+        fake_counter.count_messages(messages)
+        fake_counter._encoding.encoded.clear()
+
+        delta = fake_counter.count_delta(messages, updated)
+
+        assert delta == 3
+        assert delta == fake_counter.count_messages(
+            updated
+        ) - fake_counter.count_messages(messages)
+        assert fake_counter._encoding.encoded == ["e f g h i"]
+
 
 class TestModelContextConfig:
     """Tests for model context configuration."""
@@ -641,3 +703,46 @@ class TestMessageCompressor:
         # Should not compress
         assert not result.was_compressed
         assert result.messages == messages
+
+    def test_reported_reductions_match_recount(self, fake_counter):
+        """Test that tokens tracked from strategy deltas match a full recount."""
+        compressor = MessageCompressor(
+            model_id="gpt-4",
+            config=CompressionConfig(
+                first_messages_to_keep=1,
+                last_messages_to_keep=2,
+                min_attachment_length=10,
+            ),
+        )
+        compressor.token_counter = fake_counter
+        compressor.model_context = ModelContextConfig(
+            context_window=1500,
+            output_tokens=100,
+            trigger_threshold=0.9,
+            target_threshold=0.7,
+        )
+        messages = [{"role": "system", "content": "You are helpful."}]
+        for i in range(12):
+            messages.append(
+                {"role": "user", "content": f"[Attachment {i}]\n" + "word " * 80}
+            )
+            messages.append(
+                {"role": "assistant", "content": "Tool Result: " + "line " * 60}
+            )
+
+        result = compressor.compress_if_needed(messages)
+
+        assert result.was_compressed
+        assert result.compressed_tokens == fake_counter.count_messages(result.messages)
+        assert result.compressed_tokens <= compressor.target_limit
+        for strategy in (
+            HistoryTruncationStrategy(),
+            AttachmentTruncationStrategy(),
+            ToolResultTruncationStrategy(),
+        ):
+            compressed, details = strategy.compress(
+                messages, fake_counter, 500, compressor.config
+            )
+            assert details["tokens_reduced"] == fake_counter.count_messages(
+                messages
+            ) - fake_counter.count_messages(compressed)
@@ -0,0 +1,150 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for chat history loading in package mode."""
+
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
+from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
+from app.models.user import User
+from chat_shell.history import loader
+
+TASK_ID = 4242
+
+
+def _add_message(db: Session, user: User, message_id: int, role: SubtaskRole, **kw):
+    subtask = Subtask(
+        user_id=user.id,
+        task_id=TASK_ID,
+        team_id=1,
+        title="history",
+        bot_ids=[],
+        role=role,
+        message_id=message_id,
+        status=SubtaskStatus.COMPLETED,
+        sender_user_id=user.id,
+        completed_at=datetime.now(),
+        **kw,
+    )
+    db.add(subtask)
+    db.flush()
+    return subtask
+
+
+def _add_context(db: Session, user: User, subtask: Subtask, **kw) -> SubtaskContext:
+    context = SubtaskContext(
+        subtask_id=subtask.id,
+        user_id=user.id,
+        status=ContextStatus.READY.value,
+        **kw,
+    )
+    db.add(context)
+    db.flush()
+    return context
+
+
+@pytest.fixture
+def conversation(test_db: Session, test_user: User) -> None:
+    """Five user turns with attachments and knowledge bases."""
+    for turn in range(5):
+        user_msg = _add_message(
+            test_db, test_user, turn * 2 + 1, SubtaskRole.USER, prompt=f"q{turn}"
+        )
+        _add_message(
+            test_db,
+            test_user,
+            turn * 2 + 2,
+            SubtaskRole.ASSISTANT,
+            result={"value": f"a{turn}"},
+        )
+        _add_context(
+            test_db,
+            test_user,
+            user_msg,
+            context_type=ContextType.ATTACHMENT.value,
+            name=f"doc{turn}.md",
+            extracted_text=f"document {turn}",
+            text_length=10,
+            binary_data=b"x" * 1024,
+            type_data={"mime_type": "text/markdown"},
+        )
+        _add_context(
+            test_db,
+            test_user,
+            user_msg,
+            context_type=ContextType.ATTACHMENT.value,
+            name=f"img{turn}.png",
+            binary_data=b"png",
+            image_base64="cG5n" * 1024,
+            type_data={"mime_type": "image/png"},
+        )
+        _add_context(
+            test_db,
+            test_user,
+            user_msg,
+            context_type=ContextType.KNOWLEDGE_BASE.value,
+            name="kb",
+            extracted_text=f"kb result {turn}",
+            type_data={"knowledge_id": 7},
+        )
+    test_db.commit()
+
+
+def test_history_loads_contexts_in_batch(
+    test_db: Session, conversation, mocker
+) -> None:
+    mocker.patch("app.db.session.SessionLocal", return_value=test_db)
+    mocker.patch.object(test_db, "close")
+    test_db.expunge_all()
+    statements = []
+    event.listen(
+        test_db.get_bind(),
+        "before_cursor_execute",
+        lambda conn, cursor, statement, *args: statements.append(statement),
+    )
+
+    history = loader._load_history_from_db_sync(TASK_ID, is_group_chat=False)
+
+    # Subtasks, context metadata, texts, images; independent of history length
+    statements = [s for s in statements if s.startswith("SELECT")]
+    assert len(statements) == 4
+    assert not any("image_base64" in statement for statement in statements)
+
+    assert [msg["role"] for msg in history] == ["user", "assistant"] * 5
+    first = history[0]["content"]
+    assert first[0]["text"] == (
+        "[Document: doc0.md]\ndocument 0\n\n"
+        "[Knowledge Base: kb (ID: 7)]\nkb result 0\n\n"
+        "q0"
+    )
+    assert first[1]["image_url"]["url"] == (
+        "data:image/png;base64," + base64.b64encode(b"png").decode()
+    )
+    assert history[5]["content"] == "a2"
+
+
+def test_history_contexts_skip_unused_payloads(test_db: Session, conversation) -> None:
+    subtask_ids = [
+        row.id
+        for row in test_db.query(Subtask.id).filter(
+            Subtask.task_id == TASK_ID, Subtask.role == SubtaskRole.USER
+        )
+    ]
+    test_db.expunge_all()
+
+    contexts = loader._load_history_contexts(test_db, subtask_ids)
+
+    document, image, kb = contexts[subtask_ids[0]]
+    for context, unloaded in (
+        (document, {"binary_data", "image_base64"}),
+        (image, {"extracted_text", "image_base64"}),
+        (kb, {"binary_data", "image_base64"}),
+    ):
+        assert unloaded <= inspect(context).unloaded
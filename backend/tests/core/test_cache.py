@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the Redis cache manager."""
+
+import asyncio
+from unittest.mock import patch
+
+import fakeredis
+import pytest
+from fakeredis import aioredis
+
+from app.core.cache import RedisCache
+
+
+def _cache(server: fakeredis.FakeServer, **kwargs) -> RedisCache:
+    cache = RedisCache("redis://fake", **kwargs)
+    cache._get_loop_client = lambda: aioredis.FakeRedis(server=server)
+    cache._sync_client = fakeredis.FakeRedis(server=server)
+    return cache
+
+
+@pytest.fixture
+def server() -> fakeredis.FakeServer:
+    return fakeredis.FakeServer()
+
+
+@pytest.mark.asyncio
+async def test_client_reuses_loop_pool() -> None:
+    cache = RedisCache("redis://127.0.0.1:6379/0")
+
+    first = await cache._get_client()
+    second = await cache._get_client()
+
+    assert first is not second
+    assert first.connection_pool is second.connection_pool
+    assert cache._get_loop_client() is cache._get_loop_client()
+
+
+@pytest.mark.asyncio
+async def test_mset_and_mget(server) -> None:
+    cache = _cache(server)
+
+    assert await cache.mset({"a": {"x": 1}, "b": [1, 2]}, expire=60)
+    assert await cache.mget(["a", "missing", "b"]) == [{"x": 1}, None, [1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_l1_serves_hot_keys_without_redis(server) -> None:
+    cache = _cache(server, l1_prefixes=["git_repos:"])
+    redis = fakeredis.FakeRedis(server=server)
+    await cache.set("git_repos:1:github.com", [{"name": "repo"}])
+    await cache.set("chat:cancel:1", True)
+
+    assert await cache.get("git_repos:1:github.com") == [{"name": "repo"}]
+    assert await cache.get("chat:cancel:1") is True
+
+    # Deleting behind the cache's back only affects keys without L1
+    redis.delete("git_repos:1:github.com", "chat:cancel:1")
+    assert await cache.get("git_repos:1:github.com") == [{"name": "repo"}]
+    assert cache.get_sync("git_repos:1:github.com") == [{"name": "repo"}]
+    assert await cache.get("chat:cancel:1") is None
+
+    # L1 hits decode a fresh object every time
+    (await cache.get("git_repos:1:github.com")).append("mutated")
+    assert await cache.get("git_repos:1:github.com") == [{"name": "repo"}]
+
+
+async def _wait_for(predicate) -> bool:
+    for _ in range(50):
+        if await predicate():
+            return True
+        await asyncio.sleep(0.05)
+    return False
+
+
+@pytest.mark.asyncio
+async def test_writes_invalidate_l1_in_other_processes(server) -> None:
+    writer = _cache(server, l1_prefixes=["git_repos:"])
+    reader = _cache(server, l1_prefixes=["git_repos:"])
+    redis = fakeredis.FakeRedis(server=server)
+    key = "git_repos:1:github.com"
+
+    async def subscribed() -> bool:
+        return redis.pubsub_numsub("wegent:cache:invalidate")[0][1] > 0
+
+    await writer.set(key, ["old"])
+    assert await reader.get(key) == ["old"]
+    assert await _wait_for(subscribed)
+    # Populate the reader's L1 once the listener is running
+    assert await reader.get(key) == ["old"]
+    assert len(reader._l1) == 1
+
+    await writer.set(key, ["new"])
+
+    async def refreshed() -> bool:
+        return len(reader._l1) == 0
+
+    assert await _wait_for(refreshed)
+    assert await reader.get(key) == ["new"]
+    reader._listener_stop.set()
+    writer._listener_stop.set()
+
+
+@pytest.mark.asyncio
+async def test_errors_are_swallowed() -> None:
+    cache = RedisCache("redis://fake")
+    with patch.object(cache, "_get_loop_client", side_effect=ConnectionError("down")):
+        assert await cache.get("k") is None
+        assert await cache.mget(["k"]) == [None]
+        assert await cache.set("k", 1) is False
+        assert await cache.mset({"k": 1}) is False
@@ -9,6 +9,7 @@ Tests for GiteaProvider pagination and X-Total-Count header handling
 import asyncio
 from unittest.mock import AsyncMock, MagicMock, Mock, patch
 
+import httpx
 import pytest
 
 from app.repository.gitea_provider import GiteaProvider
@@ -41,100 +42,90 @@ def gitea_provider():
 class TestGiteaProviderPagination:
     """Test GiteaProvider pagination logic with X-Total-Count header"""
 
-    @pytest.mark.asyncio
-    async def test_fetch_all_repositories_with_x_total_count_header(
-        self, gitea_provider, mock_user, mocker
-    ):
-        """Test that pagination correctly uses X-Total-Count header"""
-        # Mock cache_manager
+    @pytest.fixture
+    def mock_cache(self, mocker):
+        """Mock the provider cache and the repository sync state"""
         mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
         mock_cache.is_building = AsyncMock(return_value=False)
         mock_cache.set_building = AsyncMock()
         mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
         mock_cache.set = AsyncMock()
 
-        # Create mock responses for 3 pages (total 120 repos, 50 per page)
-        def create_mock_response(page, repos_count, total_count):
-            response = Mock()
-            response.status_code = 200
-            response.headers = {"X-Total-Count": str(total_count)}
-            response.json.return_value = [
-                {
-                    "id": i + (page - 1) * 50,
-                    "name": f"repo-{i + (page - 1) * 50}",
-                    "full_name": f"user/repo-{i + (page - 1) * 50}",
-                    "clone_url": f"https://gitea.example.com/user/repo-{i + (page - 1) * 50}.git",
-                    "private": False,
-                }
-                for i in range(repos_count)
-            ]
-            response.raise_for_status = Mock()
-            return response
+        sync_cache = mocker.patch("app.repository.repo_sync.cache_manager")
+        sync_cache.get = AsyncMock(return_value=None)
+        sync_cache.set = AsyncMock()
+        return mock_cache
+
+    @staticmethod
+    def mock_pages(gitea_provider, mocker, pages, headers):
+        """
+        Serve repository pages through the provider's HTTP client
+
+        Args:
+            pages: Number of repos returned for each page number
+            headers: Response headers for every page
+
+        Returns:
+            Requested page numbers
+        """
+        requested = []
+
+        def handler(request):
+            page = int(request.url.params["page"])
+            requested.append(page)
+            repos_count = pages.get(page, 0)
+            return httpx.Response(
+                200,
+                headers=headers,
+                json=[
+                    {
+                        "id": i + (page - 1) * 50,
+                        "name": f"repo-{i + (page - 1) * 50}",
+                        "full_name": f"user/repo-{i + (page - 1) * 50}",
+                        "clone_url": f"https://gitea.example.com/user/repo-{i + (page - 1) * 50}.git",
+                        "private": False,
+                    }
+                    for i in range(repos_count)
+                ],
+            )
+
+        client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        mocker.patch.object(gitea_provider._http, "get", return_value=client)
+        return requested
 
+    @pytest.mark.asyncio
+    async def test_fetch_all_repositories_with_x_total_count_header(
+        self, gitea_provider, mock_user, mock_cache, mocker
+    ):
+        """Test that pagination correctly uses X-Total-Count header"""
         # Page 1: 50 repos, Page 2: 50 repos, Page 3: 20 repos (total 120)
-        responses = [
-            create_mock_response(1, 50, 120),
-            create_mock_response(2, 50, 120),
-            create_mock_response(3, 20, 120),
-        ]
-        call_count = [0]
-
-        def mock_request(*args, **kwargs):
-            response = responses[call_count[0]]
-            call_count[0] += 1
-            return response
-
-        mocker.patch(
-            "asyncio.to_thread",
-            side_effect=lambda func, *args, **kwargs: mock_request(),
+        requested = self.mock_pages(
+            gitea_provider, mocker, {1: 50, 2: 50, 3: 20}, {"X-Total-Count": "120"}
         )
 
         await gitea_provider._fetch_all_repositories_async(
             mock_user, "test_token", "gitea.example.com"
         )
 
-        # Verify cache was set with all 120 repos
+        # Pages 2 and 3 are known from the header and fetched after page 1
+        assert requested[0] == 1
+        assert sorted(requested) == [1, 2, 3]
+
+        # Verify cache was set with all 120 repos in page order
         mock_cache.set.assert_called_once()
         call_args = mock_cache.set.call_args
         cached_repos = call_args[0][1]
         assert len(cached_repos) == 120
+        assert [repo["id"] for repo in cached_repos] == list(range(120))
 
     @pytest.mark.asyncio
     async def test_fetch_all_repositories_stops_when_total_reached(
-        self, gitea_provider, mock_user, mocker
+        self, gitea_provider, mock_user, mock_cache, mocker
     ):
         """Test that pagination stops when total count is reached"""
-        mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
-        mock_cache.is_building = AsyncMock(return_value=False)
-        mock_cache.set_building = AsyncMock()
-        mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
-
-        # Mock response with exactly 50 repos and X-Total-Count = 50
-        response = Mock()
-        response.status_code = 200
-        response.headers = {"X-Total-Count": "50"}
-        response.json.return_value = [
-            {
-                "id": i,
-                "name": f"repo-{i}",
-                "full_name": f"user/repo-{i}",
-                "clone_url": f"https://gitea.example.com/user/repo-{i}.git",
-                "private": False,
-            }
-            for i in range(50)
-        ]
-        response.raise_for_status = Mock()
-
-        call_count = [0]
-
-        def mock_request(*args, **kwargs):
-            call_count[0] += 1
-            return response
-
-        mocker.patch(
-            "asyncio.to_thread",
-            side_effect=lambda func, *args, **kwargs: mock_request(),
+        # Exactly 50 repos and X-Total-Count = 50
+        requested = self.mock_pages(
+            gitea_provider, mocker, {1: 50}, {"X-Total-Count": "50"}
         )
 
         await gitea_provider._fetch_all_repositories_async(
@@ -142,60 +133,22 @@ class TestGiteaProviderPagination:
         )
 
         # Should only call API once since total (50) equals fetched count (50)
-        assert call_count[0] == 1
+        assert requested == [1]
 
     @pytest.mark.asyncio
     async def test_fetch_all_repositories_fallback_without_header(
-        self, gitea_provider, mock_user, mocker
+        self, gitea_provider, mock_user, mock_cache, mocker
     ):
         """Test fallback to old logic when X-Total-Count header is missing"""
-        mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
-        mock_cache.is_building = AsyncMock(return_value=False)
-        mock_cache.set_building = AsyncMock()
-        mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
-
-        # Create responses without X-Total-Count header
-        def create_mock_response(repos_count):
-            response = Mock()
-            response.status_code = 200
-            response.headers = {}  # No X-Total-Count header
-            response.json.return_value = [
-                {
-                    "id": i,
-                    "name": f"repo-{i}",
-                    "full_name": f"user/repo-{i}",
-                    "clone_url": f"https://gitea.example.com/user/repo-{i}.git",
-                    "private": False,
-                }
-                for i in range(repos_count)
-            ]
-            response.raise_for_status = Mock()
-            return response
-
         # Page 1: 50 repos, Page 2: 30 repos (less than per_page, should stop)
-        responses = [
-            create_mock_response(50),
-            create_mock_response(30),
-        ]
-        call_count = [0]
-
-        def mock_request(*args, **kwargs):
-            response = responses[min(call_count[0], len(responses) - 1)]
-            call_count[0] += 1
-            return response
-
-        mocker.patch(
-            "asyncio.to_thread",
-            side_effect=lambda func, *args, **kwargs: mock_request(),
-        )
+        requested = self.mock_pages(gitea_provider, mocker, {1: 50, 2: 30}, {})
 
         await gitea_provider._fetch_all_repositories_async(
             mock_user, "test_token", "gitea.example.com"
         )
 
         # Should call API twice (page 1 returns 50, page 2 returns 30 < 50)
-        assert call_count[0] == 2
+        assert requested == [1, 2]
 
         # Verify cache was set with 80 repos
         mock_cache.set.assert_called_once()
@@ -205,48 +158,12 @@ class TestGiteaProviderPagination:
 
     @pytest.mark.asyncio
     async def test_fetch_all_repositories_handles_malformed_header(
-        self, gitea_provider, mock_user, mocker
+        self, gitea_provider, mock_user, mock_cache, mocker
     ):
         """Test that malformed X-Total-Count header is handled gracefully"""
-        mock_cache = mocker.patch("app.repository.gitea_provider.cache_manager")
-        mock_cache.is_building = AsyncMock(return_value=False)
-        mock_cache.set_building = AsyncMock()
-        mock_cache.generate_full_cache_key = Mock(return_value="test_cache_key")
-        mock_cache.set = AsyncMock()
-
-        # Create response with malformed X-Total-Count header
-        def create_mock_response(repos_count):
-            response = Mock()
-            response.status_code = 200
-            response.headers = {"X-Total-Count": "not_a_number"}  # Malformed header
-            response.json.return_value = [
-                {
-                    "id": i,
-                    "name": f"repo-{i}",
-                    "full_name": f"user/repo-{i}",
-                    "clone_url": f"https://gitea.example.com/user/repo-{i}.git",
-                    "private": False,
-                }
-                for i in range(repos_count)
-            ]
-            response.raise_for_status = Mock()
-            return response
-
         # Page 1: 50 repos, Page 2: 30 repos (should fall back to old logic)
-        responses = [
-            create_mock_response(50),
-            create_mock_response(30),
-        ]
-        call_count = [0]
-
-        def mock_request(*args, **kwargs):
-            response = responses[min(call_count[0], len(responses) - 1)]
-            call_count[0] += 1
-            return response
-
-        mocker.patch(
-            "asyncio.to_thread",
-            side_effect=lambda func, *args, **kwargs: mock_request(),
+        requested = self.mock_pages(
+            gitea_provider, mocker, {1: 50, 2: 30}, {"X-Total-Count": "not_a_number"}
         )
 
         # Should not raise an exception
@@ -255,7 +172,8 @@ class TestGiteaProviderPagination:
         )
 
         # Should fall back to old logic: page 2 returns < 50, so stops
-        assert call_count[0] == 2
+        assert requested == [1, 2]
+        assert len(mock_cache.set.call_args[0][1]) == 80
 
     @pytest.mark.asyncio
     async def test_get_repositories_triggers_async_fetch_when_has_more(
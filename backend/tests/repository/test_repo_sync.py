@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Tests for paginated repository list synchronization
+"""
+
+import fakeredis
+import httpx
+import pytest
+from fakeredis import aioredis
+
+from app.core.cache import RedisCache
+from app.repository import repo_sync
+from app.repository.repo_sync import sync_repositories
+
+PER_PAGE = 2
+BASE_URL = "https://git.example.com/user/repos"
+
+
+def _repos(page, count=PER_PAGE):
+    return [
+        {"id": (page - 1) * PER_PAGE + i, "name": f"repo-{(page - 1) * PER_PAGE + i}"}
+        for i in range(count)
+    ]
+
+
+class FakeServer:
+    """Paginated repository API with Link headers and per-page ETags"""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.requests = []
+        self.client = httpx.AsyncClient(transport=httpx.MockTransport(self.handle))
+
+    def handle(self, request):
+        page = int(request.url.params["page"])
+        since = request.url.params.get("since")
+        self.requests.append((page, since, request.headers.get("If-None-Match")))
+
+        if since is None:
+            repos = self.pages.get(page, [])
+        else:
+            updated = [
+                repo
+                for repos in self.pages.values()
+                for repo in repos
+                if repo.get("updated")
+            ]
+            repos = updated[(page - 1) * PER_PAGE : page * PER_PAGE]
+        etag = f'"{page}-{len(repos)}-{[repo["id"] for repo in repos]}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304)
+        headers = {"ETag": etag}
+        if since is None:
+            headers["Link"] = f'<{BASE_URL}?page={len(self.pages)}>; rel="last"'
+        return httpx.Response(200, headers=headers, json=repos)
+
+    async def fetch_page(self, page, etag, since):
+        params = {"page": page}
+        if since:
+            params["since"] = since
+        return await self.client.get(
+            BASE_URL,
+            params=params,
+            headers=repo_sync.conditional_headers({}, etag),
+        )
+
+
+def _parse(response):
+    return [{"id": repo["id"], "name": repo["name"]} for repo in response.json()]
+
+
+@pytest.fixture
+def cache(mocker):
+    server = fakeredis.FakeServer()
+    cache = RedisCache("redis://fake")
+    cache._get_loop_client = lambda: aioredis.FakeRedis(server=server)
+    mocker.patch.object(repo_sync, "cache_manager", cache)
+    return cache
+
+
+async def _sync(server, incremental=False):
+    return await sync_repositories(
+        1,
+        "git.example.com",
+        server.fetch_page,
+        _parse,
+        per_page=PER_PAGE,
+        max_pages=10,
+        incremental=incremental,
+    )
+
+
+@pytest.mark.unit
+class TestSyncRepositories:
+    @pytest.mark.asyncio
+    async def test_full_sync_fetches_remaining_pages_from_link_header(self, cache):
+        server = FakeServer({1: _repos(1), 2: _repos(2), 3: _repos(3, 1)})
+
+        repos = await _sync(server)
+
+        assert [repo["id"] for repo in repos] == [0, 1, 2, 3, 4]
+        assert server.requests[0] == (1, None, None)
+        assert sorted(page for page, _, _ in server.requests) == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_pages_are_reused_on_304(self, cache):
+        server = FakeServer({1: _repos(1), 2: _repos(2, 1)})
+        await _sync(server)
+
+        server.pages[2] = _repos(2, 1) + [{"id": 9, "name": "new-repo"}]
+        server.requests.clear()
+        repos = await _sync(server)
+
+        assert [repo["id"] for repo in repos] == [0, 1, 2, 9]
+        assert all(etag for _, _, etag in server.requests)
+
+        server.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(lambda request: httpx.Response(304))
+        )
+        cached = await _sync(server)
+
+        assert cached == repos
+
+    @pytest.mark.asyncio
+    async def test_incremental_sync_merges_updated_repositories(self, cache):
+        server = FakeServer({1: _repos(1), 2: _repos(2, 1)})
+        full = await _sync(server, incremental=True)
+        await cache.set(cache.generate_full_cache_key(1, "git.example.com"), full)
+
+        server.pages[2] = [{"id": 2, "name": "renamed", "updated": True}]
+        server.requests.clear()
+        repos = await _sync(server, incremental=True)
+
+        assert [repo["name"] for repo in repos] == ["renamed", "repo-0", "repo-1"]
+        assert server.requests[0][1] is not None
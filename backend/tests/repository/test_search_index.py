@@ -0,0 +1,111 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Tests for the repository search index
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import fakeredis
+import pytest
+from fakeredis import aioredis
+
+from app.core.cache import RedisCache
+from app.repository import search_index
+from app.repository.search_index import RepositorySearchIndex, RepositorySearchIndexes
+
+REPOS = [
+    {"id": 1, "name": "backend-tools", "full_name": "acme/backend-tools"},
+    {"id": 2, "name": "wegent", "full_name": "acme/wegent"},
+    {"id": 3, "name": "wegent-docs", "full_name": "acme/wegent-docs"},
+    {"id": 4, "name": "infra", "full_name": "wegent-ops/infra"},
+]
+
+CACHE_KEY = "git_repos:1:github.com"
+
+
+def _ids(repos):
+    return [repo["id"] for repo in repos]
+
+
+@pytest.mark.unit
+class TestRepositorySearchIndex:
+    def test_ranks_exact_then_prefix_then_substring(self):
+        index = RepositorySearchIndex(REPOS)
+
+        assert _ids(index.search("wegent")) == [2, 3, 4]
+        assert _ids(index.search("WEGENT", limit=1)) == [2]
+        assert _ids(index.search("ols")) == [1]
+
+    def test_fullmatch(self):
+        index = RepositorySearchIndex(REPOS)
+
+        assert _ids(index.search("acme/wegent", fullmatch=True)) == [2]
+        assert index.search("wegen", fullmatch=True) == []
+
+    def test_fuzzy_only_without_substring_match(self):
+        index = RepositorySearchIndex(REPOS)
+
+        assert _ids(index.search("wgdocs")) == [3]
+        assert index.search("zzz") == []
+
+
+@pytest.mark.unit
+class TestRepositorySearchIndexes:
+    @pytest.fixture
+    def cache(self, mocker):
+        server = fakeredis.FakeServer()
+        cache = RedisCache("redis://fake")
+        cache._get_loop_client = lambda: aioredis.FakeRedis(server=server)
+        mocker.patch.object(search_index, "cache_manager", cache)
+        return cache
+
+    @pytest.mark.asyncio
+    async def test_builds_index_once_per_payload(self, cache, mocker):
+        await cache.set(CACHE_KEY, REPOS)
+        indexes = RepositorySearchIndexes(max_entries=10)
+        refresh = AsyncMock()
+        build = mocker.spy(RepositorySearchIndexes, "_build")
+
+        for query in ("w", "we", "weg"):
+            await indexes.search(1, "github.com", query, refresh)
+        await cache.set(CACHE_KEY, REPOS[:1])
+        results = await indexes.search(1, "github.com", "weg", refresh)
+
+        assert results == []
+        assert build.call_count == 2
+        refresh.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_serves_stale_index_while_refreshing(self, cache):
+        await cache.set(CACHE_KEY, REPOS)
+        indexes = RepositorySearchIndexes(max_entries=10)
+        await indexes.search(1, "github.com", "wegent", AsyncMock())
+        await cache.delete(CACHE_KEY)
+
+        refreshed = asyncio.Event()
+
+        async def refresh():
+            await cache.set(CACHE_KEY, REPOS[:2])
+            refreshed.set()
+
+        stale = await indexes.search(1, "github.com", "wegent", refresh)
+        await asyncio.wait_for(refreshed.wait(), 1)
+        fresh = await indexes.search(1, "github.com", "wegent", refresh)
+
+        assert _ids(stale) == [2, 3, 4]
+        assert _ids(fresh) == [2]
+
+    @pytest.mark.asyncio
+    async def test_builds_cache_on_first_search(self, cache):
+        indexes = RepositorySearchIndexes(max_entries=10)
+
+        async def refresh():
+            await cache.set(CACHE_KEY, REPOS)
+
+        results = await indexes.search(1, "github.com", "infra", refresh)
+
+        assert _ids(results) == [4]
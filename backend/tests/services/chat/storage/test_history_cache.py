@@ -0,0 +1,175 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the rendered chat history cache."""
+
+from datetime import datetime
+
+import fakeredis
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
+from app.models.user import User
+from app.services.chat.storage.history_cache import HistoryCache
+
+TASK_ID = 9001
+
+
+class Renderer:
+    """Renders subtasks into their prompt and records what it rendered."""
+
+    def __init__(self):
+        self.rendered: list[int] = []
+
+    def __call__(self, db: Session, subtasks: list[Subtask]) -> list:
+        self.rendered.extend(subtask.message_id for subtask in subtasks)
+        return [
+            {"content": subtask.prompt} if subtask.prompt else None
+            for subtask in subtasks
+        ]
+
+
+def _add_messages(db: Session, user: User, message_ids, **kw) -> list[Subtask]:
+    subtasks = [
+        Subtask(
+            user_id=user.id,
+            task_id=TASK_ID,
+            team_id=1,
+            title="history",
+            bot_ids=[],
+            role=SubtaskRole.USER,
+            prompt=f"m{message_id}",
+            message_id=message_id,
+            status=SubtaskStatus.COMPLETED,
+            completed_at=datetime.now(),
+            **kw,
+        )
+        for message_id in message_ids
+    ]
+    db.add_all(subtasks)
+    db.commit()
+    return subtasks
+
+
+@pytest.fixture
+def redis_client() -> fakeredis.FakeRedis:
+    return fakeredis.FakeRedis()
+
+
+def _cache(redis_client=None) -> HistoryCache:
+    cache = HistoryCache(max_entries=4)
+    if redis_client is not None:
+        cache._redis_client = redis_client
+        cache._redis_disabled = False
+    return cache
+
+
+def _contents(messages: list) -> list[str]:
+    return [message["content"] for message in messages]
+
+
+def test_new_turns_are_rendered_incrementally(test_db: Session, test_user: User):
+    cache = _cache()
+    render = Renderer()
+    _add_messages(test_db, test_user, [1, 2, 3])
+
+    assert _contents(cache.load(test_db, TASK_ID, "v", render)) == ["m1", "m2", "m3"]
+
+    _add_messages(test_db, test_user, [4, 5])
+    messages = cache.load(test_db, TASK_ID, "v", render)
+
+    assert _contents(messages) == ["m1", "m2", "m3", "m4", "m5"]
+    assert render.rendered == [1, 2, 3, 4, 5]
+
+    # Older turns are served from the cache without rendering
+    assert _contents(cache.load(test_db, TASK_ID, "v", render, 3)) == ["m1", "m2"]
+    assert render.rendered == [1, 2, 3, 4, 5]
+
+
+def test_limit_on_cold_cache_renders_only_recent_turns(
+    test_db: Session, test_user: User
+):
+    cache = _cache()
+    render = Renderer()
+    _add_messages(test_db, test_user, [1, 2, 3, 4, 5])
+
+    messages = cache.load(test_db, TASK_ID, "v", render, 5, limit=2)
+
+    assert _contents(messages) == ["m3", "m4"]
+    assert render.rendered == [3, 4]
+    assert cache.get(TASK_ID, "v")[1] is None
+
+    # Once the full history is cached, a limit is served from it
+    cache.load(test_db, TASK_ID, "v", render)
+    render = Renderer()
+    assert _contents(cache.load(test_db, TASK_ID, "v", render, limit=2)) == [
+        "m4",
+        "m5",
+    ]
+    assert render.rendered == []
+
+
+def test_returned_messages_can_be_modified(test_db: Session, test_user: User):
+    cache = _cache()
+    _add_messages(test_db, test_user, [1])
+
+    cache.load(test_db, TASK_ID, "v", Renderer())[0]["content"] = "changed"
+
+    assert _contents(cache.load(test_db, TASK_ID, "v", Renderer())) == ["m1"]
+
+
+def test_changed_messages_invalidate_the_cached_prefix(
+    test_db: Session, test_user: User
+):
+    cache = _cache()
+    subtasks = _add_messages(test_db, test_user, [1, 2, 3])
+    cache.load(test_db, TASK_ID, "v", Renderer())
+
+    # Another process retries message 2 without going through this cache
+    subtasks[1].status = SubtaskStatus.PENDING
+    test_db.commit()
+    render = Renderer()
+
+    assert _contents(cache.load(test_db, TASK_ID, "v", render)) == ["m1", "m3"]
+    assert render.rendered == [1, 3]
+
+
+def test_history_is_shared_through_redis(
+    test_db: Session, test_user: User, redis_client
+):
+    _add_messages(test_db, test_user, [1, 2])
+    _cache(redis_client).load(test_db, TASK_ID, "v", Renderer())
+
+    other = _cache(redis_client)
+    render = Renderer()
+    assert _contents(other.load(test_db, TASK_ID, "v", render)) == ["m1", "m2"]
+    assert render.rendered == []
+
+    # Variants are cached separately
+    assert other.get(TASK_ID, "group")[1] is None
+
+    other.invalidate(TASK_ID)
+    assert _cache(redis_client).get(TASK_ID, "v") == (1, None)
+
+
+def test_applied_correction_invalidates_the_cached_history(
+    test_db: Session, test_user: User, monkeypatch
+):
+    from app.services.chat.correction import service as correction_service
+
+    cache = _cache()
+    monkeypatch.setattr(correction_service, "history_cache", cache)
+    subtasks = _add_messages(test_db, test_user, [1, 2])
+    cache.load(test_db, TASK_ID, "v", Renderer())
+
+    subtasks[1].prompt = "m2 corrected"
+    correction_service.apply_correction_to_subtask(test_db, subtasks[1], "better")
+    render = Renderer()
+
+    assert _contents(cache.load(test_db, TASK_ID, "v", render)) == [
+        "m1",
+        "m2 corrected",
+    ]
+    assert render.rendered == [1, 2]
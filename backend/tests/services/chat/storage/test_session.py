@@ -0,0 +1,46 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the append-only streaming content cache."""
+
+import fakeredis
+import pytest
+from fakeredis import aioredis
+
+from app.core.cache import RedisCache
+from app.services.chat.storage.session import SessionManager
+
+
+@pytest.fixture
+def session_manager() -> SessionManager:
+    server = fakeredis.FakeServer()
+    cache = RedisCache("redis://fake")
+    cache._get_loop_client = lambda: aioredis.FakeRedis(server=server)
+    manager = SessionManager()
+    manager._cache = cache
+    return manager
+
+
+@pytest.mark.asyncio
+async def test_deltas_rebuild_content(session_manager) -> None:
+    offset = 0
+    for delta in ["Hello", ", ", "wörld"]:
+        assert await session_manager.append_streaming_content(1, delta, offset)
+        offset += len(delta.encode("utf-8"))
+
+    assert await session_manager.get_streaming_content(1) == "Hello, wörld"
+
+    assert await session_manager.delete_streaming_content(1)
+    assert await session_manager.get_streaming_content(1) is None
+
+
+@pytest.mark.asyncio
+async def test_append_at_wrong_offset_reports_stale_cache(session_manager) -> None:
+    # Cache lost the first delta (e.g. expired), the append must not pass
+    assert not await session_manager.append_streaming_content(1, "world", 6)
+
+    assert await session_manager.save_streaming_content(1, "Hello world")
+    assert await session_manager.get_streaming_content(1) == "Hello world"
+    assert await session_manager.append_streaming_content(1, "!", 11)
+    assert await session_manager.get_streaming_content(1) == "Hello world!"
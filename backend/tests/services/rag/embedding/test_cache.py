@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the embedding cache."""
+
+from typing import List
+
+import fakeredis
+import pytest
+from llama_index.core.base.embeddings.base import BaseEmbedding
+
+from app.services.rag.embedding.cache import (
+    CachedEmbedding,
+    EmbeddingCache,
+    build_model_cache_key,
+)
+
+
+class CountingEmbedding(BaseEmbedding):
+    """Deterministic embedding model that records every text it embeds."""
+
+    calls: List[List[str]] = []
+
+    def _get_query_embedding(self, query: str) -> List[float]:
+        self.calls.append([query])
+        return [float(len(query)), 1.0]
+
+    async def _aget_query_embedding(self, query: str) -> List[float]:
+        return self._get_query_embedding(query)
+
+    def _get_text_embedding(self, text: str) -> List[float]:
+        return self._get_text_embeddings([text])[0]
+
+    def _get_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.0] for text in texts]
+
+    async def _aget_text_embeddings(self, texts: List[str]) -> List[List[float]]:
+        return self._get_text_embeddings(texts)
+
+
+@pytest.fixture
+def cache() -> EmbeddingCache:
+    cache = EmbeddingCache(max_entries=100)
+    cache._redis_client = fakeredis.FakeRedis()
+    cache._redis_disabled = False
+    return cache
+
+
+@pytest.fixture
+def inner() -> CountingEmbedding:
+    return CountingEmbedding(calls=[])
+
+
+def test_repeated_texts_are_embedded_once(cache, inner) -> None:
+    model = CachedEmbedding(inner=inner, model_key="1:abc", cache=cache)
+
+    first = model.get_text_embedding_batch(["alpha", "beta", "alpha"])
+    second = model.get_text_embedding_batch(["beta", "gamma"])
+
+    assert first == [[5.0, 0.0], [4.0, 0.0], [5.0, 0.0]]
+    assert second == [[4.0, 0.0], [5.0, 0.0]]
+    assert inner.calls == [["alpha", "beta"], ["gamma"]]
+    stats = cache.get_stats()
+    assert stats["l1_hits"] == 1
+    assert stats["misses"] == 4
+
+
+def test_query_and_text_modes_are_separate(cache, inner) -> None:
+    model = CachedEmbedding(inner=inner, model_key="1:abc", cache=cache)
+
+    assert model.get_query_embedding("hello") == [5.0, 1.0]
+    assert model.get_query_embedding("hello") == [5.0, 1.0]
+    assert model.get_text_embedding("hello") == [5.0, 0.0]
+    assert inner.calls == [["hello"], ["hello"]]
+
+
+def test_redis_tier_shared_across_processes(cache, inner) -> None:
+    CachedEmbedding(inner=inner, model_key="1:abc", cache=cache).get_text_embedding(
+        "shared"
+    )
+
+    # A second process has an empty L1 but the same Redis
+    other = EmbeddingCache(max_entries=100)
+    other._redis_client = cache._redis_client
+    other._redis_disabled = False
+    other_inner = CountingEmbedding(calls=[])
+    model = CachedEmbedding(inner=other_inner, model_key="1:abc", cache=other)
+
+    assert model.get_text_embedding("shared") == [6.0, 0.0]
+    assert other_inner.calls == []
+    assert other.get_stats()["l2_hits"] == 1
+
+
+def test_model_key_changes_with_crd_config() -> None:
+    key = build_model_cache_key(7, protocol="openai", model_id="a", base_url=None)
+    same = build_model_cache_key(7, base_url=None, model_id="a", protocol="openai")
+    edited = build_model_cache_key(7, protocol="openai", model_id="b", base_url=None)
+
+    assert key == same
+    assert key != edited
+    assert key.startswith("7:")
+
+
+def test_invalidate_model_drops_local_entries(cache, inner) -> None:
+    CachedEmbedding(inner=inner, model_key="7:abc", cache=cache).get_text_embedding("x")
+    CachedEmbedding(inner=inner, model_key="8:abc", cache=cache).get_text_embedding("x")
+
+    assert cache.invalidate_model(7) == 1
+    assert cache.get_stats()["l1_size"] == 1
+
+
+def test_lru_is_bounded(inner) -> None:
+    cache = EmbeddingCache(max_entries=2)
+    model = CachedEmbedding(inner=inner, model_key="1:abc", cache=cache)
+
+    model.get_text_embedding_batch(["a", "b", "c"])
+
+    assert cache.get_stats()["l1_size"] == 2
+
+
+@pytest.mark.asyncio
+async def test_async_batch_uses_cache(cache, inner) -> None:
+    model = CachedEmbedding(inner=inner, model_key="1:abc", cache=cache)
+
+    await model.aget_text_embedding_batch(["one", "two"])
+    result = await model.aget_text_embedding_batch(["two", "three"])
+
+    assert result == [[3.0, 0.0], [5.0, 0.0]]
+    assert inner.calls == [["one", "two"], ["three"]]
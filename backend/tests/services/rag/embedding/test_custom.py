@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for CustomEmbedding batching."""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services.rag.embedding.custom import CustomEmbedding
+
+
+def _fake_response(inputs):
+    """Build an OpenAI-style response with data in reverse order."""
+    response = MagicMock()
+    response.raise_for_status.return_value = None
+    response.json.return_value = {
+        "data": [
+            {"index": i, "embedding": [float(len(text)), float(i)]}
+            for i, text in reversed(list(enumerate(inputs)))
+        ]
+    }
+    return response
+
+
+@pytest.fixture
+def embedding() -> CustomEmbedding:
+    return CustomEmbedding(
+        api_url="http://embedding.local/v1/embeddings",
+        model="test-model",
+        api_key="key",
+        embed_batch_size=3,
+        max_concurrency=2,
+    )
+
+
+def test_batch_sends_multiple_inputs_per_request(embedding) -> None:
+    """Texts are grouped into embed_batch_size inputs per HTTP request."""
+    calls = []
+    lock = threading.Lock()
+
+    def fake_post(url, json, headers, timeout):
+        with lock:
+            calls.append(list(json["input"]))
+        return _fake_response(json["input"])
+
+    session = MagicMock()
+    session.post.side_effect = fake_post
+    with patch.object(embedding, "_get_session", return_value=session):
+        texts = ["a", "bb", "ccc", "dddd", "eeeee", "ffffff", "g"]
+        result = embedding.get_text_embedding_batch(texts)
+
+    assert len(calls) == 3
+    assert sorted(len(batch) for batch in calls) == [1, 3, 3]
+    # Results keep input order even though responses are reversed
+    assert [vec[0] for vec in result] == [float(len(t)) for t in texts]
+    assert session.post.call_args.kwargs["headers"]["Authorization"] == "Bearer key"
+
+
+def test_single_batch_does_not_use_thread_pool(embedding) -> None:
+    """Small inputs go through one request without fan-out."""
+    session = MagicMock()
+    session.post.side_effect = lambda url, json, headers, timeout: _fake_response(
+        json["input"]
+    )
+    with (
+        patch.object(embedding, "_get_session", return_value=session),
+        patch("app.services.rag.embedding.custom.ThreadPoolExecutor") as pool,
+    ):
+        result = embedding.get_text_embedding_batch(["x", "yy"])
+
+    pool.assert_not_called()
+    assert result == [[1.0, 0.0], [2.0, 1.0]]
+
+
+def test_mismatched_response_raises(embedding) -> None:
+    """A response with the wrong number of embeddings is rejected."""
+    with pytest.raises(ValueError):
+        embedding._parse_embeddings({"data": [{"embedding": [0.1]}]}, expected=2)
+
+
+@pytest.mark.asyncio
+async def test_async_batch_uses_single_request(embedding) -> None:
+    """Async path posts all inputs of a batch in one call."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        inputs = json.loads(request.content)["input"]
+        return httpx.Response(
+            200,
+            json={
+                "data": [
+                    {"index": i, "embedding": [float(len(t))]}
+                    for i, t in enumerate(inputs)
+                ]
+            },
+        )
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    with patch.object(embedding, "_get_async_client", return_value=client):
+        result = await embedding.aget_text_embedding_batch(["a", "bb", "ccc", "dddd"])
+        query = await embedding.aget_query_embedding("hello")
+
+    assert result == [[1.0], [2.0], [3.0], [4.0]]
+    assert query == [5.0]
+    await client.aclose()
@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the storage backend registry."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.schemas.kind import Retriever
+from app.services.rag.storage.elasticsearch_backend import ElasticsearchBackend
+from app.services.rag.storage.registry import StorageBackendRegistry
+
+
+def _retriever(name="es", namespace="default", url="http://es:9200") -> Retriever:
+    return Retriever.model_validate(
+        {
+            "metadata": {"name": name, "namespace": namespace},
+            "spec": {
+                "storageConfig": {
+                    "type": "elasticsearch",
+                    "url": url,
+                    "indexStrategy": {"mode": "per_dataset"},
+                }
+            },
+        }
+    )
+
+
+@pytest.fixture
+def factory() -> MagicMock:
+    return MagicMock(
+        side_effect=lambda retriever: MagicMock(name=retriever.spec.storageConfig.url)
+    )
+
+
+def test_backend_is_reused_until_crd_changes(factory) -> None:
+    registry = StorageBackendRegistry(factory=factory)
+
+    first = registry.get(_retriever())
+    assert registry.get(_retriever()) is first
+    assert factory.call_count == 1
+
+    # Editing the CRD changes its fingerprint and builds a new backend
+    edited = registry.get(_retriever(url="http://es-new:9200"))
+    assert edited is not first
+    assert factory.call_count == 2
+
+
+def test_invalidate_drops_all_versions(factory) -> None:
+    registry = StorageBackendRegistry(factory=factory)
+    registry.get(_retriever())
+    registry.get(_retriever(url="http://es-new:9200"))
+    registry.get(_retriever(name="other"))
+
+    assert registry.invalidate("es", "default") == 2
+    assert registry.get_stats()["retrievers"] == ["default/other"]
+
+
+def test_lru_bound(factory) -> None:
+    registry = StorageBackendRegistry(factory=factory, max_entries=2)
+    for name in ("a", "b", "c"):
+        registry.get(_retriever(name=name))
+
+    assert registry.get_stats()["retrievers"] == ["default/b", "default/c"]
+
+
+def test_check_health_evicts_unhealthy_and_idle(factory) -> None:
+    registry = StorageBackendRegistry(factory=factory, idle_ttl=60)
+    healthy = registry.get(_retriever(name="healthy"))
+    broken = registry.get(_retriever(name="broken"))
+    idle = registry.get(_retriever(name="idle"))
+    healthy.health_check.return_value = True
+    broken.health_check.return_value = False
+    registry._entries[
+        next(key for key in registry._entries if key[1] == "idle")
+    ].last_used_at = (time.monotonic() - 120)
+
+    assert registry.check_health() == 2
+    assert registry.get_stats()["retrievers"] == ["default/healthy"]
+    idle.health_check.assert_not_called()
+
+
+def test_clear_closes_backends(factory) -> None:
+    registry = StorageBackendRegistry(factory=factory)
+    backend = registry.get(_retriever())
+
+    registry.clear()
+
+    backend.close.assert_called_once()
+    assert registry.get_stats()["size"] == 0
+
+
+def _store() -> MagicMock:
+    store = MagicMock()
+    store.client.close = AsyncMock()
+    return store
+
+
+def _es_backend() -> ElasticsearchBackend:
+    return ElasticsearchBackend(
+        {"url": "http://es:9200", "indexStrategy": {"mode": "per_dataset"}}
+    )
+
+
+def _run_on_new_loop(target, release=None):
+    """Call target on a fresh event loop, like the per-request indexing loops."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        return target()
+    finally:
+        if release is not None:
+            release(loop)
+        loop.close()
+        asyncio.set_event_loop(None)
+
+
+def test_elasticsearch_vector_stores_are_memoized_per_loop() -> None:
+    backend = _es_backend()
+    with patch.object(
+        ElasticsearchBackend, "create_vector_store", side_effect=lambda *a: _store()
+    ):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            store = backend.get_vector_store("index_1", "vector")
+            assert backend.get_vector_store("index_1", "vector") is store
+            assert backend.get_vector_store("index_1", "hybrid") is not store
+        finally:
+            loop.close()
+            asyncio.set_event_loop(None)
+
+
+def test_elasticsearch_stores_are_not_reused_across_loops_of_a_thread() -> None:
+    backend = _es_backend()
+    registry = StorageBackendRegistry(factory=lambda retriever: backend)
+    registry.get(_retriever())
+    stores = []
+
+    def index_twice():
+        # Two indexing calls on the same worker thread, each on its own loop
+        for release in (registry.release_event_loop, None):
+            stores.append(
+                _run_on_new_loop(
+                    lambda: backend.get_vector_store("index_1"), release=release
+                )
+            )
+        # A loop closed without release is dropped on the next lookup
+        _run_on_new_loop(lambda: backend.get_vector_store("index_1"))
+
+    with patch.object(
+        ElasticsearchBackend, "create_vector_store", side_effect=lambda *a: _store()
+    ):
+        thread = threading.Thread(target=index_twice)
+        thread.start()
+        thread.join()
+
+    first, second = stores
+    assert first is not second
+    first.client.close.assert_awaited_once()
+    second.client.close.assert_not_awaited()
+    assert len(backend._loop_stores) <= 1
@@ -0,0 +1,91 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the knowledge base chunk snapshot cache."""
+
+import fakeredis
+import pytest
+
+from app.services.rag.chunk_snapshot import ChunkSnapshotCache
+
+CHUNKS = [
+    {
+        "content": f"chunk {i}",
+        "title": "guide.md",
+        "chunk_id": i,
+        "doc_ref": "7",
+        "token_counts": {"openai": 2, "default": 2},
+        "metadata": {"_node_content": "{...}"},
+    }
+    for i in range(3)
+]
+
+
+@pytest.fixture
+def redis_client() -> fakeredis.FakeRedis:
+    return fakeredis.FakeRedis()
+
+
+def _cache(redis_client) -> ChunkSnapshotCache:
+    cache = ChunkSnapshotCache(max_entries=4)
+    cache._redis_client = redis_client
+    cache._redis_disabled = False
+    return cache
+
+
+def test_snapshot_is_shared_and_compact(redis_client) -> None:
+    writer = _cache(redis_client)
+    version, chunks = writer.get(1, max_chunks=100)
+    assert (version, chunks) == (0, None)
+    writer.put(1, version, 100, CHUNKS)
+
+    # Another process only has the Redis copy
+    version, chunks = _cache(redis_client).get(1, max_chunks=100)
+
+    assert version == 0
+    assert chunks == [
+        {
+            key: chunk[key]
+            for key in ("content", "title", "chunk_id", "doc_ref", "token_counts")
+        }
+        for chunk in CHUNKS
+    ]
+
+
+def test_bump_version_invalidates_snapshots(redis_client) -> None:
+    cache = _cache(redis_client)
+    other = _cache(redis_client)
+    cache.put(1, 0, 100, CHUNKS)
+    assert other.get(1, max_chunks=100)[1] is not None
+
+    cache.bump_version(1)
+
+    assert cache.get(1, max_chunks=100) == (1, None)
+    assert other.get(1, max_chunks=100) == (1, None)
+
+
+def test_snapshot_put_for_stale_version_is_not_served(redis_client) -> None:
+    cache = _cache(redis_client)
+    version, _ = cache.get(1, max_chunks=100)
+
+    # A document changes while the chunks are being fetched
+    cache.bump_version(1)
+    cache.put(1, version, 100, CHUNKS)
+
+    assert cache.get(1, max_chunks=100) == (1, None)
+
+
+def test_truncated_snapshot_only_serves_smaller_limits(redis_client) -> None:
+    cache = _cache(redis_client)
+    cache.put(1, 0, 2, CHUNKS[:2])
+
+    assert [c["chunk_id"] for c in cache.get(1, max_chunks=1)[1]] == [0]
+    assert cache.get(1, max_chunks=100) == (0, None)
+
+
+def test_without_redis_every_lookup_misses() -> None:
+    cache = ChunkSnapshotCache()
+    cache.put(1, 0, 100, CHUNKS)
+
+    assert cache.get(1, max_chunks=100) == (None, None)
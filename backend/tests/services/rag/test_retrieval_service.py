@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for multi-knowledge-base retrieval fan-out."""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.services.rag.retrieval_service import RetrievalService
+
+
+class FakeStorageBackend:
+    """Storage backend that records precomputed query vectors."""
+
+    def __init__(self, delay: float = 0.0, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.query_embeddings = []
+
+    def retrieve(self, knowledge_id, query, query_embedding=None, **kwargs):
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("backend down")
+        self.query_embeddings.append(query_embedding)
+        return {"records": [{"content": knowledge_id, "score": 0.9, "title": "doc"}]}
+
+
+def _plan(kb_id, backend, embed_model, embedding_key=("embed", "default", 1)):
+    kb = MagicMock()
+    kb.id = kb_id
+    kb.user_id = 1
+    return {
+        "kb": kb,
+        "knowledge_id": str(kb_id),
+        "storage_backend": backend,
+        "embed_model": embed_model,
+        "embedding_key": embedding_key,
+        "retrieval_setting": {
+            "top_k": 5,
+            "score_threshold": 0.5,
+            "retrieval_mode": "vector",
+        },
+    }
+
+
+def _embed_model():
+    model = MagicMock()
+    lock = threading.Lock()
+    model.calls = 0
+
+    def embed(query):
+        with lock:
+            model.calls += 1
+        return [0.1, 0.2]
+
+    model.get_query_embedding.side_effect = embed
+    return model
+
+
+async def _fan_out(plans, timeout=None):
+    service = RetrievalService()
+    with (
+        patch.object(
+            RetrievalService, "_get_active_knowledge_base", side_effect=lambda db, i: i
+        ),
+        patch.object(
+            service, "_prepare_kb_retrieval", side_effect=lambda kb, db: plans[kb]
+        ),
+    ):
+        return await service.retrieve_from_knowledge_bases_internal(
+            query="hello",
+            knowledge_base_ids=list(plans),
+            db=MagicMock(),
+            timeout=timeout,
+        )
+
+
+@pytest.mark.asyncio
+async def test_shared_embedding_model_embeds_query_once() -> None:
+    embed_model = _embed_model()
+    backends = {kb_id: FakeStorageBackend() for kb_id in (1, 2, 3)}
+    plans = {
+        kb_id: _plan(kb_id, backend, embed_model) for kb_id, backend in backends.items()
+    }
+
+    results = await _fan_out(plans)
+
+    assert sorted(results) == [1, 2, 3]
+    assert embed_model.calls == 1
+    for backend in backends.values():
+        assert backend.query_embeddings == [[0.1, 0.2]]
+
+
+@pytest.mark.asyncio
+async def test_failed_and_slow_knowledge_bases_are_skipped() -> None:
+    embed_model = _embed_model()
+    plans = {
+        1: _plan(1, FakeStorageBackend(), embed_model),
+        2: _plan(2, FakeStorageBackend(fail=True), embed_model),
+        3: _plan(3, FakeStorageBackend(delay=1.0), embed_model),
+    }
+
+    started = time.monotonic()
+    results = await _fan_out(plans, timeout=0.3)
+
+    assert time.monotonic() - started < 0.9
+    assert list(results) == [1]
+    assert results[1]["records"][0]["content"] == "1"
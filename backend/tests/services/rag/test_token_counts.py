@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for index-time token accounting."""
+
+from datetime import datetime
+
+import pytest
+from llama_index.core.schema import MetadataMode, TextNode
+from sqlalchemy.orm import Session
+
+from app.models.kind import Kind
+from app.models.knowledge import KnowledgeDocument
+from app.models.user import User
+from app.services.knowledge import KnowledgeService
+from app.services.rag.index import tokenizers
+from app.services.rag.index.indexer import count_chunk_tokens
+
+
+@pytest.fixture
+def fixed_tokenizers(monkeypatch):
+    """Replace the registered tokenizers with deterministic ones."""
+    monkeypatch.setattr(tokenizers, "_tokenizers", {})
+    monkeypatch.setattr(tokenizers, "_defaults_registered", True)
+    tokenizers.register_tokenizer("default", lambda text: len(text))
+    tokenizers.register_tokenizer("openai", lambda text: len(text.split()))
+
+
+def test_count_chunk_tokens_stores_counts_out_of_embedded_text(
+    fixed_tokenizers,
+) -> None:
+    nodes = [TextNode(text="one two three"), TextNode(text="four five")]
+
+    totals = count_chunk_tokens(nodes)
+
+    assert totals == {"default": 22, "openai": 5}
+    assert nodes[0].metadata["token_counts"] == {"default": 13, "openai": 3}
+    assert "token_counts" not in nodes[0].get_content(MetadataMode.EMBED)
+    assert "token_counts" not in nodes[0].get_content(MetadataMode.LLM)
+
+
+def test_default_tokenizers_cover_token_counter_providers() -> None:
+    counts = tokenizers.count_tokens("hello world " * 10)
+
+    assert {"openai", "anthropic", "google", "default"} <= set(counts)
+    assert all(count > 0 for count in counts.values())
+
+
+def test_select_token_count_falls_back_to_default_family() -> None:
+    counts = {"openai": 10, "default": 12}
+
+    assert tokenizers.select_token_count(counts, "openai") == 10
+    assert tokenizers.select_token_count(counts, "anthropic") == 12
+    assert tokenizers.select_token_count(None, "openai") is None
+
+
+def test_refresh_token_counts_aggregates_active_documents(
+    test_db: Session, test_user: User
+) -> None:
+    kb = Kind(
+        user_id=test_user.id,
+        kind="KnowledgeBase",
+        name="token-count-kb",
+        namespace="default",
+        json={"spec": {"name": "token-count-kb"}, "status": {"state": "Available"}},
+        created_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    test_db.add(kb)
+    test_db.commit()
+
+    for name, token_counts, file_size, is_active in [
+        ("a.pdf", {"openai": 100, "default": 120}, 50000, True),
+        ("b.md", {"default": 30}, 120, True),
+        ("legacy.txt", None, 400, True),
+        ("pending.pdf", {"openai": 999, "default": 999}, 10, False),
+    ]:
+        test_db.add(
+            KnowledgeDocument(
+                kind_id=kb.id,
+                attachment_id=0,
+                name=name,
+                file_extension=name.rsplit(".", 1)[1],
+                file_size=file_size,
+                user_id=test_user.id,
+                is_active=is_active,
+                source_type="file",
+                token_counts=token_counts,
+            )
+        )
+    test_db.commit()
+
+    totals = KnowledgeService.refresh_token_counts(test_db, kb.id)
+
+    # Legacy documents count file_size / 4 towards every family
+    assert totals == {"openai": 230, "default": 250}
+    assert KnowledgeService.get_total_token_count(test_db, kb.id, "openai") == 230
+    assert KnowledgeService.get_total_token_count(test_db, kb.id, "google") == 250
+    assert kb.json["status"]["state"] == "Available"
@@ -0,0 +1,167 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for token coalescing and persistence in StreamingCore."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.services.streaming import StreamingConfig, StreamingCore, StreamingState
+
+
+class RecordingEmitter:
+    """Emitter that records chunk events."""
+
+    def __init__(self):
+        self.chunks = []
+
+    async def emit_chunk(self, content, offset, subtask_id, result=None):
+        self.chunks.append((content, offset))
+
+    async def emit_done(self, task_id, subtask_id, offset, result, message_id=None):
+        self.chunks.append(("<done>", offset))
+
+
+def _core(**config) -> tuple[StreamingCore, RecordingEmitter]:
+    emitter = RecordingEmitter()
+    state = StreamingState(task_id=1, subtask_id=2, user_id=3, message_id=4)
+    config.setdefault("redis_save_interval", 3600)
+    config.setdefault("db_save_interval", 3600)
+    core = StreamingCore(
+        emitter, state, StreamingConfig(**config), storage_handler=AsyncMock()
+    )
+    return core, emitter
+
+
+def _reassemble(chunks) -> str:
+    text = ""
+    for content, offset in chunks:
+        if content == "<done>":
+            continue
+        assert offset == len(text)
+        text += content
+    return text
+
+
+def test_full_response_appends() -> None:
+    state = StreamingState(task_id=1, subtask_id=2, user_id=3)
+    for token in ["Hel", "lo", " world"]:
+        state.append_content(token)
+
+    assert state.full_response == "Hello world"
+    assert state.offset == 11
+    state.full_response = "reset"
+    assert state.full_response == "reset"
+
+
+@pytest.mark.asyncio
+async def test_tokens_are_coalesced_by_size() -> None:
+    core, emitter = _core(coalesce_interval=60, coalesce_max_bytes=8)
+    tokens = ["first", "ab", "cd", "ef", "gh", "ij", "k"]
+
+    for token in tokens:
+        assert await core.process_token(token)
+    await core.finalize()
+
+    # First token goes out alone, then 8-byte frames, then the tail on finalize
+    assert [content for content, _ in emitter.chunks] == [
+        "first",
+        "abcdefgh",
+        "ijk",
+        "<done>",
+    ]
+    assert _reassemble(emitter.chunks) == "".join(tokens)
+
+
+@pytest.mark.asyncio
+async def test_timer_flushes_idle_buffer() -> None:
+    core, emitter = _core(coalesce_interval=0.01, coalesce_max_bytes=1024)
+
+    await core.process_token("a")
+    await core.process_token("b")
+    await core.process_token("c")
+    assert [content for content, _ in emitter.chunks] == ["a"]
+
+    await asyncio.sleep(0.05)
+    assert [content for content, _ in emitter.chunks] == ["a", "bc"]
+    assert _reassemble(emitter.chunks) == "abc"
+
+
+@pytest.mark.asyncio
+async def test_reasoning_flushes_pending_content() -> None:
+    core, emitter = _core(coalesce_interval=60, coalesce_max_bytes=1024)
+
+    await core.process_token("a")
+    await core.process_token("b")
+    await core.process_token("__REASONING__think__END_REASONING__")
+
+    assert emitter.chunks == [("a", 0), ("b", 1), ("", 2)]
+
+
+@pytest.mark.asyncio
+async def test_coalescing_can_be_disabled_per_stream() -> None:
+    core, emitter = _core(coalesce_tokens=False)
+
+    for token in ["a", "b", "c"]:
+        await core.process_token(token)
+
+    assert emitter.chunks == [("a", 0), ("b", 1), ("c", 2)]
+
+
+@pytest.mark.asyncio
+async def test_append_persistence_sends_deltas() -> None:
+    core, _ = _core(coalesce_tokens=False, redis_save_interval=0)
+    storage = core._storage
+    storage.append_streaming_content.return_value = True
+
+    for token in ["ab", "cd", "é"]:
+        await core.process_token(token)
+    await core.finalize()
+
+    appended = [call.args for call in storage.append_streaming_content.call_args_list]
+    assert appended == [(2, "ab", 0), (2, "cd", 2), (2, "é", 4)]
+    storage.save_streaming_content.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stale_cache_falls_back_to_full_rewrite() -> None:
+    core, _ = _core(coalesce_tokens=False, redis_save_interval=0)
+    storage = core._storage
+    storage.append_streaming_content.side_effect = [True, False, True]
+
+    for token in ["ab", "cd", "ef"]:
+        await core.process_token(token)
+
+    storage.save_streaming_content.assert_called_once_with(2, "abcd")
+    assert storage.append_streaming_content.call_args.args == (2, "ef", 4)
+
+
+@pytest.mark.asyncio
+async def test_db_snapshots_only_at_checkpoints() -> None:
+    core, _ = _core(
+        coalesce_tokens=False, db_save_interval=0, db_checkpoint_interval=3600
+    )
+    storage = core._storage
+    core.state.last_db_save = asyncio.get_running_loop().time()
+
+    for token in ["a", "b", "c"]:
+        await core.process_token(token)
+    # Text alone is recoverable from Redis and does not trigger DB writes
+    storage.update_subtask_status.assert_not_called()
+
+    core.state.add_thinking_step({"title": "tool"})
+    await core.process_token("d")
+    assert storage.update_subtask_status.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_snapshot_mode_writes_db_every_interval() -> None:
+    core, _ = _core(coalesce_tokens=False, append_persistence=False, db_save_interval=0)
+
+    for token in ["a", "b", "c"]:
+        await core.process_token(token)
+
+    assert core._storage.update_subtask_status.call_count == 3
@@ -0,0 +1,54 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the executor dispatch hint stream."""
+
+import fakeredis
+import pytest
+
+from app.services.adapters.dispatch_queue import (
+    DISPATCH_TYPE_ONLINE,
+    DISPATCH_TYPE_PIPELINE,
+    DispatchQueue,
+    get_dispatch_type,
+)
+
+
+@pytest.fixture
+def queue() -> DispatchQueue:
+    queue = DispatchQueue("redis://fake", "test:dispatch", maxlen=100)
+    queue._redis_client = fakeredis.FakeRedis(decode_responses=True)
+    return queue
+
+
+def test_dispatch_type_from_labels() -> None:
+    assert get_dispatch_type({"metadata": {"labels": {}}}) == DISPATCH_TYPE_ONLINE
+    assert get_dispatch_type({}) == DISPATCH_TYPE_ONLINE
+    assert get_dispatch_type({"metadata": {"labels": {"type": "offline"}}}) is None
+    assert (
+        get_dispatch_type({"metadata": {"labels": {"source": "chat_shell"}}}) is None
+    )
+
+
+def test_notify_adds_hints(queue: DispatchQueue) -> None:
+    assert queue.notify_task(1, {"metadata": {"labels": {"type": "online"}}})
+    assert queue.notify(2, DISPATCH_TYPE_PIPELINE)
+    assert not queue.notify_task(3, {"metadata": {"labels": {"type": "offline"}}})
+
+    entries = queue.redis_client.xrange("test:dispatch")
+    assert [fields for _, fields in entries] == [
+        {"task_id": "1", "type": "online"},
+        {"task_id": "2", "type": "pipeline"},
+    ]
+
+
+def test_redis_errors_are_swallowed(queue: DispatchQueue) -> None:
+    queue._redis_client = fakeredis.FakeRedis(
+        server=fakeredis.FakeServer(), decode_responses=True
+    )
+    queue._redis_client.connection_pool.connection_kwargs["server"].connected = False
+
+    assert not queue.notify(1, DISPATCH_TYPE_ONLINE)
+    # Publishing is skipped during the backoff window
+    assert queue.redis_client is None
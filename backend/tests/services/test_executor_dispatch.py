@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the indexed task/subtask lookup used by executor dispatch."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.models.kind import Kind
+from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
+from app.models.task import TaskResource
+from app.models.user import User
+from app.services.adapters.executor_kinds import ExecutorKindsService
+
+
+@pytest.fixture
+def service() -> ExecutorKindsService:
+    return ExecutorKindsService(Kind)
+
+
+def _task(db: Session, user: User, name: str, status=None, labels=None, age=0):
+    task_json = {"metadata": {"name": name, "labels": labels or {}}}
+    if status is not None:
+        task_json["status"] = {"status": status}
+    task = TaskResource(
+        user_id=user.id,
+        kind="Task",
+        name=name,
+        namespace="default",
+        json=task_json,
+        is_active=True,
+        created_at=datetime.now() - timedelta(minutes=age),
+    )
+    db.add(task)
+    db.flush()
+    return task
+
+
+def _subtask(
+    db: Session,
+    user: User,
+    task: TaskResource,
+    message_id: int,
+    status=SubtaskStatus.PENDING,
+    role=SubtaskRole.ASSISTANT,
+):
+    subtask = Subtask(
+        user_id=user.id,
+        task_id=task.id,
+        team_id=1,
+        title=f"message {message_id}",
+        bot_ids=[1],
+        role=role,
+        prompt="",
+        status=status,
+        message_id=message_id,
+        completed_at=datetime.now(),
+    )
+    db.add(subtask)
+    db.flush()
+    return subtask
+
+
+def test_dispatch_columns_follow_json(test_db: Session, test_user: User) -> None:
+    task = _task(
+        test_db,
+        test_user,
+        "t",
+        status="PENDING",
+        labels={"type": "offline", "source": "api"},
+    )
+    test_db.refresh(task)
+    assert task.dispatch_status == "PENDING"
+    assert task.dispatch_type == "offline"
+    assert task.dispatch_source == "api"
+
+    task.json = {**task.json, "status": {"status": "RUNNING"}}
+    test_db.flush()
+    test_db.refresh(task)
+    assert task.dispatch_status == "RUNNING"
+
+
+def test_first_subtasks_for_pending_tasks(
+    service: ExecutorKindsService, test_db: Session, test_user: User
+) -> None:
+    older = _task(test_db, test_user, "older", status="PENDING", age=10)
+    newer = _task(test_db, test_user, "newer", status="PENDING", age=1)
+    _task(test_db, test_user, "chat", status="PENDING", labels={"source": "chat_shell"})
+    offline = _task(
+        test_db, test_user, "offline", status="PENDING", labels={"type": "offline"}
+    )
+    _task(test_db, test_user, "done", status="COMPLETED")
+
+    _subtask(test_db, test_user, older, 1, role=SubtaskRole.USER)
+    older_first = _subtask(test_db, test_user, older, 2)
+    _subtask(test_db, test_user, older, 4)
+    newer_first = _subtask(test_db, test_user, newer, 2)
+    offline_first = _subtask(test_db, test_user, offline, 2)
+
+    subtasks = service._get_first_subtasks_for_tasks(
+        test_db, SubtaskStatus.PENDING, 10, "online"
+    )
+    assert [s.id for s in subtasks] == [newer_first.id, older_first.id]
+
+    subtasks = service._get_first_subtasks_for_tasks(
+        test_db, SubtaskStatus.PENDING, 10, "offline"
+    )
+    assert [s.id for s in subtasks] == [offline_first.id]
+
+
+def test_first_subtasks_for_task_ids(
+    service: ExecutorKindsService, test_db: Session, test_user: User
+) -> None:
+    pending = _task(test_db, test_user, "pending", status="PENDING")
+    no_status = _task(test_db, test_user, "no-status")
+    busy = _task(test_db, test_user, "busy", status="RUNNING")
+    done = _task(test_db, test_user, "done", status="COMPLETED")
+
+    pending_first = _subtask(test_db, test_user, pending, 2)
+    no_status_first = _subtask(test_db, test_user, no_status, 2)
+    _subtask(test_db, test_user, busy, 2, status=SubtaskStatus.RUNNING)
+    _subtask(test_db, test_user, busy, 4)
+    _subtask(test_db, test_user, done, 2)
+
+    subtasks = service._get_first_subtasks_for_task_ids(
+        test_db, [no_status.id, busy.id, done.id, pending.id], SubtaskStatus.PENDING
+    )
+    assert [s.id for s in subtasks] == [no_status_first.id, pending_first.id]
@@ -176,6 +176,29 @@ class MessageCompressor:
         """
         return self.token_counter.is_over_limit(messages, self.trigger_limit)
 
+    def _tokens_after(
+        self,
+        tokens_before: int,
+        compressed: list[dict[str, Any]],
+        details: dict[str, Any],
+    ) -> int:
+        """Get the token count after a strategy was applied.
+
+        Uses the reduction reported by the strategy and only recounts
+        when the strategy did not report one.
+
+        Args:
+            tokens_before: Token count before the strategy was applied
+            compressed: Messages returned by the strategy
+            details: Details returned by the strategy
+
+        Returns:
+            Token count of compressed
+        """
+        if "tokens_reduced" in details:
+            return tokens_before - details["tokens_reduced"]
+        return self.token_counter.count_messages(compressed)
+
     def _estimate_potentials(
         self, messages: list[dict[str, Any]]
     ) -> list[StrategyAllocation]:
@@ -334,6 +357,7 @@ class MessageCompressor:
         )
 
         current_messages = messages
+        current_tokens = original_tokens
         strategies_applied: list[str] = []
         all_details: dict[str, Any] = {}
 
@@ -342,8 +366,6 @@ class MessageCompressor:
         logger.info("[MessageCompressor] Phase 1: Sequential strategy application")
 
         for strategy in self.strategies:
-            current_tokens = self.token_counter.count_messages(current_messages)
-
             # Check if we've reached target
             if current_tokens <= self.target_limit:
                 logger.info(
@@ -386,7 +408,7 @@ class MessageCompressor:
                 self.config,
             )
 
-            new_tokens = self.token_counter.count_messages(compressed)
+            new_tokens = self._tokens_after(current_tokens, compressed, details)
             tokens_saved = current_tokens - new_tokens
 
             if tokens_saved > 0:
@@ -401,11 +423,10 @@ class MessageCompressor:
                     current_tokens,
                     new_tokens,
                 )
+                current_tokens = new_tokens
 
         # ========== Phase 2: Potential-based Weighted Iteration ==========
         # If still over target, iterate with weighted allocation based on remaining potential
-        current_tokens = self.token_counter.count_messages(current_messages)
-
         for iteration in range(MAX_WEIGHTED_ITERATIONS):
             if current_tokens <= self.target_limit:
                 break
@@ -446,7 +467,7 @@ class MessageCompressor:
                 if alloc.allocated_tokens <= 0:
                     continue
 
-                tokens_before = self.token_counter.count_messages(current_messages)
+                tokens_before = current_tokens
 
                 compressed, details = alloc.strategy.compress(
                     current_messages,
@@ -455,11 +476,12 @@ class MessageCompressor:
                     self.config,
                 )
 
-                new_tokens = self.token_counter.count_messages(compressed)
+                new_tokens = self._tokens_after(tokens_before, compressed, details)
                 tokens_saved = tokens_before - new_tokens
 
                 if tokens_saved > 0:
                     current_messages = compressed
+                    current_tokens = new_tokens
                     strategy_key = f"phase2_iter{iteration + 1}_{alloc.strategy.name}"
                     if alloc.strategy.name not in strategies_applied:
                         strategies_applied.append(alloc.strategy.name)
@@ -474,12 +496,8 @@ class MessageCompressor:
                         new_tokens,
                     )
 
-            current_tokens = self.token_counter.count_messages(current_messages)
-
         # ========== Phase 3: Forced Compression (Guarantee Target) ==========
         # If still over target after all iterations, force compression to guarantee target
-        current_tokens = self.token_counter.count_messages(current_messages)
-
         if current_tokens > self.target_limit:
             logger.warning(
                 "[MessageCompressor] Phase 3: Forcing compression to guarantee target, "
@@ -491,12 +509,13 @@ class MessageCompressor:
             current_messages, force_details = self._force_compression_to_target(
                 current_messages, self.target_limit
             )
+            current_tokens = force_details["final_tokens"]
             all_details["phase3_forced"] = force_details
 
             if "forced_truncation" not in strategies_applied:
                 strategies_applied.append("forced_truncation")
 
-        compressed_tokens = self.token_counter.count_messages(current_messages)
+        compressed_tokens = current_tokens
 
         # Log final result
         logger.info(
@@ -561,6 +580,7 @@ class MessageCompressor:
         }
 
         if current_tokens <= target_tokens:
+            details["final_tokens"] = current_tokens
             return messages, details
 
         # Separate system messages from conversation
@@ -612,7 +632,7 @@ class MessageCompressor:
             )
 
             result = system_messages + truncated_messages
-            current_tokens = self.token_counter.count_messages(result)
+            current_tokens -= self.token_counter.count_messages([removed_msg])
 
         details["actions"].append(f"after_middle_removal: {current_tokens} tokens")
 
@@ -135,7 +135,9 @@ class CompressionStrategy(ABC):
             config: Compression configuration
 
         Returns:
-            Tuple of (compressed messages, compression details)
+            Tuple of (compressed messages, compression details). Details
+            should include "tokens_reduced", the exact drop in
+            count_messages, so the compressor does not have to recount.
         """
         ...
 
@@ -304,7 +306,9 @@ class AttachmentTruncationStrategy(CompressionStrategy):
             compressed, chars_removed = self._apply_truncation(
                 messages, mid_ratio, min_length
             )
-            current_tokens = token_counter.count_messages(compressed)
+            current_tokens = original_tokens + token_counter.count_delta(
+                messages, compressed
+            )
 
             logger.debug(
                 "[AttachmentTruncation] Binary search iteration %d: "
@@ -348,7 +352,9 @@ class AttachmentTruncationStrategy(CompressionStrategy):
                 messages, self.MIN_RETENTION_RATIO, min_length
             )
             best_ratio = self.MIN_RETENTION_RATIO
-            best_tokens = token_counter.count_messages(best_compressed)
+            best_tokens = original_tokens + token_counter.count_delta(
+                messages, best_compressed
+            )
 
         # Count truncated messages and chars removed
         truncated_count = 0
@@ -361,8 +367,7 @@ class AttachmentTruncationStrategy(CompressionStrategy):
                     truncated_count += 1
                     total_chars_removed += len(orig_content) - len(comp_content)
 
-        final_tokens = token_counter.count_messages(best_compressed)
-        actual_tokens_reduced = original_tokens - final_tokens
+        actual_tokens_reduced = original_tokens - best_tokens
 
         logger.info(
             "[AttachmentTruncation] Complete: requested=%d, actual=%d tokens reduced, "
@@ -608,7 +613,7 @@ class HistoryTruncationStrategy(CompressionStrategy):
         middle_end = len(conversation_messages) - last_count
         middle_messages = conversation_messages[middle_start:middle_end]
 
-        middle_tokens = sum(token_counter.count_message(msg) for msg in middle_messages)
+        middle_tokens = sum(token_counter.count_each(middle_messages))
 
         return StrategyPotential(
             total_compressible_tokens=middle_tokens,
@@ -666,9 +671,9 @@ class HistoryTruncationStrategy(CompressionStrategy):
         middle_messages = conversation_messages[middle_start:middle_end]
 
         # Calculate tokens for each middle message
-        middle_message_tokens = [
-            (msg, token_counter.count_message(msg)) for msg in middle_messages
-        ]
+        middle_message_tokens = zip(
+            middle_messages, token_counter.count_each(middle_messages)
+        )
 
         # Remove messages from the beginning of middle (oldest first)
         # Stop as soon as we reach the target (don't over-compress)
@@ -694,11 +699,18 @@ class HistoryTruncationStrategy(CompressionStrategy):
         )
 
         # Build result with truncation notice if any messages were removed
+        tokens_reduced = 0
         if messages_to_remove > 0:
             truncation_notice_msg = {
                 "role": "system",
                 "content": self.TRUNCATION_NOTICE,
             }
+            # Removed messages plus their formatting overhead, minus the notice
+            tokens_reduced = (
+                tokens_removed
+                + messages_to_remove * 3
+                - token_counter.count_messages([truncation_notice_msg])
+            )
 
             result = (
                 system_messages
@@ -714,7 +726,7 @@ class HistoryTruncationStrategy(CompressionStrategy):
             "messages_removed": messages_to_remove,
             "middle_messages_kept": len(kept_middle),
             "tokens_requested": tokens_to_reduce,
-            "tokens_reduced": tokens_removed,
+            "tokens_reduced": tokens_reduced,
         }
 
         return result, details
@@ -767,7 +779,7 @@ class ToolResultTruncationStrategy(CompressionStrategy):
         Returns:
             StrategyPotential with tool result compression potential
         """
-        total_tokens = 0
+        tool_results = []
 
         for msg in messages:
             content = msg.get("content", "")
@@ -779,7 +791,9 @@ class ToolResultTruncationStrategy(CompressionStrategy):
             is_tool_result = role == "tool" or self._has_tool_result_content(content)
 
             if is_tool_result:
-                total_tokens += token_counter.count_message(msg)
+                tool_results.append(msg)
+
+        total_tokens = sum(token_counter.count_each(tool_results))
 
         if total_tokens == 0:
             return StrategyPotential()
@@ -852,7 +866,9 @@ class ToolResultTruncationStrategy(CompressionStrategy):
                 token_counter,
                 mid_ratio,
             )
-            current_tokens = token_counter.count_messages(compressed)
+            current_tokens = original_tokens + token_counter.count_delta(
+                messages, compressed
+            )
 
             logger.debug(
                 "[ToolResultTruncation] Binary search iteration %d: "
@@ -896,7 +912,9 @@ class ToolResultTruncationStrategy(CompressionStrategy):
                 self.MIN_RETENTION_RATIO,
             )
             best_ratio = self.MIN_RETENTION_RATIO
-            best_tokens = token_counter.count_messages(best_compressed)
+            best_tokens = original_tokens + token_counter.count_delta(
+                messages, best_compressed
+            )
         # Count truncated messages and chars removed
         truncated_count = 0
         total_chars_removed = 0
@@ -908,8 +926,7 @@ class ToolResultTruncationStrategy(CompressionStrategy):
                     truncated_count += 1
                     total_chars_removed += len(orig_content) - len(comp_content)
 
-        final_tokens = token_counter.count_messages(best_compressed)
-        actual_tokens_reduced = original_tokens - final_tokens
+        actual_tokens_reduced = original_tokens - best_tokens
 
         logger.info(
             "[ToolResultTruncation] Complete: requested=%d, actual=%d tokens reduced, "
@@ -6,15 +6,24 @@
 
 This module provides token counting functionality using tiktoken for OpenAI models
 and character-based estimation for other providers.
+
+Compression counts the same messages many times (before compression, after
+each strategy, on every binary search step), so tiktoken counts are memoized
+per text in a process-wide LRU keyed by text length and hash. Texts that are
+not cached yet are encoded in one batch.
 """
 
-import base64
 import logging
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of texts whose token counts are memoized
+TOKEN_COUNT_CACHE_MAX_ENTRIES = 16384
+
 
 @lru_cache(maxsize=4)
 def _get_encoding(model_name: str = "cl100k_base"):
@@ -38,6 +47,63 @@ def _get_encoding(model_name: str = "cl100k_base"):
         return None
 
 
+def _base64_size(data: str) -> int:
+    """Get the decoded size of base64 data without decoding it."""
+    data = data.rstrip()
+    return len(data) * 3 // 4 - data[-2:].count("=")
+
+
+class TokenCountCache:
+    """Thread-safe LRU of text token counts.
+
+    Entries are keyed by (length, hash) of the text rather than the text
+    itself, so the cache does not keep large attachments alive. Python caches
+    the hash on each str object, so repeated lookups of the same message
+    content are O(1).
+    """
+
+    def __init__(self, max_entries: int = TOKEN_COUNT_CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple[int, int], int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, texts: list[str]) -> list[int | None]:
+        """Look up token counts, returning None for texts not in the cache."""
+        counts: list[int | None] = []
+        with self._lock:
+            for text in texts:
+                key = (len(text), hash(text))
+                count = self._entries.get(key)
+                if count is not None:
+                    self._entries.move_to_end(key)
+                counts.append(count)
+        return counts
+
+    def put_many(self, counts: dict[str, int]) -> None:
+        """Store token counts of texts."""
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            for text, count in counts.items():
+                key = (len(text), hash(text))
+                self._entries[key] = count
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Token counts of tiktoken-encoded texts, shared by all counters
+_token_count_cache = TokenCountCache()
+
+
 class TokenCounter:
     """Token counter for various model providers.
 
@@ -81,6 +147,8 @@ class TokenCounter:
         self.provider = self._detect_provider()
         self._encoding = None
 
+        self._cache = _token_count_cache
+
         # Try to load tiktoken for OpenAI models
         if self.provider == "openai":
             self._encoding = _get_encoding("cl100k_base")
@@ -105,15 +173,61 @@ class TokenCounter:
         """
         if not text:
             return 0
+        return self.count_texts([text])[0]
+
+    def count_texts(self, texts: list[str]) -> list[int]:
+        """Count tokens in several text strings at once.
+
+        With tiktoken, cached counts are reused and the remaining texts are
+        encoded in a single batch.
+
+        Args:
+            texts: Texts to count tokens for
 
-        # Use tiktoken for accurate counting if available
-        if self._encoding:
+        Returns:
+            Estimated token count of each text
+        """
+        if not self._encoding:
+            return [self._estimate_text(text) for text in texts]
+
+        counts = self._cache.get_many(texts)
+        missing = list(
+            dict.fromkeys(
+                text for text, count in zip(texts, counts) if count is None and text
+            )
+        )
+        if not missing:
+            return [count or 0 for count in counts]
+
+        encoded = self._encode(missing)
+        self._cache.put_many(encoded)
+        return [
+            encoded.get(text, 0) if count is None else count
+            for text, count in zip(texts, counts)
+        ]
+
+    def _encode(self, texts: list[str]) -> dict[str, int]:
+        """Encode texts with tiktoken, falling back to estimation on errors."""
+        try:
+            if len(texts) == 1:
+                return {texts[0]: len(self._encoding.encode(texts[0]))}
+            return {
+                text: len(tokens)
+                for text, tokens in zip(texts, self._encoding.encode_batch(texts))
+            }
+        except Exception:
+            pass
+
+        counts = {}
+        for text in texts:
             try:
-                return len(self._encoding.encode(text))
+                counts[text] = len(self._encoding.encode(text))
             except Exception:
-                pass
+                counts[text] = self._estimate_text(text)
+        return counts
 
-        # Fall back to character-based estimation
+    def _estimate_text(self, text: str) -> int:
+        """Estimate tokens in a text string from its length."""
         chars_per_token = self.CHARS_PER_TOKEN.get(
             self.provider, self.CHARS_PER_TOKEN["default"]
         )
@@ -136,7 +250,7 @@ class TokenCounter:
         if isinstance(image_data, str):
             # Base64 string
             try:
-                image_bytes = len(base64.b64decode(image_data))
+                image_bytes = _base64_size(image_data)
                 # Larger images use more tokens
                 if image_bytes > 1024 * 1024:  # > 1MB
                     return tokens_per_image * 2
@@ -151,7 +265,7 @@ class TokenCounter:
                     # Extract base64 part
                     try:
                         base64_part = url_str.split(",", 1)[1]
-                        image_bytes = len(base64.b64decode(base64_part))
+                        image_bytes = _base64_size(base64_part)
                         if image_bytes > 1024 * 1024:
                             return tokens_per_image * 2
                     except Exception:
@@ -168,30 +282,26 @@ class TokenCounter:
         Returns:
             Estimated token count
         """
-        tokens = 0
+        return self.count_each([message])[0]
 
-        # Count role (approximately 1-2 tokens)
-        role = message.get("role", "")
-        tokens += 2  # Role tokens
+    def count_each(self, messages: list[dict[str, Any]]) -> list[int]:
+        """Count tokens in each message, encoding their texts in one batch.
 
-        content = message.get("content", "")
+        Args:
+            messages: List of message dictionaries
 
-        if isinstance(content, str):
-            # Simple text content
-            tokens += self.count_text(content)
-        elif isinstance(content, list):
-            # Multimodal content (text + images)
-            for part in content:
-                if isinstance(part, dict):
-                    part_type = part.get("type", "")
-                    if part_type == "text":
-                        tokens += self.count_text(part.get("text", ""))
-                    elif part_type == "image_url":
-                        tokens += self.count_image(part)
-                elif isinstance(part, str):
-                    tokens += self.count_text(part)
+        Returns:
+            Estimated token count of each message, without formatting overhead
+        """
+        texts: list[str] = []
+        spans = []
+        for msg in messages:
+            start = len(texts)
+            tokens = self._collect_message(msg, texts)
+            spans.append((tokens, start, len(texts)))
 
-        return tokens
+        text_counts = self.count_texts(texts)
+        return [tokens + sum(text_counts[start:end]) for tokens, start, end in spans]
 
     def count_messages(self, messages: list[dict[str, Any]]) -> int:
         """Count total tokens in a list of messages.
@@ -202,9 +312,7 @@ class TokenCounter:
         Returns:
             Total estimated token count
         """
-        total = 0
-        for msg in messages:
-            total += self.count_message(msg)
+        total = sum(self.count_each(messages))
 
         # Add overhead for message formatting (varies by provider)
         # Approximately 3 tokens per message for formatting
@@ -212,6 +320,70 @@ class TokenCounter:
 
         return total
 
+    def count_delta(
+        self,
+        original: list[dict[str, Any]],
+        updated: list[dict[str, Any]],
+    ) -> int:
+        """Count the token difference between two versions of a message list.
+
+        Strategies that rewrite messages in place keep unchanged messages as
+        the same objects, so only replaced messages are counted.
+
+        Args:
+            original: Original messages
+            updated: Updated messages
+
+        Returns:
+            Tokens of updated minus tokens of original
+        """
+        if len(original) != len(updated):
+            return self.count_messages(updated) - self.count_messages(original)
+
+        changed = [
+            (before, after)
+            for before, after in zip(original, updated)
+            if before is not after
+        ]
+        return self.count_messages([after for _, after in changed]) - (
+            self.count_messages([before for before, _ in changed])
+        )
+
+    def _collect_message(self, message: dict[str, Any], texts: list[str]) -> int:
+        """Collect the texts of a message and count its other tokens.
+
+        Args:
+            message: Message dictionary with role and content
+            texts: List to append the message texts to
+
+        Returns:
+            Token count of the role and images
+        """
+        # Count role (approximately 1-2 tokens)
+        tokens = 2  # Role tokens
+
+        content = message.get("content", "")
+
+        if isinstance(content, str):
+            # Simple text content
+            if content:
+                texts.append(content)
+        elif isinstance(content, list):
+            # Multimodal content (text + images)
+            for part in content:
+                if isinstance(part, dict):
+                    part_type = part.get("type", "")
+                    if part_type == "text":
+                        text = part.get("text", "")
+                        if text:
+                            texts.append(text)
+                    elif part_type == "image_url":
+                        tokens += self.count_image(part)
+                elif isinstance(part, str) and part:
+                    texts.append(part)
+
+        return tokens
+
     def estimate_remaining(
         self, messages: list[dict[str, Any]], context_limit: int
     ) -> int:
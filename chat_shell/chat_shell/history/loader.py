@@ -295,66 +295,155 @@ def _load_history_from_db_sync(
         is_group_chat: Whether to include username prefix in user messages
         exclude_after_message_id: If provided, exclude messages with message_id >= this value.
         limit: If provided, limit the number of messages returned (most recent N messages).
+
+    Rendered messages are cached per task, see app.services.chat.storage.history_cache.
     """
-    # Import backend's models and database session
+    # Import backend's database session and history cache
     # This works in package mode since we're running within the backend process
     from app.db.session import SessionLocal
-    from app.models.subtask import Subtask, SubtaskRole, SubtaskStatus
-    from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
-    from app.models.user import User
-
-    history: list[dict[str, Any]] = []
+    from app.services.chat.storage.history_cache import history_cache
 
     db = SessionLocal()
     try:
-        query = (
-            db.query(Subtask, User.user_name)
-            .outerjoin(User, Subtask.sender_user_id == User.id)
-            .filter(
-                Subtask.task_id == task_id,
-                Subtask.status == SubtaskStatus.COMPLETED,
-            )
+        # Only messages added since the previous turn are rendered
+        history = history_cache.load(
+            db,
+            task_id,
+            variant="package:group" if is_group_chat else "package",
+            render=lambda db, subtasks: _render_history_messages(
+                db, subtasks, is_group_chat
+            ),
+            before_message_id=exclude_after_message_id,
+            limit=limit,
         )
+    finally:
+        db.close()
+    return history
 
-        if exclude_after_message_id is not None:
-            query = query.filter(Subtask.message_id < exclude_after_message_id)
 
-        # If limit is specified, we need to get the most recent N messages
-        # First order by message_id desc to get the latest, then reverse
-        if limit is not None and limit > 0:
-            # Get the most recent N messages by ordering desc and limiting
-            subtasks = query.order_by(Subtask.message_id.desc()).limit(limit).all()
-            # Reverse to get chronological order
-            subtasks = list(reversed(subtasks))
-        else:
-            subtasks = query.order_by(Subtask.message_id.asc()).all()
+def _render_history_messages(
+    db, subtasks: list[Any], is_group_chat: bool
+) -> list[dict[str, Any] | None]:
+    """Render subtasks into history messages, None for subtasks to skip.
 
-        for subtask, sender_username in subtasks:
-            msg = _build_history_message(db, subtask, sender_username, is_group_chat)
-            if msg:
-                history.append(msg)
-    finally:
-        db.close()
+    Contexts and sender usernames of all subtasks are loaded in batch.
+    """
+    from app.models.subtask import SubtaskRole
+    from app.models.user import User
 
-    return history
+    user_subtasks = [s for s in subtasks if s.role == SubtaskRole.USER]
+    contexts_by_subtask = _load_history_contexts(db, [s.id for s in user_subtasks])
+
+    sender_usernames: dict[int, str] = {}
+    sender_ids = {s.sender_user_id for s in user_subtasks if s.sender_user_id}
+    if is_group_chat and sender_ids:
+        sender_usernames = dict(
+            db.query(User.id, User.user_name).filter(User.id.in_(sender_ids)).all()
+        )
+
+    return [
+        _build_history_message(
+            subtask,
+            contexts_by_subtask.get(subtask.id, []),
+            sender_usernames.get(subtask.sender_user_id),
+            is_group_chat,
+        )
+        for subtask in subtasks
+    ]
+
+
+def _load_history_contexts(db, subtask_ids: list[int]) -> dict[int, list[Any]]:
+    """Load the prompt contexts of many subtasks in one batch.
+
+    Contexts are queried once for all subtasks without their large columns.
+    Afterwards only the payloads the prompt uses are fetched, again in one
+    query each: extracted_text of documents and knowledge bases, and
+    binary_data of images. image_base64 is never loaded.
+
+    Args:
+        db: Database session
+        subtask_ids: IDs of the user subtasks in the history
+
+    Returns:
+        Dict mapping subtask ID to its READY attachment and knowledge_base
+        contexts, ordered by creation time
+    """
+    from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
+    from sqlalchemy.orm import load_only
+    from sqlalchemy.orm.attributes import set_committed_value
+
+    if not subtask_ids:
+        return {}
+
+    contexts = (
+        db.query(SubtaskContext)
+        .options(
+            load_only(
+                SubtaskContext.subtask_id,
+                SubtaskContext.context_type,
+                SubtaskContext.name,
+                SubtaskContext.text_length,
+                SubtaskContext.type_data,
+                SubtaskContext.created_at,
+            )
+        )
+        .filter(
+            SubtaskContext.subtask_id.in_(subtask_ids),
+            SubtaskContext.status == ContextStatus.READY.value,
+            SubtaskContext.context_type.in_(
+                [ContextType.ATTACHMENT.value, ContextType.KNOWLEDGE_BASE.value]
+            ),
+        )
+        .order_by(SubtaskContext.created_at, SubtaskContext.id)
+        .all()
+    )
+
+    contexts_by_subtask: dict[int, list[Any]] = {}
+    text_contexts = {}
+    image_contexts = {}
+    for context in contexts:
+        contexts_by_subtask.setdefault(context.subtask_id, []).append(context)
+        if context.context_type == ContextType.ATTACHMENT.value and (
+            context.mime_type or ""
+        ).startswith("image/"):
+            image_contexts[context.id] = context
+        else:
+            text_contexts[context.id] = context
+
+    # Fill the deferred columns in place so the contexts do not lazy-load them
+    for column, targets in (
+        (SubtaskContext.extracted_text, text_contexts),
+        (SubtaskContext.binary_data, image_contexts),
+    ):
+        if not targets:
+            continue
+        rows = (
+            db.query(SubtaskContext.id, column)
+            .filter(SubtaskContext.id.in_(list(targets)))
+            .all()
+        )
+        for context_id, value in rows:
+            set_committed_value(targets[context_id], column.key, value)
+
+    return contexts_by_subtask
 
 
 def _build_history_message(
-    db,
     subtask,
+    all_contexts: list[Any],
     sender_username: str | None,
     is_group_chat: bool = False,
 ) -> dict[str, Any] | None:
     """Build a single history message from a subtask.
 
     For user messages, this function:
-    1. Loads all contexts (attachments and knowledge_base) in one query
+    1. Uses the contexts (attachments and knowledge_base) loaded in batch
     2. Processes attachments first (images or text) - they have priority
     3. Processes knowledge_base contexts with remaining token space
     4. Follows MAX_EXTRACTED_TEXT_LENGTH limit with attachments having priority
     """
     from app.models.subtask import SubtaskRole
-    from app.models.subtask_context import ContextStatus, ContextType, SubtaskContext
+    from app.models.subtask_context import ContextType
 
     if subtask.role == SubtaskRole.USER:
         # Build text content
@@ -362,20 +451,6 @@ def _build_history_message(
         if is_group_chat and sender_username:
             text_content = f"User[{sender_username}]: {text_content}"
 
-        # Load all contexts in one query and separate by type
-        all_contexts = (
-            db.query(SubtaskContext)
-            .filter(
-                SubtaskContext.subtask_id == subtask.id,
-                SubtaskContext.status == ContextStatus.READY.value,
-                SubtaskContext.context_type.in_(
-                    [ContextType.ATTACHMENT.value, ContextType.KNOWLEDGE_BASE.value]
-                ),
-            )
-            .order_by(SubtaskContext.created_at)
-            .all()
-        )
-
         if not all_contexts:
             return {"role": "user", "content": text_content}
 
@@ -8,6 +8,7 @@ This tool implements smart injection strategy that automatically chooses
 between direct injection and RAG retrieval based on context window capacity.
 """
 
+import asyncio
 import json
 import logging
 from typing import Any, Dict, List, Optional
@@ -86,6 +87,10 @@ class KnowledgeBaseTool(BaseTool):
     max_direct_chunks: int = 500
     context_buffer_ratio: float = 0.1
 
+    # Deadline (seconds) for retrieving from all knowledge bases in parallel.
+    # Knowledge bases that do not answer in time are left out of the results.
+    retrieval_timeout: float = 20.0
+
     # Current conversation messages for context calculation
     current_messages: List[Dict[str, Any]] = Field(default_factory=list)
 
@@ -289,10 +294,11 @@ class KnowledgeBaseTool(BaseTool):
         """
         # Try to import from backend if available
         try:
-            from app.services.knowledge_service import KnowledgeService
+            from app.services.knowledge import KnowledgeService
 
             total_file_size = 0
             total_estimated_tokens = 0
+            model_family = self.injection_strategy.token_counter.provider
 
             for kb_id in self.knowledge_base_ids:
                 try:
@@ -300,8 +306,10 @@ class KnowledgeBaseTool(BaseTool):
                         self.db_session, kb_id
                     )
                     total_file_size += file_size
-                    # Estimate tokens: approximately 4 characters per token
-                    total_estimated_tokens += file_size // 4
+                    # Token counts are aggregated per model family at index time
+                    total_estimated_tokens += KnowledgeService.get_total_token_count(
+                        self.db_session, kb_id, model_family
+                    )
                 except Exception as e:
                     logger.warning(
                         f"[KnowledgeBaseTool] Failed to get size for KB {kb_id}: {e}"
@@ -342,7 +350,10 @@ class KnowledgeBaseTool(BaseTool):
             async with httpx.AsyncClient(timeout=30.0) as client:
                 response = await client.post(
                     f"{backend_url}/api/internal/rag/kb-size",
-                    json={"knowledge_base_ids": self.knowledge_base_ids},
+                    json={
+                        "knowledge_base_ids": self.knowledge_base_ids,
+                        "model_family": self.injection_strategy.token_counter.provider,
+                    },
                 )
 
                 if response.status_code == 200:
@@ -403,6 +414,7 @@ class KnowledgeBaseTool(BaseTool):
                             "source": chunk.get("title", "Unknown"),
                             "score": None,  # null for direct injection (not RAG similarity)
                             "knowledge_base_id": kb_id,
+                            "token_counts": chunk.get("token_counts"),
                         }
                         processed_chunks.append(processed_chunk)
 
@@ -469,6 +481,7 @@ class KnowledgeBaseTool(BaseTool):
                             "source": chunk.get("title", "Unknown"),
                             "score": None,  # null for direct injection (not RAG similarity)
                             "knowledge_base_id": kb_id,
+                            "token_counts": chunk.get("token_counts"),
                         }
                         processed_chunks.append(processed_chunk)
 
@@ -488,7 +501,10 @@ class KnowledgeBaseTool(BaseTool):
         query: str,
         max_results: int,
     ) -> Dict[int, List[Dict[str, Any]]]:
-        """Retrieve chunks from all knowledge bases.
+        """Retrieve chunks from all knowledge bases in parallel.
+
+        Knowledge bases are searched concurrently under retrieval_timeout.
+        Failed or late knowledge bases are skipped (partial results).
 
         Args:
             query: Search query
@@ -508,41 +524,23 @@ class KnowledgeBaseTool(BaseTool):
 
             retrieval_service = RetrievalService()
 
-            for kb_id in self.knowledge_base_ids:
-                try:
-                    result = (
-                        await retrieval_service.retrieve_from_knowledge_base_internal(
-                            query=query,
-                            knowledge_base_id=kb_id,
-                            db=self.db_session,
-                            metadata_condition=metadata_condition,
-                        )
-                    )
-
-                    records = result.get("records", [])
-                    logger.info(
-                        f"[KnowledgeBaseTool] Retrieved {len(records)} chunks from KB {kb_id}"
-                    )
-
-                    # Process records into chunks
-                    chunks = []
-                    for record in records:
-                        chunk = {
-                            "content": record.get("content", ""),
-                            "source": record.get("title", "Unknown"),
-                            "score": record.get("score", 0.0),
-                            "knowledge_base_id": kb_id,
-                        }
-                        chunks.append(chunk)
-
-                    if chunks:
-                        kb_chunks[kb_id] = chunks
+            # Backend fans out and shares one query embedding per embedding model
+            results = await retrieval_service.retrieve_from_knowledge_bases_internal(
+                query=query,
+                knowledge_base_ids=self.knowledge_base_ids,
+                db=self.db_session,
+                metadata_condition=metadata_condition,
+                timeout=self.retrieval_timeout,
+            )
 
-                except Exception as e:
-                    logger.error(
-                        f"[KnowledgeBaseTool] Error retrieving from KB {kb_id}: {e}"
-                    )
-                    continue
+            for kb_id, result in results.items():
+                records = result.get("records", [])
+                logger.info(
+                    f"[KnowledgeBaseTool] Retrieved {len(records)} chunks from KB {kb_id}"
+                )
+                chunks = self._records_to_chunks(records, kb_id)
+                if chunks:
+                    kb_chunks[kb_id] = chunks
 
         except ImportError:
             # Backend RAG service not available, try HTTP fallback
@@ -557,6 +555,9 @@ class KnowledgeBaseTool(BaseTool):
     ) -> Dict[int, List[Dict[str, Any]]]:
         """Retrieve chunks from RAG service via HTTP API.
 
+        Requests for all knowledge bases are sent concurrently over one
+        client and bounded by retrieval_timeout.
+
         Args:
             query: Search query
             max_results: Max results per KB
@@ -577,57 +578,80 @@ class KnowledgeBaseTool(BaseTool):
         else:
             backend_url = getattr(settings, "BACKEND_API_URL", "http://localhost:8000")
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            for kb_id in self.knowledge_base_ids:
-                try:
-                    payload = {
-                        "query": query,
-                        "knowledge_base_id": kb_id,
-                        "max_results": max_results,
-                    }
-                    if self.document_ids:
-                        payload["document_ids"] = self.document_ids
+        async def _retrieve_one(
+            client: httpx.AsyncClient, kb_id: int
+        ) -> List[Dict[str, Any]]:
+            payload = {
+                "query": query,
+                "knowledge_base_id": kb_id,
+                "max_results": max_results,
+            }
+            if self.document_ids:
+                payload["document_ids"] = self.document_ids
 
-                    response = await client.post(
-                        f"{backend_url}/api/internal/rag/retrieve",
-                        json=payload,
-                    )
+            response = await client.post(
+                f"{backend_url}/api/internal/rag/retrieve",
+                json=payload,
+            )
 
-                    if response.status_code != 200:
-                        logger.warning(
-                            f"[KnowledgeBaseTool] HTTP RAG returned {response.status_code}: {response.text}"
-                        )
-                        continue
+            if response.status_code != 200:
+                logger.warning(
+                    f"[KnowledgeBaseTool] HTTP RAG returned {response.status_code}: {response.text}"
+                )
+                return []
 
-                    data = response.json()
-                    records = data.get("records", [])
+            data = response.json()
+            records = data.get("records", [])
 
-                    logger.info(
-                        f"[KnowledgeBaseTool] HTTP retrieved {len(records)} chunks from KB {kb_id}"
-                    )
+            logger.info(
+                f"[KnowledgeBaseTool] HTTP retrieved {len(records)} chunks from KB {kb_id}"
+            )
+            return self._records_to_chunks(records, kb_id)
 
-                    # Process records into chunks
-                    chunks = []
-                    for record in records:
-                        chunk = {
-                            "content": record.get("content", ""),
-                            "source": record.get("title", "Unknown"),
-                            "score": record.get("score", 0.0),
-                            "knowledge_base_id": kb_id,
-                        }
-                        chunks.append(chunk)
+        async with httpx.AsyncClient(timeout=30.0) as client:
+            tasks = {
+                asyncio.create_task(_retrieve_one(client, kb_id)): kb_id
+                for kb_id in self.knowledge_base_ids
+            }
+            done, pending = await asyncio.wait(tasks, timeout=self.retrieval_timeout)
 
-                    if chunks:
-                        kb_chunks[kb_id] = chunks
+            for task in pending:
+                task.cancel()
+                logger.warning(
+                    f"[KnowledgeBaseTool] HTTP RAG for KB {tasks[task]} exceeded "
+                    f"{self.retrieval_timeout}s deadline, returning partial results"
+                )
+            if pending:
+                await asyncio.wait(pending)
 
-                except Exception as e:
+            for task in done:
+                kb_id = tasks[task]
+                if task.exception() is not None:
                     logger.error(
-                        f"[KnowledgeBaseTool] HTTP RAG failed for KB {kb_id}: {e}"
+                        f"[KnowledgeBaseTool] HTTP RAG failed for KB {kb_id}: {task.exception()}"
                     )
                     continue
+                chunks = task.result()
+                if chunks:
+                    kb_chunks[kb_id] = chunks
 
         return kb_chunks
 
+    @staticmethod
+    def _records_to_chunks(
+        records: List[Dict[str, Any]], kb_id: int
+    ) -> List[Dict[str, Any]]:
+        """Convert Dify-style retrieval records into tool chunks."""
+        return [
+            {
+                "content": record.get("content", ""),
+                "source": record.get("title", "Unknown"),
+                "score": record.get("score", 0.0),
+                "knowledge_base_id": kb_id,
+            }
+            for record in records
+        ]
+
     def _build_document_filter(self) -> Optional[dict[str, Any]]:
         """Build metadata_condition for filtering by document IDs.
 
@@ -763,43 +787,43 @@ class KnowledgeBaseTool(BaseTool):
         Returns:
             JSON string with RAG result
         """
-        # Flatten all chunks and sort by score
+        # Merge chunks from all KBs into one ranking by score
+        ranked_chunks = [
+            (kb_id, chunk) for kb_id, chunks in kb_chunks.items() for chunk in chunks
+        ]
+        ranked_chunks.sort(key=lambda item: item[1].get("score") or 0.0, reverse=True)
+
+        # Limit total results
+        ranked_chunks = ranked_chunks[:max_results]
+
+        # Number sources in ranking order so [1] is the best-matching source
         all_chunks = []
         source_references = []
-        source_index = 1
         seen_sources: dict[tuple[int, str], int] = {}
 
-        for kb_id, chunks in kb_chunks.items():
-            for chunk in chunks:
-                source_file = chunk.get("source", "Unknown")
-                source_key = (kb_id, source_file)
-
-                if source_key not in seen_sources:
-                    seen_sources[source_key] = source_index
-                    source_references.append(
-                        {
-                            "index": source_index,
-                            "title": source_file,
-                            "kb_id": kb_id,
-                        }
-                    )
-                    source_index += 1
+        for kb_id, chunk in ranked_chunks:
+            source_file = chunk.get("source", "Unknown")
+            source_key = (kb_id, source_file)
 
-                all_chunks.append(
+            if source_key not in seen_sources:
+                seen_sources[source_key] = len(source_references) + 1
+                source_references.append(
                     {
-                        "content": chunk["content"],
-                        "source": source_file,
-                        "source_index": seen_sources[source_key],
-                        "score": chunk["score"],
-                        "knowledge_base_id": kb_id,
+                        "index": seen_sources[source_key],
+                        "title": source_file,
+                        "kb_id": kb_id,
                     }
                 )
 
-        # Sort by score (descending)
-        all_chunks.sort(key=lambda x: x.get("score", 0.0) or 0.0, reverse=True)
-
-        # Limit total results
-        all_chunks = all_chunks[:max_results]
+            all_chunks.append(
+                {
+                    "content": chunk["content"],
+                    "source": source_file,
+                    "source_index": seen_sources[source_key],
+                    "score": chunk["score"],
+                    "knowledge_base_id": kb_id,
+                }
+            )
 
         logger.info(
             f"[KnowledgeBaseTool] RAG fallback: returning {len(all_chunks)} results with {len(source_references)} unique sources for query: {query}"
@@ -120,6 +120,9 @@ class InjectionStrategy:
     ) -> int:
         """Estimate tokens required for chunks.
 
+        Chunks carrying token counts from index time use the count of the
+        model's provider. Other chunks are estimated from their characters.
+
         Args:
             chunks: List of knowledge base chunks
             clean_chunks: Whether to clean chunks before estimation
@@ -130,18 +133,26 @@ class InjectionStrategy:
         if not chunks:
             return 0
 
+        provider = self.token_counter.provider
+        counted_tokens = 0
         total_chars = 0
 
         for chunk in chunks:
+            token_counts = chunk.get("token_counts")
+            if token_counts:
+                count = token_counts.get(provider, token_counts.get("default"))
+                if count is not None:
+                    counted_tokens += int(count)
+                    continue
+
             content = chunk.get("content", "")
             if clean_chunks:
                 content = self.content_cleaner.clean_content(content)
             total_chars += len(content)
 
         # Estimate tokens (add overhead for formatting)
-        estimated_tokens = int(
-            total_chars
-            / self.token_counter.CHARS_PER_TOKEN.get(self.token_counter.provider, 4.0)
+        estimated_tokens = counted_tokens + int(
+            total_chars / self.token_counter.CHARS_PER_TOKEN.get(provider, 4.0)
         )
 
         # Add overhead for chunk formatting (source info, etc.)
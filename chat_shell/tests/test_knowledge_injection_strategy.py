@@ -121,6 +121,23 @@ class TestInjectionStrategy:
             tokens < 200
         )  # Reasonable upper bound (increased due to formatting overhead)
 
+    def test_estimate_chunk_tokens_uses_index_time_counts(self):
+        """Test that token counts stored at index time replace estimation."""
+        strategy = InjectionStrategy("claude-3-5-sonnet", context_window=200000)
+
+        chunks = [
+            {
+                "content": "x" * 4000,
+                "token_counts": {"anthropic": 300, "default": 250},
+            },
+            {"content": "y" * 4000, "token_counts": {"openai": 200, "default": 180}},
+        ]
+
+        tokens = strategy.estimate_chunk_tokens(chunks)
+
+        # Provider count for the first chunk, default count for the second
+        assert tokens == 300 + 180 + 2 * 50
+
     def test_prepare_chunks_for_injection(self):
         """Test chunk preparation for injection."""
         strategy = InjectionStrategy("claude-3-5-sonnet", context_window=200000)
@@ -195,9 +195,19 @@ class Agent:
         if self.project_path is None:
             self.project_path = project_path
 
+        # Shallow/partial clone options come from the Shell of the first bot
+        bots = self.task_data.get("bot") or []
+        git_clone = (bots[0].get("git_clone") if bots else None) or {}
+
         if not os.path.exists(project_path):
             success, error_msg = git_util.clone_repo(
-                git_url, branch_name, project_path, username, git_token
+                git_url,
+                branch_name,
+                project_path,
+                username,
+                git_token,
+                depth=git_clone.get("depth"),
+                filter_spec=git_clone.get("filter"),
             )
 
             if success:
@@ -0,0 +1,446 @@
+#!/usr/bin/env python
+
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# -*- coding: utf-8 -*-
+
+"""
+Git Change Tracker - Incremental file change tracking for the workbench
+
+Changes are recomputed when the working tree reports filesystem events, and
+only for the touched paths. Line counts come from `git diff --numstat` and are
+cached by (base blob, working tree blob), so a file that did not really change
+costs no diff at all.
+"""
+
+import hashlib
+import os
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from git import GitCommandError, Repo
+
+from shared.logger import setup_logger
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    FileSystemEventHandler = object
+    WATCHDOG_AVAILABLE = False
+
+logger = setup_logger("git_change_tracker")
+
+# Time to let a burst of filesystem events settle before refreshing
+DEBOUNCE_SECONDS = 0.5
+# Refresh interval without filesystem events (seconds). Also catches changes
+# the watcher cannot see, e.g. commits in a gitdir outside the working tree.
+IDLE_REFRESH_INTERVAL = 30.0
+# Refresh interval when the working tree cannot be watched
+POLL_INTERVAL = 2.0
+# Paths per git invocation, keeps the command line bounded
+PATHSPEC_BATCH_SIZE = 200
+MAX_CACHED_NUMSTATS = 10000
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Callback arguments: file changes, whether HEAD or the branch moved
+ChangeCallback = Callable[[List[Dict[str, Any]], bool], None]
+
+
+class _WorkingTreeEventHandler(FileSystemEventHandler):
+    """Forwards filesystem events to the tracker"""
+
+    def __init__(self, tracker: "GitChangeTracker"):
+        self._tracker = tracker
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed", "closed_no_write"):
+            return
+        paths = [event.src_path]
+        if getattr(event, "dest_path", None):
+            paths.append(event.dest_path)
+        self._tracker.notify(
+            paths,
+            is_directory=event.is_directory,
+            structural=event.event_type in ("deleted", "moved"),
+        )
+
+
+class GitChangeTracker:
+    """
+    Tracks files changed in a working tree relative to a base commit
+    Responsibilities:
+    1. Collect paths touched since the previous refresh
+    2. Diff only those paths against the base commit
+    3. Report changes and HEAD moves through a callback
+    """
+
+    def __init__(
+        self,
+        repo_path: str,
+        base_commit: Optional[str],
+        on_change: Optional[ChangeCallback] = None,
+    ):
+        """
+        Initialize the tracker
+
+        Args:
+            repo_path: Working tree of the repository
+            base_commit: Commit to compare against, None compares with the index
+            on_change: Called from the tracker thread when changes or HEAD move
+        """
+        self.repo = Repo(repo_path)
+        self.repo_root = os.path.realpath(self.repo.working_tree_dir)
+        self.base_commit = base_commit
+        self.on_change = on_change
+
+        self._changes: Dict[str, Dict[str, Any]] = {}
+        # (base blob, working tree blob) -> (added, removed)
+        self._numstat_cache: Dict[Tuple[str, Optional[str]], Tuple[int, int]] = {}
+        self._head_state: Optional[Tuple[str, str]] = None
+        self._index_mtime: Optional[int] = None
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._dirty: set = set()
+        self._needs_full_scan = True
+        self._wake_event = threading.Event()
+        self._stop_event = threading.Event()
+        self._observer = None
+        self._thread: Optional[threading.Thread] = None
+
+    # =========================================================================
+    # Lifecycle
+    # =========================================================================
+
+    def start(self) -> None:
+        """Start watching the working tree, or polling if it cannot be watched"""
+        watching = self._start_observer()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(watching,),
+            name="GitChangeTracker",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(
+            f"Started git change tracking for {self.repo_root} "
+            f"({'filesystem events' if watching else f'polling every {POLL_INTERVAL}s'})"
+        )
+
+    def stop(self) -> None:
+        """Stop watching; safe to call from the change callback"""
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                if threading.current_thread() is not self._observer:
+                    self._observer.join(timeout=5)
+            except Exception as e:
+                logger.debug(f"Error stopping filesystem observer: {e}")
+            self._observer = None
+        if self._thread is not None and threading.current_thread() is not self._thread:
+            self._thread.join(timeout=5)
+
+    def _start_observer(self) -> bool:
+        if not WATCHDOG_AVAILABLE:
+            return False
+        try:
+            observer = Observer()
+            observer.schedule(
+                _WorkingTreeEventHandler(self), self.repo_root, recursive=True
+            )
+            observer.daemon = True
+            observer.start()
+        except Exception as e:
+            # e.g. inotify watch limit reached on very large trees
+            logger.warning(
+                f"Cannot watch {self.repo_root}, falling back to polling: {e}"
+            )
+            return False
+        self._observer = observer
+        return True
+
+    def _run(self, watching: bool) -> None:
+        self._refresh_and_notify()
+        while not self._stop_event.is_set():
+            if watching:
+                self._wake_event.wait(IDLE_REFRESH_INTERVAL)
+                # Let the rest of the burst arrive
+                self._stop_event.wait(DEBOUNCE_SECONDS)
+            else:
+                self._stop_event.wait(POLL_INTERVAL)
+                with self._lock:
+                    self._needs_full_scan = True
+            if self._stop_event.is_set():
+                break
+            self._wake_event.clear()
+            self._refresh_and_notify()
+
+    def _refresh_and_notify(self) -> None:
+        try:
+            changed, head_changed = self._refresh()
+            if (changed or head_changed) and self.on_change:
+                self.on_change(self.get_changes(), head_changed)
+        except Exception as e:
+            logger.warning(f"Error refreshing git changes: {e}")
+
+    # =========================================================================
+    # Events
+    # =========================================================================
+
+    def notify(
+        self, paths: Iterable[str], is_directory: bool = False, structural: bool = False
+    ) -> None:
+        """
+        Record filesystem events
+
+        Args:
+            paths: Absolute paths reported by the event
+            is_directory: Whether the paths are directories
+            structural: Whether the event deleted or moved them
+        """
+        touched = []
+        for path in paths:
+            rel_path = os.path.relpath(os.path.abspath(path), self.repo_root)
+            if rel_path == os.curdir or rel_path.startswith(os.pardir):
+                continue
+            if rel_path.split(os.sep, 1)[0] == ".git":
+                # HEAD and index are compared on every refresh
+                touched.append(None)
+                continue
+            if is_directory and not structural:
+                # Directory content changes are reported per file
+                continue
+            touched.append(rel_path.replace(os.sep, "/"))
+
+        if not touched:
+            return
+        with self._lock:
+            for rel_path in touched:
+                if rel_path is None:
+                    continue
+                if is_directory:
+                    # Moving or deleting a directory touches everything under it
+                    self._needs_full_scan = True
+                else:
+                    self._dirty.add(rel_path)
+        self._wake_event.set()
+
+    # =========================================================================
+    # Diffing
+    # =========================================================================
+
+    def get_changes(self) -> List[Dict[str, Any]]:
+        """Get the current file changes, sorted by path"""
+        return [self._changes[path] for path in sorted(self._changes)]
+
+    def refresh(self, full: bool = False) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Bring the file changes up to date
+
+        Args:
+            full: Diff the whole working tree instead of the touched paths
+
+        Returns:
+            (file changes, whether HEAD or the branch moved)
+        """
+        if full:
+            with self._lock:
+                self._needs_full_scan = True
+        _, head_changed = self._refresh()
+        return self.get_changes(), head_changed
+
+    def _refresh(self) -> Tuple[bool, bool]:
+        with self._refresh_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, set()
+                full, self._needs_full_scan = self._needs_full_scan, False
+
+            head_state = self._read_head_state()
+            head_changed = head_state != self._head_state
+            self._head_state = head_state
+
+            # Staging and committing change which files are tracked
+            index_mtime = self._read_index_mtime()
+            if index_mtime != self._index_mtime:
+                self._index_mtime = index_mtime
+                full = True
+
+            if full:
+                changes = self._diff_paths(None)
+                changed = changes != self._changes
+                self._changes = changes
+            elif dirty:
+                changes = self._diff_paths(sorted(dirty))
+                changed = False
+                for path, change in list(self._changes.items()):
+                    if (
+                        change["old_path"] in dirty or change["new_path"] in dirty
+                    ) and changes.get(path) != change:
+                        del self._changes[path]
+                        changed = True
+                for path, change in changes.items():
+                    if self._changes.get(path) != change:
+                        self._changes[path] = change
+                        changed = True
+            else:
+                changed = False
+
+            if full or dirty:
+                # git diff may refresh stat data in the index, which is not a
+                # change in tracked files
+                self._index_mtime = self._read_index_mtime()
+
+            return changed, head_changed
+
+    def _read_head_state(self) -> Tuple[str, str]:
+        head = self.repo.head
+        branch = "" if head.is_detached else head.reference.name
+        return head.commit.hexsha, branch
+
+    def _read_index_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.repo.index.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _diff_args(self) -> List[str]:
+        return [self.base_commit] if self.base_commit else []
+
+    def _diff_paths(self, paths: Optional[List[str]]) -> Dict[str, Dict[str, Any]]:
+        """Diff paths (or the whole tree) against the base, keyed by new path"""
+        if paths is None:
+            batches = [None]
+        else:
+            batches = [
+                paths[i : i + PATHSPEC_BATCH_SIZE]
+                for i in range(0, len(paths), PATHSPEC_BATCH_SIZE)
+            ]
+
+        changes = {}
+        for batch in batches:
+            try:
+                entries = self._diff_raw(batch)
+            except GitCommandError as e:
+                if not self.base_commit:
+                    raise
+                logger.warning(
+                    f"Failed to compare with base commit: {e}, "
+                    "falling back to unstaged changes"
+                )
+                self.base_commit = None
+                return self._diff_paths(paths)
+
+            # Line counts only for content not seen before
+            misses = [
+                entry for entry in entries if entry["key"] not in self._numstat_cache
+            ]
+            if misses:
+                self._count_lines(misses)
+
+            for entry in entries:
+                added, removed = self._numstat_cache.get(entry["key"], (0, 0))
+                changes[entry["new_path"]] = {
+                    "old_path": entry["old_path"],
+                    "new_path": entry["new_path"],
+                    "new_file": entry["status"] == "A",
+                    "renamed_file": entry["status"] == "R",
+                    "deleted_file": entry["status"] == "D",
+                    "added_lines": added,
+                    "removed_lines": removed,
+                    "diff_title": os.path.basename(entry["new_path"]),
+                }
+        return changes
+
+    def _diff_raw(self, paths: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Run `git diff --raw`, which lists changed files without diffing content"""
+        args = [*self._diff_args(), "--raw", "-z", "-M", "--no-abbrev"]
+        if paths is not None:
+            args += ["--", *paths]
+        tokens = self.repo.git.diff(*args).split("\0")
+
+        entries = []
+        i = 0
+        while i < len(tokens):
+            meta = tokens[i]
+            i += 1
+            if not meta.startswith(":"):
+                continue
+            _, _, base_blob, _, status = meta[1:].split(" ", 4)
+            status = status[0]
+            if status in ("R", "C"):
+                old_path, new_path = tokens[i], tokens[i + 1]
+                i += 2
+            else:
+                old_path = new_path = tokens[i]
+                i += 1
+            if status == "C":
+                status = "A"
+
+            worktree_blob = None if status == "D" else self._hash_worktree(new_path)
+            entries.append(
+                {
+                    "status": status,
+                    "old_path": old_path,
+                    "new_path": new_path,
+                    "key": (base_blob, worktree_blob),
+                }
+            )
+        return entries
+
+    def _count_lines(self, entries: List[Dict[str, Any]]) -> None:
+        """Fill the numstat cache with `git diff --numstat`, without building patches"""
+        paths = sorted(
+            {path for e in entries for path in (e["old_path"], e["new_path"])}
+        )
+        output = self.repo.git.diff(
+            *self._diff_args(), "--numstat", "-z", "-M", "--", *paths
+        )
+
+        counts: Dict[str, Tuple[int, int]] = {}
+        tokens = output.split("\0")
+        i = 0
+        while i < len(tokens):
+            fields = tokens[i].split("\t")
+            i += 1
+            if len(fields) != 3:
+                continue
+            added, removed, path = fields
+            if not path:
+                # Rename: old and new path follow
+                path = tokens[i + 1]
+                i += 2
+            # Binary files report "-"
+            counts[path] = (
+                int(added) if added.isdigit() else 0,
+                int(removed) if removed.isdigit() else 0,
+            )
+
+        if len(self._numstat_cache) + len(entries) > MAX_CACHED_NUMSTATS:
+            self._numstat_cache.clear()
+        for entry in entries:
+            self._numstat_cache[entry["key"]] = counts.get(entry["new_path"], (0, 0))
+
+    def _hash_worktree(self, rel_path: str) -> Optional[str]:
+        """Git blob id of a working tree file, the same as `git hash-object`"""
+        path = os.path.join(self.repo_root, rel_path)
+        try:
+            if os.path.islink(path):
+                target = os.readlink(path).encode()
+                digest = hashlib.sha1(b"blob %d\0" % len(target))
+                digest.update(target)
+                return digest.hexdigest()
+
+            with open(path, "rb") as f:
+                digest = hashlib.sha1(b"blob %d\0" % os.fstat(f.fileno()).st_size)
+                while chunk := f.read(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                return digest.hexdigest()
+        except OSError:
+            return None
@@ -9,8 +9,8 @@
 """
 Progress State Manager - Unified management of thinking and workbench states
 """
+
 import os
-import threading
 from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import urlparse
@@ -18,6 +18,8 @@ from urllib.parse import urlparse
 try:
     from git import GitCommandError, InvalidGitRepositoryError, Repo
 
+    from executor.agents.claude_code.git_change_tracker import GitChangeTracker
+
     GIT_AVAILABLE = True
 except ImportError:
     GIT_AVAILABLE = False
@@ -60,14 +62,14 @@ class ProgressStateManager:
         self.project_path = project_path
         self.workbench_data: Optional[Dict[str, Any]] = None
         self.initial_commit_id: Optional[str] = None  # Save commit ID at task start
-        self._monitor_timer: Optional[threading.Timer] = (
-            None  # Periodic monitoring task
+        self._change_tracker: Optional["GitChangeTracker"] = (
+            None  # Event-driven git change tracking
         )
         self._is_monitoring: bool = False  # Monitoring status flag
 
     def initialize_workbench(self, status: str = "running") -> None:
         """
-        Initialize workbench data structure, save initial commit ID, and start periodic monitoring
+        Initialize workbench data structure, save initial commit ID, and start change monitoring
 
         Args:
             status: Initial status ("running" | "completed" | "failed")
@@ -77,7 +79,7 @@ class ProgressStateManager:
         # Save initial commit ID
         self._save_initial_commit()
 
-        # Start periodic monitoring task
+        # Start change monitoring
         self._start_monitoring()
 
         logger.info(f"Initialized workbench data with status: {status}")
@@ -350,7 +352,7 @@ class ProgressStateManager:
 
     def _get_git_file_changes(self) -> List[Dict[str, Any]]:
         """
-        Get file changes from git diff (using GitPython SDK)
+        Get file changes from git diff against the initial commit
 
         Returns:
             List of file change dictionaries with structure:
@@ -365,187 +367,106 @@ class ProgressStateManager:
                 "diff_title": str
             }
         """
-        file_changes = []
-
         if not GIT_AVAILABLE:
             logger.warning(
                 "GitPython is not available, skipping file changes detection"
             )
-            return file_changes
+            return []
 
         try:
-            # Get working directory from project_path
-            repo_path = self.project_path
-
-            if not repo_path or not os.path.exists(repo_path):
-                return file_changes
-
-            # Initialize Git repository object
-            try:
-                repo = Repo(repo_path)
-            except InvalidGitRepositoryError:
-                logger.warning(f"Not a valid git repository: {repo_path}")
-                return file_changes
-
-            # Get current branch name (for logging)
-            try:
-                current_branch = repo.active_branch.name
-            except Exception:
-                current_branch = "HEAD"
-
-            # Get file changes: prioritize initial commit comparison, otherwise use unstaged changes
-            if self.initial_commit_id:
-                try:
-                    # Compare initial commit with current state (including all committed and uncommitted changes)
-                    initial_commit = repo.commit(self.initial_commit_id)
-                    current_commit = repo.head.commit
-
-                    # Get committed changes (initial_commit..HEAD)
-                    committed_diffs = initial_commit.diff(
-                        current_commit, create_patch=True
-                    )
-
-                    # Get unstaged changes (working tree vs index)
-                    unstaged_diffs = repo.index.diff(None, create_patch=True)
-
-                    # Get staged but uncommitted changes (HEAD vs index)
-                    # Use diff(None) to get differences between index and working tree, then reverse
-                    staged_diffs = repo.index.diff(current_commit, create_patch=True)
-
-                    # Merge all changes (use dictionary for deduplication with file path as key)
-                    all_diffs_dict = {}
-
-                    # First add committed changes
-                    for diff in committed_diffs:
-                        path = diff.b_path if diff.b_path else diff.a_path
-                        all_diffs_dict[path] = diff
-
-                    # Then add staged changes (will override committed files with same name)
-                    for diff in staged_diffs:
-                        path = diff.b_path if diff.b_path else diff.a_path
-                        all_diffs_dict[path] = diff
-
-                    # Finally add unstaged changes (highest priority)
-                    for diff in unstaged_diffs:
-                        path = diff.b_path if diff.b_path else diff.a_path
-                        all_diffs_dict[path] = diff
-
-                    diffs = list(all_diffs_dict.values())
-                except Exception as e:
-                    logger.warning(
-                        f"Failed to compare with initial commit: {str(e)}, falling back to unstaged changes"
-                    )
-                    diffs = repo.index.diff(None, create_patch=True)
-            else:
-                # No initial commit ID, only get unstaged changes
-                diffs = repo.index.diff(None, create_patch=True)
-                logger.info(
-                    f"No initial commit ID, using unstaged changes only: {len(diffs)} files"
-                )
-
-            for diff in diffs:
-                # Get file paths
-                old_path = diff.a_path if diff.a_path else diff.b_path
-                new_path = diff.b_path if diff.b_path else diff.a_path
-
-                # Determine file status
-                new_file = diff.new_file
-                deleted_file = diff.deleted_file
-                renamed_file = diff.renamed_file
-
-                # Calculate added/removed lines
-                added_lines = 0
-                removed_lines = 0
-
-                if diff.diff:
-                    # Parse diff content to count lines
-                    diff_text = diff.diff.decode("utf-8", errors="ignore")
-                    for line in diff_text.split("\n"):
-                        if line.startswith("+") and not line.startswith("+++"):
-                            added_lines += 1
-                        elif line.startswith("-") and not line.startswith("---"):
-                            removed_lines += 1
-
-                # Generate diff title (filename without path)
-                diff_title = os.path.basename(new_path)
-
-                file_change = {
-                    "old_path": old_path,
-                    "new_path": new_path,
-                    "new_file": new_file,
-                    "renamed_file": renamed_file,
-                    "deleted_file": deleted_file,
-                    "added_lines": added_lines,
-                    "removed_lines": removed_lines,
-                    "diff_title": diff_title,
-                }
-
-                file_changes.append(file_change)
-
+            tracker = self._change_tracker or self._create_change_tracker()
+            if tracker is None:
+                return []
+            file_changes, _ = tracker.refresh(full=True)
+            return file_changes
         except GitCommandError as e:
             logger.warning(f"Git command failed: {str(e)}")
         except Exception as e:
             logger.warning(f"Failed to get git file changes: {str(e)}", exc_info=True)
 
-        return file_changes
+        return []
+
+    def _create_change_tracker(self) -> Optional["GitChangeTracker"]:
+        """
+        Create a change tracker for the project repository
+
+        Returns:
+            GitChangeTracker, or None if the project is not a git repository
+        """
+        repo_path = self.project_path
+        if not repo_path or not os.path.exists(repo_path):
+            return None
+
+        try:
+            tracker = GitChangeTracker(
+                repo_path,
+                self.initial_commit_id,
+                on_change=self._on_git_changes,
+            )
+        except InvalidGitRepositoryError:
+            logger.warning(f"Not a valid git repository: {repo_path}")
+            return None
+
+        if not self.initial_commit_id:
+            logger.info("No initial commit ID, using unstaged changes only")
+        return tracker
 
     def _start_monitoring(self) -> None:
         """
-        Start periodic monitoring task, check git changes every 2 seconds
+        Start tracking git changes, driven by filesystem events in the project
         """
         if self._is_monitoring:
             logger.warning("Monitoring is already running")
             return
 
         self._is_monitoring = True
-        self._schedule_next_check()
-        logger.info("Started git changes monitoring (interval: 2s)")
+        if not GIT_AVAILABLE:
+            return
+
+        try:
+            self._change_tracker = self._create_change_tracker()
+            if self._change_tracker:
+                self._change_tracker.start()
+                logger.info("Started git changes monitoring")
+        except Exception as e:
+            logger.warning(f"Failed to start git changes monitoring: {str(e)}")
 
     def _stop_monitoring(self) -> None:
         """
-        Stop periodic monitoring task
+        Stop tracking git changes
         """
         self._is_monitoring = False
-        if self._monitor_timer:
-            self._monitor_timer.cancel()
-            self._monitor_timer = None
-        logger.info("Stopped git changes monitoring")
+        if self._change_tracker:
+            self._change_tracker.stop()
+            self._change_tracker = None
+            logger.info("Stopped git changes monitoring")
 
-    def _schedule_next_check(self) -> None:
-        """
-        Schedule next check
+    def _on_git_changes(
+        self, file_changes: List[Dict[str, Any]], head_changed: bool
+    ) -> None:
         """
-        if not self._is_monitoring:
-            return
-
-        self._monitor_timer = threading.Timer(2.0, self._check_git_changes)
-        self._monitor_timer.daemon = True
-        self._monitor_timer.start()
+        Update workbench data when the tracker reports changes
 
-    def _check_git_changes(self) -> None:
-        """
-        Periodically check git changes and update workbench data
+        Args:
+            file_changes: Current file changes
+            head_changed: Whether HEAD or the branch moved, i.e. commits may be new
         """
         try:
             if not self._is_monitoring or self.workbench_data is None:
                 return
 
-            # Detect file changes
-            file_changes = self._get_git_file_changes()
             if file_changes:
                 self.workbench_data["file_changes"] = file_changes
 
             # Detect new commits and branch changes
-            self._update_task_commits()
+            if head_changed:
+                self._update_task_commits()
 
             # Update last check time
             self.workbench_data["lastUpdated"] = datetime.now().isoformat()
 
         except Exception as e:
             logger.warning(f"Error during git changes check: {str(e)}")
-        finally:
-            # Schedule next check
-            self._schedule_next_check()
 
     def __del__(self):
         """
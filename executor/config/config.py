@@ -24,6 +24,15 @@ CANCEL_RETRY_ATTEMPTS = int(os.environ.get("CANCEL_RETRY_ATTEMPTS", "3"))
 CANCEL_RETRY_DELAY = int(os.environ.get("CANCEL_RETRY_DELAY", "2"))
 GRACEFUL_SHUTDOWN_TIMEOUT = int(os.environ.get("GRACEFUL_SHUTDOWN_TIMEOUT", "10"))
 
+# Attachment download configuration
+# ATTACHMENT_CACHE_DIR is a host-level directory shared between executor containers;
+# attachments carrying a sha256 checksum are cached there, leave empty to disable
+ATTACHMENT_DOWNLOAD_WORKERS = int(os.environ.get("ATTACHMENT_DOWNLOAD_WORKERS", "4"))
+ATTACHMENT_CACHE_DIR = os.environ.get("ATTACHMENT_CACHE_DIR", "")
+ATTACHMENT_CACHE_MAX_BYTES = int(
+    os.environ.get("ATTACHMENT_CACHE_MAX_BYTES", str(10 * 1024 * 1024 * 1024))
+)
+
 # Custom instruction files configuration
 # These files will be automatically loaded from the project root and merged with systemPrompt
 # Supports relative paths from project root (e.g., ".cursorrules", ".cursor/rules", "docs/.ai-guidelines")
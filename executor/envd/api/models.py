@@ -46,3 +46,19 @@ class ErrorResponse(BaseModel):
 
     message: str
     code: int
+
+
+class UploadStatus(BaseModel):
+    """State of a resumable upload"""
+
+    upload_id: str
+    path: str
+    offset: int
+    complete: bool
+
+
+class ArchiveResult(BaseModel):
+    """Result of unpacking an archive"""
+
+    path: str
+    entries: int
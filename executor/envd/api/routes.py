@@ -6,21 +6,63 @@ REST API route handlers for envd
 """
 
 import os
+import re
+import tarfile
 import time
+from pathlib import Path
 from typing import Optional
 
 import psutil
-from fastapi import FastAPI, File, Header, HTTPException, Query, Response, UploadFile
-from fastapi.responses import FileResponse
+from fastapi import (
+    FastAPI,
+    File,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import FileResponse, StreamingResponse
 
 from shared.logger import setup_logger
 
-from .models import EntryInfo, InitRequest, MetricsResponse
+from .models import ArchiveResult, EntryInfo, InitRequest, MetricsResponse, UploadStatus
 from .state import AccessTokenAlreadySetError, get_state_manager
+from .transfer import (
+    RangeNotSatisfiableError,
+    UploadOffsetError,
+    abort_upload,
+    check_archive_format,
+    extract_archive,
+    get_upload_offset,
+    iter_archive,
+    iter_file_range,
+    parse_content_range,
+    parse_range_header,
+    save_upload,
+    write_upload_chunk,
+)
 from .utils import resolve_path, verify_access_token, verify_signature
 
 logger = setup_logger("envd_api_routes")
 
+# Minimum free disk space required to accept uploads
+MIN_FREE_DISK_SPACE = 100 * 1024 * 1024
+
+UPLOAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+def _check_disk_space(directory: Path) -> None:
+    disk = psutil.disk_usage(directory)
+    if disk.free < MIN_FREE_DISK_SPACE:
+        raise HTTPException(status_code=507, detail="Not enough disk space")
+
+
+def _check_upload_id(upload_id: str) -> None:
+    if not UPLOAD_ID_PATTERN.match(upload_id):
+        raise HTTPException(status_code=400, detail=f"Invalid upload id: {upload_id}")
+
 
 def register_rest_api(app: FastAPI):
     """Register REST API endpoints from OpenAPI spec"""
@@ -84,6 +126,13 @@ def register_rest_api(app: FastAPI):
                 default_workdir=request.defaultWorkdir,
             )
 
+            # Warm pool containers are bound to a sandbox here
+            heartbeat_id = (request.envVars or {}).get("HEARTBEAT_ID")
+            if heartbeat_id:
+                from executor.services.heartbeat_service import bind_heartbeat
+
+                bind_heartbeat(heartbeat_id)
+
             # Set response headers as per reference implementation
             return Response(
                 status_code=204,
@@ -110,8 +159,9 @@ def register_rest_api(app: FastAPI):
         signature: Optional[str] = Query(None),
         signature_expiration: Optional[int] = Query(None),
         x_access_token: Optional[str] = Header(None),
+        range_header: Optional[str] = Header(None, alias="Range"),
     ):
-        """Download a file"""
+        """Download a file, or part of it with a Range header"""
         verify_access_token(x_access_token)
         verify_signature(signature, signature_expiration)
 
@@ -134,11 +184,35 @@ def register_rest_api(app: FastAPI):
                     status_code=401, detail=f"Permission denied: {path}"
                 )
 
-            # Return file
-            return FileResponse(
-                path=str(file_path),
+            file_size = file_path.stat().st_size
+            try:
+                byte_range = parse_range_header(range_header, file_size)
+            except RangeNotSatisfiableError:
+                return Response(
+                    status_code=416,
+                    headers={"Content-Range": f"bytes */{file_size}"},
+                )
+
+            if byte_range is None:
+                # Return file
+                return FileResponse(
+                    path=str(file_path),
+                    media_type="application/octet-stream",
+                    filename=file_path.name,
+                    headers={"Accept-Ranges": "bytes"},
+                )
+
+            start, end = byte_range
+            return StreamingResponse(
+                iter_file_range(file_path, start, end),
+                status_code=206,
                 media_type="application/octet-stream",
-                filename=file_path.name,
+                headers={
+                    "Accept-Ranges": "bytes",
+                    "Content-Range": f"bytes {start}-{end}/{file_size}",
+                    "Content-Length": str(end - start + 1),
+                    "Content-Disposition": f'attachment; filename="{file_path.name}"',
+                },
             )
 
         except HTTPException:
@@ -168,15 +242,12 @@ def register_rest_api(app: FastAPI):
             file_path.parent.mkdir(parents=True, exist_ok=True)
 
             # Check disk space
-            disk = psutil.disk_usage(file_path.parent)
-            if disk.free < 100 * 1024 * 1024:  # Less than 100MB free
-                raise HTTPException(status_code=507, detail="Not enough disk space")
+            _check_disk_space(file_path.parent)
 
-            # Write file
-            content = await file.read()
-            file_path.write_bytes(content)
+            # Write file in chunks
+            size = await save_upload(file, file_path)
 
-            logger.info(f"Uploaded file to {file_path} ({len(content)} bytes)")
+            logger.info(f"Uploaded file to {file_path} ({size} bytes)")
 
             # Return entry info
             return [EntryInfo(path=str(file_path), name=file_path.name, type="file")]
@@ -187,6 +258,172 @@ def register_rest_api(app: FastAPI):
             logger.exception(f"Error uploading file: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.get("/files/uploads/{upload_id}", response_model=UploadStatus)
+    async def get_upload_status(
+        upload_id: str,
+        path: Optional[str] = Query(None),
+        username: Optional[str] = Query(None),
+        signature: Optional[str] = Query(None),
+        signature_expiration: Optional[int] = Query(None),
+        x_access_token: Optional[str] = Header(None),
+    ):
+        """Get the offset to resume a resumable upload from"""
+        verify_access_token(x_access_token)
+        verify_signature(signature, signature_expiration)
+        _check_upload_id(upload_id)
+
+        file_path = resolve_path(path, username, state_manager.default_workdir)
+        return UploadStatus(
+            upload_id=upload_id,
+            path=str(file_path),
+            offset=get_upload_offset(file_path, upload_id),
+            complete=False,
+        )
+
+    @app.put("/files/uploads/{upload_id}", response_model=UploadStatus)
+    async def upload_file_chunk(
+        upload_id: str,
+        request: Request,
+        path: Optional[str] = Query(None),
+        username: Optional[str] = Query(None),
+        signature: Optional[str] = Query(None),
+        signature_expiration: Optional[int] = Query(None),
+        x_access_token: Optional[str] = Header(None),
+        content_range: Optional[str] = Header(None),
+    ):
+        """
+        Upload a chunk of a file, streamed from the raw request body
+
+        - Content-Range: bytes <start>-<end>/<total> gives the chunk position
+        - The file is moved into place once <total> bytes are received
+        - Returns 409 with the expected offset if the chunk leaves a gap
+        """
+        verify_access_token(x_access_token)
+        verify_signature(signature, signature_expiration)
+        _check_upload_id(upload_id)
+
+        try:
+            start, total = parse_content_range(content_range)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        try:
+            file_path = resolve_path(path, username, state_manager.default_workdir)
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            _check_disk_space(file_path.parent)
+
+            offset, complete = await write_upload_chunk(
+                request.stream(), file_path, upload_id, start, total
+            )
+            if complete:
+                logger.info(f"Uploaded file to {file_path} ({offset} bytes)")
+
+            return UploadStatus(
+                upload_id=upload_id,
+                path=str(file_path),
+                offset=offset,
+                complete=complete,
+            )
+
+        except UploadOffsetError as e:
+            raise HTTPException(
+                status_code=409,
+                detail=str(e),
+                headers={"Upload-Offset": str(e.offset)},
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception(f"Error uploading file chunk: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @app.delete("/files/uploads/{upload_id}", status_code=204)
+    async def abort_file_upload(
+        upload_id: str,
+        path: Optional[str] = Query(None),
+        username: Optional[str] = Query(None),
+        signature: Optional[str] = Query(None),
+        signature_expiration: Optional[int] = Query(None),
+        x_access_token: Optional[str] = Header(None),
+    ):
+        """Discard the partial file of a resumable upload"""
+        verify_access_token(x_access_token)
+        verify_signature(signature, signature_expiration)
+        _check_upload_id(upload_id)
+
+        file_path = resolve_path(path, username, state_manager.default_workdir)
+        abort_upload(file_path, upload_id)
+        return Response(status_code=204)
+
+    @app.get("/files/archive")
+    async def download_archive(
+        path: Optional[str] = Query(None),
+        format: str = Query("tar"),
+        username: Optional[str] = Query(None),
+        signature: Optional[str] = Query(None),
+        signature_expiration: Optional[int] = Query(None),
+        x_access_token: Optional[str] = Header(None),
+    ):
+        """Download a directory tree as a tar, tar.gz or tar.zst archive"""
+        verify_access_token(x_access_token)
+        verify_signature(signature, signature_expiration)
+
+        try:
+            media_type = check_archive_format(format)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        dir_path = resolve_path(path, username, state_manager.default_workdir)
+        if not dir_path.is_dir():
+            raise HTTPException(status_code=404, detail=f"Directory not found: {path}")
+
+        return StreamingResponse(
+            iter_archive(dir_path, format),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="{dir_path.name or "root"}.{format}"'
+                )
+            },
+        )
+
+    @app.post("/files/archive", response_model=ArchiveResult)
+    async def upload_archive(
+        request: Request,
+        path: Optional[str] = Query(None),
+        format: str = Query("tar"),
+        username: Optional[str] = Query(None),
+        signature: Optional[str] = Query(None),
+        signature_expiration: Optional[int] = Query(None),
+        x_access_token: Optional[str] = Header(None),
+    ):
+        """Unpack a tar, tar.gz or tar.zst archive streamed in the request body"""
+        verify_access_token(x_access_token)
+        verify_signature(signature, signature_expiration)
+
+        try:
+            check_archive_format(format)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+        try:
+            dir_path = resolve_path(path, username, state_manager.default_workdir)
+            dir_path.mkdir(parents=True, exist_ok=True)
+            _check_disk_space(dir_path)
+
+            entries = await extract_archive(request.stream(), dir_path, format)
+            logger.info(f"Extracted {entries} archive entries to {dir_path}")
+
+            return ArchiveResult(path=str(dir_path), entries=entries)
+
+        except (ValueError, tarfile.TarError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid archive: {e}")
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.exception(f"Error extracting archive: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     logger.info("Registered envd REST API routes:")
     logger.info("  GET /health")
     logger.info("  GET /metrics")
@@ -194,3 +431,5 @@ def register_rest_api(app: FastAPI):
     logger.info("  GET /envs")
     logger.info("  GET /files")
     logger.info("  POST /files")
+    logger.info("  GET/PUT/DELETE /files/uploads/{upload_id}")
+    logger.info("  GET/POST /files/archive")
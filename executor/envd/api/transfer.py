@@ -0,0 +1,482 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Streaming file transfer helpers for envd REST API
+
+Uploads and downloads go through disk in fixed-size chunks, so memory use does
+not depend on the file size. Archives are produced and consumed by a worker
+thread connected to the request through a bounded queue, which gives
+backpressure in both directions.
+"""
+
+import asyncio
+import io
+import os
+import queue
+import tarfile
+import threading
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Optional, Tuple
+
+import anyio
+from fastapi import UploadFile
+
+from shared.logger import setup_logger
+
+try:
+    import zstandard
+except ImportError:  # Optional, only needed for tar.zst archives
+    zstandard = None
+
+logger = setup_logger("envd_api_transfer")
+
+CHUNK_SIZE = 1024 * 1024
+# Chunks buffered between the archive worker thread and the request
+ARCHIVE_QUEUE_SIZE = 4
+QUEUE_POLL_TIMEOUT = 0.5
+
+ARCHIVE_MEDIA_TYPES = {
+    "tar": "application/x-tar",
+    "tar.gz": "application/gzip",
+    "tar.zst": "application/zstd",
+}
+
+
+class RangeNotSatisfiableError(Exception):
+    """Raised when a Range header does not overlap the file"""
+
+    pass
+
+
+class UploadOffsetError(Exception):
+    """Raised when a resumable upload chunk does not continue the partial file"""
+
+    def __init__(self, offset: int):
+        super().__init__(f"Upload must resume at offset {offset}")
+        self.offset = offset
+
+
+class _TransferCancelled(Exception):
+    pass
+
+
+# =============================================================================
+# Downloads
+# =============================================================================
+
+
+def parse_range_header(
+    range_header: Optional[str], file_size: int
+) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range HTTP Range header
+
+    Multiple ranges and unknown units are ignored, and the whole file is sent.
+
+    Args:
+        range_header: Value of the Range header
+        file_size: Size of the requested file
+
+    Returns:
+        Inclusive (start, end) byte positions, or None for the whole file
+
+    Raises:
+        RangeNotSatisfiableError: If the range starts past the end of the file
+    """
+    if not range_header:
+        return None
+
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    start_str, _, end_str = spec.strip().partition("-")
+    try:
+        if not start_str:
+            # Suffix range: last N bytes
+            suffix = int(end_str)
+            if suffix <= 0:
+                raise RangeNotSatisfiableError(range_header)
+            start, end = max(0, file_size - suffix), file_size - 1
+        else:
+            start = int(start_str)
+            end = min(int(end_str), file_size - 1) if end_str else file_size - 1
+    except ValueError:
+        return None
+
+    if start >= file_size or start > end:
+        raise RangeNotSatisfiableError(range_header)
+    return start, end
+
+
+async def iter_file_range(path: Path, start: int, end: int) -> AsyncIterator[bytes]:
+    """Read bytes start..end (inclusive) of a file in chunks"""
+    remaining = end - start + 1
+    async with await anyio.open_file(path, "rb") as f:
+        await f.seek(start)
+        while remaining > 0:
+            chunk = await f.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+# =============================================================================
+# Uploads
+# =============================================================================
+
+
+async def save_upload(upload: UploadFile, target: Path) -> int:
+    """
+    Copy an uploaded file to its target in chunks
+
+    The data is written to a temporary file next to the target and moved into
+    place at the end, so readers never see a half-written file.
+
+    Returns:
+        Number of bytes written
+    """
+    tmp_path = target.with_name(f".{target.name}.{uuid.uuid4().hex}.tmp")
+    size = 0
+    try:
+        async with await anyio.open_file(tmp_path, "wb") as out:
+            while chunk := await upload.read(CHUNK_SIZE):
+                await out.write(chunk)
+                size += len(chunk)
+        os.replace(tmp_path, target)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return size
+
+
+def parse_content_range(content_range: Optional[str]) -> Tuple[int, Optional[int]]:
+    """
+    Parse the Content-Range header of a resumable upload chunk
+
+    Accepts "bytes start-end/total", and no header, which means a single
+    chunk at offset 0 that completes the upload.
+
+    Returns:
+        (start, total); total is None without a header
+
+    Raises:
+        ValueError: If the header is malformed
+    """
+    if not content_range:
+        return 0, None
+
+    unit, _, spec = content_range.strip().partition(" ")
+    if unit.lower() != "bytes":
+        raise ValueError(f"Unsupported Content-Range unit: {unit}")
+
+    byte_range, _, total_str = spec.partition("/")
+    start_str, _, end_str = byte_range.partition("-")
+    start, end, total = int(start_str), int(end_str), int(total_str)
+
+    if start < 0 or end < start or end >= total:
+        raise ValueError(f"Invalid Content-Range: {content_range}")
+    return start, total
+
+
+def partial_upload_path(target: Path, upload_id: str) -> Path:
+    """Path of the partial file of a resumable upload, next to its target"""
+    return target.with_name(f".{target.name}.{upload_id}.part")
+
+
+def get_upload_offset(target: Path, upload_id: str) -> int:
+    """Number of bytes already received for a resumable upload"""
+    try:
+        return partial_upload_path(target, upload_id).stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+async def write_upload_chunk(
+    stream: AsyncIterator[bytes],
+    target: Path,
+    upload_id: str,
+    start: int,
+    total: Optional[int],
+) -> Tuple[int, bool]:
+    """
+    Append a chunk of a resumable upload
+
+    A chunk may start at or before the current offset, so a client can retry a
+    chunk whose response it did not receive. Whatever was written before the
+    client disconnected is kept and reported by get_upload_offset.
+
+    Args:
+        stream: Request body
+        target: Final path of the uploaded file
+        upload_id: Client-chosen id of the upload
+        start: Offset of the chunk
+        total: Total file size if known; None completes the upload after
+            this chunk
+
+    Returns:
+        (offset, complete)
+
+    Raises:
+        UploadOffsetError: If the chunk would leave a gap
+    """
+    partial = partial_upload_path(target, upload_id)
+    offset = get_upload_offset(target, upload_id)
+    if start > offset:
+        raise UploadOffsetError(offset)
+
+    async with await anyio.open_file(partial, "ab" if start == offset else "r+b") as f:
+        if start < offset:
+            await f.truncate(start)
+            await f.seek(start)
+        offset = start
+        async for chunk in stream:
+            await f.write(chunk)
+            offset += len(chunk)
+
+    complete = total is None or offset >= total
+    if complete:
+        os.replace(partial, target)
+    return offset, complete
+
+
+def abort_upload(target: Path, upload_id: str) -> None:
+    partial_upload_path(target, upload_id).unlink(missing_ok=True)
+
+
+# =============================================================================
+# Archives
+# =============================================================================
+
+
+def check_archive_format(archive_format: str) -> str:
+    """
+    Validate an archive format
+
+    Returns:
+        Media type of the format
+
+    Raises:
+        ValueError: If the format is unknown or its codec is not installed
+    """
+    if archive_format not in ARCHIVE_MEDIA_TYPES:
+        raise ValueError(
+            f"Unsupported archive format: {archive_format}, "
+            f"expected one of {', '.join(ARCHIVE_MEDIA_TYPES)}"
+        )
+    if archive_format == "tar.zst" and zstandard is None:
+        raise ValueError("tar.zst archives require the zstandard package")
+    return ARCHIVE_MEDIA_TYPES[archive_format]
+
+
+class _QueueWriter(io.RawIOBase):
+    """Write end of the worker thread -> request queue"""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        chunk = bytes(data)
+        while not self._cancelled.is_set():
+            try:
+                self._chunks.put(chunk, timeout=QUEUE_POLL_TIMEOUT)
+                return len(chunk)
+            except queue.Full:
+                continue
+        raise _TransferCancelled()
+
+
+class _QueueReader(io.RawIOBase):
+    """Read end of the request -> worker thread queue, None marks the end"""
+
+    def __init__(self, chunks: queue.Queue, cancelled: threading.Event):
+        self._chunks = chunks
+        self._cancelled = cancelled
+        self._pending = b""
+        self._eof = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending and not self._eof:
+            if self._cancelled.is_set():
+                raise _TransferCancelled()
+            try:
+                chunk = self._chunks.get(timeout=QUEUE_POLL_TIMEOUT)
+            except queue.Empty:
+                continue
+            if chunk is None:
+                self._eof = True
+            else:
+                self._pending = chunk
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def _write_archive(directory: Path, archive_format: str, out) -> None:
+    compressor = None
+    fileobj = out
+    if archive_format == "tar.zst":
+        compressor = zstandard.ZstdCompressor().stream_writer(out, closefd=False)
+        fileobj = compressor
+
+    mode = "w|gz" if archive_format == "tar.gz" else "w|"
+    with tarfile.open(fileobj=fileobj, mode=mode) as tar:
+        tar.add(str(directory), arcname=".")
+
+    if compressor is not None:
+        compressor.close()
+    out.flush()
+
+
+async def iter_archive(directory: Path, archive_format: str) -> AsyncIterator[bytes]:
+    """
+    Stream a directory tree as an archive
+
+    Args:
+        directory: Directory to pack
+        archive_format: One of ARCHIVE_MEDIA_TYPES
+
+    Yields:
+        Archive bytes in chunks of up to CHUNK_SIZE
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+    cancelled = threading.Event()
+    done = object()
+
+    def produce():
+        out = io.BufferedWriter(_QueueWriter(chunks, cancelled), CHUNK_SIZE)
+        result = done
+        try:
+            _write_archive(directory, archive_format, out)
+        except _TransferCancelled:
+            return
+        except Exception as e:
+            result = e
+        # Unblocks the consumer even if the archive failed halfway
+        while not cancelled.is_set():
+            try:
+                chunks.put(result, timeout=QUEUE_POLL_TIMEOUT)
+                return
+            except queue.Full:
+                continue
+
+    def next_item():
+        while not cancelled.is_set():
+            try:
+                return chunks.get(timeout=QUEUE_POLL_TIMEOUT)
+            except queue.Empty:
+                continue
+        return done
+
+    threading.Thread(target=produce, name="EnvdArchiveWriter", daemon=True).start()
+    try:
+        while True:
+            item = await asyncio.to_thread(next_item)
+            if item is done:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Client went away or the archive is complete: stop the worker
+        cancelled.set()
+
+
+def _check_member(member: tarfile.TarInfo, root: Path) -> None:
+    """Reject members that would be written outside root or are not plain files"""
+    if not (member.isfile() or member.isdir() or member.issym() or member.islnk()):
+        raise ValueError(f"Unsupported archive member type: {member.name}")
+
+    target = (root / member.name).resolve()
+    if os.path.commonpath([root, target]) != str(root):
+        raise ValueError(f"Archive member outside target directory: {member.name}")
+
+    if member.issym():
+        link_target = (target.parent / member.linkname).resolve()
+    elif member.islnk():
+        link_target = (root / member.linkname).resolve()
+    else:
+        return
+    if os.path.commonpath([root, link_target]) != str(root):
+        raise ValueError(f"Archive link outside target directory: {member.name}")
+
+
+def _extract_archive(fileobj, directory: Path, archive_format: str) -> int:
+    directory.mkdir(parents=True, exist_ok=True)
+    root = directory.resolve()
+
+    if archive_format == "tar.zst":
+        fileobj = zstandard.ZstdDecompressor().stream_reader(fileobj)
+    mode = "r|gz" if archive_format == "tar.gz" else "r|"
+
+    # Extraction filters only exist in recent Python patch releases
+    extract_kwargs = {"filter": "data"} if hasattr(tarfile, "data_filter") else {}
+
+    count = 0
+    with tarfile.open(fileobj=fileobj, mode=mode) as tar:
+        for member in tar:
+            _check_member(member, root)
+            tar.extract(member, root, **extract_kwargs)
+            count += 1
+    return count
+
+
+async def extract_archive(
+    stream: AsyncIterator[bytes], directory: Path, archive_format: str
+) -> int:
+    """
+    Unpack an archive streamed in the request body into a directory
+
+    Args:
+        stream: Request body
+        directory: Directory to unpack into, created if missing
+        archive_format: One of ARCHIVE_MEDIA_TYPES
+
+    Returns:
+        Number of extracted entries
+
+    Raises:
+        ValueError: If a member would escape the directory
+        tarfile.TarError: If the archive is invalid
+    """
+    chunks: queue.Queue = queue.Queue(maxsize=ARCHIVE_QUEUE_SIZE)
+    cancelled = threading.Event()
+    reader = io.BufferedReader(_QueueReader(chunks, cancelled), CHUNK_SIZE)
+    extraction = asyncio.ensure_future(
+        asyncio.to_thread(_extract_archive, reader, directory, archive_format)
+    )
+
+    async def feed(item) -> bool:
+        # Stops feeding when the worker is done, e.g. on a corrupt archive
+        while not extraction.done():
+            try:
+                chunks.put_nowait(item)
+                return True
+            except queue.Full:
+                pass
+            try:
+                await asyncio.to_thread(chunks.put, item, True, QUEUE_POLL_TIMEOUT)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    try:
+        async for chunk in stream:
+            if chunk and not await feed(chunk):
+                break
+        await feed(None)
+        return await extraction
+    finally:
+        cancelled.set()
@@ -21,6 +21,7 @@ from executor.mcp_servers.wegent import start_wegent_mcp_server
 from executor.mcp_servers.wegent.server import stop_wegent_mcp_server
 from executor.services.agent_service import AgentService
 from executor.services.heartbeat_service import start_heartbeat, stop_heartbeat
+from executor.services.readiness_service import announce_ready_in_background
 from executor.tasks import process, run_task
 
 # Import the shared logger
@@ -123,6 +124,12 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.warning(f"Failed to start heartbeat service: {e}")
 
+    # Tell executor_manager when the server starts accepting connections
+    try:
+        announce_ready_in_background(int(os.getenv("PORT", 10001)))
+    except Exception as e:
+        logger.warning(f"Failed to schedule readiness announcement: {e}")
+
     yield  # Application runs here
 
     # Stop Wegent MCP server
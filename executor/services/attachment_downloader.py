@@ -7,15 +7,29 @@ Attachment downloader service for executor.
 
 Downloads attachments from Backend API to local workspace,
 similar to the skill download pattern.
+
+Attachments are fetched concurrently over a shared keep-alive session.
+Attachments that carry a sha256 checksum are also kept in a host-level
+content-addressed cache (ATTACHMENT_CACHE_DIR) so that follow-up subtasks and
+other executors on the same host copy them locally instead of downloading
+them again.
 """
 
+import hashlib
 import logging
 import os
+import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+from executor.config import config
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +37,9 @@ logger = logging.getLogger(__name__)
 # This follows the same pattern as skill downloads
 DEFAULT_API_BASE_URL = "http://wegent-backend:8000"
 
+# Chunk size for streaming downloads and cache copies
+CHUNK_SIZE = 64 * 1024
+
 
 @dataclass
 class AttachmentDownloadResult:
@@ -32,6 +49,110 @@ class AttachmentDownloadResult:
     failed: List[Dict[str, Any]]  # Failed attachments with error info
 
 
+class AttachmentCache:
+    """Content-addressed attachment cache shared between executors on a host.
+
+    Entries live at {cache_dir}/{attachment_id}/{sha256}. They are published
+    atomically (temp file + rename) and never modified afterwards; readers get
+    a private copy so edits in one task workspace cannot leak into the cache.
+
+    The directory is writable by every executor container on the host, so
+    entries are not trusted: each hit is hashed while it is copied and
+    entries that do not match their sha256 are evicted.
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._prune_lock = threading.Lock()
+
+    def entry_path(self, att_id: Any, sha256: str) -> str:
+        return os.path.join(self.cache_dir, str(att_id), sha256)
+
+    def copy_to(self, att_id: Any, sha256: str, dest_path: str) -> bool:
+        """
+        Copy a cached attachment to dest_path, verifying its checksum.
+
+        Returns:
+            True on cache hit, False if the entry does not exist or was
+            corrupt, in which case dest_path holds no usable content
+        """
+        entry = self.entry_path(att_id, sha256)
+        digest = hashlib.sha256()
+        try:
+            with open(entry, "rb") as src, open(dest_path, "wb") as dst:
+                for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+                    dst.write(chunk)
+        except FileNotFoundError:
+            return False
+
+        if digest.hexdigest() != sha256:
+            logger.warning(f"Evicting corrupt attachment cache entry {entry}")
+            try:
+                os.unlink(entry)
+            except OSError:
+                pass
+            return False
+        try:
+            # Recently used entries survive pruning
+            os.utime(entry)
+        except OSError:
+            pass
+        return True
+
+    def store(self, att_id: Any, sha256: str, src_path: str) -> None:
+        """Publish a downloaded and verified attachment to the cache."""
+        entry = self.entry_path(att_id, sha256)
+        if os.path.exists(entry):
+            return
+        entry_dir = os.path.dirname(entry)
+        Path(entry_dir).mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=entry_dir, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as dst, open(src_path, "rb") as src:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+            os.replace(tmp_path, entry)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self.prune()
+
+    def prune(self) -> None:
+        """Evict least recently used entries until the cache fits max_bytes."""
+        if self.max_bytes <= 0 or not self._prune_lock.acquire(blocking=False):
+            return
+        try:
+            entries = []
+            total = 0
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.startswith(".tmp-"):
+                        continue
+                    path = os.path.join(root, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+        finally:
+            self._prune_lock.release()
+
+
 class AttachmentDownloader:
     """Download attachments from Backend API to local workspace"""
 
@@ -44,6 +165,8 @@ class AttachmentDownloader:
         task_id: str,
         subtask_id: str,
         auth_token: str,
+        max_workers: Optional[int] = None,
+        cache_dir: Optional[str] = None,
     ):
         """
         Initialize attachment downloader.
@@ -53,6 +176,8 @@ class AttachmentDownloader:
             task_id: Task ID for organizing attachments
             subtask_id: Subtask ID for organizing attachments
             auth_token: JWT token for authenticated API calls
+            max_workers: Concurrent downloads, defaults to ATTACHMENT_DOWNLOAD_WORKERS
+            cache_dir: Shared cache directory, defaults to ATTACHMENT_CACHE_DIR
         """
         self.workspace = workspace
         self.task_id = task_id
@@ -63,6 +188,21 @@ class AttachmentDownloader:
         self.api_base_url = os.getenv("TASK_API_DOMAIN", DEFAULT_API_BASE_URL).rstrip(
             "/"
         )
+        self.max_workers = max(1, max_workers or config.ATTACHMENT_DOWNLOAD_WORKERS)
+
+        cache_dir = config.ATTACHMENT_CACHE_DIR if cache_dir is None else cache_dir
+        self.cache = (
+            AttachmentCache(cache_dir, config.ATTACHMENT_CACHE_MAX_BYTES)
+            if cache_dir
+            else None
+        )
+
+        # One keep-alive session shared by all workers, with a connection
+        # pool large enough that workers never wait on each other
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
 
     def get_attachments_dir(self) -> str:
         """
@@ -113,8 +253,17 @@ class AttachmentDownloader:
         success = []
         failed = []
 
-        for att in attachments:
-            result = self._download_single(att)
+        workers = min(self.max_workers, len(attachments))
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="attachment-download"
+            ) as pool:
+                # map() keeps results in the order of the attachments
+                results = list(pool.map(self._download_single, attachments))
+        finally:
+            self.session.close()
+
+        for result in results:
             if "error" in result:
                 failed.append(result)
             else:
@@ -158,32 +307,72 @@ class AttachmentDownloader:
             logger.warning(f"Attachment missing required fields: {att}")
             return {**att, "error": "Missing required fields (id or original_filename)"}
 
-        # Build download URL using TASK_API_DOMAIN, similar to skill downloads
-        download_url = self._build_download_url(att_id)
-        logger.info(
-            f"Downloading attachment: {filename} (id={att_id}) from {download_url}"
-        )
+        file_path = self.get_attachment_path(filename)
+        sha256 = att.get("sha256")
+        tmp_path = None
 
         try:
+            # Fill a private temp file and rename it into place, so concurrent
+            # downloads of the same filename never write to the same file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(file_path), prefix=".tmp-"
+            )
+            os.close(fd)
+
+            if self.cache and sha256:
+                try:
+                    if self.cache.copy_to(att_id, sha256, tmp_path):
+                        os.replace(tmp_path, file_path)
+                        logger.info(
+                            f"Copied attachment '{filename}' (id={att_id}) from cache"
+                        )
+                        return {**att, "local_path": file_path}
+                except OSError as e:
+                    logger.warning(
+                        f"Attachment cache read failed for '{filename}': {e}"
+                    )
+
+            # Build download URL using TASK_API_DOMAIN, similar to skill downloads
+            download_url = self._build_download_url(att_id)
+            logger.info(
+                f"Downloading attachment: {filename} (id={att_id}) from {download_url}"
+            )
+
             # Download file with streaming for large files
-            response = requests.get(
+            with self.session.get(
                 download_url,
                 headers=self.headers,
                 timeout=self.DEFAULT_TIMEOUT,
                 stream=True,
-            )
-
-            if response.status_code != 200:
-                error_msg = f"HTTP {response.status_code}"
-                logger.error(f"Failed to download attachment '{filename}': {error_msg}")
+            ) as response:
+                if response.status_code != 200:
+                    error_msg = f"HTTP {response.status_code}"
+                    logger.error(
+                        f"Failed to download attachment '{filename}': {error_msg}"
+                    )
+                    return {**att, "error": error_msg}
+
+                # Save file to workspace, hashing it on the way
+                digest = hashlib.sha256()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+
+            if sha256 and digest.hexdigest() != sha256:
+                error_msg = "Checksum mismatch"
+                logger.error(f"Checksum mismatch for attachment '{filename}'")
                 return {**att, "error": error_msg}
 
-            # Save file to workspace
-            file_path = self.get_attachment_path(filename)
-            with open(file_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if self.cache and sha256:
+                try:
+                    self.cache.store(att_id, sha256, tmp_path)
+                except OSError as e:
+                    logger.warning(
+                        f"Attachment cache write failed for '{filename}': {e}"
+                    )
 
+            os.replace(tmp_path, file_path)
             logger.info(f"Downloaded attachment '{filename}' to {file_path}")
             return {**att, "local_path": file_path}
 
@@ -203,3 +392,10 @@ class AttachmentDownloader:
             error_msg = str(e)
             logger.error(f"Error downloading attachment '{filename}': {e}")
             return {**att, "error": error_msg}
+        finally:
+            # Left over unless it was renamed into place
+            if tmp_path and os.path.exists(tmp_path):
+                try:
+                    os.unlink(tmp_path)
+                except OSError:
+                    pass
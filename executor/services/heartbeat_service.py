@@ -112,6 +112,18 @@ class HeartbeatService:
             # For regular tasks, use a different endpoint
             return f"{heartbeat_base}/tasks/{self._heartbeat_id}/heartbeat"
 
+    def set_heartbeat_id(self, heartbeat_id: str) -> None:
+        """Set the heartbeat ID after startup.
+
+        Used by warm pool containers, which are started without an ID and
+        bound to a sandbox later through envd /init.
+
+        Args:
+            heartbeat_id: Heartbeat ID (sandbox_id or task_id)
+        """
+        self._heartbeat_id = heartbeat_id
+        self._heartbeat_url = self._build_heartbeat_url()
+
     @classmethod
     def get_instance(cls) -> "HeartbeatService":
         """Get the singleton instance of HeartbeatService.
@@ -353,3 +365,21 @@ def stop_heartbeat() -> None:
     Convenience function to stop the global heartbeat service instance.
     """
     get_heartbeat_service().stop()
+
+
+def bind_heartbeat(heartbeat_id: str) -> bool:
+    """Start (or restart) the heartbeat service for a new heartbeat ID.
+
+    Args:
+        heartbeat_id: Heartbeat ID assigned to this container
+
+    Returns:
+        True if the service is running with the given ID
+    """
+    service = get_heartbeat_service()
+    if service.is_running:
+        if service._heartbeat_id == heartbeat_id:
+            return True
+        service.stop()
+    service.set_heartbeat_id(heartbeat_id)
+    return service.start()
@@ -0,0 +1,82 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Readiness announcement for executor containers.
+
+executor_manager used to find out that a new container was up by probing it
+once per second. Instead, the executor tells executor_manager as soon as its
+HTTP server accepts connections, and the manager only probes as a fallback.
+"""
+
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+import requests
+
+from shared.logger import setup_logger
+
+logger = setup_logger("readiness_service")
+
+# How long to wait for the local server to start listening (seconds)
+LISTEN_TIMEOUT = 60
+LISTEN_POLL_INTERVAL = 0.05
+ANNOUNCE_TIMEOUT = 5
+
+
+def _get_ready_url() -> Optional[str]:
+    """Build the executor_manager readiness URL, or None if not configured."""
+    executor_name = os.getenv("EXECUTOR_NAME")
+    base_url = os.getenv("EXECUTOR_MANAGER_HEARTBEAT_BASE_URL")
+    if not executor_name or not base_url:
+        return None
+    return f"{base_url.rstrip('/')}/executors/{executor_name}/ready"
+
+
+def _wait_until_listening(port: int) -> bool:
+    deadline = time.monotonic() + LISTEN_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return True
+        except OSError:
+            time.sleep(LISTEN_POLL_INTERVAL)
+    return False
+
+
+def _announce(ready_url: str, port: int) -> None:
+    if not _wait_until_listening(port):
+        logger.warning(f"[Readiness] Server not listening on port {port}")
+        return
+    try:
+        response = requests.post(
+            ready_url, json={"port": port}, timeout=ANNOUNCE_TIMEOUT
+        )
+        logger.info(f"[Readiness] Announced ready: status={response.status_code}")
+    except Exception as e:
+        # executor_manager falls back to probing
+        logger.warning(f"[Readiness] Failed to announce readiness: {e}")
+
+
+def announce_ready_in_background(port: int) -> bool:
+    """Announce readiness once the HTTP server on `port` accepts connections.
+
+    Args:
+        port: Port the executor's HTTP server listens on
+
+    Returns:
+        True if the announcement was scheduled
+    """
+    ready_url = _get_ready_url()
+    if ready_url is None:
+        return False
+    threading.Thread(
+        target=_announce,
+        args=(ready_url, port),
+        name="ReadinessAnnouncer",
+        daemon=True,
+    ).start()
+    return True
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+import threading
+
+import pytest
+from git import Repo
+
+from executor.agents.claude_code.git_change_tracker import GitChangeTracker
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = Repo.init(tmp_path)
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    (tmp_path / "a.txt").write_text("one\ntwo\nthree\n")
+    (tmp_path / "b.txt").write_text("keep\n")
+    repo.index.add(["a.txt", "b.txt"])
+    repo.index.commit("initial")
+    return repo
+
+
+def _by_path(changes):
+    return {change["new_path"]: change for change in changes}
+
+
+class TestGitChangeTracker:
+    """Test cases for GitChangeTracker"""
+
+    def test_full_refresh_counts_lines(self, repo, tmp_path):
+        tracker = GitChangeTracker(str(tmp_path), repo.head.commit.hexsha)
+        (tmp_path / "a.txt").write_text("one\n2\nthree\nfour\n")
+        (tmp_path / "b.txt").unlink()
+        (tmp_path / "c.txt").write_text("new\n")
+        repo.index.add(["c.txt"])
+
+        changes = _by_path(tracker.refresh(full=True)[0])
+
+        assert changes["a.txt"]["added_lines"] == 2
+        assert changes["a.txt"]["removed_lines"] == 1
+        assert changes["b.txt"]["deleted_file"] is True
+        assert changes["c.txt"]["new_file"] is True
+        assert changes["c.txt"]["added_lines"] == 1
+
+    def test_refresh_diffs_only_touched_paths(self, repo, tmp_path, mocker):
+        tracker = GitChangeTracker(str(tmp_path), repo.head.commit.hexsha)
+        tracker.refresh()
+        diff_raw = mocker.spy(tracker, "_diff_raw")
+
+        (tmp_path / "a.txt").write_text("one\n")
+        tracker.notify([str(tmp_path / "a.txt"), str(tmp_path / "ignored.log")])
+        changes = _by_path(tracker.refresh()[0])
+
+        diff_raw.assert_called_once_with(["a.txt", "ignored.log"])
+        assert changes["a.txt"]["removed_lines"] == 2
+
+    def test_unchanged_content_reuses_line_counts(self, repo, tmp_path, mocker):
+        tracker = GitChangeTracker(str(tmp_path), repo.head.commit.hexsha)
+        (tmp_path / "a.txt").write_text("changed\n")
+        tracker.refresh()
+        count_lines = mocker.spy(tracker, "_count_lines")
+
+        # Reverting and redoing an edit produces blobs seen before
+        (tmp_path / "a.txt").write_text("one\ntwo\nthree\n")
+        tracker.notify([str(tmp_path / "a.txt")])
+        assert tracker.refresh()[0] == []
+
+        (tmp_path / "a.txt").write_text("changed\n")
+        tracker.notify([str(tmp_path / "a.txt")])
+        changes = _by_path(tracker.refresh()[0])
+
+        count_lines.assert_not_called()
+        assert changes["a.txt"]["added_lines"] == 1
+
+    def test_commit_reports_head_change(self, repo, tmp_path):
+        tracker = GitChangeTracker(str(tmp_path), repo.head.commit.hexsha)
+        assert tracker.refresh()[1] is True
+        assert tracker.refresh()[1] is False
+
+        (tmp_path / "a.txt").write_text("committed\n")
+        repo.index.add(["a.txt"])
+        repo.index.commit("change")
+        changes, head_changed = tracker.refresh()
+
+        assert head_changed is True
+        assert _by_path(changes)["a.txt"]["added_lines"] == 1
+
+    def test_filesystem_events_trigger_callback(self, repo, tmp_path):
+        updates = []
+        changed = threading.Event()
+
+        def on_change(file_changes, head_changed):
+            updates.append(file_changes)
+            if file_changes:
+                changed.set()
+
+        tracker = GitChangeTracker(
+            str(tmp_path), repo.head.commit.hexsha, on_change=on_change
+        )
+        tracker.start()
+        try:
+            (tmp_path / "b.txt").write_text("keep\nmore\n")
+            assert changed.wait(10)
+        finally:
+            tracker.stop()
+
+        assert updates[-1][0]["new_path"] == "b.txt"
@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# -*- coding: utf-8 -*-
+
+"""
+Unit tests for executor/envd/api streaming file transfer
+"""
+
+import io
+import tarfile
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from executor.envd.api import routes
+from executor.envd.api.routes import register_rest_api
+from executor.envd.api.transfer import (
+    RangeNotSatisfiableError,
+    parse_content_range,
+    parse_range_header,
+)
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    register_rest_api(app)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://envd"
+    ) as client:
+        yield client
+
+
+class TestParseHeaders:
+    def test_range_forms(self):
+        assert parse_range_header(None, 100) is None
+        assert parse_range_header("bytes=10-19", 100) == (10, 19)
+        assert parse_range_header("bytes=90-", 100) == (90, 99)
+        assert parse_range_header("bytes=-5", 100) == (95, 99)
+        assert parse_range_header("bytes=50-500", 100) == (50, 99)
+        # Multiple ranges fall back to the whole file
+        assert parse_range_header("bytes=0-1,5-6", 100) is None
+
+    def test_range_past_end(self):
+        with pytest.raises(RangeNotSatisfiableError):
+            parse_range_header("bytes=100-", 100)
+
+    def test_content_range(self):
+        assert parse_content_range(None) == (0, None)
+        assert parse_content_range("bytes 5-9/10") == (5, 10)
+        with pytest.raises(ValueError):
+            parse_content_range("bytes 5-10/10")
+
+
+class TestFiles:
+    @pytest.mark.asyncio
+    async def test_upload_and_ranged_download(self, client, tmp_path):
+        target = tmp_path / "dir" / "data.bin"
+        content = bytes(range(256)) * 1000
+
+        response = await client.post(
+            "/files", params={"path": str(target)}, files={"file": content}
+        )
+        assert response.status_code == 200
+        assert target.read_bytes() == content
+        assert list(target.parent.iterdir()) == [target]
+
+        response = await client.get(
+            "/files", params={"path": str(target)}, headers={"Range": "bytes=10-19"}
+        )
+        assert response.status_code == 206
+        assert response.content == content[10:20]
+        assert response.headers["content-range"] == f"bytes 10-19/{len(content)}"
+
+        response = await client.get(
+            "/files",
+            params={"path": str(target)},
+            headers={"Range": f"bytes={len(content)}-"},
+        )
+        assert response.status_code == 416
+
+    @pytest.mark.asyncio
+    async def test_resumable_upload_routes_verify_signature(
+        self, client, tmp_path, monkeypatch
+    ):
+        calls = []
+        monkeypatch.setattr(
+            routes, "verify_signature", lambda *args: calls.append(args)
+        )
+        params = {
+            "path": str(tmp_path / "big.bin"),
+            "signature": "v1_sig",
+            "signature_expiration": 123,
+        }
+
+        await client.get("/files/uploads/up-1", params=params)
+        await client.delete("/files/uploads/up-1", params=params)
+
+        assert calls == [("v1_sig", 123), ("v1_sig", 123)]
+
+    @pytest.mark.asyncio
+    async def test_resumable_upload(self, client, tmp_path):
+        target = tmp_path / "big.bin"
+        content = b"0123456789"
+        url = "/files/uploads/up-1"
+        params = {"path": str(target)}
+
+        response = await client.put(
+            url,
+            params=params,
+            content=content[:4],
+            headers={"Content-Range": "bytes 0-3/10"},
+        )
+        assert response.json()["offset"] == 4
+        assert response.json()["complete"] is False
+        assert not target.exists()
+
+        # A gap is rejected with the offset to resume from
+        response = await client.put(
+            url,
+            params=params,
+            content=content[6:],
+            headers={"Content-Range": "bytes 6-9/10"},
+        )
+        assert response.status_code == 409
+        assert response.headers["upload-offset"] == "4"
+
+        response = await client.get(url, params=params)
+        assert response.json()["offset"] == 4
+
+        response = await client.put(
+            url,
+            params=params,
+            content=content[4:],
+            headers={"Content-Range": "bytes 4-9/10"},
+        )
+        assert response.json()["complete"] is True
+        assert target.read_bytes() == content
+        assert list(tmp_path.iterdir()) == [target]
+
+
+class TestArchive:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("archive_format", ["tar", "tar.gz"])
+    async def test_round_trip(self, client, tmp_path, archive_format):
+        source = tmp_path / "src"
+        (source / "nested").mkdir(parents=True)
+        (source / "a.txt").write_text("a")
+        (source / "nested" / "b.bin").write_bytes(b"b" * 3_000_000)
+
+        response = await client.get(
+            "/files/archive",
+            params={"path": str(source), "format": archive_format},
+        )
+        assert response.status_code == 200
+
+        dest = tmp_path / "dest"
+        response = await client.post(
+            "/files/archive",
+            params={"path": str(dest), "format": archive_format},
+            content=response.content,
+        )
+        assert response.status_code == 200
+        assert (dest / "a.txt").read_text() == "a"
+        assert (dest / "nested" / "b.bin").read_bytes() == b"b" * 3_000_000
+
+    @pytest.mark.asyncio
+    async def test_rejects_member_outside_directory(self, client, tmp_path):
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            info = tarfile.TarInfo("../escape.txt")
+            info.size = 1
+            tar.addfile(info, io.BytesIO(b"x"))
+
+        response = await client.post(
+            "/files/archive",
+            params={"path": str(tmp_path / "dest")},
+            content=buffer.getvalue(),
+        )
+
+        assert response.status_code == 400
+        assert not (tmp_path / "escape.txt").exists()
+
+    @pytest.mark.asyncio
+    async def test_unknown_format(self, client, tmp_path):
+        response = await client.get(
+            "/files/archive", params={"path": str(tmp_path), "format": "rar"}
+        )
+
+        assert response.status_code == 400
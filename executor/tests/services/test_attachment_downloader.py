@@ -0,0 +1,137 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Unit tests for executor/services/attachment_downloader.py
+"""
+
+import hashlib
+import threading
+from unittest.mock import MagicMock
+
+import pytest
+
+from executor.services.attachment_downloader import AttachmentDownloader
+
+CONTENT = {1: b"first attachment", 2: b"second attachment"}
+
+
+def _sha(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@pytest.fixture
+def backend():
+    """Fake Backend attachment endpoint keyed by attachment id."""
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, **kwargs):
+        att_id = int(url.rsplit("/", 2)[-2])
+        with lock:
+            calls.append(att_id)
+        response = MagicMock()
+        response.__enter__.return_value = response
+        response.status_code = 200 if att_id in CONTENT else 404
+        response.iter_content.return_value = [CONTENT.get(att_id, b"")]
+        return response
+
+    return get, calls
+
+
+def _downloader(tmp_path, backend, cache_dir=""):
+    downloader = AttachmentDownloader(
+        workspace=str(tmp_path / "workspace"),
+        task_id="7",
+        subtask_id="9",
+        auth_token="token",
+        max_workers=4,
+        cache_dir=cache_dir,
+    )
+    downloader.session.get = MagicMock(side_effect=backend[0])
+    return downloader
+
+
+class TestAttachmentDownloader:
+    def test_downloads_concurrently_in_order(self, tmp_path, backend):
+        attachments = [
+            {"id": 1, "original_filename": "a.txt"},
+            {"id": 3, "original_filename": "missing.txt"},
+            {"id": 2, "original_filename": "b.txt"},
+        ]
+
+        result = _downloader(tmp_path, backend).download_all(attachments)
+
+        assert [att["id"] for att in result.success] == [1, 2]
+        assert result.failed[0]["error"] == "HTTP 404"
+        with open(result.success[1]["local_path"], "rb") as f:
+            assert f.read() == CONTENT[2]
+
+    def test_checksum_mismatch_fails(self, tmp_path, backend):
+        attachments = [{"id": 1, "original_filename": "a.txt", "sha256": "0" * 64}]
+
+        result = _downloader(tmp_path, backend).download_all(attachments)
+
+        assert result.success == []
+        assert result.failed[0]["error"] == "Checksum mismatch"
+
+    def test_cache_hit_skips_download(self, tmp_path, backend):
+        cache_dir = str(tmp_path / "cache")
+        attachments = [
+            {"id": 1, "original_filename": "a.txt", "sha256": _sha(CONTENT[1])},
+            {"id": 2, "original_filename": "b.txt"},
+        ]
+
+        _downloader(tmp_path, backend, cache_dir).download_all(attachments)
+        second = _downloader(tmp_path, backend, cache_dir)
+        second.subtask_id = "10"
+        result = second.download_all(attachments)
+
+        # Attachment without checksum is never cached
+        assert sorted(backend[1]) == [1, 2, 2]
+        path = result.success[0]["local_path"]
+        with open(path, "rb") as f:
+            assert f.read() == CONTENT[1]
+
+        # Workspace copies are private, editing one leaves the cache intact
+        with open(path, "wb") as f:
+            f.write(b"edited")
+        with open(tmp_path / "cache" / "1" / _sha(CONTENT[1]), "rb") as f:
+            assert f.read() == CONTENT[1]
+
+    def test_corrupt_cache_entry_is_evicted(self, tmp_path, backend):
+        cache_dir = str(tmp_path / "cache")
+        attachments = [
+            {"id": 1, "original_filename": "a.txt", "sha256": _sha(CONTENT[1])}
+        ]
+        _downloader(tmp_path, backend, cache_dir).download_all(attachments)
+
+        # Another container overwrites the shared entry
+        entry = tmp_path / "cache" / "1" / _sha(CONTENT[1])
+        entry.write_bytes(b"tampered")
+        second = _downloader(tmp_path, backend, cache_dir)
+        second.subtask_id = "10"
+        result = second.download_all(attachments)
+
+        assert backend[1] == [1, 1]
+        with open(result.success[0]["local_path"], "rb") as f:
+            assert f.read() == CONTENT[1]
+        assert entry.read_bytes() == CONTENT[1]
+
+    def test_same_filename_downloads_do_not_interleave(self, tmp_path, backend):
+        attachments = [
+            {"id": 1, "original_filename": "same.txt"},
+            {"id": 2, "original_filename": "same.txt"},
+        ]
+
+        downloader = _downloader(tmp_path, backend)
+        result = downloader.download_all(attachments)
+
+        assert len(result.success) == 2
+        with open(result.success[0]["local_path"], "rb") as f:
+            assert f.read() in (CONTENT[1], CONTENT[2])
+        # Temp files are renamed into place
+        assert [
+            path.name for path in tmp_path.joinpath("workspace").rglob(".tmp-*")
+        ] == []
@@ -96,6 +96,71 @@ class ExecutorConfig:
     )
 
 
+@dataclass(frozen=True)
+class WarmPoolConfig:
+    """Warm sandbox container pool configuration.
+
+    Pools are kept per executor image. The default executor image uses
+    min_size/max_size; other images can be pooled through image_sizes.
+    """
+
+    # Containers kept idle at all times, 0 disables the pool
+    min_size: int = field(
+        default_factory=lambda: int(os.getenv("SANDBOX_WARM_POOL_MIN_SIZE", "0"))
+    )
+    # Upper bound when refilling after bursts of claims
+    max_size: int = field(
+        default_factory=lambda: int(os.getenv("SANDBOX_WARM_POOL_MAX_SIZE", "4"))
+    )
+    refill_interval: int = field(
+        default_factory=lambda: int(
+            os.getenv("SANDBOX_WARM_POOL_REFILL_INTERVAL", "10")
+        )
+    )
+    # Idle containers older than this are replaced
+    max_idle_seconds: int = field(
+        default_factory=lambda: int(
+            os.getenv("SANDBOX_WARM_POOL_MAX_IDLE_SECONDS", "3600")
+        )
+    )
+    # JSON object: {"<image>": {"min_size": 1, "max_size": 2}, ...}
+    image_sizes: str = field(
+        default_factory=lambda: os.getenv("SANDBOX_WARM_POOL_IMAGES", "")
+    )
+
+
+@dataclass(frozen=True)
+class ProxyConfig:
+    """E2B sandbox proxy configuration."""
+
+    # Keep-alive connections kept open per sandbox base_url
+    max_keepalive_connections: int = field(
+        default_factory=lambda: int(
+            os.getenv("SANDBOX_PROXY_MAX_KEEPALIVE_CONNECTIONS", "10")
+        )
+    )
+    max_connections: int = field(
+        default_factory=lambda: int(os.getenv("SANDBOX_PROXY_MAX_CONNECTIONS", "50"))
+    )
+    keepalive_expiry: float = field(
+        default_factory=lambda: float(os.getenv("SANDBOX_PROXY_KEEPALIVE_EXPIRY", "30"))
+    )
+    # Number of sandbox base_urls with an open client, least recently used first out
+    max_clients: int = field(
+        default_factory=lambda: int(os.getenv("SANDBOX_PROXY_MAX_CLIENTS", "256"))
+    )
+    # Seconds a sandbox_id -> base_url lookup is reused
+    lookup_cache_ttl: float = field(
+        default_factory=lambda: float(os.getenv("SANDBOX_PROXY_LOOKUP_TTL", "30"))
+    )
+    # Number of sandbox lookups cached, least recently used first out
+    lookup_cache_max_entries: int = field(
+        default_factory=lambda: int(
+            os.getenv("SANDBOX_PROXY_LOOKUP_MAX_ENTRIES", "1024")
+        )
+    )
+
+
 @dataclass
 class AppConfig:
     """Application-wide configuration container."""
@@ -104,6 +169,8 @@ class AppConfig:
     timeout: TimeoutConfig = field(default_factory=TimeoutConfig)
     retry: RetryConfig = field(default_factory=RetryConfig)
     executor: ExecutorConfig = field(default_factory=ExecutorConfig)
+    warm_pool: WarmPoolConfig = field(default_factory=WarmPoolConfig)
+    proxy: ProxyConfig = field(default_factory=ProxyConfig)
 
 
 # Global configuration instance
@@ -34,6 +34,18 @@ TASK_FETCH_INTERVAL = 5  # Task fetch interval (seconds)
 TIME_LOG_INTERVAL = 5  # Time log interval (seconds)
 SCHEDULER_SLEEP_TIME = 1  # Scheduler sleep time (seconds)
 
+# Push-based dispatch: wait on the backend's Redis Stream of dispatch hints
+# and fetch as soon as work arrives (the interval poller stays as fallback)
+DISPATCH_QUEUE_ENABLED = os.getenv("DISPATCH_QUEUE_ENABLED", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+DISPATCH_QUEUE_STREAM = os.getenv("DISPATCH_QUEUE_STREAM", "wegent:executor:dispatch")
+DISPATCH_QUEUE_GROUP = os.getenv("DISPATCH_QUEUE_GROUP", "executor_manager")
+# Must stay below the Redis socket timeout (5 seconds)
+DISPATCH_QUEUE_BLOCK_MS = int(os.getenv("DISPATCH_QUEUE_BLOCK_MS", "3000"))
+
 # Offline task scheduling time configuration
 # Evening time range for offline tasks (default: 21-23)
 OFFLINE_TASK_EVENING_HOURS = os.getenv("OFFLINE_TASK_EVENING_HOURS", "21-23")
@@ -46,6 +58,18 @@ OFFLINE_TASK_MORNING_HOURS = os.getenv("OFFLINE_TASK_MORNING_HOURS", "0-8")
 PORT_RANGE_MIN = int(os.getenv("EXECUTOR_PORT_RANGE_MIN", 10000))
 PORT_RANGE_MAX = int(os.getenv("EXECUTOR_PORT_RANGE_MAX", 10100))
 
+# Docker Engine API: container lookups are served from an in-memory table fed
+# by the /events stream; the docker CLI is used when the socket is unavailable
+DOCKER_ENGINE_API_ENABLED = os.getenv("DOCKER_ENGINE_API_ENABLED", "true").lower() in (
+    "true",
+    "1",
+    "yes",
+)
+# Full re-listing interval that repairs anything the event stream missed (seconds)
+DOCKER_STATE_RECONCILE_INTERVAL = int(
+    os.getenv("DOCKER_STATE_RECONCILE_INTERVAL", "60")
+)
+
 # GitHub App Configuration
 GITHUB_APP_ID = os.getenv("GITHUB_APP_ID")
 GITHUB_PRIVATE_KEY_PATH = os.getenv("GITHUB_PRIVATE_KEY_PATH")
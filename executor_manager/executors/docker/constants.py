@@ -28,6 +28,11 @@ DEFAULT_LOCALE = "en_US.UTF-8"
 
 # Mount path
 WORKSPACE_MOUNT_PATH = "/workspace"
+ATTACHMENT_CACHE_MOUNT_PATH = "/attachment-cache"
+GIT_MIRROR_CACHE_MOUNT_PATH = "/git-mirror-cache"
+
+# Background git mirror refreshes running at once
+GIT_MIRROR_REFRESH_WORKERS = 4
 
 # Task progress status
 DEFAULT_PROGRESS_RUNNING = 30
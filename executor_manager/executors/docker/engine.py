@@ -0,0 +1,432 @@
+#!/usr/bin/env python
+
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# -*- coding: utf-8 -*-
+
+"""
+Docker Engine API client and container state cache.
+
+The Docker executor used to fork the docker CLI for every status check, port
+lookup and container count. This module talks to the Engine API directly over
+the unix socket with a pooled HTTP session, and keeps an in-memory table of
+executor_manager containers that is fed by the /events stream and
+periodically reconciled against a full listing. Lookups against the table
+cost no API call at all.
+"""
+
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+import httpx
+
+from executor_manager.config.config import (
+    DOCKER_ENGINE_API_ENABLED,
+    DOCKER_STATE_RECONCILE_INTERVAL,
+)
+from executor_manager.executors.docker.constants import DOCKER_SOCKET_PATH
+from shared.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+OWNER_LABEL = "owner=executor_manager"
+
+# Container states listed by `docker ps` without -a
+RUNNING_STATES = ("running", "paused", "restarting")
+
+# Container event actions that change state, ports or labels
+TRACKED_ACTIONS = {
+    "create",
+    "start",
+    "restart",
+    "die",
+    "stop",
+    "kill",
+    "oom",
+    "pause",
+    "unpause",
+    "rename",
+    "update",
+}
+
+# Seconds to wait before retrying after an Engine API error
+ENGINE_ERROR_BACKOFF_SECONDS = 5
+
+
+class DockerEngineError(Exception):
+    """Error response from the Docker Engine API"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+class DockerNotFoundError(DockerEngineError):
+    """The requested container does not exist"""
+
+
+class DockerEngineClient:
+    """Minimal Docker Engine API client over the unix socket"""
+
+    def __init__(self, socket_path: str = DOCKER_SOCKET_PATH, timeout: float = 30):
+        self.socket_path = socket_path
+        self._client = httpx.Client(
+            transport=httpx.HTTPTransport(uds=socket_path),
+            base_url="http://docker",
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+
+    def close(self) -> None:
+        self._client.close()
+
+    def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        response = self._client.request(method, path, **kwargs)
+        if response.status_code == 404:
+            raise DockerNotFoundError(404, _error_message(response))
+        if response.status_code >= 400:
+            raise DockerEngineError(response.status_code, _error_message(response))
+        return response
+
+    def ping(self) -> bool:
+        try:
+            return self._request("GET", "/_ping").text == "OK"
+        except Exception:
+            return False
+
+    def list_containers(
+        self, all: bool = False, labels: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """List containers, optionally filtered by labels ("key" or "key=value")"""
+        params = {"all": "1" if all else "0"}
+        if labels:
+            params["filters"] = json.dumps({"label": labels})
+        return self._request("GET", "/containers/json", params=params).json()
+
+    def inspect_container(self, name: str) -> Dict[str, Any]:
+        return self._request("GET", f"/containers/{name}/json").json()
+
+    def stop_container(self, name: str, timeout: int = 10) -> None:
+        # 304: already stopped
+        self._request(
+            "POST",
+            f"/containers/{name}/stop",
+            params={"t": str(timeout)},
+            timeout=timeout + 30,
+        )
+
+    def remove_container(self, name: str, force: bool = False) -> None:
+        self._request(
+            "DELETE", f"/containers/{name}", params={"force": "1" if force else "0"}
+        )
+
+    def pause_container(self, name: str) -> None:
+        self._request("POST", f"/containers/{name}/pause")
+
+    def unpause_container(self, name: str) -> None:
+        self._request("POST", f"/containers/{name}/unpause")
+
+    def stream_events(self, filters: Dict[str, List[str]], since: Optional[int]):
+        """Yield decoded events until the stream is closed
+
+        The caller must close the returned generator to release the connection.
+        """
+        params = {"filters": json.dumps(filters)}
+        if since is not None:
+            params["since"] = str(since)
+        timeout = httpx.Timeout(10, read=None)
+        with self._client.stream(
+            "GET", "/events", params=params, timeout=timeout
+        ) as response:
+            if response.status_code >= 400:
+                response.read()
+                raise DockerEngineError(response.status_code, _error_message(response))
+            for line in response.iter_lines():
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        return response.json().get("message", response.text)
+    except Exception:
+        return response.text
+
+
+@dataclass
+class ContainerState:
+    """Cached state of one executor_manager container"""
+
+    id: str
+    name: str
+    state: str
+    labels: Dict[str, str] = field(default_factory=dict)
+    # Host port mappings on 0.0.0.0: {"host_port", "container_port", "protocol"}
+    ports: List[Dict[str, Any]] = field(default_factory=list)
+    oom_killed: Optional[bool] = None
+    exit_code: Optional[int] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self.state in RUNNING_STATES
+
+    def matches(self, label_selector: Optional[str]) -> bool:
+        """Check a docker-style label filter: "key" or "key=value" """
+        if not label_selector:
+            return True
+        key, sep, value = label_selector.partition("=")
+        if key not in self.labels:
+            return False
+        return not sep or self.labels[key] == value
+
+    @classmethod
+    def from_list_entry(cls, data: Dict[str, Any]) -> "ContainerState":
+        """Build from a /containers/json entry (no OOM flag or exit code)"""
+        names = data.get("Names") or [""]
+        ports = [
+            {
+                "host_port": int(p["PublicPort"]),
+                "container_port": int(p["PrivatePort"]),
+                "protocol": p.get("Type", "tcp"),
+            }
+            for p in data.get("Ports") or []
+            if p.get("IP") == "0.0.0.0" and p.get("PublicPort")
+        ]
+        return cls(
+            id=data["Id"],
+            name=names[0].lstrip("/"),
+            state=data.get("State", "unknown"),
+            labels=data.get("Labels") or {},
+            ports=ports,
+        )
+
+    @classmethod
+    def from_inspect(cls, data: Dict[str, Any]) -> "ContainerState":
+        """Build from a /containers/{id}/json response"""
+        state = data.get("State") or {}
+        ports = []
+        network_ports = (data.get("NetworkSettings") or {}).get("Ports") or {}
+        for container_port, bindings in network_ports.items():
+            port, _, protocol = container_port.partition("/")
+            for binding in bindings or []:
+                if binding.get("HostIp") == "0.0.0.0" and binding.get("HostPort"):
+                    ports.append(
+                        {
+                            "host_port": int(binding["HostPort"]),
+                            "container_port": int(port),
+                            "protocol": protocol or "tcp",
+                        }
+                    )
+        return cls(
+            id=data["Id"],
+            name=data.get("Name", "").lstrip("/"),
+            state=state.get("Status", "unknown"),
+            labels=(data.get("Config") or {}).get("Labels") or {},
+            ports=ports,
+            oom_killed=bool(state.get("OOMKilled", False)),
+            exit_code=int(state.get("ExitCode", -1)),
+        )
+
+
+class ContainerStateCache:
+    """In-memory table of executor_manager containers, keyed by name.
+
+    A full listing seeds the table, a background thread applies /events as
+    they arrive, and a second thread re-lists every reconcile interval to
+    repair anything the event stream missed. While the event stream is down
+    the cache reports itself as not synced, and callers fall back to asking
+    Docker directly.
+    """
+
+    def __init__(
+        self,
+        client: DockerEngineClient,
+        reconcile_interval: float = DOCKER_STATE_RECONCILE_INTERVAL,
+    ):
+        self.client = client
+        self.reconcile_interval = reconcile_interval
+        self._containers: Dict[str, ContainerState] = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._stop_event = threading.Event()
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set()
+
+    def start(self) -> None:
+        """Seed the table and start the event and reconcile threads"""
+        if self._threads:
+            return
+        self._stop_event.clear()
+        self._threads = [
+            threading.Thread(
+                target=self._watch_events, name="docker-event-watcher", daemon=True
+            ),
+            threading.Thread(
+                target=self._reconcile_loop, name="docker-state-reconcile", daemon=True
+            ),
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._synced.clear()
+        self._threads = []
+
+    def reconcile(self) -> None:
+        """Replace the table with a full listing of owned containers"""
+        entries = self.client.list_containers(all=True, labels=[OWNER_LABEL])
+        with self._lock:
+            containers = {}
+            for entry in entries:
+                container = ContainerState.from_list_entry(entry)
+                # Listings carry no OOM flag or exit code, keep known values
+                previous = self._containers.get(container.name)
+                if previous is not None and previous.id == container.id:
+                    container.oom_killed = previous.oom_killed
+                    container.exit_code = previous.exit_code
+                containers[container.name] = container
+            self._containers = containers
+
+    def refresh(self, name: str) -> Optional[ContainerState]:
+        """Re-inspect one container and update its entry
+
+        Returns:
+            The container state, or None if it does not exist or is not owned
+            by executor_manager
+        """
+        try:
+            container = ContainerState.from_inspect(self.client.inspect_container(name))
+        except DockerNotFoundError:
+            self.discard(name)
+            return None
+        if not container.matches(OWNER_LABEL):
+            return None
+        with self._lock:
+            # Drop the old entry if the container was renamed
+            for key, existing in list(self._containers.items()):
+                if existing.id == container.id and key != container.name:
+                    del self._containers[key]
+            self._containers[container.name] = container
+        return container
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            self._containers.pop(name, None)
+
+    def get(self, name: str) -> Optional[ContainerState]:
+        with self._lock:
+            return self._containers.get(name)
+
+    def list(
+        self, label_selector: Optional[str] = None, running_only: bool = True
+    ) -> List[ContainerState]:
+        with self._lock:
+            containers = list(self._containers.values())
+        return [
+            c
+            for c in containers
+            if (c.is_running or not running_only) and c.matches(label_selector)
+        ]
+
+    def used_host_ports(self) -> Set[int]:
+        return {
+            port["host_port"]
+            for container in self.list()
+            for port in container.ports
+            if port["protocol"] == "tcp"
+        }
+
+    def apply_event(self, event: Dict[str, Any]) -> None:
+        """Apply one /events message to the table"""
+        if event.get("Type") != "container":
+            return
+        action = event.get("Action", "")
+        actor = event.get("Actor") or {}
+        name = (actor.get("Attributes") or {}).get("name")
+        if action == "destroy":
+            if name:
+                self.discard(name)
+            return
+        if action not in TRACKED_ACTIONS:
+            return
+        # The event only names the container, so read its current state
+        self.refresh(actor.get("ID") or name)
+
+    def _watch_events(self) -> None:
+        filters = {"type": ["container"], "label": [OWNER_LABEL]}
+        while not self._stop_event.is_set():
+            events = None
+            try:
+                since = int(time.time())
+                self.reconcile()
+                events = self.client.stream_events(filters, since=since)
+                self._synced.set()
+                for event in events:
+                    if self._stop_event.is_set():
+                        break
+                    self.apply_event(event)
+            except Exception as e:
+                logger.warning(f"Docker event stream interrupted: {e}")
+            finally:
+                self._synced.clear()
+                if events is not None:
+                    events.close()
+            self._stop_event.wait(ENGINE_ERROR_BACKOFF_SECONDS)
+
+    def _reconcile_loop(self) -> None:
+        while not self._stop_event.wait(self.reconcile_interval):
+            if not self.synced:
+                continue
+            try:
+                self.reconcile()
+            except Exception as e:
+                logger.warning(f"Error reconciling Docker container state: {e}")
+
+
+_engine_client: Optional[DockerEngineClient] = None
+_state_cache: Optional[ContainerStateCache] = None
+_init_lock = threading.Lock()
+
+
+def get_docker_engine_client() -> Optional[DockerEngineClient]:
+    """Get the shared Engine API client, or None if the socket is unavailable"""
+    global _engine_client
+    if not DOCKER_ENGINE_API_ENABLED or not os.path.exists(DOCKER_SOCKET_PATH):
+        return None
+    if _engine_client is None:
+        with _init_lock:
+            if _engine_client is None:
+                _engine_client = DockerEngineClient(DOCKER_SOCKET_PATH)
+    return _engine_client
+
+
+def get_container_state_cache() -> Optional[ContainerStateCache]:
+    """Get the container state cache, starting it on first use
+
+    Returns:
+        The cache if it is in sync with Docker, None otherwise
+    """
+    global _state_cache
+    client = get_docker_engine_client()
+    if client is None:
+        return None
+    if _state_cache is None:
+        with _init_lock:
+            if _state_cache is None:
+                _state_cache = ContainerStateCache(client)
+                _state_cache.start()
+                logger.info(
+                    f"Docker container state cache started on {DOCKER_SOCKET_PATH}"
+                )
+    return _state_cache if _state_cache.synced else None
@@ -13,7 +13,9 @@ Docker executor for running tasks in Docker containers
 import json
 import os
 import subprocess
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from email import utils
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -23,6 +25,7 @@ import requests
 from executor_manager.config.config import EXECUTOR_ENV
 from executor_manager.executors.base import Executor
 from executor_manager.executors.docker.constants import (
+    ATTACHMENT_CACHE_MOUNT_PATH,
     CONTAINER_OWNER,
     DEFAULT_API_ENDPOINT,
     DEFAULT_DOCKER_HOST,
@@ -32,6 +35,8 @@ from executor_manager.executors.docker.constants import (
     DEFAULT_TASK_ID,
     DEFAULT_TIMEZONE,
     DOCKER_SOCKET_PATH,
+    GIT_MIRROR_CACHE_MOUNT_PATH,
+    GIT_MIRROR_REFRESH_WORKERS,
     WORKSPACE_MOUNT_PATH,
 )
 from executor_manager.executors.docker.utils import (
@@ -42,11 +47,14 @@ from executor_manager.executors.docker.utils import (
     get_container_ports,
     get_container_status,
     get_running_task_details,
+    track_container,
 )
 from executor_manager.utils.executor_name import generate_executor_name
 from shared.logger import setup_logger
 from shared.status import TaskStatus
 from shared.telemetry.config import get_otel_config
+from shared.utils import git_util
+from shared.utils.crypto import decrypt_git_token, is_token_encrypted
 
 logger = setup_logger(__name__)
 
@@ -65,6 +73,14 @@ class DockerExecutor(Executor):
         self.subprocess = subprocess_module
         self.requests = requests_module
 
+        # Git mirrors are refreshed off the submit path, one refresh per
+        # mirror and branch at a time
+        self._mirror_refresher = ThreadPoolExecutor(
+            max_workers=GIT_MIRROR_REFRESH_WORKERS, thread_name_prefix="git-mirror"
+        )
+        self._mirror_refreshes = set()
+        self._mirror_refresh_lock = threading.Lock()
+
         # Check if Docker is available
         self._check_docker_availability()
 
@@ -355,6 +371,7 @@ class DockerExecutor(Executor):
             logger.info(
                 f"Started Docker container {executor_name} with ID {container_id}"
             )
+            track_container(executor_name)
 
             # Register regular tasks to RunningTaskTracker for heartbeat monitoring
             # This enables OOM detection for non-sandbox tasks
@@ -690,6 +707,12 @@ class DockerExecutor(Executor):
         # Add workspace mount
         self._add_workspace_mount(cmd)
 
+        # Add shared attachment cache mount
+        self._add_attachment_cache_mount(cmd)
+
+        # Add shared git mirror cache mount
+        self._add_git_mirror_cache_mount(cmd, task)
+
         # Add network configuration
         self._add_network_config(cmd)
 
@@ -728,6 +751,84 @@ class DockerExecutor(Executor):
         if executor_workspace:
             cmd.extend(["-v", f"{executor_workspace}:{WORKSPACE_MOUNT_PATH}"])
 
+    def _add_attachment_cache_mount(self, cmd: List[str]) -> None:
+        """Mount the host-level attachment cache shared by executor containers
+
+        The mount is writable so containers can publish downloads. Entries
+        are therefore untrusted: executors verify each hit against its sha256
+        and evict entries that do not match.
+        """
+        cache_dir = os.getenv("ATTACHMENT_CACHE_HOST_DIR", "")
+        if cache_dir:
+            cmd.extend(
+                [
+                    "-v",
+                    f"{cache_dir}:{ATTACHMENT_CACHE_MOUNT_PATH}",
+                    "-e",
+                    f"ATTACHMENT_CACHE_DIR={ATTACHMENT_CACHE_MOUNT_PATH}",
+                ]
+            )
+
+    def _add_git_mirror_cache_mount(self, cmd: List[str], task: Dict[str, Any]) -> None:
+        """Mount the task user's git mirror cache read-only into the container"""
+        cache_dir = os.getenv("GIT_MIRROR_CACHE_HOST_DIR", "")
+        user_id = (task.get("user") or {}).get("id")
+        if not cache_dir or user_id is None:
+            return
+
+        # Mirrors are fetched with the owner's credentials, so each user only
+        # sees their own partition and containers can never write to it
+        partition = f"user-{user_id}"
+        local_cache_dir = os.getenv("GIT_MIRROR_CACHE_DIR", cache_dir)
+        self._refresh_git_mirror(task, os.path.join(local_cache_dir, partition))
+
+        # Workspaces reference mirror objects by absolute path, so the
+        # mount path must be identical in every container
+        cmd.extend(
+            [
+                "-v",
+                f"{os.path.join(cache_dir, partition)}:{GIT_MIRROR_CACHE_MOUNT_PATH}:ro",
+                "-e",
+                f"GIT_MIRROR_CACHE_DIR={GIT_MIRROR_CACHE_MOUNT_PATH}",
+            ]
+        )
+
+    def _refresh_git_mirror(self, task: Dict[str, Any], mirror_dir: str) -> None:
+        """Start a background refresh of the mirror of the task repository
+
+        The container does not wait for it: its clone references whatever
+        the mirror holds by then, or clones without a mirror.
+        """
+        git_url = task.get("git_url")
+        if not git_url:
+            return
+
+        user = task.get("user") or {}
+        token = user.get("git_token")
+        if token and is_token_encrypted(token):
+            token = decrypt_git_token(token)
+        if not token or token == "***":
+            return
+
+        branch = task.get("branch_name")
+        key = (git_util.get_mirror_path(git_url, mirror_dir), branch)
+        with self._mirror_refresh_lock:
+            if key in self._mirror_refreshes:
+                return
+            self._mirror_refreshes.add(key)
+
+        auth_url = git_util.build_auth_url(
+            git_url, user.get("user_name") or "token", token
+        )
+        future = self._mirror_refresher.submit(
+            git_util.update_mirror, git_url, auth_url, branch, mirror_dir
+        )
+        future.add_done_callback(lambda _: self._finish_mirror_refresh(key))
+
+    def _finish_mirror_refresh(self, key: Tuple[str, Optional[str]]) -> None:
+        with self._mirror_refresh_lock:
+            self._mirror_refreshes.discard(key)
+
     def _add_network_config(self, cmd: List[str]) -> None:
         """Add network configuration"""
         network = os.getenv("NETWORK", "")
@@ -776,12 +877,18 @@ class DockerExecutor(Executor):
             heartbeat_id = str(task.get("task_id", ""))
             heartbeat_type = "task"
 
-        if not heartbeat_id:
+        # Warm pool containers get their HEARTBEAT_ID through envd /init
+        # when a sandbox claims them
+        is_warm_pool = is_sandbox and task.get("sandbox_metadata", {}).get(
+            "warm_pool", False
+        )
+        if not heartbeat_id and not is_warm_pool:
             logger.debug("No heartbeat_id available, skipping heartbeat env vars")
             return
 
         # Add heartbeat environment variables
-        cmd.extend(["-e", f"HEARTBEAT_ID={heartbeat_id}"])
+        if heartbeat_id:
+            cmd.extend(["-e", f"HEARTBEAT_ID={heartbeat_id}"])
         cmd.extend(["-e", f"HEARTBEAT_TYPE={heartbeat_type}"])
         cmd.extend(["-e", "HEARTBEAT_ENABLED=true"])
 
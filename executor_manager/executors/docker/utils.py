@@ -19,6 +19,11 @@ from urllib.parse import urlparse
 
 from executor_manager.common.config import ROUTE_PREFIX
 from executor_manager.config.config import PORT_RANGE_MAX, PORT_RANGE_MIN
+from executor_manager.executors.docker import engine
+from executor_manager.executors.docker.engine import (
+    DockerEngineError,
+    DockerNotFoundError,
+)
 from shared.logger import setup_logger
 from shared.utils.ip_util import get_host_ip, is_ip_address
 
@@ -114,6 +119,25 @@ def _get_first_available_port(used_ports: Set[int]) -> int:
     raise RuntimeError(f"No available ports in range {PORT_RANGE_MIN}-{PORT_RANGE_MAX}")
 
 
+def track_container(container_name: str) -> None:
+    """
+    Record a container created outside the Engine API client in the state cache.
+
+    `docker run` goes through the CLI, so this makes the new container and its
+    ports visible right away instead of when its create event arrives.
+
+    Args:
+        container_name (str): Name of the container
+    """
+    cache = engine.get_container_state_cache()
+    if cache is None:
+        return
+    try:
+        cache.refresh(container_name)
+    except Exception as e:
+        logger.warning(f"Error refreshing state of container '{container_name}': {e}")
+
+
 def get_docker_used_ports() -> Set[int]:
     """
     Get ports used by Docker containers with owner=executor_manager label.
@@ -121,6 +145,14 @@ def get_docker_used_ports() -> Set[int]:
     Returns:
         Set[int]: Set of port numbers in use
     """
+    cache = engine.get_container_state_cache()
+    if cache is not None:
+        return {
+            port
+            for port in cache.used_host_ports()
+            if PORT_RANGE_MIN <= port <= PORT_RANGE_MAX
+        }
+
     docker_used_ports = set()
     cmd = [
         "docker",
@@ -154,6 +186,13 @@ def check_container_ownership(container_name: str) -> bool:
         bool: True if container exists and is owned by executor_manager, False otherwise
     """
     try:
+        cache = engine.get_container_state_cache()
+        if cache is not None:
+            if cache.get(container_name) is not None:
+                return True
+            # The create event of a new container may not have arrived yet
+            return cache.refresh(container_name) is not None
+
         check_cmd = [
             "docker",
             "ps",
@@ -188,11 +227,19 @@ def delete_container(container_name: str) -> dict:
         dict: Result with status and optional error message
     """
     try:
-        # Stop and remove container in one command
-        cmd = f"docker stop {container_name} && docker rm {container_name}"
-        subprocess.run(cmd, shell=True, check=True, capture_output=True)
+        client = engine.get_docker_engine_client()
+        if client is not None:
+            client.stop_container(container_name)
+            client.remove_container(container_name)
+        else:
+            # Stop and remove container in one command
+            cmd = f"docker stop {container_name} && docker rm {container_name}"
+            subprocess.run(cmd, shell=True, check=True, capture_output=True)
         logger.info(f"Deleted Docker container '{container_name}'")
         return {"status": "success"}
+    except DockerEngineError as e:
+        logger.error(f"Docker error deleting container '{container_name}': {e}")
+        return {"status": "failed", "error_msg": f"Docker error: {e}"}
     except subprocess.CalledProcessError as e:
         logger.error(f"Docker error deleting container '{container_name}': {e.stderr}")
         return {"status": "failed", "error_msg": f"Docker error: {e.stderr}"}
@@ -221,10 +268,17 @@ def pause_container(container_name: str) -> dict:
                 "error_msg": f"Container '{container_name}' not found or not owned by executor_manager",
             }
 
-        cmd = ["docker", "pause", container_name]
-        subprocess.run(cmd, check=True, capture_output=True)
+        client = engine.get_docker_engine_client()
+        if client is not None:
+            client.pause_container(container_name)
+        else:
+            cmd = ["docker", "pause", container_name]
+            subprocess.run(cmd, check=True, capture_output=True)
         logger.info(f"Paused Docker container '{container_name}'")
         return {"status": "success"}
+    except DockerEngineError as e:
+        logger.error(f"Docker error pausing container '{container_name}': {e}")
+        return {"status": "failed", "error_msg": f"Docker error: {e}"}
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.decode() if hasattr(e.stderr, "decode") else str(e.stderr)
         logger.error(f"Docker error pausing container '{container_name}': {error_msg}")
@@ -252,10 +306,17 @@ def unpause_container(container_name: str) -> dict:
                 "error_msg": f"Container '{container_name}' not found or not owned by executor_manager",
             }
 
-        cmd = ["docker", "unpause", container_name]
-        subprocess.run(cmd, check=True, capture_output=True)
+        client = engine.get_docker_engine_client()
+        if client is not None:
+            client.unpause_container(container_name)
+        else:
+            cmd = ["docker", "unpause", container_name]
+            subprocess.run(cmd, check=True, capture_output=True)
         logger.info(f"Unpaused Docker container '{container_name}'")
         return {"status": "success"}
+    except DockerEngineError as e:
+        logger.error(f"Docker error unpausing container '{container_name}': {e}")
+        return {"status": "failed", "error_msg": f"Docker error: {e}"}
     except subprocess.CalledProcessError as e:
         error_msg = e.stderr.decode() if hasattr(e.stderr, "decode") else str(e.stderr)
         logger.error(
@@ -297,11 +358,17 @@ def count_running_containers(label_selector: str = None) -> dict:
         dict: Result with status, count and optional error message
     """
     try:
-        cmd = _build_docker_ps_command(label_selector)
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+        cache = engine.get_container_state_cache()
+        if cache is not None:
+            container_count = len(cache.list(label_selector))
+        else:
+            cmd = _build_docker_ps_command(label_selector)
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
 
-        # Count non-empty lines in output
-        container_count = sum(1 for line in result.stdout.split("\n") if line.strip())
+            # Count non-empty lines in output
+            container_count = sum(
+                1 for line in result.stdout.split("\n") if line.strip()
+            )
 
         logger.info(
             f"Found {container_count} running containers with owner=executor_manager"
@@ -328,29 +395,45 @@ def get_running_task_details(label_selector: str = None) -> dict:
         dict: Result with status, task_details and optional error message
     """
     try:
-        # Base command with owner filter
-        cmd = ["docker", "ps", "--filter", "label=owner=executor_manager"]
-
-        # Add additional label selector if provided
-        if label_selector:
-            cmd.extend(["--filter", f"label={label_selector}"])
-
-        # Format to get task_id, subtask_id, subtask_next_id and container name
-        # Using go template formatting to get multiple fields
-        cmd.extend(
-            [
-                "--format",
-                '{{.Label "task_id"}}|{{.Label "subtask_id"}}|{{.Label "subtask_next_id"}}|{{.Label "aigc.weibo.com/task-type"}}|{{.Names}}',
+        cache = engine.get_container_state_cache()
+        if cache is not None:
+            lines = [
+                "|".join(
+                    [
+                        container.labels.get("task_id", ""),
+                        container.labels.get("subtask_id", ""),
+                        container.labels.get("subtask_next_id", ""),
+                        container.labels.get("aigc.weibo.com/task-type", ""),
+                        container.name,
+                    ]
+                )
+                for container in cache.list(label_selector)
             ]
-        )
+        else:
+            # Base command with owner filter
+            cmd = ["docker", "ps", "--filter", "label=owner=executor_manager"]
+
+            # Add additional label selector if provided
+            if label_selector:
+                cmd.extend(["--filter", f"label={label_selector}"])
+
+            # Format to get task_id, subtask_id, subtask_next_id and container name
+            # Using go template formatting to get multiple fields
+            cmd.extend(
+                [
+                    "--format",
+                    '{{.Label "task_id"}}|{{.Label "subtask_id"}}|{{.Label "subtask_next_id"}}|{{.Label "aigc.weibo.com/task-type"}}|{{.Names}}',
+                ]
+            )
 
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            lines = result.stdout.split("\n")
 
         # Process container information
         containers = []
         task_map = {}
 
-        for line in result.stdout.split("\n"):
+        for line in lines:
             if not line.strip():
                 continue
 
@@ -430,6 +513,13 @@ def get_container_ports(container_name: str) -> dict:
                 "ports": [],
             }
 
+        cache = engine.get_container_state_cache()
+        container = cache.get(container_name) if cache is not None else None
+        if container is not None:
+            # Like `docker ps`, only running containers publish ports
+            ports = list(container.ports) if container.is_running else []
+            return {"status": "success", "ports": ports}
+
         # Get ports information for the specific container
         cmd = [
             "docker",
@@ -500,6 +590,10 @@ def get_container_status(container_name: str) -> dict:
             - error_msg (str): Error message if any
     """
     try:
+        client = engine.get_docker_engine_client()
+        if client is not None:
+            return _get_container_status_from_engine(client, container_name)
+
         # Use docker inspect to get detailed container state
         cmd = [
             "docker",
@@ -567,6 +661,41 @@ def get_container_status(container_name: str) -> dict:
         }
 
 
+def _get_container_status_from_engine(client, container_name: str) -> dict:
+    """Get container status from the state cache, inspecting through the API on a miss"""
+    cache = engine.get_container_state_cache()
+    container = cache.get(container_name) if cache is not None else None
+    # Listings carry no OOM flag or exit code, which only matter once stopped
+    if container is None or (container.exit_code is None and not container.is_running):
+        try:
+            container = engine.ContainerState.from_inspect(
+                client.inspect_container(container_name)
+            )
+        except DockerNotFoundError:
+            return {
+                "exists": False,
+                "status": "not_found",
+                "oom_killed": False,
+                "exit_code": -1,
+                "error_msg": None,
+            }
+        except DockerEngineError as e:
+            return {
+                "exists": False,
+                "status": "error",
+                "oom_killed": False,
+                "exit_code": -1,
+                "error_msg": str(e),
+            }
+    return {
+        "exists": True,
+        "status": container.state,
+        "oom_killed": bool(container.oom_killed),
+        "exit_code": container.exit_code if container.exit_code is not None else 0,
+        "error_msg": None,
+    }
+
+
 def get_container_task_id(container_name: str) -> Optional[str]:
     """
     Get task_id from container label.
@@ -578,6 +707,11 @@ def get_container_task_id(container_name: str) -> Optional[str]:
         task_id string if found, None otherwise
     """
     try:
+        cache = engine.get_container_state_cache()
+        container = cache.get(container_name) if cache is not None else None
+        if container is not None:
+            return container.labels.get("task_id") or None
+
         cmd = [
             "docker",
             "inspect",
@@ -18,6 +18,7 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 
+from executor_manager.routers.wegent_e2b_proxy import close_proxy_clients
 from executor_manager.services.sandbox import get_sandbox_manager
 from routers.routers import app  # Import the FastAPI app defined in routes.py
 from scheduler.scheduler import TaskScheduler
@@ -115,6 +116,9 @@ async def lifespan(app):
         logger.info("Stopping SandboxManager...")
         await sandbox_manager.stop_gc_task()
 
+    # Close pooled connections to sandbox containers
+    await close_proxy_clients()
+
     # Shutdown OpenTelemetry
     if otel_config.enabled:
         from shared.telemetry.core import shutdown_telemetry
@@ -27,6 +27,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 
 from executor_manager.models.sandbox import SandboxStatus
+from executor_manager.routers.wegent_e2b_proxy import invalidate_sandbox_info
 from executor_manager.services.sandbox import get_sandbox_manager
 from shared.logger import setup_logger
 
@@ -476,6 +477,8 @@ async def delete_sandbox(sandbox_id: str, http_request: Request):
         )
 
     success, message = await manager.terminate_sandbox(sandbox.sandbox_id)
+    # Stop routing proxy requests to the old container
+    invalidate_sandbox_info(sandbox.sandbox_id)
     if not success:
         raise HTTPException(
             status_code=500,
@@ -599,6 +599,13 @@ async def get_executor_load(http_request: Request):
         executor = ExecutorDispatcher.get_executor(EXECUTOR_DISPATCHER_MODE)
         result = executor.get_executor_count()
         result["total"] = int(os.getenv("MAX_CONCURRENT_TASKS", "30"))
+
+        # Warm sandbox pool hit rate and sizes
+        from executor_manager.services.sandbox import get_sandbox_manager
+
+        warm_pool = get_sandbox_manager().warm_pool
+        if warm_pool.enabled:
+            result["warm_pool"] = warm_pool.get_stats()
         return result
     except Exception as e:
         logger.error(f"Error getting executor load: {e}")
@@ -836,5 +843,28 @@ async def task_heartbeat(task_id: str, http_request: Request):
     return {"status": "ok", "task_id": task_id}
 
 
+@api_router.post("/executors/{executor_name}/ready")
+async def executor_ready(executor_name: str):
+    """
+    Receive a readiness announcement from a newly started executor container.
+
+    Wakes up code waiting for the container to come up, so it does not have
+    to wait for its next probe.
+
+    Args:
+        executor_name: Container/Pod name
+
+    Returns:
+        dict: Acknowledgement
+    """
+    from executor_manager.services.container_readiness import (
+        get_container_readiness,
+    )
+
+    get_container_readiness().mark_ready(executor_name)
+    logger.info(f"[ExecutorAPI] Executor ready: {executor_name}")
+    return {"status": "ok", "executor_name": executor_name}
+
+
 # Mount api_router to app
 app.include_router(api_router)
@@ -23,6 +23,7 @@ from typing import Optional
 from fastapi import APIRouter, HTTPException, Query, Request
 
 from executor_manager.models.sandbox import SandboxStatus
+from executor_manager.routers.wegent_e2b_proxy import invalidate_sandbox_info
 from executor_manager.schemas.sandbox import (
     CreateSandboxRequest,
     CreateSandboxResponse,
@@ -182,6 +183,8 @@ async def terminate_sandbox(sandbox_id: str, http_request: Request):
 
     manager = get_sandbox_manager()
     success, message = await manager.terminate_sandbox(sandbox_id)
+    # Stop routing proxy requests to the old container
+    invalidate_sandbox_info(sandbox_id)
 
     if not success:
         raise HTTPException(
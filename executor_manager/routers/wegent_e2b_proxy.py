@@ -19,19 +19,41 @@ to the existing executor task dispatch endpoint (/api/tasks/execute).
 import json
 import os
 import time
+from collections import OrderedDict
+from typing import Any, Tuple
 
 import httpx
 from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from executor_manager.common.config import ROUTE_PREFIX, get_config
 from executor_manager.services.sandbox import get_sandbox_manager
+from executor_manager.services.sandbox.proxy_clients import (
+    get_sandbox_proxy_clients,
+)
 from shared.logger import setup_logger
 
 logger = setup_logger(__name__)
 
 router = APIRouter(tags=["sandbox-proxy"])
 
+# Headers that apply to a single connection and are not forwarded
+HOP_BY_HOP_HEADERS = {
+    "host",
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "te",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+}
+
+# sandbox_id -> (expires_at, base_url, sandbox), least recently used first
+_sandbox_info_cache: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+
 
 async def _find_sandbox_by_e2b_id(manager, e2b_sandbox_id: str):
     """Find sandbox by E2B sandbox ID in metadata.
@@ -60,12 +82,22 @@ async def _find_sandbox_by_e2b_id(manager, e2b_sandbox_id: str):
 async def _get_sandbox_info(sandbox_id: str) -> tuple:
     """Get sandbox info including base_url and metadata.
 
+    Lookups are cached for a short time: finding a sandbox by its E2B id scans
+    all active sandboxes, and SDK clients send many requests to the same one.
+
     Args:
         sandbox_id: E2B sandbox UUID
 
     Returns:
         Tuple of (base_url, sandbox) for the container
     """
+    cached = _sandbox_info_cache.get(sandbox_id)
+    if cached is not None:
+        if cached[0] > time.monotonic():
+            _sandbox_info_cache.move_to_end(sandbox_id)
+            return cached[1], cached[2]
+        del _sandbox_info_cache[sandbox_id]
+
     manager = get_sandbox_manager()
 
     # Find sandbox by e2b_sandbox_id
@@ -91,9 +123,37 @@ async def _get_sandbox_info(sandbox_id: str) -> tuple:
             },
         )
 
+    proxy_config = get_config().proxy
+    expires_at = time.monotonic() + proxy_config.lookup_cache_ttl
+    _sandbox_info_cache[sandbox_id] = (expires_at, base_url, sandbox)
+    _sandbox_info_cache.move_to_end(sandbox_id)
+    while len(_sandbox_info_cache) > proxy_config.lookup_cache_max_entries:
+        _sandbox_info_cache.popitem(last=False)
     return base_url, sandbox
 
 
+def invalidate_sandbox_info(sandbox_id: str) -> None:
+    """Drop cached lookups of a sandbox, e.g. after it was deleted.
+
+    Args:
+        sandbox_id: E2B sandbox UUID or internal sandbox ID
+    """
+    keys = [
+        key
+        for key, (_, _, sandbox) in _sandbox_info_cache.items()
+        if key == sandbox_id or sandbox.sandbox_id == sandbox_id
+    ]
+    for key in keys:
+        _, base_url, _ = _sandbox_info_cache.pop(key)
+        get_sandbox_proxy_clients().discard(base_url)
+
+
+async def close_proxy_clients() -> None:
+    """Close pooled upstream connections on shutdown."""
+    _sandbox_info_cache.clear()
+    await get_sandbox_proxy_clients().aclose()
+
+
 @router.api_route(
     "/{sandbox_id}/{port:int}/{path:path}",
     methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS", "HEAD"],
@@ -138,83 +198,57 @@ async def proxy_to_sandbox(sandbox_id: str, port: int, path: str, request: Reque
             f"[SandboxProxy] Sandbox metadata: task_type={task_type}, is_sandbox={is_sandbox}"
         )
 
-        # Read request body
-        body = await request.body()
-
         # For sandbox tasks, transform the request for executor's task dispatch endpoint
         if is_sandbox and path == "execute" and request.method == "POST":
+            body = await request.body()
             return await _proxy_sandbox_execute(base_url, sandbox, body, request)
 
         # Regular proxy for non-sandbox tasks or non-execute paths
-        target_url = f"{base_url}/{path}"
-
-        # Get query string
-        query_string = str(request.query_params)
-        if query_string:
-            target_url = f"{target_url}?{query_string}"
-
-        logger.info(f"[SandboxProxy] Proxying {request.method} {path} -> {target_url}")
-
-        # Forward headers (exclude hop-by-hop headers)
-        excluded_headers = {
-            "host",
-            "connection",
-            "keep-alive",
-            "proxy-authenticate",
-            "proxy-authorization",
-            "te",
-            "trailers",
-            "transfer-encoding",
-            "upgrade",
-        }
+        logger.info(f"[SandboxProxy] Proxying {request.method} {path} -> {base_url}")
+
         headers = {
             key: value
             for key, value in request.headers.items()
-            if key.lower() not in excluded_headers
+            if key.lower() not in HOP_BY_HOP_HEADERS
         }
+        # Stream the request body upstream as the client sends it
+        has_body = (
+            "content-length" in request.headers
+            or "transfer-encoding" in request.headers
+        )
 
-        # Make request to container
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.request(
-                method=request.method,
-                url=target_url,
-                headers=headers,
-                content=body,
-            )
+        client = get_sandbox_proxy_clients().get_client(base_url)
+        upstream_request = client.build_request(
+            method=request.method,
+            url=f"/{path}",
+            params=request.query_params.multi_items(),
+            headers=headers,
+            content=request.stream() if has_body else None,
+        )
+        response = await client.send(upstream_request, stream=True)
 
-        # Check if response is streaming
+        # Pass the body through undecoded, so it matches content-encoding.
+        # The client reads it at its own pace and the connection returns to
+        # the pool once it is consumed.
         content_type = response.headers.get("content-type", "")
-        is_streaming = (
-            "text/event-stream" in content_type
-            or "application/x-ndjson" in content_type
-            or response.headers.get("transfer-encoding") == "chunked"
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={
+                key: value
+                for key, value in response.headers.items()
+                if key.lower() not in HOP_BY_HOP_HEADERS
+            },
+            media_type=content_type or "application/json",
+            background=BackgroundTask(response.aclose),
         )
 
-        if is_streaming:
-            # For streaming responses, return StreamingResponse
-            async def stream_response():
-                async for chunk in response.aiter_bytes():
-                    yield chunk
-
-            return StreamingResponse(
-                stream_response(),
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=content_type,
-            )
-        else:
-            # For regular responses, return directly
-            return StreamingResponse(
-                iter([response.content]),
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=content_type or "application/json",
-            )
-
     except HTTPException:
         raise
     except httpx.ConnectError as e:
         logger.error(f"[SandboxProxy] Connection failed to sandbox {sandbox_id}: {e}")
+        # The container may have moved or stopped, look it up again next time
+        invalidate_sandbox_info(sandbox_id)
         raise HTTPException(
             status_code=503,
             detail={
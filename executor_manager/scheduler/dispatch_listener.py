@@ -0,0 +1,148 @@
+#!/usr/bin/env python
+
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+# -*- coding: utf-8 -*-
+
+"""
+Dispatch listener module, reacts to dispatch hints pushed by the backend
+"""
+
+import os
+import socket
+import threading
+
+import redis
+
+from executor_manager.common.redis_factory import RedisClientFactory
+from executor_manager.config.config import (
+    DISPATCH_QUEUE_BLOCK_MS,
+    DISPATCH_QUEUE_GROUP,
+    DISPATCH_QUEUE_STREAM,
+    SCHEDULER_SLEEP_TIME,
+)
+from shared.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Hint types published by the backend
+DISPATCH_TYPE_ONLINE = "online"
+DISPATCH_TYPE_PIPELINE = "pipeline"
+
+
+class DispatchQueueListener:
+    """Blocks on the backend's dispatch stream and triggers task fetches.
+
+    The backend adds a hint to a Redis Stream whenever executor subtasks
+    become PENDING. Hints are read through a consumer group, so each one is
+    handled by a single executor_manager instance, and at most as many hints
+    as there are free slots are read at once. Hints only bring the interval
+    fetch jobs forward, which stay the single place that claims tasks.
+    """
+
+    def __init__(self, scheduler):
+        """Initialize listener
+
+        Args:
+            scheduler: TaskScheduler whose fetch jobs are triggered
+        """
+        self.scheduler = scheduler
+        self.stream = DISPATCH_QUEUE_STREAM
+        self.group = DISPATCH_QUEUE_GROUP
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self._client = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start listening in a daemon thread"""
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="dispatch-queue-listener", daemon=True
+        )
+        self._thread.start()
+        logger.info(
+            f"Dispatch listener started: stream={self.stream}, group={self.group}, consumer={self.consumer}"
+        )
+
+    def stop(self):
+        """Stop listening"""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=DISPATCH_QUEUE_BLOCK_MS / 1000 + 1)
+            self._thread = None
+
+    def _get_client(self):
+        """Get a dedicated client, blocking reads must not share connections"""
+        if self._client is None:
+            client = RedisClientFactory.create_client()
+            if client is None:
+                return None
+            try:
+                client.xgroup_create(self.stream, self.group, id="$", mkstream=True)
+            except redis.ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+            self._client = client
+        return self._client
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if not self.poll_once():
+                    self._stop_event.wait(SCHEDULER_SLEEP_TIME)
+            except Exception as e:
+                logger.error(f"Dispatch listener error: {e}")
+                self._client = None
+                self._stop_event.wait(SCHEDULER_SLEEP_TIME)
+
+    def poll_once(self):
+        """Wait for hints once and run the matching fetch jobs
+
+        Returns:
+            bool: False if the listener could not wait (no free slots or no
+            Redis connection) and the caller should back off
+        """
+        available_slots = self.scheduler.get_available_online_slots()
+        if available_slots <= 0:
+            return False
+
+        client = self._get_client()
+        if client is None:
+            return False
+
+        response = client.xreadgroup(
+            self.group,
+            self.consumer,
+            {self.stream: ">"},
+            count=available_slots,
+            block=DISPATCH_QUEUE_BLOCK_MS,
+        )
+        if not response:
+            return True
+
+        entry_ids = []
+        hint_types = set()
+        for _, entries in response:
+            for entry_id, fields in entries:
+                entry_ids.append(entry_id)
+                hint_types.add(fields.get("type"))
+
+        # Hints carry no state, the dispatch API does the claiming, so they
+        # are acknowledged up front; anything missed is picked up by polling
+        client.xack(self.stream, self.group, *entry_ids)
+        logger.info(
+            f"Received {len(entry_ids)} dispatch hints, types={sorted(t for t in hint_types if t)}"
+        )
+
+        # Run the scheduled jobs early rather than fetching from this thread,
+        # so hints never dispatch in parallel with an interval run
+        if DISPATCH_TYPE_ONLINE in hint_types:
+            self.scheduler.trigger_job("fetch_online_tasks")
+        if DISPATCH_TYPE_PIPELINE in hint_types:
+            self.scheduler.trigger_job("fetch_subtasks")
+        return True
@@ -11,16 +11,20 @@ Scheduler module, responsible for periodic task execution
 """
 
 import os
+import threading
 import time
+from datetime import datetime
 
 import pytz
 from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.jobstores.base import JobLookupError
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 
 from executor_manager.clients.task_api_client import TaskApiClient
 from executor_manager.config.config import (
+    DISPATCH_QUEUE_ENABLED,
     EXECUTOR_DISPATCHER_MODE,
     OFFLINE_TASK_EVENING_HOURS,
     OFFLINE_TASK_MORNING_HOURS,
@@ -28,12 +32,17 @@ from executor_manager.config.config import (
     TASK_FETCH_INTERVAL,
 )
 from executor_manager.executors.dispatcher import ExecutorDispatcher
+from executor_manager.scheduler.dispatch_listener import DispatchQueueListener
 from executor_manager.tasks.task_processor import TaskProcessor
 from shared.logger import setup_logger
 from shared.telemetry.decorators import add_span_event, set_span_attribute, trace_sync
 
 logger = setup_logger(__name__)
 
+# Jobs that fetch and dispatch against the online slot count; the dispatch
+# listener triggers them too, so each runs one instance at a time
+EXCLUSIVE_JOB_IDS = ("fetch_online_tasks", "fetch_subtasks")
+
 
 class TaskScheduler:
     """Task scheduler class, responsible for periodic task fetching and processing"""
@@ -47,6 +56,11 @@ class TaskScheduler:
         self.max_offline_concurrent_tasks = int(
             os.getenv("MAX_OFFLINE_CONCURRENT_TASKS", "10")
         )
+        self.dispatch_listener = (
+            DispatchQueueListener(self) if DISPATCH_QUEUE_ENABLED else None
+        )
+        self._job_locks = {job_id: threading.Lock() for job_id in EXCLUSIVE_JOB_IDS}
+        self._job_reruns = {job_id: threading.Event() for job_id in EXCLUSIVE_JOB_IDS}
 
         # Configure APScheduler
         jobstores = {"default": MemoryJobStore()}
@@ -73,6 +87,55 @@ class TaskScheduler:
             timezone=timezone,
         )
 
+    def _run_exclusive(self, job_id, fetch):
+        """Run a fetch job unless another instance of it is running
+
+        A run requested while the job is in flight is not started in
+        parallel, where it would dispatch against the same slot count;
+        the running instance fetches once more instead.
+
+        Args:
+            job_id: ID of the job in EXCLUSIVE_JOB_IDS
+            fetch: Fetch-and-dispatch method of the job
+        """
+        lock = self._job_locks[job_id]
+        rerun = self._job_reruns[job_id]
+        rerun.set()
+        while rerun.is_set():
+            if not lock.acquire(blocking=False):
+                logger.debug(f"Job {job_id} is running, requested another fetch")
+                return
+            try:
+                rerun.clear()
+                fetch()
+            finally:
+                lock.release()
+
+    def trigger_job(self, job_id):
+        """Run a scheduled job now, through the scheduler's own job guard
+
+        Args:
+            job_id: ID of the job to run
+        """
+        try:
+            self.scheduler.modify_job(
+                job_id, next_run_time=datetime.now(self.scheduler.timezone)
+            )
+        except JobLookupError:
+            logger.warning(f"Cannot trigger unknown job {job_id}")
+
+    def get_available_online_slots(self):
+        """Get the number of online tasks that can be started now (0 on error)"""
+        executor_count_result = ExecutorDispatcher.get_executor(
+            EXECUTOR_DISPATCHER_MODE
+        ).get_executor_count("aigc.weibo.com/task-type=online")
+
+        if executor_count_result["status"] != "success":
+            return 0
+
+        running_executor_num = executor_count_result.get("running", 0)
+        return min(10, self.max_concurrent_tasks - running_executor_num)
+
     @trace_sync(
         span_name="fetch_online_tasks",
         tracer_name="executor_manager.scheduler",
@@ -236,8 +299,9 @@ class TaskScheduler:
         logger.info(f"Set task fetch interval to {TASK_FETCH_INTERVAL} seconds")
 
         self.scheduler.add_job(
-            self.fetch_online_and_process_tasks,
+            self._run_exclusive,
             "interval",
+            args=["fetch_online_tasks", self.fetch_online_and_process_tasks],
             seconds=TASK_FETCH_INTERVAL,
             id="fetch_online_tasks",
             name="fetch_online_tasks",
@@ -264,8 +328,9 @@ class TaskScheduler:
         )
 
         self.scheduler.add_job(
-            self.fetch_subtasks,
+            self._run_exclusive,
             "interval",
+            args=["fetch_subtasks", self.fetch_subtasks],
             seconds=TASK_FETCH_INTERVAL,
             id="fetch_subtasks",
             name="fetch_subtasks",
@@ -279,6 +344,8 @@ class TaskScheduler:
 
         try:
             self.scheduler.start()
+            if self.dispatch_listener:
+                self.dispatch_listener.start()
 
             while self.running:
                 time.sleep(SCHEDULER_SLEEP_TIME)
@@ -296,6 +363,9 @@ class TaskScheduler:
         logger.info("Stopping service...")
         self.running = False
 
+        if self.dispatch_listener:
+            self.dispatch_listener.stop()
+
         if self.scheduler.running:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler shutdown complete")
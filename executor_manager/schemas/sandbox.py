@@ -53,7 +53,10 @@ class CreateSandboxRequest(BaseModel):
     )
     metadata: Optional[Dict[str, Any]] = Field(
         default=None,
-        description="Additional metadata for the sandbox",
+        description=(
+            "Additional metadata for the sandbox; executor_image selects a "
+            "non-default executor image"
+        ),
     )
 
 
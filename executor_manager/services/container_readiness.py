@@ -0,0 +1,106 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Readiness signals from executor containers.
+
+Executor containers call POST /executors/{executor_name}/ready as soon as
+their HTTP server accepts connections. Code waiting for a container blocks on
+that signal instead of sleeping between probes, and keeps probing with
+exponential backoff in case the announcement is lost.
+"""
+
+import asyncio
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from executor_manager.common.singleton import SingletonMeta
+from shared.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Announcements older than this are dropped (seconds)
+READY_MARK_TTL = 600
+
+# Backoff between readiness probes (seconds)
+PROBE_INITIAL_DELAY = 0.2
+PROBE_MAX_DELAY = 1.0
+
+
+class ContainerReadiness(metaclass=SingletonMeta):
+    """Tracks readiness announcements and wakes up waiters."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._ready: Dict[str, float] = {}
+        self._waiters: Dict[
+            str, List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]]
+        ] = defaultdict(list)
+
+    def mark_ready(self, container_name: str) -> None:
+        """Record that a container announced readiness and wake its waiters.
+
+        Args:
+            container_name: Container/Pod name
+        """
+        now = time.time()
+        with self._lock:
+            # The announcement can arrive before anyone waits for it
+            self._ready[container_name] = now
+            for name, ready_at in list(self._ready.items()):
+                if now - ready_at > READY_MARK_TTL:
+                    del self._ready[name]
+            waiters = self._waiters.pop(container_name, [])
+
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def is_ready(self, container_name: str) -> bool:
+        with self._lock:
+            return container_name in self._ready
+
+    def forget(self, container_name: str) -> None:
+        """Drop the announcement of a container once it has been handled."""
+        with self._lock:
+            self._ready.pop(container_name, None)
+
+    async def wait(self, container_name: str, timeout: float) -> bool:
+        """Wait for a container's readiness announcement.
+
+        Args:
+            container_name: Container/Pod name
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the container has announced readiness
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._lock:
+            if container_name in self._ready:
+                return True
+            self._waiters[container_name].append(waiter)
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                waiters = self._waiters.get(container_name)
+                if waiters and waiter in waiters:
+                    waiters.remove(waiter)
+                    if not waiters:
+                        del self._waiters[container_name]
+
+
+def get_container_readiness() -> ContainerReadiness:
+    """Get the ContainerReadiness singleton instance.
+
+    Returns:
+        ContainerReadiness instance
+    """
+    return ContainerReadiness()
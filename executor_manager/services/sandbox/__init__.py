@@ -14,6 +14,7 @@ Public API:
     - SandboxManager: Main service for sandbox operations
     - get_sandbox_manager(): Get the singleton SandboxManager instance
     - SandboxScheduler: Background scheduler for sandbox maintenance
+    - WarmContainerPool: Pre-started sandbox containers
 """
 
 from executor_manager.services.sandbox.execution_runner import (
@@ -33,11 +34,13 @@ from executor_manager.services.sandbox.repository import (
     get_sandbox_repository,
 )
 from executor_manager.services.sandbox.scheduler import SandboxScheduler
+from executor_manager.services.sandbox.warm_pool import WarmContainerPool
 
 __all__ = [
     "SandboxManager",
     "get_sandbox_manager",
     "SandboxScheduler",
+    "WarmContainerPool",
     "ContainerHealthChecker",
     "get_container_health_checker",
     "ExecutionRunner",
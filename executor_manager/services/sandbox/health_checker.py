@@ -16,6 +16,11 @@ import httpx
 from executor_manager.common.config import get_config
 from executor_manager.common.singleton import SingletonMeta
 from executor_manager.executors.docker.utils import get_container_ports
+from executor_manager.services.container_readiness import (
+    PROBE_INITIAL_DELAY,
+    PROBE_MAX_DELAY,
+    get_container_readiness,
+)
 from shared.logger import setup_logger
 
 logger = setup_logger(__name__)
@@ -97,13 +102,20 @@ class ContainerHealthChecker(metaclass=SingletonMeta):
         if max_wait is None:
             max_wait = self._config.timeout.container_ready
 
-        start_time = asyncio.get_event_loop().time()
+        readiness = get_container_readiness()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait
+        delay = PROBE_INITIAL_DELAY
         logger.info(
             f"[ContainerHealthChecker] Waiting for container {container_name} "
             f"to be ready (max_wait={max_wait}s)"
         )
 
-        while asyncio.get_event_loop().time() - start_time < max_wait:
+        while loop.time() < deadline:
+            # Returns early when the container announces readiness
+            announced = await readiness.wait(
+                container_name, timeout=min(delay, deadline - loop.time())
+            )
             try:
                 port_result = get_container_ports(container_name)
                 if port_result.get("status") == "success":
@@ -118,6 +130,7 @@ class ContainerHealthChecker(metaclass=SingletonMeta):
                                 f"on port {port}: healthy={is_healthy}"
                             )
                             if is_healthy:
+                                readiness.forget(container_name)
                                 logger.info(
                                     f"[ContainerHealthChecker] Container ready: "
                                     f"{container_name} on port {port}"
@@ -126,7 +139,11 @@ class ContainerHealthChecker(metaclass=SingletonMeta):
             except Exception as e:
                 logger.debug(f"[ContainerHealthChecker] Waiting for container: {e}")
 
-            await asyncio.sleep(1)
+            if announced:
+                await asyncio.sleep(delay)
+            delay = min(delay * 2, PROBE_MAX_DELAY)
+
+        readiness.forget(container_name)
 
         logger.warning(
             f"[ContainerHealthChecker] Container {container_name} did not become ready "
@@ -27,12 +27,20 @@ from executor_manager.models.sandbox import (
     Sandbox,
     SandboxStatus,
 )
+from executor_manager.services.container_readiness import (
+    PROBE_INITIAL_DELAY,
+    get_container_readiness,
+)
 from executor_manager.services.heartbeat_manager import get_heartbeat_manager
 from executor_manager.services.sandbox.execution_runner import get_execution_runner
 from executor_manager.services.sandbox.health_checker import (
     get_container_health_checker,
 )
 from executor_manager.services.sandbox.repository import get_sandbox_repository
+from executor_manager.services.sandbox.warm_pool import (
+    WarmContainerPool,
+    init_warm_container,
+)
 from executor_manager.utils.executor_name import generate_executor_name
 from shared.logger import setup_logger
 
@@ -62,8 +70,15 @@ class SandboxManager(metaclass=SingletonMeta):
         self._health_checker = get_container_health_checker()
         self._execution_runner = get_execution_runner()
         self._scheduler: Optional["SandboxScheduler"] = None
+        self._warm_pool = WarmContainerPool(self)
+        self._refill_task: Optional[asyncio.Task] = None
         self._shutting_down = False
 
+    @property
+    def warm_pool(self) -> WarmContainerPool:
+        """Pool of pre-started sandbox containers."""
+        return self._warm_pool
+
     # =========================================================================
     # Sandbox Lifecycle
     # =========================================================================
@@ -177,6 +192,10 @@ class SandboxManager(metaclass=SingletonMeta):
         Returns:
             Error message if failed, None if successful
         """
+        # Use a pre-started container when the image is pooled
+        if await self._claim_warm_container(sandbox):
+            return None
+
         # Build task data for executor
         task_data = self._build_sandbox_task(sandbox)
 
@@ -207,6 +226,52 @@ class SandboxManager(metaclass=SingletonMeta):
 
         return None
 
+    async def _claim_warm_container(self, sandbox: Sandbox) -> bool:
+        """Assign an idle warm container to a sandbox.
+
+        Args:
+            sandbox: Sandbox to assign a container to
+
+        Returns:
+            True if a warm container was claimed, False on a pool miss
+        """
+        image = self._get_sandbox_image(sandbox)
+        claimed = False
+        while not claimed:
+            container = self._warm_pool.claim(image)
+            if container is None:
+                break
+
+            # Bind the container to this sandbox, which starts its heartbeat
+            env_vars = {
+                "HEARTBEAT_ID": sandbox.sandbox_id,
+                "SANDBOX_ID": sandbox.sandbox_id,
+            }
+            if await init_warm_container(
+                container, env_vars, self._config.timeout.http_container_wait
+            ):
+                sandbox.container_name = container.container_name
+                sandbox.set_running(container.base_url)
+                self._repository.save_sandbox(sandbox)
+                claimed = True
+                logger.info(
+                    f"[SandboxManager] Claimed warm container {container.container_name} "
+                    f"for sandbox {sandbox.sandbox_id}"
+                )
+            else:
+                self._warm_pool.discard(container)
+
+        if image in self._warm_pool.get_pool_sizes():
+            self._schedule_warm_pool_refill()
+        return claimed
+
+    def _schedule_warm_pool_refill(self) -> None:
+        """Refill the warm pool in the background after a claim."""
+        if self._shutting_down:
+            return
+        if self._refill_task is None or self._refill_task.done():
+            self._refill_task = asyncio.create_task(self._warm_pool.refill())
+
     async def _wait_for_container_ready(
         self,
         executor,
@@ -216,16 +281,30 @@ class SandboxManager(metaclass=SingletonMeta):
     ) -> Optional[str]:
         """Wait for container to be ready and return base_url.
 
+        Probes as soon as the container announces readiness, otherwise with
+        exponential backoff.
+
         Args:
             executor: Executor instance
             container_name: Container/Pod name
-            max_retries: Maximum number of retries
-            interval: Interval between retries in seconds
+            max_retries: Maximum number of retries at the full interval
+            interval: Interval between retries in seconds; the total wait is
+                max_retries * interval
 
         Returns:
             base_url if ready, None otherwise
         """
-        for i in range(max_retries):
+        readiness = get_container_readiness()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_retries * interval
+        delay = min(PROBE_INITIAL_DELAY, interval)
+        attempt = 0
+
+        while loop.time() < deadline:
+            announced = await readiness.wait(
+                container_name, timeout=min(delay, deadline - loop.time())
+            )
+            attempt += 1
             result = await asyncio.to_thread(
                 executor.get_container_address, container_name
             )
@@ -235,17 +314,24 @@ class SandboxManager(metaclass=SingletonMeta):
                     # Check if container is healthy
                     is_healthy = await self._check_container_health(base_url)
                     if is_healthy:
+                        readiness.forget(container_name)
                         logger.info(
                             f"[SandboxManager] Container ready: {container_name}, "
-                            f"base_url={base_url}"
+                            f"base_url={base_url} (attempt {attempt}, "
+                            f"announced={announced})"
                         )
                         return base_url
 
             logger.debug(
                 f"[SandboxManager] Waiting for container {container_name} to be ready "
-                f"(attempt {i + 1}/{max_retries})"
+                f"(attempt {attempt})"
             )
-            await asyncio.sleep(interval)
+            if announced:
+                # Announced but not reachable yet, waiting would return at once
+                await asyncio.sleep(delay)
+            delay = min(delay * 2, interval)
+
+        readiness.forget(container_name)
 
         logger.error(
             f"[SandboxManager] Container {container_name} failed to become ready"
@@ -270,6 +356,20 @@ class SandboxManager(metaclass=SingletonMeta):
         except Exception:
             return False
 
+    def _get_sandbox_image(self, sandbox: Sandbox) -> str:
+        """Get the executor image a sandbox runs, the default unless requested.
+
+        Args:
+            sandbox: Sandbox to get the image for
+
+        Returns:
+            Executor image name
+        """
+        return (
+            sandbox.metadata.get("executor_image")
+            or self._config.executor.executor_image
+        )
+
     def _build_sandbox_task(self, sandbox: Sandbox) -> Dict[str, Any]:
         """Build task data for creating a sandbox container.
 
@@ -319,7 +419,7 @@ class SandboxManager(metaclass=SingletonMeta):
             "git_repo_id": 0,
             "branch_name": "",
             "git_url": "",
-            "executor_image": self._config.executor.executor_image,
+            "executor_image": self._get_sandbox_image(sandbox),
             "sandbox_metadata": {
                 "sandbox_id": sandbox.sandbox_id,
                 "timeout": (
@@ -785,15 +885,32 @@ class SandboxManager(metaclass=SingletonMeta):
         # Import here to avoid circular imports
         from executor_manager.services.sandbox.scheduler import SandboxScheduler
 
+        if self._warm_pool.enabled:
+            await self._remove_warm_pool_leftovers()
+
         self._scheduler = SandboxScheduler(self)
         await self._scheduler.start()
 
+    async def _remove_warm_pool_leftovers(self) -> None:
+        """Delete unclaimed warm containers started by a previous process."""
+        in_use = []
+        for sandbox_id in self._repository.get_active_sandbox_ids():
+            sandbox = self._repository.load_sandbox(sandbox_id)
+            if sandbox is not None:
+                in_use.append(sandbox.container_name)
+        try:
+            await self._warm_pool.remove_leftovers(in_use)
+        except Exception as e:
+            logger.warning(f"[SandboxManager] Error removing warm containers: {e}")
+
     async def stop_scheduler(self) -> None:
         """Stop the background task scheduler."""
         self._shutting_down = True
         if self._scheduler is not None:
             await self._scheduler.stop()
             self._scheduler = None
+        if self._warm_pool.enabled:
+            await self._warm_pool.drain()
 
     # Legacy method names for backward compatibility
     async def start_gc_task(self) -> None:
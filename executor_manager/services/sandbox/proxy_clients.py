@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Keep-alive HTTP clients for the E2B sandbox proxy.
+
+The proxy forwards every E2B SDK call (envd file reads, code execution,
+process RPCs) to a sandbox container. One long-lived client is kept per
+container base_url so upstream connections are reused across requests instead
+of being opened and torn down for each one.
+"""
+
+import asyncio
+from collections import OrderedDict
+
+import httpx
+
+from executor_manager.common.config import get_config
+from executor_manager.common.singleton import SingletonMeta
+from shared.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Read timeout between chunks, connect timeout for new upstream sockets (seconds)
+PROXY_READ_TIMEOUT = 60.0
+PROXY_CONNECT_TIMEOUT = 10.0
+
+
+class SandboxProxyClients(metaclass=SingletonMeta):
+    """Pool of httpx.AsyncClient instances keyed by sandbox base_url."""
+
+    def __init__(self):
+        self._config = get_config().proxy
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict()
+
+    def get_client(self, base_url: str) -> httpx.AsyncClient:
+        """Get the shared client for a sandbox, creating it on first use.
+
+        Args:
+            base_url: Container base URL (e.g., http://localhost:8080)
+
+        Returns:
+            httpx.AsyncClient reusing connections to base_url
+        """
+        client = self._clients.get(base_url)
+        if client is not None and not client.is_closed:
+            self._clients.move_to_end(base_url)
+            return client
+
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=httpx.Timeout(PROXY_READ_TIMEOUT, connect=PROXY_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_keepalive_connections=self._config.max_keepalive_connections,
+                max_connections=self._config.max_connections,
+                keepalive_expiry=self._config.keepalive_expiry,
+            ),
+        )
+        self._clients[base_url] = client
+
+        # Containers come and go, so evict clients of the least recently used
+        # sandboxes, which are unlikely to have streams in flight
+        while len(self._clients) > self._config.max_clients:
+            _, evicted = self._clients.popitem(last=False)
+            self._close_later(evicted)
+
+        return client
+
+    def discard(self, base_url: str) -> None:
+        """Close the client of a sandbox that is gone or unreachable."""
+        client = self._clients.pop(base_url, None)
+        if client is not None:
+            self._close_later(client)
+
+    async def aclose(self) -> None:
+        """Close all clients."""
+        clients = list(self._clients.values())
+        self._clients.clear()
+        await asyncio.gather(
+            *(client.aclose() for client in clients), return_exceptions=True
+        )
+
+    def _close_later(self, client: httpx.AsyncClient) -> None:
+        try:
+            asyncio.get_running_loop().create_task(client.aclose())
+        except RuntimeError:
+            logger.debug("[SandboxProxyClients] No running loop to close client")
+
+
+def get_sandbox_proxy_clients() -> SandboxProxyClients:
+    """Get the SandboxProxyClients singleton instance.
+
+    Returns:
+        SandboxProxyClients instance
+    """
+    return SandboxProxyClients()
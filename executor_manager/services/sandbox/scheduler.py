@@ -7,17 +7,20 @@
 This module handles scheduled tasks for sandbox management:
 - Heartbeat checking: Detect dead executor containers
 - Garbage collection: Clean up expired sandboxes
+- Warm pool refill: Keep pre-started sandbox containers available
 
 Uses APScheduler for task scheduling.
 """
 
 import os
 import time
+from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 
+from executor_manager.common.config import get_config
 from shared.logger import setup_logger
 
 if TYPE_CHECKING:
@@ -94,6 +97,18 @@ class SandboxScheduler:
             replace_existing=True,
         )
 
+        # Add warm pool refill job, first run right away
+        warm_pool = self._sandbox_manager.warm_pool
+        if warm_pool.enabled:
+            self._scheduler.add_job(
+                warm_pool.refill,
+                IntervalTrigger(seconds=get_config().warm_pool.refill_interval),
+                id="warm_pool_refill",
+                name="Warm Pool Refill",
+                replace_existing=True,
+                next_run_time=datetime.now(),
+            )
+
         self._scheduler.start()
         logger.info(
             f"[SandboxScheduler] Started with jobs: "
@@ -0,0 +1,317 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Warm container pool for sandbox creation.
+
+Sandbox containers carry no task data at start: executions are sent to them
+over HTTP, and the only per-sandbox setting, the heartbeat id, is injected
+through envd /init. So containers can be started and health-checked ahead of
+time, and creating a sandbox becomes claiming one of them.
+
+Pools are kept per executor image. The refill job keeps between min_size and
+max_size idle containers per image, sized by how many were claimed since the
+previous refill, and replaces containers that stayed idle too long.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from executor_manager.common.config import get_config
+from executor_manager.config.config import EXECUTOR_DISPATCHER_MODE
+from executor_manager.executors.dispatcher import ExecutorDispatcher
+from shared.logger import setup_logger
+
+if TYPE_CHECKING:
+    from executor_manager.services.sandbox.manager import SandboxManager
+
+logger = setup_logger(__name__)
+
+# User label of warm containers, used to find leftovers after a restart
+WARM_POOL_USER = "warmpool"
+
+
+@dataclass
+class WarmContainer:
+    """An idle, health-checked sandbox container."""
+
+    container_name: str
+    base_url: str
+    image: str
+    created_at: float
+
+
+class WarmContainerPool:
+    """Pool of pre-started sandbox containers, keyed by executor image."""
+
+    def __init__(self, sandbox_manager: "SandboxManager"):
+        """Initialize the pool.
+
+        Args:
+            sandbox_manager: SandboxManager used to wait for container readiness
+        """
+        self._sandbox_manager = sandbox_manager
+        self._config = get_config()
+        self._idle: Dict[str, Deque[WarmContainer]] = defaultdict(deque)
+        self._starting: Dict[str, int] = defaultdict(int)
+        self._claims_since_refill: Dict[str, int] = defaultdict(int)
+        # Strong references to fire-and-forget deletions until they finish
+        self._background_tasks: Set[asyncio.Task] = set()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "started": 0,
+            "start_failures": 0,
+            "discarded": 0,
+        }
+
+    # =========================================================================
+    # Configuration
+    # =========================================================================
+
+    def get_pool_sizes(self) -> Dict[str, Tuple[int, int]]:
+        """Get (min_size, max_size) for every pooled image."""
+        pool_config = self._config.warm_pool
+        sizes: Dict[str, Tuple[int, int]] = {}
+
+        default_image = self._config.executor.executor_image
+        if default_image and pool_config.min_size > 0:
+            sizes[default_image] = (
+                pool_config.min_size,
+                max(pool_config.min_size, pool_config.max_size),
+            )
+
+        if pool_config.image_sizes:
+            try:
+                for image, image_sizes in json.loads(pool_config.image_sizes).items():
+                    min_size = int(image_sizes.get("min_size", 0))
+                    max_size = int(image_sizes.get("max_size", min_size))
+                    if min_size > 0:
+                        sizes[image] = (min_size, max(min_size, max_size))
+            except (ValueError, AttributeError) as e:
+                logger.error(
+                    f"[WarmContainerPool] Invalid SANDBOX_WARM_POOL_IMAGES: {e}"
+                )
+
+        return sizes
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any image is pooled."""
+        return bool(self.get_pool_sizes())
+
+    # =========================================================================
+    # Claiming
+    # =========================================================================
+
+    def claim(self, image: str) -> Optional[WarmContainer]:
+        """Take an idle container for an image.
+
+        Args:
+            image: Executor image the sandbox needs
+
+        Returns:
+            WarmContainer, or None on a pool miss
+        """
+        if image not in self.get_pool_sizes():
+            return None
+
+        self._claims_since_refill[image] += 1
+        idle = self._idle[image]
+        if idle:
+            self._stats["hits"] += 1
+            return idle.popleft()
+
+        self._stats["misses"] += 1
+        return None
+
+    def discard(self, container: WarmContainer) -> None:
+        """Delete a warm container that turned out to be unusable."""
+        self._stats["discarded"] += 1
+        task = asyncio.create_task(self._delete_container(container.container_name))
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_task_done)
+
+    def _on_background_task_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(
+                f"[WarmContainerPool] Background task failed: {task.exception()}"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool counters and hit rate."""
+        claims = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "hit_rate": round(self._stats["hits"] / claims, 4) if claims else None,
+            "idle": {image: len(idle) for image, idle in self._idle.items()},
+            "starting": {
+                image: count for image, count in self._starting.items() if count
+            },
+        }
+
+    # =========================================================================
+    # Refill
+    # =========================================================================
+
+    async def refill(self) -> None:
+        """Recycle stale containers and top up every pool to its target size."""
+        now = time.time()
+        max_idle = self._config.warm_pool.max_idle_seconds
+        pool_sizes = self.get_pool_sizes()
+
+        jobs = []
+        for image, idle in list(self._idle.items()):
+            keep = deque()
+            for container in idle:
+                if image in pool_sizes and now - container.created_at < max_idle:
+                    keep.append(container)
+                else:
+                    jobs.append(self._delete_container(container.container_name))
+            self._idle[image] = keep
+
+        for image, (min_size, max_size) in pool_sizes.items():
+            # Follow demand between min and max
+            claims = self._claims_since_refill.pop(image, 0)
+            target = min(max(min_size, claims), max_size)
+            missing = target - len(self._idle[image]) - self._starting[image]
+            for _ in range(missing):
+                # Counted before awaiting so overlapping refills do not overshoot
+                self._starting[image] += 1
+                jobs.append(self._start_container(image))
+
+        if jobs:
+            await asyncio.gather(*jobs)
+            logger.info(f"[WarmContainerPool] Refilled: {self.get_stats()}")
+
+    async def drain(self) -> None:
+        """Delete all idle containers."""
+        names = [c.container_name for idle in self._idle.values() for c in idle]
+        self._idle.clear()
+        await asyncio.gather(*(self._delete_container(name) for name in names))
+
+    async def remove_leftovers(self, in_use: List[str]) -> None:
+        """Delete idle warm containers left behind by a previous process.
+
+        Args:
+            in_use: Container names claimed by active sandboxes
+        """
+        executor = ExecutorDispatcher.get_executor(EXECUTOR_DISPATCHER_MODE)
+        result = await asyncio.to_thread(
+            executor.get_current_task_ids, f"user={WARM_POOL_USER}"
+        )
+        tracked = {c.container_name for idle in self._idle.values() for c in idle}
+        leftovers = [
+            container["container_name"]
+            for container in result.get("containers", [])
+            if container["container_name"] not in tracked
+            and container["container_name"] not in in_use
+        ]
+        if leftovers:
+            logger.info(
+                f"[WarmContainerPool] Removing {len(leftovers)} leftover warm containers"
+            )
+            await asyncio.gather(*(self._delete_container(n) for n in leftovers))
+
+    def _build_warm_task(self, image: str) -> Dict[str, Any]:
+        """Build task data for an unassigned sandbox container."""
+        return {
+            "task_id": 0,
+            "subtask_id": uuid.uuid4().hex,
+            "task_title": "Sandbox: warm pool",
+            "subtask_title": "Waiting for claim",
+            "type": "sandbox",
+            "prompt": "",
+            "status": "PENDING",
+            "bot": [],
+            "user": {"id": 0, "name": WARM_POOL_USER},
+            "executor_image": image,
+            # No sandbox_id yet: the heartbeat id is set through envd /init
+            "sandbox_metadata": {"warm_pool": True},
+        }
+
+    async def _start_container(self, image: str) -> None:
+        try:
+            executor = ExecutorDispatcher.get_executor(EXECUTOR_DISPATCHER_MODE)
+            result = await asyncio.to_thread(
+                executor.submit_executor, self._build_warm_task(image), None
+            )
+            if result.get("status") != "success":
+                self._stats["start_failures"] += 1
+                logger.warning(
+                    f"[WarmContainerPool] Failed to start warm container for {image}: "
+                    f"{result.get('error_msg')}"
+                )
+                return
+
+            container_name = result["executor_name"]
+            base_url = await self._sandbox_manager._wait_for_container_ready(
+                executor, container_name
+            )
+            if base_url is None:
+                self._stats["start_failures"] += 1
+                await self._delete_container(container_name)
+                return
+
+            self._stats["started"] += 1
+            self._idle[image].append(
+                WarmContainer(
+                    container_name=container_name,
+                    base_url=base_url,
+                    image=image,
+                    created_at=time.time(),
+                )
+            )
+        except Exception as e:
+            self._stats["start_failures"] += 1
+            logger.error(f"[WarmContainerPool] Error starting warm container: {e}")
+        finally:
+            self._starting[image] -= 1
+
+    async def _delete_container(self, container_name: str) -> None:
+        try:
+            executor = ExecutorDispatcher.get_executor(EXECUTOR_DISPATCHER_MODE)
+            await asyncio.to_thread(executor.delete_executor, container_name)
+        except Exception as e:
+            logger.warning(
+                f"[WarmContainerPool] Error deleting warm container {container_name}: {e}"
+            )
+
+
+async def init_warm_container(
+    container: WarmContainer, env_vars: Dict[str, str], timeout: float
+) -> bool:
+    """Assign a warm container to a sandbox through envd /init.
+
+    Args:
+        container: Claimed container
+        env_vars: Environment for the sandbox, including HEARTBEAT_ID
+        timeout: HTTP timeout in seconds
+
+    Returns:
+        True if the container accepted the environment
+    """
+    try:
+        async with httpx.AsyncClient(timeout=timeout) as client:
+            response = await client.post(
+                f"{container.base_url}/init",
+                json={
+                    "envVars": env_vars,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+            return response.status_code < 300
+    except Exception as e:
+        logger.warning(
+            f"[WarmContainerPool] /init failed for {container.container_name}: {e}"
+        )
+        return False
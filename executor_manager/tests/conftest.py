@@ -293,6 +293,12 @@ def reset_all_singletons_and_mock_redis(mocker, mock_redis_client):
     )
     mocker.patch("redis.from_url", return_value=mock_redis_client)
 
+    # Use the docker CLI code paths even where a Docker socket exists
+    mocker.patch(
+        "executor_manager.executors.docker.engine.get_docker_engine_client",
+        return_value=None,
+    )
+
     # Reset singletons
     try:
         from executor_manager.common.singleton import SingletonMeta
@@ -0,0 +1,270 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Tests for the Docker Engine API client state cache"""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from executor_manager.executors.docker import utils
+from executor_manager.executors.docker.engine import (
+    ContainerState,
+    ContainerStateCache,
+    DockerNotFoundError,
+)
+
+OWNER_LABELS = {"owner": "executor_manager"}
+
+
+def _list_entry(name, state="running", labels=None, ports=None, container_id=None):
+    return {
+        "Id": container_id or f"id-{name}",
+        "Names": [f"/{name}"],
+        "State": state,
+        "Labels": {**OWNER_LABELS, **(labels or {})},
+        "Ports": ports or [],
+    }
+
+
+def _inspect(
+    name,
+    status="running",
+    labels=None,
+    ports=None,
+    oom_killed=False,
+    exit_code=0,
+    container_id=None,
+):
+    return {
+        "Id": container_id or f"id-{name}",
+        "Name": f"/{name}",
+        "State": {"Status": status, "OOMKilled": oom_killed, "ExitCode": exit_code},
+        "Config": {"Labels": {**OWNER_LABELS, **(labels or {})}},
+        "NetworkSettings": {"Ports": ports or {}},
+    }
+
+
+@pytest.fixture
+def engine_client():
+    return MagicMock()
+
+
+@pytest.fixture
+def cache(engine_client):
+    return ContainerStateCache(engine_client)
+
+
+class TestContainerState:
+    def test_from_list_entry_keeps_public_ports(self):
+        container = ContainerState.from_list_entry(
+            _list_entry(
+                "executor-1",
+                ports=[
+                    {
+                        "IP": "0.0.0.0",
+                        "PrivatePort": 8080,
+                        "PublicPort": 10001,
+                        "Type": "tcp",
+                    },
+                    {
+                        "IP": "::",
+                        "PrivatePort": 8080,
+                        "PublicPort": 10001,
+                        "Type": "tcp",
+                    },
+                    {"PrivatePort": 9000, "Type": "tcp"},
+                ],
+            )
+        )
+
+        assert container.name == "executor-1"
+        assert container.ports == [
+            {"host_port": 10001, "container_port": 8080, "protocol": "tcp"}
+        ]
+        assert container.exit_code is None
+
+    def test_from_inspect(self):
+        container = ContainerState.from_inspect(
+            _inspect(
+                "executor-1",
+                status="exited",
+                oom_killed=True,
+                exit_code=137,
+                ports={"8080/tcp": [{"HostIp": "0.0.0.0", "HostPort": "10002"}]},
+            )
+        )
+
+        assert container.state == "exited"
+        assert container.oom_killed is True
+        assert container.exit_code == 137
+        assert container.ports == [
+            {"host_port": 10002, "container_port": 8080, "protocol": "tcp"}
+        ]
+
+    def test_matches_label_selector(self):
+        container = ContainerState(
+            id="1", name="c", state="running", labels={"task_id": "42"}
+        )
+
+        assert container.matches(None)
+        assert container.matches("task_id")
+        assert container.matches("task_id=42")
+        assert not container.matches("task_id=43")
+        assert not container.matches("subtask_id")
+
+
+class TestContainerStateCache:
+    def test_reconcile_replaces_table(self, cache, engine_client):
+        cache._containers["gone"] = ContainerState(id="x", name="gone", state="running")
+        engine_client.list_containers.return_value = [
+            _list_entry("a"),
+            _list_entry("b", state="exited"),
+        ]
+
+        cache.reconcile()
+
+        assert cache.get("gone") is None
+        assert [c.name for c in cache.list()] == ["a"]
+        assert len(cache.list(running_only=False)) == 2
+
+    def test_reconcile_keeps_known_exit_code(self, cache, engine_client):
+        cache._containers["a"] = ContainerState(
+            id="id-a", name="a", state="exited", oom_killed=True, exit_code=137
+        )
+        engine_client.list_containers.return_value = [_list_entry("a", state="exited")]
+
+        cache.reconcile()
+
+        assert cache.get("a").exit_code == 137
+        assert cache.get("a").oom_killed is True
+
+    def test_apply_event_refreshes_container(self, cache, engine_client):
+        engine_client.inspect_container.return_value = _inspect(
+            "a", status="exited", oom_killed=True, exit_code=137
+        )
+
+        cache.apply_event(
+            {
+                "Type": "container",
+                "Action": "die",
+                "Actor": {"ID": "id-a", "Attributes": {"name": "a"}},
+            }
+        )
+
+        engine_client.inspect_container.assert_called_once_with("id-a")
+        assert cache.get("a").state == "exited"
+        assert cache.get("a").oom_killed is True
+
+    def test_apply_event_destroy_removes_container(self, cache, engine_client):
+        cache._containers["a"] = ContainerState(id="id-a", name="a", state="exited")
+
+        cache.apply_event(
+            {
+                "Type": "container",
+                "Action": "destroy",
+                "Actor": {"ID": "id-a", "Attributes": {"name": "a"}},
+            }
+        )
+
+        assert cache.get("a") is None
+        engine_client.inspect_container.assert_not_called()
+
+    def test_apply_event_ignores_exec_events(self, cache, engine_client):
+        cache.apply_event(
+            {"Type": "container", "Action": "exec_start: sh", "Actor": {"ID": "id-a"}}
+        )
+
+        engine_client.inspect_container.assert_not_called()
+
+    def test_refresh_missing_container(self, cache, engine_client):
+        cache._containers["a"] = ContainerState(id="id-a", name="a", state="running")
+        engine_client.inspect_container.side_effect = DockerNotFoundError(404, "gone")
+
+        assert cache.refresh("a") is None
+        assert cache.get("a") is None
+
+    def test_used_host_ports(self, cache):
+        cache._containers = {
+            "a": ContainerState(
+                id="1",
+                name="a",
+                state="running",
+                ports=[{"host_port": 10001, "container_port": 8080, "protocol": "tcp"}],
+            ),
+            "b": ContainerState(
+                id="2",
+                name="b",
+                state="exited",
+                ports=[{"host_port": 10002, "container_port": 8080, "protocol": "tcp"}],
+            ),
+        }
+
+        assert cache.used_host_ports() == {10001}
+
+
+class TestUtilsWithEngine:
+    @pytest.fixture
+    def synced_cache(self, mocker, cache, engine_client):
+        # Patch the modules utils holds, other tests re-import the package
+        mocker.patch.object(
+            utils.engine, "get_docker_engine_client", return_value=engine_client
+        )
+        mocker.patch.object(
+            utils.engine, "get_container_state_cache", return_value=cache
+        )
+        mock_run = mocker.patch.object(utils.subprocess, "run")
+        yield cache
+        mock_run.assert_not_called()
+
+    def test_running_task_details_from_cache(self, synced_cache):
+        synced_cache._containers = {
+            "a": ContainerState(
+                id="1",
+                name="a",
+                state="running",
+                labels={"task_id": "1", "subtask_id": "2", "subtask_next_id": "3"},
+            ),
+            "b": ContainerState(
+                id="2", name="b", state="exited", labels={"task_id": "9"}
+            ),
+        }
+
+        result = utils.get_running_task_details()
+
+        assert result["status"] == "success"
+        assert result["task_ids"] == ["1"]
+        assert result["containers"][0]["task_type"] == "online"
+        assert utils.count_running_containers()["count"] == 1
+
+    def test_container_status_running_from_cache(self, synced_cache, engine_client):
+        synced_cache._containers["a"] = ContainerState(
+            id="1", name="a", state="running"
+        )
+
+        result = utils.get_container_status("a")
+
+        assert result["exists"] is True
+        assert result["status"] == "running"
+        assert result["exit_code"] == 0
+        engine_client.inspect_container.assert_not_called()
+
+    def test_container_status_not_found(self, synced_cache, engine_client):
+        engine_client.inspect_container.side_effect = DockerNotFoundError(404, "gone")
+
+        result = utils.get_container_status("missing")
+
+        assert result["exists"] is False
+        assert result["status"] == "not_found"
+
+    def test_ownership_falls_back_to_inspect(self, synced_cache, engine_client):
+        engine_client.inspect_container.return_value = _inspect("new")
+
+        assert utils.check_container_ownership("new") is True
+        assert synced_cache.get("new") is not None
+
+    def test_delete_container_uses_engine(self, synced_cache, engine_client):
+        assert utils.delete_container("a") == {"status": "success"}
+        engine_client.stop_container.assert_called_once_with("a")
+        engine_client.remove_container.assert_called_once_with("a")
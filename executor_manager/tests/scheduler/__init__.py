@@ -0,0 +1,5 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for executor_manager scheduler."""
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for DispatchQueueListener."""
+
+from unittest.mock import MagicMock, call
+
+import pytest
+
+from executor_manager.scheduler.dispatch_listener import DispatchQueueListener
+
+
+@pytest.fixture
+def scheduler():
+    scheduler = MagicMock()
+    scheduler.get_available_online_slots.return_value = 3
+    return scheduler
+
+
+@pytest.fixture
+def listener(scheduler):
+    listener = DispatchQueueListener(scheduler)
+    listener._client = MagicMock()
+    return listener
+
+
+def test_waits_with_free_slot_count(listener):
+    listener._client.xreadgroup.return_value = []
+
+    assert listener.poll_once()
+
+    kwargs = listener._client.xreadgroup.call_args.kwargs
+    assert kwargs["count"] == 3
+    assert kwargs["block"] > 0
+
+
+def test_no_free_slots_skips_read(listener, scheduler):
+    scheduler.get_available_online_slots.return_value = 0
+
+    assert not listener.poll_once()
+
+    listener._client.xreadgroup.assert_not_called()
+
+
+def test_hints_trigger_fetch_jobs(listener, scheduler):
+    listener._client.xreadgroup.return_value = [
+        (
+            listener.stream,
+            [
+                ("1-0", {"task_id": "1", "type": "online"}),
+                ("2-0", {"task_id": "2", "type": "online"}),
+                ("3-0", {"task_id": "3", "type": "pipeline"}),
+            ],
+        )
+    ]
+
+    assert listener.poll_once()
+
+    listener._client.xack.assert_called_once_with(
+        listener.stream, listener.group, "1-0", "2-0", "3-0"
+    )
+    assert scheduler.trigger_job.call_args_list == [
+        call("fetch_online_tasks"),
+        call("fetch_subtasks"),
+    ]
+    scheduler.fetch_online_and_process_tasks.assert_not_called()
+    scheduler.fetch_subtasks.assert_not_called()
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2025 Weibo, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for TaskScheduler fetch job guards."""
+
+import threading
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+
+@pytest.fixture
+def task_scheduler():
+    # Importing the scheduler loads the default docker executor
+    with patch("subprocess.run", return_value=MagicMock(returncode=0)):
+        from executor_manager.scheduler import scheduler
+
+    with (
+        patch.object(scheduler, "TaskApiClient"),
+        patch.object(scheduler, "TaskProcessor"),
+    ):
+        yield scheduler.TaskScheduler()
+
+
+def test_notify_during_running_fetch_does_not_dispatch_in_parallel(task_scheduler):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    active = []
+
+    def fetch():
+        active.append(1)
+        calls.append(len(active))
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+        active.pop()
+
+    job = threading.Thread(
+        target=task_scheduler._run_exclusive, args=("fetch_online_tasks", fetch)
+    )
+    job.start()
+    assert started.wait(5)
+
+    # A hint arrives while the interval run is still dispatching
+    task_scheduler._run_exclusive("fetch_online_tasks", fetch)
+    assert calls == [1]
+
+    release.set()
+    job.join(5)
+
+    # The running instance fetched once more, never two at a time
+    assert calls == [1, 1]
+
+
+def test_trigger_job_runs_scheduled_job_now(task_scheduler):
+    task_scheduler.setup_schedule()
+
+    with patch.object(task_scheduler.scheduler, "modify_job") as modify_job:
+        task_scheduler.trigger_job("fetch_subtasks")
+
+    job_id = modify_job.call_args.args[0]
+    assert job_id == "fetch_subtasks"
+    assert isinstance(modify_job.call_args.kwargs["next_run_time"], datetime)
+    job = task_scheduler.scheduler.get_job("fetch_subtasks")
+    assert job.args == ("fetch_subtasks", task_scheduler.fetch_subtasks)
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for container readiness signaling."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from executor_manager.services.container_readiness import get_container_readiness
+
+
+class TestContainerReadiness:
+    @pytest.mark.asyncio
+    async def test_wait_returns_when_announced(self):
+        readiness = get_container_readiness()
+
+        waiter = asyncio.create_task(readiness.wait("c1", timeout=5))
+        await asyncio.sleep(0)
+        readiness.mark_ready("c1")
+
+        assert await asyncio.wait_for(waiter, 1) is True
+
+    @pytest.mark.asyncio
+    async def test_announcement_before_wait(self):
+        readiness = get_container_readiness()
+        readiness.mark_ready("c1")
+
+        assert await readiness.wait("c1", timeout=0.01) is True
+
+        readiness.forget("c1")
+        assert readiness.is_ready("c1") is False
+
+    @pytest.mark.asyncio
+    async def test_wait_times_out(self):
+        readiness = get_container_readiness()
+
+        assert await readiness.wait("c1", timeout=0.01) is False
+        assert readiness._waiters == {}
+
+
+class TestWaitForContainerReady:
+    @pytest.fixture
+    def manager(self, mocker, mock_redis_client):
+        mocker.patch(
+            "executor_manager.common.redis_factory.RedisClientFactory.get_sync_client",
+            return_value=mock_redis_client,
+        )
+        from executor_manager.services.sandbox import SandboxManager
+
+        return SandboxManager()
+
+    @pytest.mark.asyncio
+    async def test_announcement_cuts_wait_short(self, manager, mocker):
+        executor = MagicMock()
+        executor.get_container_address.return_value = {
+            "status": "success",
+            "base_url": "http://localhost:10001",
+        }
+        mocker.patch.object(
+            manager,
+            "_check_container_health",
+            new_callable=AsyncMock,
+            return_value=True,
+        )
+
+        async def announce():
+            await asyncio.sleep(0.05)
+            get_container_readiness().mark_ready("c1")
+
+        asyncio.create_task(announce())
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        # Without the announcement the first probe would come after 0.2s
+        base_url = await manager._wait_for_container_ready(
+            executor, "c1", max_retries=5, interval=1.0
+        )
+
+        assert base_url == "http://localhost:10001"
+        assert loop.time() - started < 0.15
+        assert get_container_readiness().is_ready("c1") is False
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_budget(self, manager, mocker):
+        executor = MagicMock()
+        executor.get_container_address.return_value = {"status": "failed"}
+
+        base_url = await manager._wait_for_container_ready(
+            executor, "c1", max_retries=2, interval=0.05
+        )
+
+        assert base_url is None
+        assert executor.get_container_address.call_count >= 2
@@ -0,0 +1,190 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the pooled, streaming E2B sandbox proxy."""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+BASE_URL = "http://localhost:10001"
+
+
+@pytest.fixture
+def proxy_module():
+    from executor_manager.routers import wegent_e2b_proxy
+
+    wegent_e2b_proxy._sandbox_info_cache.clear()
+    yield wegent_e2b_proxy
+    wegent_e2b_proxy._sandbox_info_cache.clear()
+
+
+@pytest.fixture
+def upstream(mocker, proxy_module):
+    """Route pooled clients to an in-memory sandbox container."""
+    received = []
+
+    async def handler(request: httpx.Request):
+        body = b"".join([chunk async for chunk in request.stream])
+        received.append((request, body))
+        if request.url.path == "/down":
+            raise httpx.ConnectError("connection refused", request=request)
+
+        async def chunks():
+            for part in (b"part-1,", b"part-2"):
+                yield part
+
+        return httpx.Response(
+            200,
+            headers={"content-type": "application/octet-stream", "x-envd": "1"},
+            content=chunks(),
+        )
+
+    from executor_manager.services.sandbox.proxy_clients import (
+        get_sandbox_proxy_clients,
+    )
+
+    clients = get_sandbox_proxy_clients()
+    original = clients.get_client
+    transport = httpx.MockTransport(handler)
+
+    def get_client(base_url):
+        client = original(base_url)
+        client._transport = transport
+        return client
+
+    mocker.patch.object(clients, "get_client", side_effect=get_client)
+    return received
+
+
+@pytest.fixture
+def lookup(mocker, proxy_module, sample_sandbox):
+    sample_sandbox.metadata["e2b_sandbox_id"] = "e2b-1"
+    manager = MagicMock()
+    manager.get_sandbox = AsyncMock(return_value=None)
+    mocker.patch.object(proxy_module, "get_sandbox_manager", return_value=manager)
+    return mocker.patch.object(
+        proxy_module,
+        "_find_sandbox_by_e2b_id",
+        new_callable=AsyncMock,
+        return_value=sample_sandbox,
+    )
+
+
+@pytest.fixture
+async def api(proxy_module):
+    app = FastAPI()
+    app.include_router(proxy_module.router, prefix="/e2b/proxy")
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        yield client
+    await proxy_module.close_proxy_clients()
+
+
+class TestProxyToSandbox:
+    @pytest.mark.asyncio
+    async def test_streams_body_both_ways(self, api, upstream, lookup):
+        response = await api.post(
+            "/e2b/proxy/e2b-1/49983/files?path=/a&path=/b",
+            content=b"x" * 100_000,
+            headers={"proxy-authorization": "Basic secret"},
+        )
+
+        assert response.status_code == 200
+        assert response.content == b"part-1,part-2"
+        assert response.headers["x-envd"] == "1"
+
+        request, body = upstream[0]
+        assert str(request.url) == f"{BASE_URL}/files?path=%2Fa&path=%2Fb"
+        assert body == b"x" * 100_000
+        assert "proxy-authorization" not in request.headers
+
+    @pytest.mark.asyncio
+    async def test_reuses_client_and_lookup(self, api, upstream, lookup):
+        from executor_manager.services.sandbox.proxy_clients import (
+            get_sandbox_proxy_clients,
+        )
+
+        for _ in range(3):
+            response = await api.get("/e2b/proxy/e2b-1/49983/health")
+            assert response.status_code == 200
+
+        assert lookup.await_count == 1
+        assert list(get_sandbox_proxy_clients()._clients) == [BASE_URL]
+        assert upstream[0][0].headers.get("transfer-encoding") is None
+
+    @pytest.mark.asyncio
+    async def test_connect_error_invalidates_lookup(self, api, upstream, lookup):
+        response = await api.get("/e2b/proxy/e2b-1/49983/down")
+        assert response.status_code == 503
+
+        await api.get("/e2b/proxy/e2b-1/49983/health")
+
+        assert lookup.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_deleted_sandbox_is_looked_up_again(
+        self, api, upstream, lookup, mocker, sample_sandbox
+    ):
+        from executor_manager.routers import sandbox as sandbox_router
+
+        await api.get("/e2b/proxy/e2b-1/49983/health")
+
+        manager = MagicMock()
+        manager.terminate_sandbox = AsyncMock(return_value=(True, "terminated"))
+        mocker.patch.object(sandbox_router, "get_sandbox_manager", return_value=manager)
+        app = FastAPI()
+        app.include_router(sandbox_router.router)
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://test"
+        ) as client:
+            response = await client.delete(f"/sandboxes/{sample_sandbox.sandbox_id}")
+        assert response.status_code == 200
+
+        # A sandbox recreated under the same E2B id runs in a new container
+        sample_sandbox.base_url = "http://localhost:10002"
+        await api.get("/e2b/proxy/e2b-1/49983/health")
+
+        assert lookup.await_count == 2
+        assert str(upstream[-1][0].url) == "http://localhost:10002/health"
+
+    @pytest.mark.asyncio
+    async def test_lookup_cache_is_bounded(
+        self, proxy_module, lookup, monkeypatch, sample_sandbox
+    ):
+        from executor_manager.common.config import reset_config
+
+        monkeypatch.setenv("SANDBOX_PROXY_LOOKUP_MAX_ENTRIES", "2")
+        reset_config()
+        for sandbox_id in ("a", "b", "a", "c"):
+            await proxy_module._get_sandbox_info(sandbox_id)
+        reset_config()
+
+        assert list(proxy_module._sandbox_info_cache) == ["a", "c"]
+
+
+class TestSandboxProxyClients:
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self, monkeypatch):
+        from executor_manager.common.config import reset_config
+        from executor_manager.services.sandbox.proxy_clients import (
+            SandboxProxyClients,
+        )
+
+        monkeypatch.setenv("SANDBOX_PROXY_MAX_CLIENTS", "2")
+        reset_config()
+        clients = SandboxProxyClients()
+
+        first = clients.get_client("http://a")
+        clients.get_client("http://b")
+        assert clients.get_client("http://a") is first
+        clients.get_client("http://c")
+
+        assert list(clients._clients) == ["http://a", "http://c"]
+        await clients.aclose()
+        assert first.is_closed
+        reset_config()
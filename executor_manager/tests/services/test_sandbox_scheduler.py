@@ -18,6 +18,7 @@ class TestSandboxScheduler:
         mock_manager = mocker.MagicMock()
         mock_manager._check_heartbeats = mocker.AsyncMock()
         mock_manager._collect_expired_sandboxes = mocker.AsyncMock()
+        mock_manager.warm_pool.enabled = False
         return mock_manager
 
     @pytest.fixture
@@ -140,6 +141,27 @@ class TestSandboxScheduler:
         # Verify three jobs were added: sandbox_heartbeat_check, task_heartbeat_check, sandbox_gc
         assert mock_scheduler_instance.add_job.call_count == 3
 
+    @pytest.mark.asyncio
+    async def test_start_adds_warm_pool_job_when_enabled(
+        self, sandbox_scheduler, mock_sandbox_manager, mocker
+    ):
+        """Test warm pool refill job is added only when a pool is configured."""
+        mock_scheduler_class = mocker.patch(
+            "executor_manager.services.sandbox.scheduler.AsyncIOScheduler"
+        )
+        mock_scheduler_instance = MagicMock()
+        mock_scheduler_instance.running = False
+        mock_scheduler_class.return_value = mock_scheduler_instance
+        mock_sandbox_manager.warm_pool.enabled = True
+
+        await sandbox_scheduler.start()
+
+        job_ids = [
+            call.kwargs.get("id")
+            for call in mock_scheduler_instance.add_job.call_args_list
+        ]
+        assert "warm_pool_refill" in job_ids
+
     # ----- stop Tests -----
 
     @pytest.mark.asyncio
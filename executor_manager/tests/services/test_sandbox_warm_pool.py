@@ -0,0 +1,259 @@
+# SPDX-FileCopyrightText: 2025 WeCode, Inc.
+#
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the warm sandbox container pool."""
+
+import asyncio
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from executor_manager.common.config import get_config
+
+IMAGE = "executor:1"
+
+
+@pytest.fixture
+def pool_env(monkeypatch):
+    """Configure a pool of 2-3 containers for the default image."""
+    from executor_manager.common.config import reset_config
+
+    monkeypatch.setenv("EXECUTOR_IMAGE", IMAGE)
+    monkeypatch.setenv("SANDBOX_WARM_POOL_MIN_SIZE", "2")
+    monkeypatch.setenv("SANDBOX_WARM_POOL_MAX_SIZE", "3")
+    reset_config()
+    yield
+    reset_config()
+
+
+@pytest.fixture
+def mock_executor(mocker):
+    executor = MagicMock()
+    executor.submit_executor.side_effect = lambda task, callback: {
+        "status": "success",
+        "executor_name": f"warm-{task['subtask_id'][:8]}",
+    }
+    executor.delete_executor.return_value = {"status": "success"}
+    mocker.patch(
+        "executor_manager.services.sandbox.warm_pool.ExecutorDispatcher.get_executor",
+        return_value=executor,
+    )
+    return executor
+
+
+@pytest.fixture
+def warm_pool(pool_env, mock_executor):
+    from executor_manager.services.sandbox.warm_pool import WarmContainerPool
+
+    manager = MagicMock()
+    manager._wait_for_container_ready = AsyncMock(
+        side_effect=lambda executor, name: f"http://localhost/{name}"
+    )
+    return WarmContainerPool(manager)
+
+
+def _warm_container(name, created_at=None, image=IMAGE):
+    from executor_manager.services.sandbox.warm_pool import WarmContainer
+
+    return WarmContainer(
+        container_name=name,
+        base_url=f"http://localhost/{name}",
+        image=image,
+        created_at=created_at or time.time(),
+    )
+
+
+class TestWarmContainerPool:
+    def test_disabled_by_default(self, mocker):
+        from executor_manager.services.sandbox.warm_pool import WarmContainerPool
+
+        pool = WarmContainerPool(MagicMock())
+
+        assert pool.enabled is False
+        assert pool.claim(IMAGE) is None
+        assert pool.get_stats()["misses"] == 0
+
+    def test_image_sizes_override(self, monkeypatch):
+        from executor_manager.common.config import reset_config
+        from executor_manager.services.sandbox.warm_pool import WarmContainerPool
+
+        monkeypatch.setenv(
+            "SANDBOX_WARM_POOL_IMAGES",
+            '{"custom:1": {"min_size": 1, "max_size": 5}, "off:1": {"min_size": 0}}',
+        )
+        reset_config()
+
+        pool = WarmContainerPool(MagicMock())
+
+        assert pool.get_pool_sizes() == {"custom:1": (1, 5)}
+        reset_config()
+
+    @pytest.mark.asyncio
+    async def test_refill_starts_min_size(self, warm_pool, mock_executor):
+        await warm_pool.refill()
+
+        assert mock_executor.submit_executor.call_count == 2
+        task = mock_executor.submit_executor.call_args[0][0]
+        assert task["type"] == "sandbox"
+        assert task["executor_image"] == IMAGE
+        assert task["sandbox_metadata"] == {"warm_pool": True}
+        assert warm_pool.get_stats()["idle"] == {IMAGE: 2}
+
+    @pytest.mark.asyncio
+    async def test_claim_counts_hits_and_misses(self, warm_pool):
+        warm_pool._idle[IMAGE].append(_warm_container("a"))
+
+        assert warm_pool.claim(IMAGE).container_name == "a"
+        assert warm_pool.claim(IMAGE) is None
+
+        stats = warm_pool.get_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_refill_follows_demand_up_to_max(self, warm_pool, mock_executor):
+        for _ in range(5):
+            warm_pool.claim(IMAGE)
+
+        await warm_pool.refill()
+
+        assert mock_executor.submit_executor.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_refill_replaces_stale_containers(self, warm_pool, mock_executor):
+        warm_pool._idle[IMAGE].extend(
+            [_warm_container("fresh"), _warm_container("stale", created_at=1.0)]
+        )
+
+        await warm_pool.refill()
+
+        mock_executor.delete_executor.assert_called_once_with("stale")
+        assert mock_executor.submit_executor.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_failed_start_is_not_pooled(self, warm_pool, mock_executor):
+        warm_pool._sandbox_manager._wait_for_container_ready = AsyncMock(
+            return_value=None
+        )
+
+        await warm_pool.refill()
+
+        assert warm_pool.get_stats()["idle"] == {IMAGE: 0}
+        assert warm_pool.get_stats()["start_failures"] == 2
+        assert mock_executor.delete_executor.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_discard_keeps_delete_task_until_done(self, warm_pool, mock_executor):
+        warm_pool.discard(_warm_container("broken"))
+
+        assert len(warm_pool._background_tasks) == 1
+        await asyncio.gather(*warm_pool._background_tasks)
+        await asyncio.sleep(0)
+
+        mock_executor.delete_executor.assert_called_once_with("broken")
+        assert warm_pool._background_tasks == set()
+
+    @pytest.mark.asyncio
+    async def test_remove_leftovers_keeps_claimed(self, warm_pool, mock_executor):
+        mock_executor.get_current_task_ids.return_value = {
+            "containers": [
+                {"container_name": "claimed"},
+                {"container_name": "orphan"},
+            ]
+        }
+
+        await warm_pool.remove_leftovers(in_use=["claimed"])
+
+        mock_executor.get_current_task_ids.assert_called_once_with("user=warmpool")
+        mock_executor.delete_executor.assert_called_once_with("orphan")
+
+
+class TestSandboxManagerWarmClaim:
+    @pytest.fixture
+    def manager(self, pool_env, mock_executor, mocker, mock_redis_client):
+        from executor_manager.common.singleton import SingletonMeta
+
+        SingletonMeta.reset_all_instances()
+        mocker.patch(
+            "executor_manager.common.redis_factory.RedisClientFactory.get_sync_client",
+            return_value=mock_redis_client,
+        )
+        from executor_manager.services.sandbox import SandboxManager
+
+        manager = SandboxManager()
+        mocker.patch.object(manager, "_schedule_warm_pool_refill")
+        yield manager
+        SingletonMeta.reset_all_instances()
+
+    @pytest.mark.asyncio
+    async def test_start_uses_warm_container(
+        self, manager, sample_sandbox, mock_executor, mocker
+    ):
+        manager.warm_pool._idle[IMAGE].append(_warm_container("warm-1"))
+        init = mocker.patch(
+            "executor_manager.services.sandbox.manager.init_warm_container",
+            new_callable=AsyncMock,
+            return_value=True,
+        )
+
+        error = await manager._start_sandbox_container(sample_sandbox)
+
+        assert error is None
+        assert sample_sandbox.container_name == "warm-1"
+        assert sample_sandbox.base_url == "http://localhost/warm-1"
+        assert init.call_args[0][1]["HEARTBEAT_ID"] == sample_sandbox.sandbox_id
+        mock_executor.submit_executor.assert_not_called()
+        manager._schedule_warm_pool_refill.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_init_falls_back_to_cold_start(
+        self, manager, sample_sandbox, mocker
+    ):
+        manager.warm_pool._idle[IMAGE].append(_warm_container("warm-1"))
+        mocker.patch(
+            "executor_manager.services.sandbox.manager.init_warm_container",
+            new_callable=AsyncMock,
+            return_value=False,
+        )
+        discard = mocker.patch.object(manager.warm_pool, "discard")
+
+        assert await manager._claim_warm_container(sample_sandbox) is False
+        discard.assert_called_once()
+        assert manager.warm_pool.get_stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_claims_from_requested_image_pool(
+        self, manager, sample_sandbox, mock_executor, mocker, monkeypatch
+    ):
+        from executor_manager.common.config import reset_config
+
+        monkeypatch.setenv("SANDBOX_WARM_POOL_IMAGES", '{"custom:1": {"min_size": 1}}')
+        reset_config()
+        manager.warm_pool._config = manager._config = get_config()
+        manager.warm_pool._idle[IMAGE].append(_warm_container("default-1"))
+        manager.warm_pool._idle["custom:1"].append(
+            _warm_container("custom-1", image="custom:1")
+        )
+        mocker.patch(
+            "executor_manager.services.sandbox.manager.init_warm_container",
+            new_callable=AsyncMock,
+            return_value=True,
+        )
+        sample_sandbox.metadata["executor_image"] = "custom:1"
+
+        assert await manager._start_sandbox_container(sample_sandbox) is None
+        assert sample_sandbox.container_name == "custom-1"
+
+        # An empty pool for the image falls back to a cold start of that image
+        mock_executor.submit_executor.side_effect = None
+        mock_executor.submit_executor.return_value = {
+            "status": "failed",
+            "error_msg": "cold start",
+        }
+        assert await manager._start_sandbox_container(sample_sandbox) == "cold start"
+        task = mock_executor.submit_executor.call_args[0][0]
+        assert task["executor_image"] == "custom:1"
+        assert len(manager.warm_pool._idle[IMAGE]) == 1
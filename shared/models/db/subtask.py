@@ -6,7 +6,7 @@
 
 from sqlalchemy import JSON, Boolean, Column, DateTime
 from sqlalchemy import Enum as SQLEnum
-from sqlalchemy import Integer, String, Text
+from sqlalchemy import Index, Integer, String, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -60,6 +60,8 @@ class Subtask(Base):
     )
 
     __table_args__ = (
+        # Finding the next subtask to dispatch for a set of tasks
+        Index("ix_subtasks_dispatch", "task_id", "role", "status", "message_id"),
         {
             "sqlite_autoincrement": True,
             "mysql_engine": "InnoDB",
@@ -116,6 +116,13 @@ class SubtaskContext(Base):
             return self.type_data.get("file_size", 0)
         return 0
 
+    @property
+    def sha256(self) -> str:
+        """Get content SHA-256 from type_data (attachment type)."""
+        if self.type_data and isinstance(self.type_data, dict):
+            return self.type_data.get("sha256", "")
+        return ""
+
     @property
     def mime_type(self) -> str:
         """Get MIME type from type_data (attachment type)."""
@@ -14,6 +14,7 @@ from shared.telemetry.metrics.business import (
     get_wegent_metrics,
     record_message_sent,
     record_model_call,
+    record_repo_clone,
     record_session_active_change,
     record_session_opened,
     record_task_completed,
@@ -37,6 +38,7 @@ __all__ = [
     "record_task_failed",
     "record_user_activity",
     "record_model_call",
+    "record_repo_clone",
     # Decorators
     "track_metric",
     "track_duration",
@@ -174,6 +174,16 @@ class WegentMetrics:
             unit="tokens",
         )
 
+    # Repository metrics
+    @property
+    def repo_clone_duration(self) -> Histogram:
+        """Histogram for repository clone duration."""
+        return self._get_or_create_histogram(
+            "wegent.repo.clone.duration",
+            "Repository clone duration in milliseconds",
+            unit="ms",
+        )
+
 
 def get_wegent_metrics() -> WegentMetrics:
     """
@@ -429,3 +439,29 @@ def record_model_call(
 
     except Exception as e:
         logger.debug(f"Failed to record model call metric: {e}")
+
+
+def record_repo_clone(
+    duration_ms: float,
+    mirror: Optional[str] = None,
+    success: bool = True,
+) -> None:
+    """
+    Record a repository clone.
+
+    Args:
+        duration_ms: Clone duration in milliseconds, including mirror update
+        mirror: Optional mirror cache status ("hit", "miss", "error", "disabled")
+        success: Whether the clone succeeded
+    """
+    if not is_telemetry_enabled():
+        return
+
+    try:
+        attributes = {"success": success}
+        if mirror:
+            attributes["mirror"] = mirror
+
+        get_wegent_metrics().repo_clone_duration.record(duration_ms, attributes)
+    except Exception as e:
+        logger.debug(f"Failed to record repo clone metric: {e}")
@@ -2,14 +2,25 @@
 #
 # SPDX-License-Identifier: Apache-2.0
 
+import fcntl
+import hashlib
+import os
 import subprocess
+import time
 from urllib.parse import quote, urlparse
 
 from shared.logger import setup_logger
+from shared.telemetry.metrics import record_repo_clone
 from shared.utils.crypto import decrypt_git_token, is_token_encrypted
 
 logger = setup_logger(__name__)
 
+# Seconds a single mirror git command may run before it is killed
+MIRROR_COMMAND_TIMEOUT = 600
+
+# Seconds between attempts to take a mirror lock held by another process
+MIRROR_LOCK_POLL_INTERVAL = 0.5
+
 
 def get_repo_name_from_url(url):
     # Remove .git suffix if exists
@@ -26,10 +37,22 @@ def get_repo_name_from_url(url):
     return repo_name
 
 
-def clone_repo(project_url, branch, project_path, user_name=None, token=None):
+def clone_repo(
+    project_url,
+    branch,
+    project_path,
+    user_name=None,
+    token=None,
+    depth=None,
+    filter_spec=None,
+):
     """
     Clone repository to specified path
 
+    Args:
+        depth: Optional shallow clone depth
+        filter_spec: Optional partial clone filter (e.g., "blob:none")
+
     Returns:
         Tuple (success, message):
         - On success: (True, None)
@@ -48,7 +71,13 @@ def clone_repo(project_url, branch, project_path, user_name=None, token=None):
     )
     if token:
         return clone_repo_with_token(
-            project_url, branch, project_path, user_name, token
+            project_url,
+            branch,
+            project_path,
+            user_name,
+            token,
+            depth=depth,
+            filter_spec=filter_spec,
         )
     return False, "Token is not provided"
 
@@ -94,8 +123,130 @@ def is_gerrit_url(url):
     return False
 
 
-def clone_repo_with_token(project_url, branch, project_path, username, token):
+def get_mirror_path(project_url, cache_dir):
+    """
+    Get the bare mirror path of a repository inside the mirror cache.
+
+    Mirrors are keyed by the repository URL without credentials, so all
+    clones of a repository that use the same cache directory share one
+    mirror. The executor manager gives each user their own cache directory.
+
+    Args:
+        project_url: Git repository URL
+        cache_dir: Mirror cache root directory
+
+    Returns:
+        Absolute path of the bare mirror repository
+    """
+    parsed = urlparse(project_url)
+    if parsed.scheme in ("http", "https") and "@" in parsed.netloc:
+        project_url = parsed._replace(netloc=parsed.netloc.split("@", 1)[1]).geturl()
+    key = project_url.rstrip("/")
+    if key.endswith(".git"):
+        key = key[:-4]
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    repo_name = get_repo_name_from_url(project_url)
+    return os.path.join(cache_dir, f"{repo_name}-{digest}.git")
+
+
+def update_mirror(
+    project_url,
+    auth_url,
+    branch,
+    cache_dir,
+    timeout=MIRROR_COMMAND_TIMEOUT,
+    lock_timeout=0,
+):
+    """
+    Create or incrementally fetch the local bare mirror of a repository.
+
+    Only one process updates a mirror at a time. Others wait at most
+    lock_timeout seconds for its lock and otherwise give up, leaving the
+    update to the lock holder. Mirrors never run gc, so objects borrowed by
+    workspaces through alternates are never removed under them.
+
+    Workspaces trust the objects of the mirrors they reference, so this must
+    only run in a trusted process, never inside a task container.
+
+    Args:
+        project_url: Git repository URL, used as the mirror key
+        auth_url: Repository URL with credentials, used only for this fetch
+        branch: Branch to fetch, or empty to fetch all branches
+        cache_dir: Mirror cache root directory
+        timeout: Seconds each git command may run
+        lock_timeout: Seconds to wait for a mirror locked by another update
+
+    Returns:
+        Tuple (mirror_path, status):
+        - status is "hit" when the mirror existed, "miss" when it was created
+        - (None, "busy") if another update holds the mirror lock
+        - (None, "error") if the mirror could not be prepared in time
+    """
+    mirror_path = get_mirror_path(project_url, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(f"{mirror_path}.lock", "w") as lock_file:
+            deadline = time.monotonic() + lock_timeout
+            while True:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        logger.info(f"git mirror of {project_url} is being updated")
+                        return None, "busy"
+                    time.sleep(MIRROR_LOCK_POLL_INTERVAL)
+
+            status = "hit"
+            if not os.path.exists(os.path.join(mirror_path, "HEAD")):
+                status = "miss"
+                subprocess.run(
+                    ["git", "init", "--bare", "--quiet", mirror_path],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=timeout,
+                )
+                subprocess.run(
+                    ["git", "config", "gc.auto", "0"],
+                    cwd=mirror_path,
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                    timeout=timeout,
+                )
+
+            if branch and branch.strip():
+                refspec = f"+refs/heads/{branch}:refs/heads/{branch}"
+                cmd = ["git", "fetch", "--quiet", auth_url, refspec]
+            else:
+                refspec = "+refs/heads/*:refs/heads/*"
+                cmd = ["git", "fetch", "--quiet", "--prune", auth_url, refspec]
+            subprocess.run(
+                cmd, cwd=mirror_path, capture_output=True, check=True, timeout=timeout
+            )
+
+        logger.info(f"git mirror {status}: {project_url} at {mirror_path}")
+        return mirror_path, status
+    except subprocess.TimeoutExpired:
+        logger.warning(
+            f"git mirror update timed out after {timeout}s for {project_url}"
+        )
+    except subprocess.CalledProcessError as e:
+        error_msg = e.stderr if e.stderr else str(e)
+        logger.warning(f"git mirror update failed for {project_url}: {error_msg}")
+    except Exception as e:
+        logger.warning(f"git mirror update failed for {project_url}: {e}")
+    return None, "error"
+
 
+def build_auth_url(project_url, username, token):
+    """
+    Embed token credentials into an HTTP(S) repository URL.
+
+    Returns:
+        URL with credentials, or project_url unchanged for other schemes
+    """
     if project_url.startswith("https://") or project_url.startswith("http://"):
         protocol, rest = project_url.split("://", 1)
 
@@ -114,6 +265,33 @@ def clone_repo_with_token(project_url, branch, project_path, username, token):
             auth_url = f"{protocol}://{username}:{token}@{rest}"
     else:
         auth_url = project_url
+    return auth_url
+
+
+def clone_repo_with_token(
+    project_url,
+    branch,
+    project_path,
+    username,
+    token,
+    depth=None,
+    filter_spec=None,
+):
+    """
+    Clone a repository using token credentials.
+
+    When GIT_MIRROR_CACHE_DIR is set and holds a mirror of the repository,
+    the workspace is cloned with --reference to it, so only objects missing
+    from the mirror are downloaded from the remote. The mirror is only read
+    here; it is kept up to date by the executor manager (update_mirror).
+
+    Returns:
+        Tuple (success, message):
+        - On success: (True, None)
+        - On failure: (False, error_message)
+    """
+    started = time.monotonic()
+    auth_url = build_auth_url(project_url, username, token)
 
     logger.info(
         f"Git clone {auth_url} to {project_path}, branch: {branch if branch else '(default)'}"
@@ -127,12 +305,29 @@ def clone_repo_with_token(project_url, branch, project_path, username, token):
     if branch and branch.strip():
         cmd.extend(["--branch", branch, "--single-branch"])
 
+    if depth:
+        cmd.extend(["--depth", str(depth)])
+    if filter_spec:
+        cmd.append(f"--filter={filter_spec}")
+
+    mirror_status = "disabled"
+    mirror_cache_dir = os.getenv("GIT_MIRROR_CACHE_DIR", "")
+    if mirror_cache_dir:
+        mirror_path = get_mirror_path(project_url, mirror_cache_dir)
+        if os.path.exists(os.path.join(mirror_path, "HEAD")):
+            mirror_status = "hit"
+            cmd.extend(["--reference", mirror_path])
+        else:
+            mirror_status = "miss"
+
     # Add URL and path
     cmd.extend([auth_url, project_path])
+    success = False
     try:
         # Use subprocess.run to capture output and errors
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         logger.info(f"git clone url: {project_url}, code: {result.returncode}")
+        success = True
 
         # Setup git hooks after successful clone
         setup_git_hooks(project_path)
@@ -145,6 +340,12 @@ def clone_repo_with_token(project_url, branch, project_path, username, token):
     except Exception as e:
         logger.error(f"git clone failed with unexpected error: {e}")
         return False, str(e)
+    finally:
+        duration_ms = (time.monotonic() - started) * 1000
+        logger.info(
+            f"git clone {project_url} took {duration_ms:.0f}ms, mirror: {mirror_status}"
+        )
+        record_repo_clone(duration_ms, mirror=mirror_status, success=success)
 
 
 def get_git_token_from_url(git_url):
@@ -207,8 +408,6 @@ def setup_git_hooks(repo_path):
         - On success: (True, None)
         - On failure: (False, error_message)
     """
-    import os
-
     try:
         # Check if .githooks directory exists in the repository
         githooks_path = os.path.join(repo_path, ".githooks")
@@ -11,9 +11,15 @@ This module provides functionality to detect and mask sensitive data such as:
 - Database connection strings
 - JWT tokens
 - Environment variable values containing sensitive data
+
+Most strings contain no sensitive data. Strings without any trigger literal
+are returned right away, and the rest are checked with one combined regex
+before the patterns are applied one by one. Results for short strings are
+memoized since callback payloads repeat the same values.
 """
 
 import re
+from functools import lru_cache
 from typing import Any, Dict, List, Optional, Union
 
 
@@ -99,6 +105,36 @@ class SensitiveDataMasker:
         "_URL",
     ]
 
+    # Pattern for export statements, masked when the variable name is sensitive
+    EXPORT_PATTERN = r'(export\s+)([A-Z_][A-Z0-9_]*)(=)(["\']?)([^"\'\s]+)(["\']?)'
+
+    # Lowercase literals of which every pattern above requires at least one;
+    # text containing none of them cannot match and is returned unchanged
+    TRIGGER_LITERALS = (
+        "github_pat_",
+        "ghp_",
+        "gho_",
+        "glpat-",
+        "sk-",
+        "akia",
+        "secret",
+        "token",
+        "api",
+        "eyj",
+        "password",
+        "passwd",
+        "pwd",
+        "mysql://",
+        "postgresql://",
+        "mongodb://",
+        "private key-----",
+        "export",
+    )
+
+    # Memoization bounds: number of cached strings and longest string cached
+    CACHE_SIZE = 4096
+    CACHE_MAX_LENGTH = 4096
+
     def __init__(
         self, mask_char: str = "*", show_prefix_len: int = 4, show_suffix_len: int = 4
     ):
@@ -119,6 +155,21 @@ class SensitiveDataMasker:
             (re.compile(pattern, re.IGNORECASE | re.MULTILINE), label)
             for pattern, label in self.SENSITIVE_PATTERNS
         ]
+        self._export_pattern = re.compile(self.EXPORT_PATTERN, re.IGNORECASE)
+
+        # All patterns in one alternation, used to find out in a single scan
+        # whether a string needs masking at all
+        patterns = [pattern for pattern, _ in self.SENSITIVE_PATTERNS]
+        patterns.append(self.EXPORT_PATTERN)
+        self._any_pattern = re.compile(
+            "|".join(f"(?:{pattern})" for pattern in patterns),
+            re.IGNORECASE | re.MULTILINE,
+        )
+
+        self._mask_cached = lru_cache(maxsize=self.CACHE_SIZE)(self._mask_text)
+        self._is_sensitive_key = lru_cache(maxsize=self.CACHE_SIZE)(
+            self._check_sensitive_key
+        )
 
     def _mask_value(self, value: str, min_length: int = 8) -> str:
         """
@@ -156,87 +207,107 @@ class SensitiveDataMasker:
         if not text or not isinstance(text, str):
             return text
 
-        masked_text = text
+        if len(text) <= self.CACHE_MAX_LENGTH:
+            return self._mask_cached(text)
+        return self._mask_text(text)
 
-        # Apply all patterns
-        for pattern, label in self.compiled_patterns:
-
-            def replace_match(match):
-                # Handle different group patterns
-                if len(match.groups()) == 1:
-                    # Single group: entire match is sensitive
-                    return self._mask_value(match.group(1))
-                elif len(match.groups()) == 2:
-                    # Two groups: first is context, second is sensitive value
-                    prefix = match.group(1) if match.group(1) else ""
-                    sensitive_value = match.group(2)
-                    masked_value = self._mask_value(sensitive_value)
-                    return f"{prefix}{masked_value}"
-                elif len(match.groups()) >= 3:
-                    # Multiple groups: first is context, second is sensitive value, third is suffix
-                    prefix = match.group(1) if match.group(1) else ""
-                    sensitive_value = match.group(2)
-                    masked_value = self._mask_value(sensitive_value)
-                    suffix = match.group(3) if match.group(3) else ""
-                    return f"{prefix}{masked_value}{suffix}"
-
-                return match.group(0)
-
-            masked_text = pattern.sub(replace_match, masked_text)
+    def _mask_text(self, text: str) -> str:
+        """
+        Mask sensitive data in a string.
 
-        # Special handling for export statements with sensitive vars
-        masked_text = self._mask_export_statements(masked_text)
+        Args:
+            text: Input text
 
-        return masked_text
+        Returns:
+            Text with sensitive data masked
+        """
+        lowered = text.lower()
+        if not any(literal in lowered for literal in self.TRIGGER_LITERALS):
+            return text
+        # If no pattern matches the original text, none of the passes below
+        # can change it
+        if not self._any_pattern.search(text):
+            return text
+        return self._apply_patterns(text)
 
-    def _mask_export_statements(self, text: str) -> str:
+    def _apply_patterns(self, text: str) -> str:
         """
-        Mask values in export statements that contain sensitive environment variables.
+        Apply each pattern in turn, then mask export statements.
+
+        Patterns run one after another on the output of the previous one, so
+        the order of SENSITIVE_PATTERNS decides how overlapping matches are
+        masked.
 
         Args:
             text: Input text
 
         Returns:
-            Text with export values masked
+            Text with sensitive data masked
         """
-        # Pattern: export VAR_NAME="value" or export VAR_NAME=value
-        export_pattern = re.compile(
-            r'(export\s+)([A-Z_][A-Z0-9_]*)(=)(["\']?)([^"\'\s]+)(["\']?)',
-            re.IGNORECASE,
-        )
+        masked_text = text
+        for pattern, _ in self.compiled_patterns:
+            masked_text = pattern.sub(self._replace_match, masked_text)
+
+        # Special handling for export statements with sensitive vars
+        return self._export_pattern.sub(self._replace_export, masked_text)
+
+    def _replace_match(self, match: re.Match) -> str:
+        """
+        Build the replacement for a match of one of SENSITIVE_PATTERNS.
 
-        def replace_export(match):
-            keyword = match.group(1)  # "export "
-            var_name = match.group(2)  # Variable name
-            equals = match.group(3)  # "="
-            quote_start = match.group(4)  # Opening quote
-            value = match.group(5)  # Value
-            quote_end = match.group(6)  # Closing quote
-
-            # First check if it matches non-sensitive patterns (should be excluded)
-            is_non_sensitive = any(
-                non_sensitive_pattern in var_name.upper()
-                for non_sensitive_pattern in self.NON_SENSITIVE_PATTERNS
-            )
-
-            if is_non_sensitive:
-                return match.group(0)
-
-            # Check if this is a sensitive environment variable
-            is_sensitive = any(
-                sensitive_keyword in var_name.upper()
-                for sensitive_keyword in self.SENSITIVE_ENV_VARS
-            )
-
-            if is_sensitive:
-                masked_value = self._mask_value(value)
-                return (
-                    f"{keyword}{var_name}{equals}{quote_start}{masked_value}{quote_end}"
-                )
+        Args:
+            match: Pattern match
 
+        Returns:
+            Replacement text
+        """
+        groups = len(match.groups())
+        if groups == 1:
+            # Single group: entire match is sensitive
+            return self._mask_value(match.group(1))
+
+        # First group is context, second is the sensitive value, third is a
+        # suffix
+        prefix = match.group(1) or ""
+        masked_value = self._mask_value(match.group(2))
+        suffix = (match.group(3) or "") if groups >= 3 else ""
+        return f"{prefix}{masked_value}{suffix}"
+
+    def _replace_export(self, match: re.Match) -> str:
+        """
+        Mask the value of an export statement with a sensitive variable name.
+
+        Args:
+            match: Match of EXPORT_PATTERN
+
+        Returns:
+            Export statement with its value masked if the name is sensitive
+        """
+        keyword, var_name, equals, quote_start, value, quote_end = match.groups()
+        if not self._is_sensitive_key(var_name):
             return match.group(0)
 
-        return export_pattern.sub(replace_export, text)
+        masked_value = self._mask_value(value)
+        return f"{keyword}{var_name}{equals}{quote_start}{masked_value}{quote_end}"
+
+    def _check_sensitive_key(self, key: str) -> bool:
+        """
+        Check whether a key or variable name suggests sensitive data.
+
+        Args:
+            key: Dictionary key or environment variable name
+
+        Returns:
+            True if the name contains a sensitive keyword and no
+            non-sensitive one
+        """
+        upper_key = key.upper()
+
+        # First check if it matches non-sensitive patterns (should be excluded)
+        if any(pattern in upper_key for pattern in self.NON_SENSITIVE_PATTERNS):
+            return False
+
+        return any(keyword in upper_key for keyword in self.SENSITIVE_ENV_VARS)
 
     def mask_dict(self, data: Dict[str, Any], recursive: bool = True) -> Dict[str, Any]:
         """
@@ -255,22 +326,7 @@ class SensitiveDataMasker:
         masked_data = {}
 
         for key, value in data.items():
-            # First check if it matches non-sensitive patterns (should be excluded)
-            is_non_sensitive = any(
-                non_sensitive_pattern in key.upper()
-                for non_sensitive_pattern in self.NON_SENSITIVE_PATTERNS
-            )
-
-            # Check if key name suggests sensitive data
-            is_sensitive_key = (
-                any(
-                    sensitive_keyword in key.upper()
-                    for sensitive_keyword in self.SENSITIVE_ENV_VARS
-                )
-                and not is_non_sensitive
-            )
-
-            if is_sensitive_key and isinstance(value, str):
+            if isinstance(value, str) and self._is_sensitive_key(key):
                 masked_data[key] = self._mask_value(value)
             elif isinstance(value, str):
                 masked_data[key] = self.mask_string(value)